@@ -6,6 +6,7 @@ import asyncio
 import asyncpg
 from src.infrastructure.api.business_store_client import BusinessStoreAPIClient
 from src.config.settings import Settings
+from src.infrastructure.database import sync_store_pages
 
 async def load_business_data():
     """실제 상가 데이터 로드"""
@@ -56,81 +57,33 @@ async def load_business_data():
             try:
                 print(f"📦 {district_name} 데이터 수집 중...")
                 
-                # API에서 상가 데이터 조회
-                stores = await client.get_stores_by_region(
-                    sido_cd=sido_cd,
-                    sigungu_cd=sigungu_cd,
-                    num_of_rows=1000  # 구별로 최대 1000개
+                # 페이지별 지문 비교 후 바뀐 상가만 기록, 구 전체 수집 후 누락 상가 폐업 처리
+                result = await sync_store_pages(
+                    conn,
+                    client.iter_store_pages(
+                        sido_cd=sido_cd,
+                        sigungu_cd=sigungu_cd,
+                        num_of_rows=1000  # 페이지 크기 (totalCount까지 전 페이지 순회)
+                    ),
+                    region_level="sigungu"
                 )
                 
-                if not stores:
+                if not result.fetched:
                     print(f"⚠️  {district_name}: 데이터 없음")
                     continue
                 
-                # DB에 저장
-                stored_count = 0
-                for store in stores:
-                    try:
-                        # 중복 확인 후 삽입
-                        insert_sql = """
-                        INSERT INTO business_stores (
-                            store_number, store_name, business_code, business_name,
-                            longitude, latitude, jibun_address, road_address,
-                            sido_name, sigungu_name, dong_name, building_name,
-                            floor_info, room_info, open_date, close_date,
-                            business_status, standard_industry_code, commercial_category_code
-                        ) VALUES (
-                            $1, $2, $3, $4, $5, $6, $7, $8, $9, $10,
-                            $11, $12, $13, $14, $15, $16, $17, $18, $19
-                        ) 
-                        ON CONFLICT (store_number) DO UPDATE SET
-                            store_name = EXCLUDED.store_name,
-                            business_code = EXCLUDED.business_code,
-                            business_name = EXCLUDED.business_name,
-                            longitude = EXCLUDED.longitude,
-                            latitude = EXCLUDED.latitude,
-                            business_status = EXCLUDED.business_status
-                        """
-                        
-                        await conn.execute(
-                            insert_sql,
-                            store.get('store_number'),
-                            store.get('store_name'),
-                            store.get('business_code'),
-                            store.get('business_name'),
-                            store.get('longitude'),
-                            store.get('latitude'),
-                            store.get('jibun_address'),
-                            store.get('road_address'),
-                            store.get('sido_name'),
-                            store.get('sigungu_name'),
-                            store.get('dong_name'),
-                            store.get('building_name'),
-                            store.get('floor_info'),
-                            store.get('room_info'),
-                            store.get('open_date'),
-                            store.get('close_date'),
-                            store.get('business_status', '영업'),
-                            store.get('standard_industry_code'),
-                            store.get('commercial_category_code')
-                        )
-                        stored_count += 1
-                        
-                    except Exception as e:
-                        print(f"❌ 개별 상가 저장 오류: {e}")
-                        continue
-                
-                total_stores += stored_count
-                print(f"✅ {district_name}: {stored_count}개 상가 저장됨")
-                
-                # API 호출 제한을 위한 잠시 대기
-                await asyncio.sleep(1)
+                total_stores += result.fetched
+                print(
+                    f"✅ {district_name}: {result.fetched}개 수집 "
+                    f"(신규 {result.inserted}, 변경 {result.updated}, "
+                    f"유지 {result.unchanged}, 폐업 {result.closed})"
+                )
                 
             except Exception as e:
                 print(f"❌ {district_name} 처리 오류: {e}")
                 continue
         
-        print(f"\n🎉 전체 {total_stores}개 상가 데이터 수집 완료!")
+        print(f"\n🎉 전체 {total_stores}개 상가 데이터 동기화 완료!")
         
         # 최종 통계 확인
         stats = await conn.fetch("""
@@ -154,6 +107,7 @@ async def load_business_data():
         traceback.print_exc()
         
     finally:
+        await client.aclose()
         await conn.close()
 
 if __name__ == "__main__":
@@ -0,0 +1,52 @@
+"""add pg_trgm GIN index on business_stores.business_name
+
+Revision ID: 20261017_name_trgm
+Revises: 20261017_content_hash
+Create Date: 2026-10-17 14:00:00.000000
+
+업종 필터:
+- 일반 검색어는 CategoryResolver가 업종코드로 해석 → ix_business_stores_code_status 사용
+- 코드로 해석되지 않는 자유 텍스트만 business_name ILIKE '%…%' 로 남으며,
+  이 경우를 pg_trgm GIN 인덱스가 처리 (선행 와일드카드도 인덱스 사용)
+- pg_trgm(contrib)을 설치할 수 없는 서버에서는 인덱스 없이 넘어감
+"""
+from typing import Sequence, Union
+import logging
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '20261017_name_trgm'
+down_revision: Union[str, None] = '20261017_content_hash'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+logger = logging.getLogger("alembic.runtime.migration")
+
+
+def _trgm_available() -> bool:
+    bind = op.get_bind()
+    return bool(bind.execute(sa.text(
+        "SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'"
+    )).scalar())
+
+
+def upgrade() -> None:
+    if not _trgm_available():
+        logger.warning("pg_trgm extension is not available; skipping ix_business_stores_business_name_trgm")
+        return
+
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index(
+        'ix_business_stores_business_name_trgm',
+        'business_stores',
+        ['business_name'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'business_name': 'gin_trgm_ops'}
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_business_stores_business_name_trgm")
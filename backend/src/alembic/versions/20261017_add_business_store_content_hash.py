@@ -0,0 +1,29 @@
+"""add business_stores content fingerprint column
+
+Revision ID: 20261017_content_hash
+Revises: 20261017_store_stats
+Create Date: 2026-10-17 13:00:00.000000
+
+상가 동기화 변경 감지:
+- content_hash: 매핑 필드 19개의 BLAKE2b-128 지문 (store_sync.fingerprint)
+- 동기화는 페이지마다 store_number로 기존 지문을 일괄 조회해 바뀐 행만 기록
+- 기존 행은 NULL로 시작하며 다음 동기화에서 한 번 채워짐
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '20261017_content_hash'
+down_revision: Union[str, None] = '20261017_store_stats'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('business_stores', sa.Column('content_hash', sa.LargeBinary(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('business_stores', 'content_hash')
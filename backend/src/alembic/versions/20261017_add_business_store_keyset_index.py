@@ -0,0 +1,35 @@
+"""add business_stores keyset pagination index
+
+Revision ID: 20261017_keyset_index
+Revises: 20261017_unit_vectors
+Create Date: 2026-10-17 11:00:00.000000
+
+/business-stores/by-region 커서 페이지네이션:
+- 쿼리: WHERE business_status = '영업' AND sido_name = ? AND sigungu_name = ?
+        AND (store_name, id) > (?, ?) ORDER BY store_name, id LIMIT ?
+- 영업 상가만 담는 부분 인덱스로 정렬 없이 다음 페이지 위치를 바로 탐색
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '20261017_keyset_index'
+down_revision: Union[str, None] = '20261017_unit_vectors'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_business_stores_region_name_keyset',
+        'business_stores',
+        ['sido_name', 'sigungu_name', 'store_name', 'id'],
+        unique=False,
+        postgresql_where=sa.text("business_status = '영업'")
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_business_stores_region_name_keyset', table_name='business_stores')
@@ -0,0 +1,141 @@
+"""add business_store_stats rollup table
+
+Revision ID: 20261017_store_stats
+Revises: 20261017_keyset_index
+Create Date: 2026-10-17 12:00:00.000000
+
+/business-stores/statistics 용 사전 집계 테이블:
+- (sido_name, sigungu_name, business_name, business_status) 별 상가 수
+- business_stores 변경 시 문장 단위(FOR EACH STATEMENT) 트리거가 전이 테이블
+  (REFERENCING NEW/OLD TABLE)로 변경분만 집계해 반영
+  → /sync-data, 벌크 로더(COPY 포함) 모두 자동 반영, 행 단위 트리거 비용 없음
+- 엔드포인트는 원본 테이블 대신 이 테이블만 조회 (수천 행 이하)
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '20261017_store_stats'
+down_revision: Union[str, None] = '20261017_keyset_index'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'business_store_stats',
+        sa.Column('sido_name', sa.String(length=50), nullable=False),
+        sa.Column('sigungu_name', sa.String(length=50), nullable=False),
+        sa.Column('business_name', sa.String(length=100), nullable=False),
+        sa.Column('business_status', sa.String(length=20), nullable=False),
+        sa.Column('store_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.PrimaryKeyConstraint(
+            'sido_name', 'sigungu_name', 'business_name', 'business_status',
+            name='business_store_stats_pkey'
+        )
+    )
+    op.create_index(
+        'ix_business_store_stats_status_sigungu',
+        'business_store_stats',
+        ['business_status', 'sigungu_name'],
+        unique=False
+    )
+
+    # 초기 적재
+    op.execute("""
+        INSERT INTO business_store_stats (sido_name, sigungu_name, business_name, business_status, store_count)
+        SELECT sido_name, sigungu_name, business_name, business_status, COUNT(*)
+        FROM business_stores
+        GROUP BY sido_name, sigungu_name, business_name, business_status
+    """)
+
+    # 변경분 반영 트리거 함수 (INSERT: +new, DELETE: -old, UPDATE: +new -old)
+    op.execute("""
+        CREATE OR REPLACE FUNCTION business_store_stats_apply() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                INSERT INTO business_store_stats AS s
+                    (sido_name, sigungu_name, business_name, business_status, store_count)
+                SELECT sido_name, sigungu_name, business_name, business_status, COUNT(*)
+                FROM new_rows
+                GROUP BY sido_name, sigungu_name, business_name, business_status
+                ON CONFLICT (sido_name, sigungu_name, business_name, business_status)
+                DO UPDATE SET store_count = s.store_count + EXCLUDED.store_count;
+            ELSIF TG_OP = 'DELETE' THEN
+                UPDATE business_store_stats AS s
+                SET store_count = s.store_count - d.cnt
+                FROM (
+                    SELECT sido_name, sigungu_name, business_name, business_status, COUNT(*) AS cnt
+                    FROM old_rows
+                    GROUP BY sido_name, sigungu_name, business_name, business_status
+                ) d
+                WHERE s.sido_name = d.sido_name AND s.sigungu_name = d.sigungu_name
+                  AND s.business_name = d.business_name AND s.business_status = d.business_status;
+            ELSE
+                INSERT INTO business_store_stats AS s
+                    (sido_name, sigungu_name, business_name, business_status, store_count)
+                SELECT sido_name, sigungu_name, business_name, business_status, SUM(delta)
+                FROM (
+                    SELECT sido_name, sigungu_name, business_name, business_status, 1 AS delta FROM new_rows
+                    UNION ALL
+                    SELECT sido_name, sigungu_name, business_name, business_status, -1 AS delta FROM old_rows
+                ) changes
+                GROUP BY sido_name, sigungu_name, business_name, business_status
+                HAVING SUM(delta) <> 0
+                ON CONFLICT (sido_name, sigungu_name, business_name, business_status)
+                DO UPDATE SET store_count = s.store_count + EXCLUDED.store_count;
+            END IF;
+
+            IF TG_OP <> 'INSERT' THEN
+                DELETE FROM business_store_stats WHERE store_count <= 0;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION business_store_stats_truncate() RETURNS trigger AS $$
+        BEGIN
+            DELETE FROM business_store_stats;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+
+    op.execute("""
+        CREATE TRIGGER business_store_stats_insert
+        AFTER INSERT ON business_stores
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION business_store_stats_apply()
+    """)
+    op.execute("""
+        CREATE TRIGGER business_store_stats_update
+        AFTER UPDATE ON business_stores
+        REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION business_store_stats_apply()
+    """)
+    op.execute("""
+        CREATE TRIGGER business_store_stats_delete
+        AFTER DELETE ON business_stores
+        REFERENCING OLD TABLE AS old_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION business_store_stats_apply()
+    """)
+    op.execute("""
+        CREATE TRIGGER business_store_stats_truncate
+        AFTER TRUNCATE ON business_stores
+        FOR EACH STATEMENT EXECUTE FUNCTION business_store_stats_truncate()
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS business_store_stats_truncate ON business_stores")
+    op.execute("DROP TRIGGER IF EXISTS business_store_stats_delete ON business_stores")
+    op.execute("DROP TRIGGER IF EXISTS business_store_stats_update ON business_stores")
+    op.execute("DROP TRIGGER IF EXISTS business_store_stats_insert ON business_stores")
+    op.execute("DROP FUNCTION IF EXISTS business_store_stats_truncate()")
+    op.execute("DROP FUNCTION IF EXISTS business_store_stats_apply()")
+    op.drop_index('ix_business_store_stats_status_sigungu', table_name='business_store_stats')
+    op.drop_table('business_store_stats')
@@ -0,0 +1,58 @@
+"""add business_stores unit vector columns
+
+Revision ID: 20261017_unit_vectors
+Revises: 20251130_optimize
+Create Date: 2026-10-17 10:00:00.000000
+
+반경 검색 SQL 경로 최적화:
+1. 위경도 BETWEEN 바운딩 박스 → ix_business_stores_geo_status 범위 스캔
+2. 후보 행은 단위 구 벡터 (x, y, z)의 현 거리 제곱으로 필터/정렬
+   - 행마다 acos/cos/sin 재계산 대신 저장된 생성 컬럼 사용
+   - 생성 컬럼이므로 INSERT/UPDATE 경로 변경 불필요 (PostgreSQL 12+)
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '20261017_unit_vectors'
+down_revision: Union[str, None] = '20251130_optimize'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'business_stores',
+        sa.Column(
+            'unit_x',
+            sa.Float(),
+            sa.Computed('cos(radians(latitude)) * cos(radians(longitude))', persisted=True),
+            nullable=True
+        )
+    )
+    op.add_column(
+        'business_stores',
+        sa.Column(
+            'unit_y',
+            sa.Float(),
+            sa.Computed('cos(radians(latitude)) * sin(radians(longitude))', persisted=True),
+            nullable=True
+        )
+    )
+    op.add_column(
+        'business_stores',
+        sa.Column(
+            'unit_z',
+            sa.Float(),
+            sa.Computed('sin(radians(latitude))', persisted=True),
+            nullable=True
+        )
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('business_stores', 'unit_z')
+    op.drop_column('business_stores', 'unit_y')
+    op.drop_column('business_stores', 'unit_x')
@@ -0,0 +1,89 @@
+"""add population_summary_snapshot
+
+Revision ID: 20261017_population_summary
+Revises: 20261017_population_parts
+Create Date: 2026-10-17 20:00:00.000000
+
+/population/summary 용 사전 계산 스냅샷 (단일 행):
+- version: 최신 reference_date, payload: 응답 본문 JSON 그대로, built_at: 재계산 시각
+- population_summary_refresh(): 전체 집계 + 상위 10개 지역을 다시 계산해 교체
+  → 인구 CSV 적재(population_import.py)와 파티션 DETACH 스크립트가 같은 트랜잭션에서 호출
+- payload는 json(jsonb 아님)이라 키 순서가 보존되고, 서버는 텍스트를 그대로 응답
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '20261017_population_summary'
+down_revision: Union[str, None] = '20261017_population_parts'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'population_summary_snapshot',
+        sa.Column('id', sa.SmallInteger(), server_default='1', nullable=False),
+        sa.Column('version', sa.Date(), nullable=True),
+        sa.Column('payload', sa.JSON(), nullable=False),
+        sa.Column('built_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.CheckConstraint('id = 1', name='population_summary_snapshot_single_row'),
+        sa.PrimaryKeyConstraint('id', name='population_summary_snapshot_pkey'),
+    )
+
+    # 동률은 /statistics 정렬(최신 기준월, 시군구, 읍면동, id) 순서
+    op.execute("""
+        CREATE OR REPLACE FUNCTION population_summary_refresh() RETURNS date AS $$
+            WITH stats AS (
+                SELECT
+                    COUNT(*) AS total_records,
+                    SUM(total_population) AS total_population,
+                    AVG(total_population) AS avg_population,
+                    COUNT(DISTINCT city) AS total_cities,
+                    COUNT(DISTINCT district) AS total_districts,
+                    MAX(reference_date) AS version
+                FROM population_statistics
+            ),
+            top_regions AS (
+                SELECT city, district, total_population,
+                       ROW_NUMBER() OVER (
+                           ORDER BY total_population DESC, reference_date DESC, COALESCE(city, ''), district, id
+                       ) AS rank
+                FROM population_statistics
+                ORDER BY rank
+                LIMIT 10
+            )
+            INSERT INTO population_summary_snapshot AS s (id, version, payload, built_at)
+            SELECT 1, stats.version, json_build_object(
+                'summary', json_build_object(
+                    'total_records', stats.total_records,
+                    'total_population', stats.total_population,
+                    'avg_population_per_district', COALESCE(ROUND(stats.avg_population), 0),
+                    'total_cities', stats.total_cities,
+                    'total_districts', stats.total_districts
+                ),
+                'top_regions', COALESCE(
+                    (SELECT json_agg(json_build_object(
+                        'city', city, 'district', district, 'population', total_population
+                     ) ORDER BY rank) FROM top_regions),
+                    '[]'::json
+                )
+            ), clock_timestamp()
+            FROM stats
+            ON CONFLICT (id) DO UPDATE SET
+                version = EXCLUDED.version,
+                payload = EXCLUDED.payload,
+                built_at = EXCLUDED.built_at
+            RETURNING s.version
+        $$ LANGUAGE sql
+    """)
+
+    # 초기 스냅샷
+    op.execute("SELECT population_summary_refresh()")
+
+
+def downgrade() -> None:
+    op.execute("DROP FUNCTION IF EXISTS population_summary_refresh()")
+    op.drop_table('population_summary_snapshot')
@@ -0,0 +1,176 @@
+"""range-partition population_statistics by reference_date (yearly)
+
+Revision ID: 20261017_population_parts
+Revises: 20261017_name_trgm
+Create Date: 2026-10-17 18:00:00.000000
+
+population_statistics 를 reference_date 연 단위 RANGE 파티션 테이블로 전환:
+- 파티션: population_statistics_y<연도> = [연도-01-01, 연도+1-01-01)
+  → 연도/기간 조건이 반열림 날짜 범위이면 파티션 프루닝 + reference_date 인덱스 범위 스캔
+- 월별 적재는 해당 연도 파티션에만 추가 (하나의 힙이 계속 커지지 않음)
+- population_statistics_ensure_partition(연도): 적재 전에 파티션 보장 (없으면 생성)
+- 오래된 연도는 DETACH PARTITION 으로 떼어내 별도 보관/삭제 (population_partitions.py)
+- 기본키는 파티션 키를 포함해야 하므로 (id, reference_date), id 시퀀스는 그대로 유지
+- 기존 테이블이 있으면 데이터를 옮기고, 없으면 빈 파티션 테이블을 생성
+"""
+from datetime import date
+from typing import Optional, Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '20261017_population_parts'
+down_revision: Union[str, None] = '20261017_name_trgm'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+AGE_BANDS = ("0_9", "10_19", "20_29", "30_39", "40_49", "50_59", "60_69", "70_79", "80_89", "90_99", "100_plus")
+
+COLUMNS = [
+    "id", "administrative_code", "reference_date", "province", "city", "district",
+    *(f"age_{band}_male" for band in AGE_BANDS),
+    *(f"age_{band}_female" for band in AGE_BANDS),
+    "total_population", "total_male", "total_female",
+]
+
+INDEXES = {
+    "ix_population_statistics_reference_date": ["reference_date"],
+    "ix_population_statistics_administrative_code": ["administrative_code"],
+}
+
+ENSURE_PARTITION_FUNCTION = """
+    CREATE OR REPLACE FUNCTION population_statistics_ensure_partition(p_year integer) RETURNS text AS $$
+    DECLARE
+        partition_name text := format('population_statistics_y%s', p_year);
+        partition_oid regclass := to_regclass(partition_name);
+    BEGIN
+        IF partition_oid IS NULL THEN
+            BEGIN
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF population_statistics FOR VALUES FROM (%L) TO (%L)',
+                    partition_name, make_date(p_year, 1, 1), make_date(p_year + 1, 1, 1)
+                );
+            EXCEPTION WHEN duplicate_table THEN
+                -- 동시에 다른 적재가 먼저 생성
+                NULL;
+            END;
+        ELSIF NOT EXISTS (
+            SELECT 1 FROM pg_inherits
+            WHERE inhparent = 'population_statistics'::regclass AND inhrelid = partition_oid
+        ) THEN
+            RAISE EXCEPTION 'partition % exists but is detached (archived)', partition_name;
+        END IF;
+        RETURN partition_name;
+    END;
+    $$ LANGUAGE plpgsql
+"""
+
+
+def _columns(id_sequence: str):
+    return [
+        sa.Column('id', sa.Integer(), server_default=sa.text(f"nextval('{id_sequence}'::regclass)"), nullable=False),
+        sa.Column('administrative_code', sa.String(length=20), nullable=False),
+        sa.Column('reference_date', sa.Date(), nullable=False),
+        sa.Column('province', sa.String(length=20), nullable=False),
+        sa.Column('city', sa.String(length=20), nullable=True),
+        sa.Column('district', sa.String(length=20), nullable=False),
+        *(sa.Column(f'age_{band}_male', sa.Integer(), nullable=False) for band in AGE_BANDS),
+        *(sa.Column(f'age_{band}_female', sa.Integer(), nullable=False) for band in AGE_BANDS),
+        sa.Column('total_population', sa.Integer(), nullable=False),
+        sa.Column('total_male', sa.Integer(), nullable=False),
+        sa.Column('total_female', sa.Integer(), nullable=False),
+    ]
+
+
+def _serial_sequence(bind, table: str) -> Optional[str]:
+    return bind.execute(sa.text("SELECT pg_get_serial_sequence(:table, 'id')"), {"table": table}).scalar()
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    existing = bind.execute(sa.text("SELECT to_regclass('population_statistics')")).scalar() is not None
+    this_year = date.today().year
+    first_year, last_year = this_year, this_year
+
+    if existing:
+        years = bind.execute(sa.text("""
+            SELECT EXTRACT(YEAR FROM MIN(reference_date))::int, EXTRACT(YEAR FROM MAX(reference_date))::int
+            FROM population_statistics
+        """)).one()
+        first_year = min(years[0] or this_year, this_year)
+        last_year = max(years[1] or this_year, this_year)
+
+        # 기존 테이블은 옆으로 치우고 이름(제약/인덱스)을 비워 둠
+        op.rename_table('population_statistics', 'population_statistics_unpartitioned')
+        op.execute(
+            "ALTER TABLE population_statistics_unpartitioned "
+            "RENAME CONSTRAINT population_statistics_pkey TO population_statistics_unpartitioned_pkey"
+        )
+        for name in (*INDEXES, 'ix_population_statistics_city_district'):
+            op.execute(f"DROP INDEX IF EXISTS {name}")
+
+        id_sequence = _serial_sequence(bind, 'population_statistics_unpartitioned')
+        op.execute(f"ALTER SEQUENCE {id_sequence} OWNED BY NONE")
+    else:
+        id_sequence = 'population_statistics_id_seq'
+        op.execute(f"CREATE SEQUENCE {id_sequence}")
+
+    op.create_table(
+        'population_statistics',
+        *_columns(id_sequence),
+        sa.PrimaryKeyConstraint('id', 'reference_date', name='population_statistics_pkey'),
+        postgresql_partition_by='RANGE (reference_date)',
+    )
+    op.execute(f"ALTER SEQUENCE {id_sequence} OWNED BY population_statistics.id")
+
+    op.execute(ENSURE_PARTITION_FUNCTION)
+    # 데이터 범위 + 올해/내년 파티션 미리 생성
+    op.execute(
+        f"SELECT population_statistics_ensure_partition(y) FROM generate_series({first_year}, {last_year + 1}) AS y"
+    )
+
+    # 부모 테이블 인덱스는 모든 파티션에 전파
+    for name, columns in INDEXES.items():
+        op.create_index(name, 'population_statistics', columns, unique=False)
+
+    if existing:
+        column_list = ", ".join(COLUMNS)
+        op.execute(f"""
+            INSERT INTO population_statistics ({column_list})
+            SELECT {column_list} FROM population_statistics_unpartitioned
+        """)
+        op.drop_table('population_statistics_unpartitioned')
+
+    op.execute("ANALYZE population_statistics")
+
+
+def downgrade() -> None:
+    # 떼어낸(DETACH) 파티션의 데이터는 되돌리지 않음
+    bind = op.get_bind()
+    id_sequence = _serial_sequence(bind, 'population_statistics')
+    op.execute(f"ALTER SEQUENCE {id_sequence} OWNED BY NONE")
+
+    op.create_table(
+        'population_statistics_unpartitioned',
+        *_columns(id_sequence),
+        sa.PrimaryKeyConstraint('id', name='population_statistics_unpartitioned_pkey'),
+    )
+    column_list = ", ".join(COLUMNS)
+    op.execute(f"""
+        INSERT INTO population_statistics_unpartitioned ({column_list})
+        SELECT {column_list} FROM population_statistics
+    """)
+
+    # 부모 삭제 시 연결된 파티션과 인덱스도 함께 삭제
+    op.drop_table('population_statistics')
+    op.execute("DROP FUNCTION IF EXISTS population_statistics_ensure_partition(integer)")
+
+    op.rename_table('population_statistics_unpartitioned', 'population_statistics')
+    op.execute(
+        "ALTER TABLE population_statistics "
+        "RENAME CONSTRAINT population_statistics_unpartitioned_pkey TO population_statistics_pkey"
+    )
+    op.execute(f"ALTER SEQUENCE {id_sequence} OWNED BY population_statistics.id")
+    for name, columns in INDEXES.items():
+        op.create_index(name, 'population_statistics', columns, unique=False)
@@ -5,11 +5,22 @@ TDD 방식으로 구현된 비즈니스 인사이트 분석 기능
 """
 
 from typing import Dict, Any, Optional, List
-import asyncio
-import json
-import subprocess
 from dataclasses import dataclass
 from abc import ABC, abstractmethod
+import os
+import shlex
+import shutil
+
+from src.config.settings import settings
+from src.infrastructure.database import DatabasePool, db_pool
+from src.infrastructure.mcp import MCPError, MCPStdioClient, mcp_client
+
+# 업종별 (요일, 시간대, 계절 추세) - mcp-server get_marketing_timing 과 같은 표
+MARKETING_TIMING = {
+    "restaurant": (["화요일", "수요일", "목요일"], ["11:30-13:00", "18:00-20:00"], "여름철 배달 주문 20% 증가 예상"),
+    "cafe": (["토요일", "일요일", "금요일"], ["09:00-11:00", "14:00-17:00"], "겨울철 따뜻한 음료 수요 30% 증가"),
+    "retail": (["금요일", "토요일", "일요일"], ["10:00-12:00", "15:00-19:00"], "연말 시즌 매출 40% 증가 예상"),
+}
 
 @dataclass
 class TargetCustomerAnalysis:
@@ -46,87 +57,215 @@ class IMCPServerConnector(ABC):
         pass
 
 class MCPServerConnector(IMCPServerConnector):
-    """실제 MCP 서버 연결 구현체"""
+    """mcp-server(Node) 연결 구현체 - 장기 실행 stdio 세션 하나를 공유"""
     
-    def __init__(self, server_path: str = "d:/FinalProjects/Marketing-Platform/mcp-server"):
-        self.server_path = server_path
+    def __init__(self, client: MCPStdioClient = mcp_client):
+        self.client = client
     
     async def call_tool(self, tool_name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
-        """MCP 서버의 도구를 호출합니다."""
-        try:
-            # MCP 서버 호출을 위한 스크립트 실행
-            call_data = {
-                "method": "tools/call",
-                "params": {
-                    "name": tool_name,
-                    "arguments": arguments
-                }
-            }
-            
-            # Node.js를 통해 MCP 서버 호출 (임시 구현)
-            # 실제로는 더 안정적인 연결 방식을 사용해야 함
-            cmd = f'cd {self.server_path} && node -e "console.log(JSON.stringify({{result: \'success\', data: {json.dumps(arguments)}}}))"'
-            
-            process = await asyncio.create_subprocess_shell(
-                cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
-            
-            stdout, stderr = await process.communicate()
-            
-            if process.returncode == 0:
-                result = json.loads(stdout.decode())
-                return result
-            else:
-                raise Exception(f"MCP Server Error: {stderr.decode()}")
-                
-        except Exception as e:
-            # Fallback to mock data for development
-            return await self._mock_tool_call(tool_name, arguments)
+        """MCP 서버의 도구를 호출합니다. (실패 시 MCPError)"""
+        return await self.client.call_tool(tool_name, arguments)
+
+class InProcessToolConnector(IMCPServerConnector):
+    """
+    Node 없이 같은 도구를 프로세스 안에서 실행하는 구현체
+    
+    mcp-server/src/index.ts 의 분석 도구와 같은 쿼리, 같은 결과 형식을 asyncpg 공유 풀로 처리합니다.
+    """
+    
+    def __init__(self, pool: DatabasePool = db_pool):
+        self.pool = pool
+        self._tools = {
+            "analyze_target_customers": self._analyze_target_customers,
+            "recommend_optimal_location": self._recommend_optimal_location,
+            "get_marketing_timing": self._get_marketing_timing,
+        }
+    
+    async def call_tool(self, tool_name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        """도구를 직접 실행합니다. (알 수 없는 도구면 MCPError)"""
+        tool = self._tools.get(tool_name)
+        if tool is None:
+            raise MCPError(f"Unknown tool: {tool_name}")
+        return await tool(arguments)
     
-    async def _mock_tool_call(self, tool_name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
-        """개발용 Mock 데이터 반환"""
-        if tool_name == "analyze_target_customers":
-            return {
-                "region": f"{arguments.get('region', '서울시')}",
-                "totalPopulation": 45000,
-                "targetCustomerAnalysis": {
-                    "primaryTarget": "30-49세 (42%)",
-                    "secondaryTarget": "20-29세 (28%)",
-                    "strategies": ["점심시간 할인", "직장인 맞춤 메뉴", "배달 서비스 강화"]
-                },
-                "confidence": "높음 (실제 인구통계 데이터 기반)",
-                "dataSource": "population_statistics 테이블"
+    async def _analyze_target_customers(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        business_type, region = args["businessType"], args["region"]
+        
+        # 1. 지역별 인구 분포 조회
+        async with self.pool.acquire() as conn:
+            data = await conn.fetchrow("""
+                SELECT 
+                    age_20_29_male + age_20_29_female as age_20_29_total,
+                    age_30_39_male + age_30_39_female as age_30_39_total,
+                    age_40_49_male + age_40_49_female as age_40_49_total,
+                    age_50_59_male + age_50_59_female as age_50_59_total,
+                    total_population,
+                    city,
+                    district
+                FROM population_statistics
+                WHERE city ILIKE $1 OR district ILIKE $1
+                ORDER BY reference_date DESC
+                LIMIT 1
+            """, f"%{region}%")
+        
+        if data is None:
+            return {"error": "해당 지역의 인구 데이터를 찾을 수 없습니다", "searchedRegion": region}
+        
+        # 2. 연령대별 비율 계산
+        total_population = data["total_population"] or 1
+        age_analysis = {
+            f"{band.replace('_', '-')}세": {
+                "count": data[f"age_{band}_total"],
+                "percentage": f"{data[f'age_{band}_total'] / total_population * 100:.1f}",
             }
-        elif tool_name == "recommend_optimal_location":
-            return {
-                "recommendedAreas": [
-                    {"area": "강남구 역삼동", "score": "89.2", "expectedROI": "23.4%"},
-                    {"area": "서초구 서초동", "score": "87.1", "expectedROI": "22.1%"},
-                    {"area": "송파구 잠실동", "score": "84.5", "expectedROI": "20.8%"}
-                ],
-                "analysisMetadata": {
-                    "totalAnalyzedLocations": 45,
-                    "confidenceLevel": "높음",
-                    "factors": ["인구밀도", "타겟연령대비율", "업종적합성"]
+            for band in ("20_29", "30_39", "40_49", "50_59")
+        }
+        
+        # 3. 업종별 타겟 고객 분석 로직
+        kind = business_type.lower()
+        if kind in ("restaurant", "cafe"):
+            # 30-40대가 주요 타겟
+            middle_age = data["age_30_39_total"] + data["age_40_49_total"]
+            primary_target = "30-49세" if middle_age > data["age_20_29_total"] else "20-29세"
+            secondary_target = "전 연령대"
+            strategies = ["점심시간 할인", "직장인 맞춤 메뉴", "배달 서비스 강화"]
+        elif kind in ("retail", "shopping"):
+            primary_target, secondary_target = "20-39세", "40-59세"
+            strategies = ["온라인 연동 프로모션", "세일 이벤트", "멤버십 혜택"]
+        else:
+            primary_target, secondary_target = "30-49세", "20-29세"
+            strategies = ["지역 맞춤 서비스", "고객 충성도 프로그램"]
+        
+        return {
+            "region": f"{data['city']} {data['district']}",
+            "totalPopulation": total_population,
+            "ageAnalysis": age_analysis,
+            "targetCustomerAnalysis": {
+                "primaryTarget": primary_target,
+                "secondaryTarget": secondary_target,
+                "strategies": strategies
+            },
+            "confidence": "높음 (실제 인구통계 데이터 기반)",
+            "dataSource": "population_statistics 테이블"
+        }
+    
+    async def _recommend_optimal_location(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        business_type, budget = args["businessType"], args["budget"]
+        target_age = args.get("targetAge") or ""
+        
+        # 1. 인구 밀도가 높은 지역 찾기
+        async with self.pool.acquire() as conn:
+            rows = await conn.fetch("""
+                SELECT 
+                    city,
+                    district,
+                    total_population,
+                    (age_20_29_male + age_20_29_female) as young_adults,
+                    (age_30_39_male + age_30_39_female + age_40_49_male + age_40_49_female) as middle_age,
+                    (age_50_59_male + age_50_59_female) as older_adults
+                FROM population_statistics
+                WHERE total_population > 5000
+                ORDER BY total_population DESC
+                LIMIT 20
+            """)
+        
+        # 2. 점수 계산 (인구 밀도 40%, 타겟 연령대 비율 30%, 업종별 가중치 30%)
+        kind = business_type.lower()
+        scored = []
+        for row in rows:
+            population = row["total_population"]
+            score = population / 50000 * 40
+            if "20-29" in target_age:
+                score += row["young_adults"] / population * 30
+            elif "30-49" in target_age:
+                score += row["middle_age"] / population * 30
+            else:
+                score += row["middle_age"] / population * 20
+            if kind in ("restaurant", "cafe"):
+                score += row["middle_age"] / population * 30
+            elif kind == "retail":
+                score += row["young_adults"] / population * 25
+            else:
+                score += 15
+            scored.append((min(score, 100), score, row))
+        
+        # 3. 상위 5개 지역 선별
+        scored.sort(key=lambda item: item[0], reverse=True)
+        return {
+            "recommendedAreas": [
+                {
+                    "area": f"{row['city']} {row['district']}",
+                    "score": f"{capped:.1f}",
+                    "expectedROI": f"{score * 0.8 + 20:.1f}%",
+                    "population": row["total_population"]
                 }
+                for capped, score, row in scored[:5]
+            ],
+            "analysisMetadata": {
+                "totalAnalyzedLocations": len(rows),
+                "confidenceLevel": "높음",
+                "factors": ["인구밀도", "타겟연령대비율", "업종적합성"],
+                "budget": budget
             }
-        elif tool_name == "get_marketing_timing":
-            return {
-                "timing": {
-                    "bestDays": ["화요일", "수요일", "목요일"],
-                    "bestHours": ["11:30-13:00", "18:00-20:00"],
-                    "seasonalTrends": "여름철 배달 주문 20% 증가 예상"
-                },
-                "confidence": "보통 (인구 데이터 + 업종 분석 기반)",
-                "recommendations": [
-                    "타겟 연령대 활동 패턴에 맞춘 마케팅 시간 설정",
-                    "지역 특성을 고려한 프로모션 기획"
-                ]
-            }
+        }
+    
+    async def _get_marketing_timing(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        target_age, business_type, region = args["targetAge"], args["businessType"], args["region"]
+        
+        # 인구 데이터 기반 마케팅 타이밍 분석
+        async with self.pool.acquire() as conn:
+            data = await conn.fetchrow("""
+                SELECT 
+                    city,
+                    district,
+                    total_population,
+                    (age_20_29_male + age_20_29_female) as age_20_29,
+                    (age_30_39_male + age_30_39_female) as age_30_39,
+                    (age_40_49_male + age_40_49_female) as age_40_49
+                FROM population_statistics
+                WHERE city ILIKE $1 OR district ILIKE $1
+                ORDER BY reference_date DESC
+                LIMIT 1
+            """, f"%{region}%")
+        
+        if data is None:
+            return {"error": "해당 지역의 데이터를 찾을 수 없습니다", "searchedRegion": region}
+        
+        # 업종별 최적 타이밍
+        best_days, best_hours, seasonal_trends = MARKETING_TIMING.get(
+            business_type.lower(), (["월요일", "화요일", "수요일"], ["10:00-17:00"], "계절별 변동 없음")
+        )
         
-        return {"error": f"Unknown tool: {tool_name}"}
+        # 타겟 연령대에 따른 조정
+        if "20-29" in target_age:
+            best_hours, best_days = ["19:00-22:00", "12:00-14:00"], ["금요일", "토요일", "일요일"]
+        elif "40-49" in target_age:
+            best_hours, best_days = ["10:00-16:00"], ["화요일", "수요일", "목요일"]
+        
+        return {
+            "region": f"{data['city']} {data['district']}",
+            "targetAge": target_age,
+            "businessType": business_type,
+            "timing": {
+                "bestDays": best_days,
+                "bestHours": best_hours,
+                "seasonalTrends": seasonal_trends
+            },
+            "populationContext": {
+                "totalPopulation": data["total_population"],
+                "targetAgePopulation": (
+                    data["age_20_29"] if "20-29" in target_age
+                    else data["age_30_39"] if "30-39" in target_age
+                    else data["age_40_49"]
+                )
+            },
+            "confidence": "보통 (인구 데이터 + 업종 분석 기반)",
+            "recommendations": [
+                "타겟 연령대 활동 패턴에 맞춘 마케팅 시간 설정",
+                "지역 특성을 고려한 프로모션 기획",
+                "계절별 메뉴/상품 라인업 조정"
+            ]
+        }
 
 class InsightsAnalysisService:
     """인사이트 분석 서비스"""
@@ -245,7 +384,34 @@ class InsightsAnalysisService:
             )
 
 # Factory 함수
+def stdio_server_available(command: str, cwd: str) -> bool:
+    """
+    mcp-server를 실제로 띄울 수 있는지 (실행 파일이 PATH에 있고, 작업 디렉토리와 진입 스크립트가 있는지)
+
+    명령의 옵션이 아닌 인자 중 경로처럼 보이는 것(dist/index.js 등)은 작업 디렉토리 기준 파일이 있어야 합니다.
+    """
+    args = shlex.split(command)
+    if not args or shutil.which(args[0]) is None or not os.path.isdir(cwd):
+        return False
+    scripts = [arg for arg in args[1:] if not arg.startswith("-") and ("/" in arg or os.path.splitext(arg)[1])]
+    return all(os.path.isfile(os.path.join(cwd, script)) for script in scripts)
+
+def create_mcp_connector(transport: Optional[str] = None) -> IMCPServerConnector:
+    """
+    도구 연결 구현체 선택 (settings.mcp_transport)
+    
+    auto: mcp-server 실행 파일, 작업 디렉토리, 빌드된 진입 스크립트가 모두 있으면 stdio, 아니면 프로세스 내 구현
+    """
+    transport = transport or settings.mcp_transport
+    if transport == "auto":
+        available = stdio_server_available(settings.mcp_server_command, settings.mcp_server_dir)
+        transport = "stdio" if available else "python"
+    if transport == "stdio":
+        return MCPServerConnector()
+    if transport == "python":
+        return InProcessToolConnector()
+    raise ValueError(f"Unknown MCP transport: {transport}")
+
 def create_insights_service() -> InsightsAnalysisService:
     """인사이트 서비스 팩토리"""
-    mcp_connector = MCPServerConnector()
-    return InsightsAnalysisService(mcp_connector)
+    return InsightsAnalysisService(create_mcp_connector())
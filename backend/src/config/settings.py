@@ -7,9 +7,8 @@
 - .env 파일은 절대 Git에 커밋하지 마세요
 """
 from pydantic_settings import BaseSettings
-from pydantic import ConfigDict, Field, field_validator
-from typing import List, Optional
-import os
+from pydantic import ConfigDict, Field
+from typing import Dict, List, Optional
 import secrets
 
 
@@ -96,6 +95,52 @@ class Settings(BaseSettings):
     mcp_pool_timeout: int = Field(default=30, description="연결 타임아웃 (초)")
     mcp_pool_recycle: int = Field(default=1800, description="연결 재사용 시간 (초)")
     
+    # =================================
+    # MCP 서버 설정 (인사이트 분석 도구)
+    # =================================
+    mcp_transport: str = Field(
+        default="auto",
+        description="도구 제공 방식 (stdio: mcp-server 프로세스, python: 프로세스 내 구현, auto: node 있으면 stdio)"
+    )
+    mcp_server_command: str = Field(default="node dist/index.js", description="mcp-server 실행 명령")
+    mcp_server_dir: str = Field(default="../mcp-server", description="mcp-server 작업 디렉토리")
+    mcp_call_timeout: float = Field(default=10.0, description="MCP 도구 호출 타임아웃 (초)")
+    
+    # =================================
+    # 상가 공간 인덱스 설정
+    # =================================
+    spatial_index_enabled: bool = Field(default=True, description="인메모리 공간 인덱스 사용 (False면 SQL 반경 검색)")
+    spatial_index_cell_deg: float = Field(default=0.01, description="격자 셀 크기 (도, 0.01 ≈ 1.1km)")
+    density_tile_detail: int = Field(default=5, description="밀도 타일 한 변의 셀 분할 (2^detail, 5 → 32x32)")
+    density_tile_cache_size: int = Field(default=4096, description="밀도 타일 LRU 캐시 항목 수")
+    marker_cluster_detail: int = Field(default=3, description="마커 클러스터 격자 (타일 한 변 2^detail, 3 → 32px)")
+    marker_cluster_max_zoom: int = Field(default=17, description="이 줌 이상에서는 클러스터 없이 개별 상가 반환")
+    nearby_batch_max_probes: int = Field(default=100, description="/nearby/batch 한 요청의 최대 지점 수")
+    
+    # =================================
+    # 인구 통계 큐브 설정
+    # =================================
+    population_cube_enabled: bool = Field(default=True, description="인메모리 인구 큐브 사용 (False면 SQL 집계)")
+    population_summary_snapshot_enabled: bool = Field(
+        default=True, description="/population/summary 사전 계산 스냅샷 응답 (False면 큐브/SQL 집계)"
+    )
+    population_centroid_csv: str = Field(
+        default="data/administrative_centroids.csv",
+        description="상권 반경 인구 추정용 읍면동 중심점 CSV (administrative_code, latitude, longitude, area_km2)"
+    )
+    population_batch_max_regions: int = Field(
+        default=500, description="/population/regions/batch 한 요청의 최대 읍면동 키 + 행정기관코드 수"
+    )
+    site_score_weights: Dict[str, float] = Field(
+        default={"target_share": 0.35, "population": 0.25, "competition": 0.2, "saturation": 0.2},
+        description="입지 점수 지표별 가중치 (target_share, population, competition, saturation - 합으로 정규화)"
+    )
+    
+    # =================================
+    # 대용량 내보내기 설정
+    # =================================
+    export_prefetch_rows: int = Field(default=2000, description="내보내기 서버 측 커서 prefetch 행 수 (전송 조각 크기)")
+    
     # =================================
     # Redis 설정 (보안 강화)
     # =================================
@@ -128,6 +173,13 @@ class Settings(BaseSettings):
     sbdata_api_key: Optional[str] = Field(default=None, description="소상공인진흥공단 API Key")
     kosis_api_key: Optional[str] = Field(default=None, description="통계청 KOSIS API Key")
     
+    # 소상공인 상가정보 API 호출 설정 (data.go.kr 트래픽 한도에 맞춤)
+    sbdata_api_base_url: str = Field(default="https://apis.data.go.kr/B553077/api/open/sdsc2", description="상가정보 API 기본 URL")
+    sbdata_api_rate_per_second: float = Field(default=20.0, description="초당 최대 호출 수 (토큰 버킷)")
+    sbdata_api_concurrency: int = Field(default=4, description="동시 페이지 요청 수")
+    sbdata_api_max_retries: int = Field(default=5, description="429/5xx 재시도 횟수")
+    sbdata_api_timeout: float = Field(default=30.0, description="요청 타임아웃 (초)")
+    
     # =================================
     # 이메일 설정 (환경변수 필수)
     # =================================
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Date, DateTime, Float, Text
+from sqlalchemy import Column, Integer, String, Date, DateTime, Float, Text, Computed, LargeBinary
 from sqlalchemy.sql import func
 from src.config.database import Base
 
@@ -21,6 +21,11 @@ class BusinessStore(Base):
     jibun_address = Column(String(300))  # 지번주소
     road_address = Column(String(300))  # 도로명주소
     
+    # 단위 구 벡터 (반경 검색용 생성 컬럼, 현 거리로 정렬)
+    unit_x = Column(Float, Computed("cos(radians(latitude)) * cos(radians(longitude))", persisted=True))
+    unit_y = Column(Float, Computed("cos(radians(latitude)) * sin(radians(longitude))", persisted=True))
+    unit_z = Column(Float, Computed("sin(radians(latitude))", persisted=True))
+    
     # 행정구역 정보
     sido_name = Column(String(50), nullable=False, index=True)  # 시도명
     sigungu_name = Column(String(50), nullable=False, index=True)  # 시군구명
@@ -41,6 +46,7 @@ class BusinessStore(Base):
     commercial_category_code = Column(String(20))  # 상권업종분류코드
     
     # 메타데이터
+    content_hash = Column(LargeBinary, nullable=True)  # 매핑 필드 지문 (동기화 변경 감지)
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
     
@@ -52,4 +58,18 @@ class BusinessStore(Base):
             ('sido_name', 'sigungu_name', 'dong_name'),
             ('business_code', 'business_status'),
             ('longitude', 'latitude'),
-        ] 
\ No newline at end of file
+        ] 
+
+
+class BusinessStoreStats(Base):
+    """상가 수 사전 집계 (business_stores 트리거로 유지)"""
+    __tablename__ = "business_store_stats"
+
+    sido_name = Column(String(50), primary_key=True)  # 시도명
+    sigungu_name = Column(String(50), primary_key=True)  # 시군구명
+    business_name = Column(String(100), primary_key=True)  # 업종명
+    business_status = Column(String(20), primary_key=True)  # 영업상태
+    store_count = Column(Integer, nullable=False, server_default="0")  # 상가 수
+
+    def __repr__(self):
+        return f"<BusinessStoreStats(sigungu_name='{self.sigungu_name}', business_name='{self.business_name}', store_count={self.store_count})>"
@@ -3,10 +3,12 @@ from src.config.database import Base
 
 class PopulationStatistics(Base):
     __tablename__ = "population_statistics"
+    # reference_date 연 단위 RANGE 파티션 (파티션 키를 포함한 복합 기본키)
+    __table_args__ = {"postgresql_partition_by": "RANGE (reference_date)"}
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     administrative_code = Column(String(20), nullable=False, index=True)
-    reference_date = Column(Date, nullable=False, index=True)
+    reference_date = Column(Date, primary_key=True, nullable=False, index=True)
     province = Column(String(20), nullable=False)
     city = Column(String(20), nullable=True)
     district = Column(String(20), nullable=False)
@@ -1,8 +1,9 @@
 from typing import List
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy import and_, text
 from src.domain.models.population import PopulationStatistics
 from src.domain.schemas.population import PopulationStatisticsFilter
+from src.infrastructure.database.region_hierarchy import REGION_QUERY, region_hierarchy
 
 class PopulationService:
     def __init__(self, db: Session):
@@ -33,30 +34,6 @@ class PopulationService:
         return query.offset(skip).limit(limit).all()
 
     def get_unique_locations(self) -> dict:
-        provinces = self.db.query(PopulationStatistics.province).distinct().all()
-        provinces = [p[0] for p in provinces]
-
-        result = {
-            "provinces": provinces,
-            "cities": {},
-            "districts": {}
-        }
-
-        for province in provinces:
-            cities = self.db.query(PopulationStatistics.city)\
-                .filter(PopulationStatistics.province == province)\
-                .distinct().all()
-            cities = [c[0] for c in cities]
-            result["cities"][province] = cities
-
-            result["districts"][province] = {}
-            for city in cities:
-                districts = self.db.query(PopulationStatistics.district)\
-                    .filter(
-                        PopulationStatistics.province == province,
-                        PopulationStatistics.city == city
-                    ).distinct().all()
-                districts = [d[0] for d in districts]
-                result["districts"][province][city] = districts
-
-        return result
+        """시도/시군구/읍면동 계층 (캐시가 비었을 때만 DISTINCT 쿼리 한 번)"""
+        tree = region_hierarchy.get_sync(lambda: self.db.execute(text(REGION_QUERY)).all())
+        return tree.nested
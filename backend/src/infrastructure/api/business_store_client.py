@@ -1,136 +1,215 @@
 import httpx
 import xml.etree.ElementTree as ET
-from typing import List, Dict, Optional
-from datetime import datetime
+from typing import AsyncIterator, List, Dict, Optional, Tuple
+import asyncio
 import logging
-from ...config.settings import Settings
+import random
+from ...config.settings import settings
+from .store_xml import StorePageParser, StoreRow, parse_store_rows, row_to_dict
+from .token_bucket import TokenBucket
 
 logger = logging.getLogger(__name__)
 
+# 재시도 대상 상태 코드 (한도 초과 + 서버 오류)
+RETRYABLE_STATUS = frozenset({429, 500, 502, 503, 504})
+
+
 class BusinessStoreAPIClient:
-    """소상공인시장진흥공단 상가(상권) 정보 API 클라이언트"""
+    """
+    소상공인시장진흥공단 상가(상권) 정보 API 클라이언트
     
-    def __init__(self):
-        self.settings = Settings()
-        self.base_url = "https://apis.data.go.kr/B553077/api/open/sdsc2"
-        # 제공받은 인증키 사용
-        self.service_key = "gQc0yFNcfSJFxqpfs1cTqhCll64HdzEQjHYSKeOYUpUMcrS2rqjroogqUOb/cuUI4dZSKEukcnq1me2b99jyFg=="
-        
-    async def get_stores_by_region(
-        self, 
-        sido_cd: str, 
-        sigungu_cd: str = None,
-        dong_cd: str = None,
-        page_no: int = 1,
-        num_of_rows: int = 1000
-    ) -> List[Dict]:
-        """지역별 상가 정보 조회"""
-        
+    - keep-alive 연결을 재사용하는 장기 httpx.AsyncClient (aclose()로 종료)
+    - totalCount 기준 전 페이지 순회, 동시 요청 수 제한
+    - 응답 본문을 받는 대로 XMLPullParser로 파싱 (store_xml)
+    - 토큰 버킷 호출 제한 + 429/5xx 지수 백오프 재시도
+    """
+    
+    DEFAULT_SERVICE_KEY = "gQc0yFNcfSJFxqpfs1cTqhCll64HdzEQjHYSKeOYUpUMcrS2rqjroogqUOb/cuUI4dZSKEukcnq1me2b99jyFg=="
+    
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        service_key: Optional[str] = None,
+        rate_per_second: Optional[float] = None,
+        concurrency: Optional[int] = None,
+        max_retries: Optional[int] = None,
+        timeout: Optional[float] = None,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+    ):
+        self.settings = settings
+        self.base_url = base_url or settings.sbdata_api_base_url
+        # 제공받은 인증키 사용 (환경변수 SBDATA_API_KEY 우선)
+        self.service_key = service_key or settings.sbdata_api_key or self.DEFAULT_SERVICE_KEY
+        self.concurrency = concurrency or settings.sbdata_api_concurrency
+        self.max_retries = settings.sbdata_api_max_retries if max_retries is None else max_retries
+        self.timeout = timeout or settings.sbdata_api_timeout
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.limiter = TokenBucket(rate_per_second or settings.sbdata_api_rate_per_second)
+        self._client: Optional[httpx.AsyncClient] = None
+    
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """장기 연결 풀 클라이언트 (최초 사용 시 생성)"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.concurrency,
+                    max_keepalive_connections=self.concurrency,
+                ),
+            )
+        return self._client
+    
+    async def aclose(self) -> None:
+        """연결 풀 종료"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+    
+    async def __aenter__(self) -> "BusinessStoreAPIClient":
+        return self
+    
+    async def __aexit__(self, *exc) -> None:
+        await self.aclose()
+    
+    def _region_params(self, sido_cd: str, sigungu_cd: Optional[str], dong_cd: Optional[str]) -> Dict:
         params = {
             'serviceKey': self.service_key,
-            'pageNo': page_no,
-            'numOfRows': num_of_rows,
             'type': 'xml',  # JSON도 가능하지만 XML이 더 안정적
             'divId': 'ctprvnCd',  # 시도코드 기준 조회
             'key': sido_cd
         }
         
-        # 시군구 코드가 있으면 추가
-        if sigungu_cd:
+        # 하위 행정구역 코드가 있으면 해당 기준으로 조회
+        if dong_cd:
+            params['divId'] = 'adongCd'
+            params['key'] = dong_cd
+        elif sigungu_cd:
             params['divId'] = 'signguCd'
             params['key'] = sigungu_cd
+        return params
+    
+    async def _request(self, params: Dict) -> Tuple[List[StoreRow], int]:
+        """호출 제한 + 재시도가 적용된 단일 페이지 GET (응답 본문은 스트리밍 파싱)"""
+        attempt = 0
+        while True:
+            await self.limiter.acquire()
+            try:
+                async with self.client.stream("GET", self.base_url, params=params) as response:
+                    if response.status_code not in RETRYABLE_STATUS:
+                        response.raise_for_status()
+                        return await self._parse_stream(response)
+                    error: Exception = httpx.HTTPStatusError(
+                        f"API 호출 실패: {response.status_code}", request=response.request, response=response
+                    )
+                    retry_after = _retry_after_seconds(response)
+            except httpx.TransportError as e:
+                error, retry_after = e, None
             
+            if attempt >= self.max_retries:
+                logger.error(f"상가 정보 API 재시도 한도 초과 (page {params.get('pageNo')}): {error}")
+                raise error
+            delay = retry_after if retry_after is not None else min(
+                self.backoff_max, self.backoff_base * (2 ** attempt)
+            ) * (0.5 + random.random() / 2)
+            logger.warning(f"상가 정보 API 재시도 {attempt + 1}/{self.max_retries} ({delay:.2f}s 후): {error}")
+            await asyncio.sleep(delay)
+            attempt += 1
+    
+    async def _parse_stream(self, response: httpx.Response) -> Tuple[List[StoreRow], int]:
+        """응답 바이트 스트림을 받는 대로 파싱"""
+        parser = StorePageParser()
+        rows: List[StoreRow] = []
+        try:
+            async for chunk in response.aiter_bytes():
+                rows.extend(parser.feed(chunk))
+            rows.extend(parser.close())
+        except ET.ParseError as e:
+            logger.error(f"XML 파싱 오류: {str(e)}")
+            raise
+        return rows, parser.total_count
+    
+    async def _fetch_page(self, params: Dict, page_no: int, num_of_rows: int) -> Tuple[List[StoreRow], int]:
+        return await self._request({**params, 'pageNo': page_no, 'numOfRows': num_of_rows})
+    
+    async def iter_store_pages(
+        self,
+        sido_cd: str,
+        sigungu_cd: Optional[str] = None,
+        dong_cd: Optional[str] = None,
+        num_of_rows: int = 1000,
+    ) -> AsyncIterator[List[StoreRow]]:
+        """
+        지역 전체 상가를 페이지 단위로 순회 (도착 순서대로 반환)
+        
+        각 페이지는 STORE_COLUMNS 순서 튜플 목록으로, 그대로
+        copy_records_to_table 레코드로 사용할 수 있습니다.
+        
+        첫 페이지의 totalCount로 나머지 페이지 수를 정하고,
+        최대 concurrency 개의 페이지를 동시에 요청합니다.
+        """
+        params = self._region_params(sido_cd, sigungu_cd, dong_cd)
+        stores, total_count = await self._fetch_page(params, 1, num_of_rows)
+        yield stores
+        
+        total_pages = -(-total_count // num_of_rows) if total_count else 1
+        if total_pages <= 1:
+            return
+        
+        semaphore = asyncio.Semaphore(self.concurrency)
+        
+        async def fetch(page_no: int) -> List[StoreRow]:
+            async with semaphore:
+                page, _ = await self._fetch_page(params, page_no, num_of_rows)
+                return page
+        
+        tasks = [asyncio.create_task(fetch(page_no)) for page_no in range(2, total_pages + 1)]
+        try:
+            for next_page in asyncio.as_completed(tasks):
+                yield await next_page
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+    
+    async def get_store_records(
+        self,
+        sido_cd: str,
+        sigungu_cd: Optional[str] = None,
+        dong_cd: Optional[str] = None,
+        num_of_rows: int = 1000,
+    ) -> List[StoreRow]:
+        """지역별 상가 전체를 STORE_COLUMNS 순서 튜플로 조회 (모든 페이지)"""
+        
+        records: List[StoreRow] = []
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.get(self.base_url, params=params)
-                response.raise_for_status()
-                
-                # XML 응답 파싱
-                return self._parse_xml_response(response.text)
-                
+            async for page in self.iter_store_pages(sido_cd, sigungu_cd, dong_cd, num_of_rows):
+                records.extend(page)
         except httpx.HTTPStatusError as e:
             logger.error(f"API 호출 실패: {e.response.status_code}")
             raise
         except Exception as e:
             logger.error(f"상가 정보 조회 오류: {str(e)}")
             raise
+        return records
+    
+    async def get_stores_by_region(
+        self, 
+        sido_cd: str, 
+        sigungu_cd: str = None,
+        dong_cd: str = None,
+        num_of_rows: int = 1000
+    ) -> List[Dict]:
+        """지역별 상가 정보 전체 조회 (모든 페이지, 컬럼명 딕셔너리)"""
+        records = await self.get_store_records(sido_cd, sigungu_cd, dong_cd, num_of_rows)
+        return [row_to_dict(row) for row in records]
     
     def _parse_xml_response(self, xml_text: str) -> List[Dict]:
         """XML 응답을 딕셔너리 리스트로 변환"""
-        stores = []
-        
-        try:
-            root = ET.fromstring(xml_text)
-            
-            # 응답 구조: response > body > items > item
-            items = root.findall('.//item')
-            
-            for item in items:
-                store_data = {}
-                
-                # 각 필드 매핑
-                field_mapping = {
-                    'bizesId': 'store_number',           # 상가업소번호
-                    'bizesNm': 'store_name',             # 상호명
-                    'indsLclsCd': 'business_code',       # 업종코드
-                    'indsLclsNm': 'business_name',       # 업종명
-                    'lon': 'longitude',                  # 경도
-                    'lat': 'latitude',                   # 위도
-                    'lnmadr': 'jibun_address',          # 지번주소
-                    'rdnmadr': 'road_address',          # 도로명주소
-                    'ctprvnNm': 'sido_name',            # 시도명
-                    'signguNm': 'sigungu_name',         # 시군구명
-                    'adongNm': 'dong_name',             # 행정동명
-                    'bldNm': 'building_name',           # 건물명
-                    'flrInfo': 'floor_info',            # 층정보
-                    'hoInfo': 'room_info',              # 호정보
-                    'opnDt': 'open_date',              # 개업일자
-                    'clsDt': 'close_date',             # 폐업일자
-                    'trdStateNm': 'business_status',    # 영업상태
-                    'ksicCd': 'standard_industry_code', # 표준산업분류코드
-                    'ctgryThreeNm': 'commercial_category_code'  # 상권업종분류
-                }
-                
-                for xml_field, db_field in field_mapping.items():
-                    element = item.find(xml_field)
-                    if element is not None and element.text:
-                        value = element.text.strip()
-                        
-                        # 데이터 타입 변환
-                        if db_field in ['longitude', 'latitude']:
-                            try:
-                                store_data[db_field] = float(value)
-                            except ValueError:
-                                store_data[db_field] = None
-                        elif db_field in ['open_date', 'close_date']:
-                            try:
-                                # YYYYMMDD 형식을 datetime으로 변환
-                                if len(value) == 8:
-                                    store_data[db_field] = datetime.strptime(value, '%Y%m%d').date()
-                                else:
-                                    store_data[db_field] = None
-                            except ValueError:
-                                store_data[db_field] = None
-                        else:
-                            store_data[db_field] = value
-                    else:
-                        store_data[db_field] = None
-                
-                # 필수 필드가 있는 경우만 추가
-                if (store_data.get('store_number') and 
-                    store_data.get('store_name') and 
-                    store_data.get('longitude') and 
-                    store_data.get('latitude')):
-                    stores.append(store_data)
-                    
-        except ET.ParseError as e:
-            logger.error(f"XML 파싱 오류: {str(e)}")
-            raise
-        except Exception as e:
-            logger.error(f"응답 처리 오류: {str(e)}")
-            raise
-            
-        return stores
+        rows, _ = parse_store_rows([xml_text.encode("utf-8")])
+        return [row_to_dict(row) for row in rows]
     
     async def get_available_regions(self) -> Dict[str, List]:
         """사용 가능한 지역 코드 조회 (하드코딩 또는 별도 API)"""
@@ -155,4 +234,17 @@ class BusinessStoreAPIClient:
                 {"code": "48", "name": "경상남도"},
                 {"code": "50", "name": "제주특별자치도"}
             ]
-        } 
\ No newline at end of file
+        }
+
+
+def _retry_after_seconds(response: httpx.Response) -> Optional[float]:
+    """Retry-After 헤더(초)"""
+    value = response.headers.get("Retry-After")
+    try:
+        return max(float(value), 0.0) if value else None
+    except ValueError:
+        return None
+
+
+# 전역 클라이언트 인스턴스 (앱 종료 시 aclose)
+business_store_api = BusinessStoreAPIClient()
@@ -0,0 +1,148 @@
+"""
+상가정보 API(sdsc2) XML 스트리밍 파서
+
+응답 바이트 스트림을 XMLPullParser에 조각 단위로 넣어 가며
+<item>이 닫힐 때마다 STORE_COLUMNS 순서의 튜플을 내보냅니다.
+- 태그 → (컬럼 위치, 변환 함수) 매핑은 모듈 로드 시 한 번만 구성
+- 처리한 <item>의 하위 요소는 즉시 해제해 전체 트리를 들고 있지 않음
+- 결과 튜플은 그대로 copy_records_to_table 레코드로 사용 가능
+"""
+from datetime import date
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+import xml.etree.ElementTree as ET
+
+from ..database.store_sync import STORE_COLUMNS
+
+StoreRow = Tuple[Any, ...]
+
+
+def _to_float(value: str) -> Optional[float]:
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+def _to_date(value: str) -> Optional[date]:
+    """YYYYMMDD → date (형식이 다르면 None)"""
+    if len(value) != 8 or not value.isdigit():
+        return None
+    try:
+        return date(int(value[:4]), int(value[4:6]), int(value[6:]))
+    except ValueError:
+        return None
+
+
+# API 태그 → DB 컬럼
+XML_FIELD_MAPPING: Dict[str, str] = {
+    'bizesId': 'store_number',           # 상가업소번호
+    'bizesNm': 'store_name',             # 상호명
+    'indsLclsCd': 'business_code',       # 업종코드
+    'indsLclsNm': 'business_name',       # 업종명
+    'lon': 'longitude',                  # 경도
+    'lat': 'latitude',                   # 위도
+    'lnmadr': 'jibun_address',           # 지번주소
+    'rdnmadr': 'road_address',           # 도로명주소
+    'ctprvnNm': 'sido_name',             # 시도명
+    'signguNm': 'sigungu_name',          # 시군구명
+    'adongNm': 'dong_name',              # 행정동명
+    'bldNm': 'building_name',            # 건물명
+    'flrInfo': 'floor_info',             # 층정보
+    'hoInfo': 'room_info',               # 호정보
+    'opnDt': 'open_date',                # 개업일자
+    'clsDt': 'close_date',               # 폐업일자
+    'trdStateNm': 'business_status',     # 영업상태
+    'ksicCd': 'standard_industry_code',  # 표준산업분류코드
+    'ctgryThreeNm': 'commercial_category_code',  # 상권업종분류
+}
+
+_CONVERTERS: Dict[str, Callable[[str], Any]] = {
+    'longitude': _to_float,
+    'latitude': _to_float,
+    'open_date': _to_date,
+    'close_date': _to_date,
+}
+
+# 태그 → (컬럼 위치, 변환 함수 또는 None)
+_TAG_TABLE: Dict[str, Tuple[int, Optional[Callable[[str], Any]]]] = {
+    tag: (STORE_COLUMNS.index(column), _CONVERTERS.get(column))
+    for tag, column in XML_FIELD_MAPPING.items()
+}
+
+# 필수 필드 위치 (상가업소번호, 상호명, 경도, 위도)
+_REQUIRED = tuple(STORE_COLUMNS.index(c) for c in ('store_number', 'store_name', 'longitude', 'latitude'))
+_WIDTH = len(STORE_COLUMNS)
+
+
+class StorePageParser:
+    """
+    sdsc2 응답 한 페이지용 증분 파서
+
+    사용법:
+        parser = StorePageParser()
+        async for chunk in response.aiter_bytes():
+            rows.extend(parser.feed(chunk))
+        rows.extend(parser.close())
+        parser.total_count
+    """
+
+    def __init__(self):
+        # end 이벤트만 받고 <item>이 닫힐 때 자식 필드를 한 번에 훑음
+        self._parser = ET.XMLPullParser(events=("end",))
+        self.total_count = 0
+        self.skipped = 0
+        self.root: Optional[ET.Element] = None
+
+    def feed(self, chunk: bytes) -> List[StoreRow]:
+        """바이트 조각을 넣고 완성된 상가 행을 반환"""
+        self._parser.feed(chunk)
+        return self._drain()
+
+    def close(self) -> List[StoreRow]:
+        """입력 종료 (잘린 문서면 ET.ParseError)"""
+        self._parser.close()
+        return self._drain()
+
+    def _drain(self) -> List[StoreRow]:
+        rows: List[StoreRow] = []
+        tag_table = _TAG_TABLE
+        for _, elem in self._parser.read_events():
+            tag = elem.tag
+            if tag == "item":
+                row: List[Any] = [None] * _WIDTH
+                for child in elem:
+                    mapped = tag_table.get(child.tag)
+                    if mapped is None:
+                        continue
+                    text = child.text
+                    value = text.strip() if text else None
+                    if value:
+                        position, convert = mapped
+                        row[position] = convert(value) if convert else value
+                if all(row[i] for i in _REQUIRED):
+                    rows.append(tuple(row))
+                else:
+                    self.skipped += 1
+                # 자식 필드 해제 (빈 <item> 껍데기만 남음)
+                elem.clear()
+            elif tag == "totalCount":
+                text = (elem.text or "").strip()
+                self.total_count = int(text) if text.isdigit() else 0
+            elif tag == "response":
+                self.root = elem
+        return rows
+
+
+def parse_store_rows(chunks: Iterable[bytes]) -> Tuple[List[StoreRow], int]:
+    """바이트 조각 열 → (상가 행 목록, totalCount)"""
+    parser = StorePageParser()
+    rows: List[StoreRow] = []
+    for chunk in chunks:
+        rows.extend(parser.feed(chunk))
+    rows.extend(parser.close())
+    return rows, parser.total_count
+
+
+def row_to_dict(row: StoreRow) -> Dict[str, Any]:
+    """상가 행 튜플 → 컬럼명 딕셔너리"""
+    return dict(zip(STORE_COLUMNS, row))
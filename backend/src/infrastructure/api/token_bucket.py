@@ -0,0 +1,47 @@
+"""
+비동기 토큰 버킷
+
+외부 API 호출을 초당 rate 회(순간 최대 capacity 회)로 제한합니다.
+"""
+from typing import Callable, Optional
+import asyncio
+import time
+
+
+class TokenBucket:
+    """
+    비동기 토큰 버킷 리미터
+
+    사용법:
+        bucket = TokenBucket(rate=20)
+        await bucket.acquire()
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, tokens: float = 1.0) -> None:
+        """토큰이 찰 때까지 대기 후 소비 (대기 순서는 lock 획득 순)"""
+        async with self._lock:
+            self._refill()
+            while self._tokens < tokens:
+                await asyncio.sleep((tokens - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= tokens
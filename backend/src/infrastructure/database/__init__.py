@@ -0,0 +1,88 @@
+"""
+Infrastructure Database
+"""
+from .pool import (
+    DatabasePool,
+    db_pool,
+    acquire,
+)
+from .store_sync import (
+    STORE_COLUMNS,
+    SyncResult,
+    StoreSynchronizer,
+    fingerprint,
+    changed_records,
+    sync_store_pages,
+    to_records,
+    upsert_stores,
+)
+from .category_resolver import (
+    CategoryCatalog,
+    CategoryFilter,
+    CategoryResolver,
+    category_resolver,
+)
+from .region_hierarchy import (
+    POPULATION_CHANGED_CHANNEL,
+    REGION_QUERY,
+    RegionHierarchy,
+    RegionTree,
+    region_hierarchy,
+)
+from .population_partitions import (
+    PopulationPartition,
+    ensure_population_partitions,
+    population_partitions,
+    detach_population_partitions,
+)
+from .population_import import (
+    IMPORT_COLUMNS,
+    PopulationImportResult,
+    import_population_csv,
+    import_population_records,
+    read_population_csv,
+)
+from .population_summary import rebuild_population_summary
+from .bulk_import import (
+    BULK_LOAD_SPECS,
+    BulkLoadResult,
+    BulkLoadSpec,
+    bulk_load,
+)
+
+__all__ = [
+    "DatabasePool",
+    "db_pool",
+    "acquire",
+    "STORE_COLUMNS",
+    "SyncResult",
+    "StoreSynchronizer",
+    "fingerprint",
+    "changed_records",
+    "sync_store_pages",
+    "to_records",
+    "upsert_stores",
+    "CategoryCatalog",
+    "CategoryFilter",
+    "CategoryResolver",
+    "category_resolver",
+    "POPULATION_CHANGED_CHANNEL",
+    "REGION_QUERY",
+    "RegionHierarchy",
+    "RegionTree",
+    "region_hierarchy",
+    "PopulationPartition",
+    "ensure_population_partitions",
+    "population_partitions",
+    "detach_population_partitions",
+    "IMPORT_COLUMNS",
+    "PopulationImportResult",
+    "import_population_csv",
+    "import_population_records",
+    "read_population_csv",
+    "rebuild_population_summary",
+    "BULK_LOAD_SPECS",
+    "BulkLoadResult",
+    "BulkLoadSpec",
+    "bulk_load",
+]
@@ -0,0 +1,328 @@
+"""
+대용량 CSV 병렬 적재 (유동인구 floating_population, 카드소비 card_consumption)
+
+load_bulk_data.py, quick_data_loader.py 공용.
+1. 메인 프로세스는 파일을 chunk_size 줄씩 잘라(헤더 포함 바이트 블록) 워커 프로세스에 분배
+2. 워커는 블록을 pandas로 파싱해 컬럼 단위로 검증/변환하고 자기 연결로 COPY
+   - 날짜/숫자 파싱 실패, 음수 건수 등 잘못된 행은 건너뛰고 건수만 집계
+3. 청크 COPY와 진행 기록(bulk_load_progress)을 한 트랜잭션으로 커밋
+   → 중단 후 같은 파일을 다시 실행하면 커밋된 청크는 건너뛰고 이어서 적재
+4. 새로 적재를 시작할 때 대상 테이블 보조 인덱스를 제거하고, 적재가 끝나면 다시 생성
+   (행마다 인덱스를 갱신하지 않고 마지막에 한 번 정렬해 생성)
+
+청크는 줄 단위로 나누므로 따옴표 안 줄바꿈이 있는 CSV는 지원하지 않습니다.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import count, islice
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
+import asyncio
+import io
+import logging
+import os
+import signal
+import time
+
+import asyncpg
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+PROGRESS_TABLE = "bulk_load_progress"
+DEFAULT_CHUNK_SIZE = 200_000
+
+_CREATE_PROGRESS = f"""
+    CREATE TABLE IF NOT EXISTS {PROGRESS_TABLE} (
+        table_name varchar(63) NOT NULL,
+        source text NOT NULL,
+        chunk_size integer NOT NULL,
+        chunk_index integer NOT NULL,
+        rows integer NOT NULL,
+        rejected integer NOT NULL,
+        loaded_at timestamp DEFAULT now(),
+        PRIMARY KEY (table_name, source, chunk_index)
+    )
+"""
+
+_COMPLETED_CHUNKS = f"""
+    SELECT chunk_index, chunk_size FROM {PROGRESS_TABLE}
+    WHERE table_name = $1 AND source = $2
+"""
+
+_MARK_CHUNK = f"""
+    INSERT INTO {PROGRESS_TABLE} (table_name, source, chunk_size, chunk_index, rows, rejected)
+    VALUES ($1, $2, $3, $4, $5, $6)
+"""
+
+Converter = Callable[[pd.DataFrame], Tuple[List[Tuple[Any, ...]], int]]
+
+
+@dataclass(frozen=True)
+class BulkLoadSpec:
+    """CSV → 테이블 적재 정의"""
+
+    table: str
+    columns: Tuple[str, ...]
+    csv_columns: Tuple[str, ...]
+    convert: Converter
+    indexes: Dict[str, Tuple[str, ...]]
+
+
+@dataclass
+class BulkLoadResult:
+    """적재 결과 건수"""
+
+    rows: int = 0
+    rejected: int = 0
+    chunks: int = 0
+    skipped_chunks: int = 0
+    seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+
+def _text(values: pd.Series) -> List[Optional[str]]:
+    return values.where(values.notna(), None).tolist()
+
+
+def _integers(frame: pd.DataFrame, columns: Tuple[str, ...]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    숫자 컬럼을 정수 행렬로 변환
+
+    Returns:
+        (행렬, 잘못된 행 마스크) - 빈 칸은 0, 숫자가 아니거나 음수면 잘못된 행
+    """
+    raw = frame[list(columns)]
+    numbers = raw.apply(pd.to_numeric, errors="coerce")
+    invalid = (raw.notna() & numbers.isna()).any(axis=1) | (numbers < 0).any(axis=1)
+    return numbers.fillna(0).to_numpy(dtype=np.int64), invalid.to_numpy()
+
+
+def floating_population_records(frame: pd.DataFrame) -> Tuple[List[Tuple[Any, ...]], int]:
+    """S-DoT 유동인구 CSV 청크 → floating_population 레코드"""
+    measured = pd.to_datetime(frame["측정시간"], format="%Y-%m-%d_%H:%M:%S", errors="coerce")
+    visitors, invalid = _integers(frame, ("방문자수",))
+    valid = ~invalid & measured.notna().to_numpy() & frame["시리얼"].notna().to_numpy()
+
+    frame = frame[valid]
+    records = list(zip(
+        _text(frame["시리얼"]),
+        measured[valid].to_numpy(dtype="datetime64[us]").tolist(),
+        _text(frame["지역"]),
+        _text(frame["자치구"]),
+        _text(frame["행정동"]),
+        visitors[valid, 0].tolist(),
+    ))
+    return records, int((~valid).sum())
+
+
+def card_consumption_records(frame: pd.DataFrame) -> Tuple[List[Tuple[Any, ...]], int]:
+    """카드소비 CSV 청크 → card_consumption 레코드"""
+    transaction_date = pd.to_datetime(frame["ta_ymd"], format="%Y%m%d", errors="coerce")
+    numbers, invalid = _integers(frame, ("hour", "age", "day", "amt", "cnt"))
+    valid = ~invalid & transaction_date.notna().to_numpy()
+
+    frame = frame[valid]
+    hour, age, day, amount, transaction_count = numbers[valid].T.tolist()
+    records = list(zip(
+        transaction_date[valid].to_numpy(dtype="datetime64[D]").tolist(),
+        _text(frame["cty_rgn_no"]),
+        _text(frame["admi_cty_no"]),
+        _text(frame["card_tpbuz_cd"]),
+        _text(frame["card_tpbuz_nm_1"]),
+        _text(frame["card_tpbuz_nm_2"]),
+        hour,
+        _text(frame["sex"]),
+        age,
+        day,
+        amount,
+        transaction_count,
+    ))
+    return records, int((~valid).sum())
+
+
+BULK_LOAD_SPECS: Dict[str, BulkLoadSpec] = {
+    "floating_population": BulkLoadSpec(
+        table="floating_population",
+        columns=("device_id", "measurement_time", "region_type", "district", "admin_dong", "visitor_count"),
+        csv_columns=("시리얼", "측정시간", "지역", "자치구", "행정동", "방문자수"),
+        convert=floating_population_records,
+        indexes={
+            "ix_floating_population_measurement_time_region_type": ("measurement_time", "region_type"),
+            "ix_floating_population_district_admin_dong": ("district", "admin_dong"),
+        },
+    ),
+    "card_consumption": BulkLoadSpec(
+        table="card_consumption",
+        columns=(
+            "transaction_date", "region_code", "admin_code", "business_type_code",
+            "business_category_1", "business_category_2", "hour_range", "gender",
+            "age_group", "day_of_week", "amount", "transaction_count",
+        ),
+        csv_columns=(
+            "ta_ymd", "cty_rgn_no", "admi_cty_no", "card_tpbuz_cd", "card_tpbuz_nm_1",
+            "card_tpbuz_nm_2", "hour", "sex", "age", "day", "amt", "cnt",
+        ),
+        convert=card_consumption_records,
+        indexes={
+            "ix_card_consumption_transaction_date_business_type_code": ("transaction_date", "business_type_code"),
+            "ix_card_consumption_region_code_business_category_1": ("region_code", "business_category_1"),
+            "ix_card_consumption_age_group_gender": ("age_group", "gender"),
+        },
+    ),
+}
+
+
+def source_key(path: str) -> str:
+    """진행 기록용 원본 식별자 (파일 이름 + 크기, 경로를 옮겨도 이어서 적재 가능)"""
+    return f"{os.path.basename(path)}:{os.path.getsize(path)}"
+
+
+def iter_csv_chunks(path: str, chunk_size: int) -> Iterator[Tuple[int, bytes]]:
+    """(청크 번호, 헤더 + chunk_size 줄) 바이트 블록 - 디코딩/파싱은 워커에서"""
+    with open(path, "rb") as file:
+        header = file.readline()
+        for index in count():
+            lines = list(islice(file, chunk_size))
+            if not lines:
+                return
+            yield index, header + b"".join(lines)
+
+
+async def completed_chunks(conn: asyncpg.Connection, table: str, source: str, chunk_size: int) -> Set[int]:
+    """이미 커밋된 청크 번호 (청크 크기가 다르면 경계가 어긋나므로 예외)"""
+    rows = await conn.fetch(_COMPLETED_CHUNKS, table, source)
+    sizes = {row["chunk_size"] for row in rows}
+    if sizes - {chunk_size}:
+        raise ValueError(
+            f"{source} was partially loaded with chunk size {sorted(sizes)}; resume with the same chunk size"
+        )
+    return {row["chunk_index"] for row in rows}
+
+
+async def load_chunk(
+    conn: asyncpg.Connection,
+    spec: BulkLoadSpec,
+    source: str,
+    chunk_size: int,
+    chunk_index: int,
+    block: bytes,
+    encoding: str = "utf-8-sig",
+) -> Tuple[int, int]:
+    """
+    청크 하나를 검증/변환 후 COPY하고 진행 기록 (단일 트랜잭션)
+
+    Returns:
+        (적재 행 수, 건너뛴 행 수)
+    """
+    frame = pd.read_csv(io.BytesIO(block), encoding=encoding, usecols=list(spec.csv_columns), dtype=str)
+    records, rejected = spec.convert(frame)
+    async with conn.transaction():
+        if records:
+            await conn.copy_records_to_table(spec.table, records=records, columns=spec.columns)
+        await conn.execute(_MARK_CHUNK, spec.table, source, chunk_size, chunk_index, len(records), rejected)
+    return len(records), rejected
+
+
+# 워커 프로세스별 이벤트 루프 + 연결 (프로세스 종료 시 함께 닫힘)
+_worker: Dict[str, Any] = {}
+
+
+def _init_worker(dsn: str) -> None:
+    # Ctrl+C는 메인 프로세스가 처리 (진행 중인 청크는 커밋까지 마치고 종료)
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    loop = asyncio.new_event_loop()
+    _worker["loop"] = loop
+    _worker["conn"] = loop.run_until_complete(asyncpg.connect(dsn))
+
+
+def _load_chunk_in_worker(
+    spec_name: str, source: str, chunk_size: int, chunk_index: int, block: bytes, encoding: str
+) -> Tuple[int, int]:
+    return _worker["loop"].run_until_complete(load_chunk(
+        _worker["conn"], BULK_LOAD_SPECS[spec_name], source, chunk_size, chunk_index, block, encoding
+    ))
+
+
+async def bulk_load(
+    spec_name: str,
+    path: str,
+    dsn: str,
+    workers: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    encoding: str = "utf-8-sig",
+) -> BulkLoadResult:
+    """
+    CSV 파일을 워커 프로세스들로 병렬 적재 (중단 지점부터 재개)
+
+    Args:
+        spec_name: BULK_LOAD_SPECS 키 ("floating_population" | "card_consumption")
+        workers: 워커 프로세스 수 (기본 CPU 수)
+        chunk_size: 청크당 줄 수 (재개 시 처음과 같아야 함)
+        encoding: 원본 인코딩 (공공데이터 파일은 cp949인 경우가 있음)
+    """
+    spec = BULK_LOAD_SPECS[spec_name]
+    workers = workers or os.cpu_count() or 1
+    source = source_key(path)
+    result = BulkLoadResult()
+    started = time.perf_counter()
+
+    conn = await asyncpg.connect(dsn)
+    try:
+        await conn.execute(_CREATE_PROGRESS)
+        done = await completed_chunks(conn, spec.table, source, chunk_size)
+        if done:
+            logger.info(f"Resuming {source}: {len(done)} chunks already loaded")
+        else:
+            for name in spec.indexes:
+                await conn.execute(f"DROP INDEX IF EXISTS {name}")
+
+        def collect(futures) -> None:
+            for future in futures:
+                rows, rejected = future.result()
+                result.rows += rows
+                result.rejected += rejected
+                result.chunks += 1
+            elapsed = time.perf_counter() - started
+            logger.info(
+                f"{spec.table}: {result.chunks + result.skipped_chunks} chunks, {result.rows:,} rows "
+                f"({result.rows / elapsed:,.0f} rows/s, rejected {result.rejected:,})"
+            )
+
+        loop = asyncio.get_running_loop()
+        pool = ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(dsn,))
+        pending: Set[asyncio.Future] = set()
+        try:
+            for chunk_index, block in iter_csv_chunks(path, chunk_size):
+                if chunk_index in done:
+                    result.skipped_chunks += 1
+                    continue
+                pending.add(loop.run_in_executor(
+                    pool, _load_chunk_in_worker, spec_name, source, chunk_size, chunk_index, block, encoding
+                ))
+                # 읽기가 적재보다 빠를 때 메모리에 쌓이는 블록 수 제한
+                if len(pending) >= workers * 2:
+                    finished, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    collect(finished)
+            if pending:
+                finished, pending = await asyncio.wait(pending)
+                collect(finished)
+        finally:
+            # 중단/오류 시 대기 중인 청크는 취소하고 실행 중인 청크만 마무리 (이벤트 루프가 닫히기 전에)
+            pool.shutdown(wait=True, cancel_futures=True)
+
+        for name, columns in spec.indexes.items():
+            await conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {spec.table} ({', '.join(columns)})")
+        await conn.execute(f"ANALYZE {spec.table}")
+    finally:
+        await conn.close()
+
+    result.seconds = time.perf_counter() - started
+    logger.info(
+        f"Loaded {result.rows:,} rows into {spec.table} in {result.seconds:.1f}s "
+        f"(rejected {result.rejected:,}, skipped {result.skipped_chunks} committed chunks)"
+    )
+    return result
@@ -0,0 +1,173 @@
+"""
+업종 검색어 → 업종코드 해석기
+
+business_name ILIKE '%…%' (선행 와일드카드, 인덱스 사용 불가) 대신
+검색어를 한 번 업종코드 집합으로 풀어 business_code = ANY($n) 으로 필터합니다.
+- 카탈로그: business_stores의 (업종코드, 업종명) + business_codes 대/중/소분류명
+- 검색어별 해석 결과는 메모리에 캐시 (카탈로그 TTL 또는 동기화 후 무효화)
+- 어떤 코드와도 맞지 않거나, 한 코드의 업종명 일부만 맞는 경우에는
+  기존 ILIKE 조건을 그대로 사용 (pg_trgm GIN 인덱스가 처리)
+- 업종코드표 분류명으로도 매칭하므로 ILIKE보다 결과가 넓어질 수 있음
+  (예: "종합소매" → 분류명이 맞는 D03 코드의 "편의점" 상가까지 포함)
+- 공백뿐인 검색어는 필터 없음(None)으로 해석
+"""
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Set, Tuple
+import asyncio
+import logging
+import time
+
+import asyncpg
+
+from .pool import DatabasePool, db_pool
+
+logger = logging.getLogger(__name__)
+
+STORE_CATEGORY_QUERY = """
+    SELECT DISTINCT business_code, business_name
+    FROM business_stores
+    WHERE business_code IS NOT NULL
+"""
+
+CODE_TABLE_QUERY = """
+    SELECT major_category_code, major_category_name,
+           middle_category_code, middle_category_name,
+           minor_category_code, minor_category_name
+    FROM business_codes
+"""
+
+
+@dataclass(frozen=True)
+class CategoryFilter:
+    """해석된 업종 필터 (codes가 있으면 코드 필터, 없으면 ILIKE 패턴)"""
+
+    term: str
+    codes: Tuple[str, ...] = ()
+    pattern: Optional[str] = None
+
+    @property
+    def uses_codes(self) -> bool:
+        return bool(self.codes)
+
+    def sql(self, param_index: int, column_prefix: str = "") -> Tuple[str, Any]:
+        """(WHERE 조건 조각, 파라미터 값)"""
+        if self.uses_codes:
+            return f" AND {column_prefix}business_code = ANY(${param_index}::varchar[])", list(self.codes)
+        return f" AND {column_prefix}business_name ILIKE ${param_index}", self.pattern
+
+
+@dataclass(frozen=True)
+class CategoryCatalog:
+    """업종코드별 업종명/분류명 사전"""
+
+    store_names: Dict[str, Set[str]]     # business_code -> business_stores.business_name 집합
+    code_names: Dict[str, Set[str]]      # business_codes의 코드 -> 분류명 집합
+
+    def resolve(self, term: str) -> Optional[CategoryFilter]:
+        """검색어 → 업종 필터 (앞뒤 공백 제거, 빈 검색어는 None)"""
+        term = term.strip()
+        if not term:
+            return None
+        needle = term.lower()
+        pattern = f"%{term}%"
+        codes: Set[str] = set()
+
+        for code, names in self.store_names.items():
+            matched = [needle in name.lower() for name in names]
+            if all(matched):
+                codes.add(code)
+            elif any(matched):
+                # 같은 코드에 다른 업종명이 섞여 있으면 코드로 좁힐 수 없음
+                return CategoryFilter(term=term, pattern=pattern)
+
+        for code, names in self.code_names.items():
+            if code in self.store_names and any(needle in name.lower() for name in names):
+                codes.add(code)
+
+        if not codes:
+            return CategoryFilter(term=term, pattern=pattern)
+        return CategoryFilter(term=term, codes=tuple(sorted(codes)))
+
+
+class CategoryResolver:
+    """
+    업종 검색어 해석기 (프로세스 메모리 캐시)
+
+    사용법:
+        category = await category_resolver.resolve("카페", conn)
+        if category is not None:        # 공백뿐인 검색어는 필터 없음
+            condition, value = category.sql(param_index)
+    """
+
+    def __init__(self, pool: DatabasePool = db_pool, ttl_seconds: int = 3600, max_terms: int = 1024):
+        self.pool = pool
+        self.ttl_seconds = ttl_seconds
+        self.max_terms = max_terms
+        self._catalog: Optional[CategoryCatalog] = None
+        self._loaded_at = 0.0
+        self._terms: Dict[str, CategoryFilter] = {}
+        self._lock = asyncio.Lock()
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._catalog is not None and time.time() - self._loaded_at <= self.ttl_seconds
+
+    def load(self, catalog: CategoryCatalog) -> None:
+        """카탈로그 교체 (해석 캐시 초기화)"""
+        self._catalog = catalog
+        self._loaded_at = time.time()
+        self._terms = {}
+
+    def invalidate(self) -> None:
+        """다음 해석 시 카탈로그 재적재"""
+        self._catalog = None
+        self._terms = {}
+
+    async def refresh(self, conn: Optional[asyncpg.Connection] = None) -> None:
+        """DB에서 카탈로그 재적재"""
+        if conn is None:
+            async with self.pool.acquire() as conn:
+                catalog = await self._fetch_catalog(conn)
+        else:
+            catalog = await self._fetch_catalog(conn)
+        self.load(catalog)
+
+    async def resolve(self, term: str, conn: Optional[asyncpg.Connection] = None) -> Optional[CategoryFilter]:
+        """검색어 → 업종 필터 (공백뿐인 검색어는 None = 필터 없음)"""
+        term = term.strip()
+        if not term:
+            return None
+        if not self.is_loaded:
+            async with self._lock:
+                if not self.is_loaded:
+                    await self.refresh(conn)
+
+        cached = self._terms.get(term)
+        if cached is None:
+            cached = self._catalog.resolve(term)
+            if len(self._terms) >= self.max_terms:
+                self._terms.clear()
+            self._terms[term] = cached
+        return cached
+
+    async def _fetch_catalog(self, conn: asyncpg.Connection) -> CategoryCatalog:
+        store_names: Dict[str, Set[str]] = {}
+        for row in await conn.fetch(STORE_CATEGORY_QUERY):
+            store_names.setdefault(row["business_code"], set()).add(row["business_name"] or "")
+
+        code_names: Dict[str, Set[str]] = {}
+        try:
+            for row in await conn.fetch(CODE_TABLE_QUERY):
+                for level in ("major", "middle", "minor"):
+                    code = row[f"{level}_category_code"]
+                    if code:
+                        code_names.setdefault(code, set()).add(row[f"{level}_category_name"] or "")
+        except asyncpg.PostgresError as e:
+            # 업종코드표가 아직 적재되지 않은 환경에서는 상가 테이블 업종명만 사용
+            logger.warning(f"business_codes 조회 실패, 상가 업종명만 사용: {str(e)}")
+
+        return CategoryCatalog(store_names=store_names, code_names=code_names)
+
+
+# 전역 해석기 인스턴스
+category_resolver = CategoryResolver()
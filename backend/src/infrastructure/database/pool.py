@@ -0,0 +1,127 @@
+"""
+asyncpg 공유 커넥션 풀
+
+raw SQL 라우터들이 요청마다 asyncpg.connect()로 새 연결을 맺던 구조를
+애플리케이션 전역 풀 하나로 통합합니다.
+- FastAPI lifespan에서 생성/워밍업/종료
+- 크기는 mcp_min_connections / mcp_max_connections 설정을 따름
+- 반납 시 asyncpg가 세션 상태를 초기화 (RESET ALL, UNLISTEN *, advisory lock 해제)
+"""
+from contextlib import asynccontextmanager
+from typing import AsyncGenerator, AsyncIterator, Optional
+import asyncio
+import logging
+
+import asyncpg
+from fastapi import HTTPException
+
+from src.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+class DatabasePool:
+    """
+    애플리케이션 전역 asyncpg 커넥션 풀
+
+    사용법:
+        async with db_pool.acquire() as conn:
+            rows = await conn.fetch("SELECT ...")
+    """
+
+    def __init__(
+        self,
+        dsn: Optional[str] = None,
+        min_size: Optional[int] = None,
+        max_size: Optional[int] = None,
+        acquire_timeout: Optional[float] = None,
+        max_inactive_lifetime: Optional[float] = None,
+    ):
+        self.dsn = dsn or settings.database_url.replace("postgresql+asyncpg://", "postgresql://")
+        self.min_size = min_size if min_size is not None else settings.mcp_min_connections
+        self.max_size = max_size if max_size is not None else settings.mcp_max_connections
+        self.acquire_timeout = acquire_timeout if acquire_timeout is not None else settings.mcp_pool_timeout
+        self.max_inactive_lifetime = (
+            max_inactive_lifetime if max_inactive_lifetime is not None else settings.mcp_pool_recycle
+        )
+        self._pool: Optional[asyncpg.Pool] = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        """풀 생성 여부"""
+        return self._pool is not None
+
+    async def open(self) -> None:
+        """풀 생성 및 워밍업 (이미 열려 있으면 무시)"""
+        async with self._lock:
+            if self._pool is not None:
+                return
+
+            pool = await asyncpg.create_pool(
+                self.dsn,
+                min_size=self.min_size,
+                max_size=self.max_size,
+                max_inactive_connection_lifetime=self.max_inactive_lifetime,
+            )
+            try:
+                await self._warm_up(pool)
+            except Exception:
+                await pool.close()
+                raise
+            self._pool = pool
+            logger.info(f"asyncpg pool opened (min={self.min_size}, max={self.max_size})")
+
+    async def _warm_up(self, pool: asyncpg.Pool) -> None:
+        """최소 연결 수만큼 동시에 빌려 왕복 확인 (첫 요청의 핸드셰이크 비용 제거)"""
+        connections = [await pool.acquire() for _ in range(self.min_size)]
+        try:
+            await asyncio.gather(*(conn.fetchval("SELECT 1") for conn in connections))
+        finally:
+            for conn in connections:
+                await pool.release(conn)
+
+    async def close(self) -> None:
+        """풀 종료"""
+        async with self._lock:
+            if self._pool is None:
+                return
+            pool, self._pool = self._pool, None
+            await pool.close()
+            logger.info("asyncpg pool closed")
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[asyncpg.Connection]:
+        """
+        풀에서 연결 대여
+
+        시작 시 DB가 없어 풀이 열리지 않았다면 첫 대여 시점에 다시 시도합니다.
+        """
+        if self._pool is None:
+            await self.open()
+
+        async with self._pool.acquire(timeout=self.acquire_timeout) as conn:
+            yield conn
+
+
+# 전역 풀 인스턴스
+db_pool = DatabasePool()
+
+
+async def acquire() -> AsyncGenerator[asyncpg.Connection, None]:
+    """
+    FastAPI 의존성: 요청 단위로 풀 연결을 빌려주고 응답 후 반납
+
+    사용법:
+        @router.get("/items")
+        async def list_items(conn: asyncpg.Connection = Depends(acquire)):
+            ...
+    """
+    try:
+        await db_pool.open()
+    except Exception as e:
+        logger.error(f"Database connection error: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Database connection failed: {str(e)}")
+
+    async with db_pool.acquire() as conn:
+        yield conn
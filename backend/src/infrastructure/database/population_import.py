@@ -0,0 +1,181 @@
+"""
+인구 통계 CSV 적재 (청크 스트리밍 + COPY + 기준월 단위 교체)
+
+import_population_data.py, quick_data_loader.py 공용.
+1. pandas read_csv(chunksize)로 파일을 청크 단위로 읽고 컬럼 단위로 변환
+   (기준연월은 고유값만 파싱, 연령대 인원은 정수 행렬 한 번에 변환)
+2. 청크마다 세션 임시 스테이징 테이블로 copy_records_to_table (행별 INSERT 없음)
+3. 파일 전체가 스테이징되면 한 트랜잭션에서
+   - 파티션 테이블이면 대상 연도 파티션 보장
+   - 파일에 포함된 기준월의 기존 행 삭제 후 스테이징 행 삽입
+   → 재적재해도 중복되지 않고, 커밋 전까지 조회는 이전 데이터를 그대로 봄
+   - population_statistics면 /population/summary 스냅샷 재계산
+"""
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any, Iterable, Iterator, List, Optional, Sequence, Tuple
+import logging
+import time
+
+import asyncpg
+import numpy as np
+import pandas as pd
+
+from .population_partitions import ensure_population_partitions
+from .population_summary import rebuild_population_summary
+
+logger = logging.getLogger(__name__)
+
+_AGE_BANDS = ("0_9", "10_19", "20_29", "30_39", "40_49", "50_59", "60_69", "70_79", "80_89", "90_99", "100_plus")
+_CSV_AGE_BANDS = ("0~9세", "10~19세", "20~29세", "30~39세", "40~49세", "50~59세",
+                  "60~69세", "70~79세", "80~89세", "90~99세", "100세 이상")
+
+# CSV 헤더 → population_statistics 컬럼 (레코드 순서)
+CSV_TEXT_COLUMNS = {
+    "행정기관코드": "administrative_code",
+    "기준연월": "reference_date",
+    "시도명": "province",
+    "시군구명": "city",
+    "읍면동명": "district",
+}
+CSV_COUNT_COLUMNS = {
+    **{f"{csv_band}_남자": f"age_{band}_male" for csv_band, band in zip(_CSV_AGE_BANDS, _AGE_BANDS)},
+    **{f"{csv_band}_여자": f"age_{band}_female" for csv_band, band in zip(_CSV_AGE_BANDS, _AGE_BANDS)},
+    "총인구수": "total_population",
+    "남자총합": "total_male",
+    "여자총합": "total_female",
+}
+
+IMPORT_COLUMNS: Tuple[str, ...] = (*CSV_TEXT_COLUMNS.values(), *CSV_COUNT_COLUMNS.values())
+_DATE = IMPORT_COLUMNS.index("reference_date")
+
+TARGET_TABLE = "population_statistics"
+STAGING_TABLE = "population_import_staging"
+DEFAULT_CHUNK_SIZE = 50_000
+
+_IS_PARTITIONED = "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass($1))"
+
+
+@dataclass
+class PopulationImportResult:
+    """적재 결과 건수"""
+
+    rows: int = 0
+    replaced: int = 0
+    reference_dates: Tuple[date, ...] = ()
+    seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+
+def _parse_dates(values: pd.Series) -> List[date]:
+    """기준연월(YYYY-MM-DD) 변환 - 월별 파일은 고유값이 몇 개뿐이므로 고유값만 파싱"""
+    parsed = {value: datetime.strptime(value, "%Y-%m-%d").date() for value in values.unique()}
+    return values.map(parsed).tolist()
+
+
+def _text(values: pd.Series) -> List[Optional[str]]:
+    """빈 칸(세종특별자치시 시군구 등)은 NULL"""
+    return values.astype(object).where(values.notna(), None).tolist()
+
+
+def to_population_records(frame: pd.DataFrame) -> List[Tuple[Any, ...]]:
+    """CSV 청크(DataFrame)를 IMPORT_COLUMNS 순서의 튜플로 변환"""
+    counts = frame[list(CSV_COUNT_COLUMNS)].fillna(0).to_numpy(dtype=np.int64)
+    return list(zip(
+        _text(frame["행정기관코드"]),
+        _parse_dates(frame["기준연월"]),
+        _text(frame["시도명"]),
+        _text(frame["시군구명"]),
+        _text(frame["읍면동명"]),
+        *counts.T.tolist(),
+    ))
+
+
+def read_population_csv(
+    path: str,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    encoding: str = "utf-8-sig",
+) -> Iterator[List[Tuple[Any, ...]]]:
+    """CSV를 chunk_size 행씩 읽어 레코드 리스트로 반환 (파일 전체를 메모리에 올리지 않음)"""
+    reader = pd.read_csv(
+        path,
+        encoding=encoding,
+        usecols=[*CSV_TEXT_COLUMNS, *CSV_COUNT_COLUMNS],
+        dtype={column: str for column in CSV_TEXT_COLUMNS},
+        chunksize=chunk_size,
+    )
+    with reader:
+        for frame in reader:
+            yield to_population_records(frame)
+
+
+async def import_population_records(
+    conn: asyncpg.Connection,
+    chunks: Iterable[Sequence[Tuple[Any, ...]]],
+    table: str = TARGET_TABLE,
+    columns: Sequence[str] = IMPORT_COLUMNS,
+) -> PopulationImportResult:
+    """
+    레코드 청크를 스테이징에 COPY한 뒤 기준월 단위로 교체 (단일 트랜잭션)
+
+    Args:
+        chunks: IMPORT_COLUMNS 순서 레코드 리스트의 반복자 (read_population_csv)
+        table: 대상 테이블
+        columns: 대상 테이블에서 IMPORT_COLUMNS에 대응하는 컬럼 이름 (같은 순서)
+    """
+    if len(columns) != len(IMPORT_COLUMNS):
+        raise ValueError(f"Expected {len(IMPORT_COLUMNS)} columns, got {len(columns)}")
+
+    column_list = ", ".join(columns)
+    date_column = columns[_DATE]
+    result = PopulationImportResult()
+    reference_dates = set()
+    started = time.perf_counter()
+
+    async with conn.transaction():
+        await conn.execute(
+            f"CREATE TEMP TABLE {STAGING_TABLE} ON COMMIT DROP AS "
+            f"SELECT {column_list} FROM {table} WITH NO DATA"
+        )
+        for records in chunks:
+            await conn.copy_records_to_table(STAGING_TABLE, records=records, columns=columns)
+            reference_dates.update(record[_DATE] for record in records)
+            result.rows += len(records)
+            elapsed = time.perf_counter() - started
+            logger.info(f"Staged {result.rows:,} rows ({result.rows / elapsed:,.0f} rows/s)")
+
+        if await conn.fetchval(_IS_PARTITIONED, table):
+            await ensure_population_partitions(conn, {reference_date.year for reference_date in reference_dates})
+
+        status = await conn.execute(
+            f"DELETE FROM {table} WHERE {date_column} = ANY($1::date[])", sorted(reference_dates)
+        )
+        result.replaced = int(status.split()[-1])
+        await conn.execute(f"INSERT INTO {table} ({column_list}) SELECT {column_list} FROM {STAGING_TABLE}")
+        if table == TARGET_TABLE:
+            # /population/summary 스냅샷도 같은 트랜잭션에서 교체
+            await rebuild_population_summary(conn)
+        # 바깥 트랜잭션 안에서 호출돼도(세이브포인트) 재호출 가능하도록 즉시 제거
+        await conn.execute(f"DROP TABLE {STAGING_TABLE}")
+
+    result.reference_dates = tuple(sorted(reference_dates))
+    result.seconds = time.perf_counter() - started
+    logger.info(
+        f"Imported {result.rows:,} rows into {table} "
+        f"(replaced {result.replaced:,}, {result.rows_per_second:,.0f} rows/s)"
+    )
+    return result
+
+
+async def import_population_csv(
+    conn: asyncpg.Connection,
+    path: str,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    table: str = TARGET_TABLE,
+    columns: Sequence[str] = IMPORT_COLUMNS,
+) -> PopulationImportResult:
+    """인구 통계 CSV 파일 적재 (read_population_csv + import_population_records)"""
+    return await import_population_records(conn, read_population_csv(path, chunk_size), table, columns)
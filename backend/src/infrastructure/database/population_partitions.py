@@ -0,0 +1,80 @@
+"""
+population_statistics 연도 파티션 관리
+
+reference_date 연 단위 RANGE 파티션(마이그레이션 20261017_population_parts)을 다룹니다.
+- ensure_population_partitions: 적재 전에 대상 연도 파티션 보장
+- population_partitions: 연결된 파티션 목록 (연도, 행 수 추정치)
+- detach_population_partitions: 기준 연도 이전 파티션을 떼어내 독립 테이블로 남김
+  → pg_dump 로 보관 후 DROP 하면 본 테이블을 다시 쓰지 않고 오래된 데이터를 정리
+"""
+from dataclasses import dataclass
+from typing import Iterable, List
+import logging
+import re
+
+import asyncpg
+
+logger = logging.getLogger(__name__)
+
+PARENT_TABLE = "population_statistics"
+
+ENSURE_PARTITION_QUERY = "SELECT population_statistics_ensure_partition($1)"
+
+PARTITIONS_QUERY = f"""
+    SELECT c.relname AS name, c.reltuples::bigint AS estimated_rows
+    FROM pg_inherits i
+    JOIN pg_class c ON c.oid = i.inhrelid
+    WHERE i.inhparent = '{PARENT_TABLE}'::regclass
+    ORDER BY c.relname
+"""
+
+_PARTITION_NAME = re.compile(rf"^{PARENT_TABLE}_y(\d{{4}})$")
+
+
+@dataclass(frozen=True)
+class PopulationPartition:
+    """연결된 연도 파티션"""
+
+    name: str
+    year: int
+    estimated_rows: int
+
+
+async def ensure_population_partitions(conn: asyncpg.Connection, years: Iterable[int]) -> List[str]:
+    """연도별 파티션 보장 (없으면 생성, 떼어낸 연도면 예외)"""
+    return [await conn.fetchval(ENSURE_PARTITION_QUERY, year) for year in sorted(set(years))]
+
+
+async def population_partitions(conn: asyncpg.Connection) -> List[PopulationPartition]:
+    """현재 연결된 연도 파티션 (연도 오름차순)"""
+    partitions = []
+    for row in await conn.fetch(PARTITIONS_QUERY):
+        match = _PARTITION_NAME.match(row["name"])
+        if match:
+            partitions.append(PopulationPartition(row["name"], int(match.group(1)), max(row["estimated_rows"], 0)))
+    return partitions
+
+
+async def detach_population_partitions(
+    conn: asyncpg.Connection,
+    before_year: int,
+    concurrently: bool = False,
+) -> List[str]:
+    """
+    before_year 이전 연도 파티션을 떼어냄
+
+    Args:
+        concurrently: DETACH PARTITION ... CONCURRENTLY (조회를 막지 않음, 트랜잭션 밖에서만 가능)
+
+    Returns:
+        떼어낸 테이블 이름 (독립 테이블로 남으며 보관 후 직접 DROP)
+    """
+    option = " CONCURRENTLY" if concurrently else ""
+    detached = []
+    for partition in await population_partitions(conn):
+        if partition.year >= before_year:
+            continue
+        await conn.execute(f'ALTER TABLE {PARENT_TABLE} DETACH PARTITION "{partition.name}"{option}')
+        logger.info(f"Detached {partition.name} (~{partition.estimated_rows} rows)")
+        detached.append(partition.name)
+    return detached
@@ -0,0 +1,26 @@
+"""
+/population/summary 스냅샷 (population_summary_snapshot)
+
+마이그레이션 20261017_population_summary 의 population_summary_refresh() 가
+전체 집계 + 상위 10개 지역을 응답 본문 JSON으로 계산해 단일 행에 저장합니다.
+- rebuild_population_summary: 인구 데이터를 바꾼 트랜잭션 안에서 호출 (적재, 파티션 DETACH)
+- SNAPSHOT_QUERY: API 서버가 시작/적재 알림 때 한 번 읽어 메모리에 보관
+  (infrastructure/population/summary.py)
+"""
+from datetime import date
+from typing import Optional
+
+import asyncpg
+
+REFRESH_SUMMARY_QUERY = "SELECT population_summary_refresh()"
+
+SNAPSHOT_QUERY = """
+    SELECT version, payload::text AS payload, built_at
+    FROM population_summary_snapshot
+    WHERE id = 1
+"""
+
+
+async def rebuild_population_summary(conn: asyncpg.Connection) -> Optional[date]:
+    """스냅샷 재계산 (반환: 새 버전 = 최신 reference_date, 데이터가 없으면 None)"""
+    return await conn.fetchval(REFRESH_SUMMARY_QUERY)
@@ -0,0 +1,192 @@
+"""
+행정구역 계층(시도 → 시군구 → 읍면동) 캐시
+
+시도마다, (시도, 시군구)마다 DISTINCT 쿼리를 반복하던 구조(N+1)를
+SELECT DISTINCT province, city, district 한 번으로 읽은 불변 트리로 대체합니다.
+- 지역 드롭다운 조회는 DB 왕복 없이 메모리 트리에서 응답
+- 인구 데이터 적재 스크립트가 NOTIFY population_data_changed 를 보내면 즉시 무효화
+  (리스너가 없는 환경에서는 TTL 만료 후 재적재)
+"""
+from dataclasses import dataclass, field
+from functools import cached_property
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+import asyncio
+import logging
+import time
+
+import asyncpg
+
+from .pool import DatabasePool, db_pool
+
+logger = logging.getLogger(__name__)
+
+# 인구 데이터 적재 후 보내는 알림 채널 (src/scripts/import_population_data.py)
+POPULATION_CHANGED_CHANNEL = "population_data_changed"
+
+REGION_QUERY = """
+    SELECT DISTINCT province, city, district
+    FROM population_statistics
+    WHERE province IS NOT NULL
+    ORDER BY province, city, district
+"""
+
+
+@dataclass(frozen=True)
+class RegionTree:
+    """행정구역 트리 (각 단계의 이름은 REGION_QUERY 정렬 순서)"""
+
+    provinces: Tuple[str, ...]
+    cities: Mapping[str, Tuple[str, ...]]
+    districts: Mapping[Tuple[str, str], Tuple[str, ...]]
+    loaded_at: float = field(default_factory=time.time, compare=False)
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Sequence[Optional[str]]]) -> "RegionTree":
+        """(province, city, district) 행 → 트리 (빈 이름은 그 단계에서 제외)"""
+        # dict를 순서 있는 집합으로 사용 (쿼리 정렬 순서 유지)
+        cities: Dict[str, Dict[str, None]] = {}
+        districts: Dict[Tuple[str, str], Dict[str, None]] = {}
+        for province, city, district in rows:
+            if not province:
+                continue
+            province_cities = cities.setdefault(province, {})
+            if not city:
+                continue
+            province_cities[city] = None
+            city_districts = districts.setdefault((province, city), {})
+            if district:
+                city_districts[district] = None
+
+        return cls(
+            provinces=tuple(cities),
+            cities=MappingProxyType({province: tuple(names) for province, names in cities.items()}),
+            districts=MappingProxyType({key: tuple(names) for key, names in districts.items()}),
+        )
+
+    def cities_of(self, province: str) -> Tuple[str, ...]:
+        return self.cities.get(province, ())
+
+    def districts_of(self, province: str, city: str) -> Tuple[str, ...]:
+        return self.districts.get((province, city), ())
+
+    @cached_property
+    def nested(self) -> Dict[str, Any]:
+        """
+        {"provinces": [...], "cities": {시도: [...]}, "districts": {시도: {시군구: [...]}}}
+
+        한 번 만들어 재사용하므로 호출 측에서 수정하지 않아야 합니다.
+        """
+        districts: Dict[str, Dict[str, List[str]]] = {province: {} for province in self.provinces}
+        for (province, city), names in self.districts.items():
+            districts[province][city] = list(names)
+        return {
+            "provinces": list(self.provinces),
+            "cities": {province: list(names) for province, names in self.cities.items()},
+            "districts": districts,
+        }
+
+
+class RegionHierarchy:
+    """
+    행정구역 트리 캐시 (프로세스 메모리)
+
+    사용법:
+        tree = await region_hierarchy.get()
+        cities = tree.cities_of("서울특별시")
+    """
+
+    def __init__(self, pool: DatabasePool = db_pool, ttl_seconds: int = 3600):
+        self.pool = pool
+        self.ttl_seconds = ttl_seconds
+        self._tree: Optional[RegionTree] = None
+        self._listener: Optional[asyncpg.Connection] = None
+        self._subscribers: List[Callable[[], None]] = []
+        self._lock = asyncio.Lock()
+
+    @property
+    def current(self) -> Optional[RegionTree]:
+        """유효한 트리 (없거나 만료되면 None)"""
+        tree = self._tree
+        if tree is None or time.time() - tree.loaded_at > self.ttl_seconds:
+            return None
+        return tree
+
+    def load(self, tree: RegionTree) -> None:
+        """트리 교체"""
+        self._tree = tree
+
+    def invalidate(self) -> None:
+        """다음 조회 시 트리 재적재"""
+        self._tree = None
+
+    async def refresh(self, conn: Optional[asyncpg.Connection] = None) -> RegionTree:
+        """DB에서 트리 재적재 (쿼리 한 번)"""
+        if conn is None:
+            async with self.pool.acquire() as conn:
+                rows = await conn.fetch(REGION_QUERY)
+        else:
+            rows = await conn.fetch(REGION_QUERY)
+        tree = RegionTree.from_rows(rows)
+        self.load(tree)
+        return tree
+
+    async def get(self, conn: Optional[asyncpg.Connection] = None) -> RegionTree:
+        """캐시된 트리 (없으면 적재)"""
+        tree = self.current
+        if tree is None:
+            async with self._lock:
+                tree = self.current
+                if tree is None:
+                    tree = await self.refresh(conn)
+        return tree
+
+    def get_sync(self, fetch_rows: Callable[[], Iterable[Sequence[Optional[str]]]]) -> RegionTree:
+        """
+        동기 SQLAlchemy 세션용 조회
+
+        Args:
+            fetch_rows: REGION_QUERY 결과를 돌려주는 함수 (캐시가 비었을 때만 호출)
+        """
+        tree = self.current
+        if tree is None:
+            tree = RegionTree.from_rows(fetch_rows())
+            self.load(tree)
+        return tree
+
+    def on_change(self, callback: Callable[[], None]) -> None:
+        """적재 알림 시 함께 호출할 콜백 등록 (이벤트 루프에서 동기 호출)"""
+        if callback not in self._subscribers:
+            self._subscribers.append(callback)
+
+    async def listen(self) -> None:
+        """적재 알림 구독 (풀과 별도의 전용 연결 사용)"""
+        if self._listener is not None:
+            return
+        conn = await asyncpg.connect(self.pool.dsn)
+        await conn.add_listener(POPULATION_CHANGED_CHANNEL, self._on_notify)
+        conn.add_termination_listener(self._on_terminated)
+        self._listener = conn
+        logger.info(f"Listening on {POPULATION_CHANGED_CHANNEL}")
+
+    async def close(self) -> None:
+        """알림 구독 종료"""
+        conn, self._listener = self._listener, None
+        if conn is not None and not conn.is_closed():
+            await conn.close()
+
+    def _on_notify(self, conn: asyncpg.Connection, pid: int, channel: str, payload: str) -> None:
+        logger.info("Population data changed, region hierarchy invalidated")
+        self.invalidate()
+        for callback in self._subscribers:
+            callback()
+
+    def _on_terminated(self, conn: asyncpg.Connection) -> None:
+        # 연결이 끊긴 동안의 알림은 놓칠 수 있으므로 TTL에만 의존
+        if self._listener is conn:
+            self._listener = None
+            logger.warning("Region hierarchy listener connection lost; falling back to TTL")
+
+
+# 전역 캐시 인스턴스
+region_hierarchy = RegionHierarchy()
@@ -0,0 +1,270 @@
+"""
+상가 정보 동기화 (지문 기반 변경 감지 + 벌크 업서트)
+
+/business-stores/sync-data, load_real_business_data.py 공용.
+1. 페이지마다 store_number로 기존 content_hash를 일괄 조회해 신규/변경 행만 추림
+2. 추린 행만 세션 임시 스테이징 테이블로 copy_records_to_table (COPY 1회)
+3. INSERT ... ON CONFLICT (store_number) DO UPDATE 1회로 병합
+   - 지문이 같은 행은 잠그지도 쓰지도 않음 (WAL/인덱스 변경 없음)
+4. 지역 전체 수집이 끝나면 이번에 보이지 않은 영업 상가를 폐업 처리
+풀을 넘기면 페이지 반영/폐업 처리 때만 연결을 빌리므로, 외부 API 수집(재시도·백오프 포함) 동안
+풀 연결을 붙잡지 않습니다.
+"""
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, AsyncIterable, AsyncIterator, Dict, Iterable, List, Optional, Sequence, Set, Tuple, Union
+import hashlib
+
+import asyncpg
+
+# API 클라이언트 매핑 필드 = business_stores 컬럼
+STORE_COLUMNS: Tuple[str, ...] = (
+    "store_number", "store_name", "business_code", "business_name",
+    "longitude", "latitude", "jibun_address", "road_address",
+    "sido_name", "sigungu_name", "dong_name", "building_name",
+    "floor_info", "room_info", "open_date", "close_date", "business_status",
+    "standard_industry_code", "commercial_category_code",
+)
+
+OPEN_STATUS = "영업"
+CLOSED_STATUS = "폐업"
+
+_WRITE_COLUMNS = STORE_COLUMNS + ("content_hash",)
+_UPDATE_COLUMNS = _WRITE_COLUMNS[1:]
+_COLUMN_LIST = ", ".join(_WRITE_COLUMNS)
+_SIDO = STORE_COLUMNS.index("sido_name")
+_SIGUNGU = STORE_COLUMNS.index("sigungu_name")
+_STATUS = STORE_COLUMNS.index("business_status")
+
+STAGING_TABLE = "business_stores_staging"
+
+_CREATE_STAGING = f"""
+    CREATE TEMP TABLE {STAGING_TABLE} ON COMMIT DROP AS
+    SELECT {_COLUMN_LIST} FROM business_stores WITH NO DATA
+"""
+
+_MERGE = f"""
+    WITH upserted AS (
+        INSERT INTO business_stores AS t ({_COLUMN_LIST})
+        SELECT {_COLUMN_LIST} FROM {STAGING_TABLE}
+        ON CONFLICT (store_number) DO UPDATE SET
+            {", ".join(f"{c} = EXCLUDED.{c}" for c in _UPDATE_COLUMNS)},
+            updated_at = NOW()
+        WHERE t.content_hash IS DISTINCT FROM EXCLUDED.content_hash
+        RETURNING (xmax = 0) AS inserted, business_status
+    )
+    SELECT
+        COUNT(*) FILTER (WHERE inserted) AS inserted,
+        COUNT(*) FILTER (WHERE NOT inserted) AS updated,
+        COUNT(*) FILTER (WHERE business_status <> '영업') AS closed
+    FROM upserted
+"""
+
+_EXISTING_HASHES = """
+    SELECT store_number, content_hash
+    FROM business_stores
+    WHERE store_number = ANY($1::varchar[])
+"""
+
+# 지역 전체 수집에서 빠진 영업 상가 폐업 처리 ($1: 이번에 본 store_number, $2/$3: 지역 범위)
+_CLOSE_MISSING = f"""
+    WITH seen AS (SELECT unnest($1::varchar[]) AS store_number),
+    region AS (
+        SELECT * FROM unnest($2::varchar[], $3::varchar[]) AS r(sido_name, sigungu_name)
+    )
+    UPDATE business_stores AS t SET
+        business_status = '{CLOSED_STATUS}',
+        close_date = COALESCE(t.close_date, CURRENT_DATE),
+        content_hash = NULL,
+        updated_at = NOW()
+    FROM region
+    WHERE t.sido_name = region.sido_name
+      AND (region.sigungu_name IS NULL OR t.sigungu_name = region.sigungu_name)
+      AND t.business_status = '영업'
+      AND NOT EXISTS (SELECT 1 FROM seen WHERE seen.store_number = t.store_number)
+"""
+
+
+@dataclass
+class SyncResult:
+    """동기화 결과 건수"""
+
+    fetched: int = 0
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    closed: int = 0
+
+    @property
+    def changed(self) -> int:
+        return self.inserted + self.updated
+
+    def add(self, other: "SyncResult") -> None:
+        self.fetched += other.fetched
+        self.inserted += other.inserted
+        self.updated += other.updated
+        self.unchanged += other.unchanged
+        self.closed += other.closed
+
+
+def _canonical(value: Any) -> str:
+    if value is None:
+        return "\x00"
+    if isinstance(value, float):
+        return repr(value)
+    if isinstance(value, date):
+        return value.isoformat()
+    return str(value)
+
+
+def fingerprint(record: Sequence[Any]) -> bytes:
+    """STORE_COLUMNS 순서 레코드의 내용 지문 (BLAKE2b-128)"""
+    payload = "\x1f".join(_canonical(value) for value in record)
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).digest()
+
+
+def normalize_record(record: Sequence[Any]) -> Tuple[Any, ...]:
+    """영업상태가 없는 레코드는 영업으로 간주 (상가정보 API는 영업 상가만 제공)"""
+    record = tuple(record)
+    if record[_STATUS] is None:
+        record = record[:_STATUS] + (OPEN_STATUS,) + record[_STATUS + 1:]
+    return record
+
+
+def to_records(stores: Iterable[Dict[str, Any]]) -> List[Tuple[Any, ...]]:
+    """API 매핑 딕셔너리를 STORE_COLUMNS 순서의 튜플로 변환"""
+    return [tuple(store.get(column) for column in STORE_COLUMNS) for store in stores]
+
+
+async def upsert_stores(
+    conn: asyncpg.Connection, records: Sequence[Tuple[Any, ...]]
+) -> SyncResult:
+    """
+    STORE_COLUMNS 순서의 레코드를 단일 트랜잭션으로 business_stores에 병합
+
+    Returns:
+        SyncResult (closed: 이번 병합으로 기록된 비영업 상가 수)
+    """
+    result = SyncResult(fetched=len(records))
+    if not records:
+        return result
+
+    # 배치 내 중복 store_number는 changed_records와 같이 마지막 값 유지
+    latest = {record[0]: record for record in map(normalize_record, records)}
+    rows = [record + (fingerprint(record),) for record in latest.values()]
+    async with conn.transaction():
+        await conn.execute(_CREATE_STAGING)
+        await conn.copy_records_to_table(STAGING_TABLE, records=rows, columns=_WRITE_COLUMNS)
+        row = await conn.fetchrow(_MERGE)
+        # 바깥 트랜잭션 안에서 호출돼도(세이브포인트) 재호출 가능하도록 즉시 제거
+        await conn.execute(f"DROP TABLE {STAGING_TABLE}")
+
+    result.inserted = row["inserted"]
+    result.updated = row["updated"]
+    result.closed = row["closed"]
+    result.unchanged = len(rows) - result.inserted - result.updated
+    return result
+
+
+async def changed_records(
+    conn: asyncpg.Connection, records: Sequence[Tuple[Any, ...]]
+) -> List[Tuple[Any, ...]]:
+    """기존 지문과 다른(또는 없는) 레코드만 반환 (배치 내 중복은 마지막 값 유지)"""
+    latest: Dict[str, Tuple[Any, ...]] = {record[0]: record for record in records}
+    if not latest:
+        return []
+
+    existing = {
+        row["store_number"]: row["content_hash"]
+        for row in await conn.fetch(_EXISTING_HASHES, list(latest))
+    }
+    return [
+        record for store_number, record in latest.items()
+        if existing.get(store_number) != fingerprint(record)
+    ]
+
+
+@asynccontextmanager
+async def _borrow(source: Union[asyncpg.Connection, Any]) -> AsyncIterator[asyncpg.Connection]:
+    """연결이면 그대로, 풀(acquire 제공)이면 작업 동안만 연결 대여"""
+    if hasattr(source, "acquire"):
+        async with source.acquire() as conn:
+            yield conn
+    else:
+        yield source
+
+
+class StoreSynchronizer:
+    """
+    페이지 단위 상가 동기화
+
+    사용법:
+        sync = StoreSynchronizer(db_pool, region_level="sigungu")  # 연결을 넘겨도 됨
+        async for page in api.iter_store_pages(sido_cd, sigungu_cd):
+            await sync.apply_page(page)
+        result = await sync.finish()  # 전체 수집 완료 시 누락 상가 폐업 처리
+    """
+
+    def __init__(self, source: Union[asyncpg.Connection, Any], region_level: Optional[str] = "sigungu"):
+        """
+        Args:
+            source: 연결 또는 풀 (풀이면 페이지 반영/폐업 처리마다 연결을 빌렸다 반납)
+            region_level: 누락 상가 폐업 처리 범위 ("sido" | "sigungu" | None=처리 안 함)
+        """
+        if region_level not in ("sido", "sigungu", None):
+            raise ValueError(f"Unknown region level: {region_level}")
+        self.source = source
+        self.region_level = region_level
+        self.result = SyncResult()
+        self._seen: Set[str] = set()
+        self._regions: Set[Tuple[str, Optional[str]]] = set()
+
+    async def apply_page(self, records: Sequence[Tuple[Any, ...]]) -> SyncResult:
+        """한 페이지 반영 (바뀐 행만 기록)"""
+        records = [normalize_record(record) for record in records]
+        async with _borrow(self.source) as conn:
+            changed = await changed_records(conn, records)
+            page_result = await upsert_stores(conn, changed)
+        page_result.fetched = len(records)
+        page_result.unchanged = len({record[0] for record in records}) - page_result.changed
+
+        for record in records:
+            self._seen.add(record[0])
+            if record[_SIDO]:
+                sigungu = record[_SIGUNGU] if self.region_level == "sigungu" else None
+                self._regions.add((record[_SIDO], sigungu))
+        self.result.add(page_result)
+        return page_result
+
+    async def finish(self) -> SyncResult:
+        """전체 수집 완료 후 호출: 이번에 보이지 않은 지역 내 영업 상가를 폐업 처리"""
+        if self.region_level and self._regions:
+            regions = sorted(self._regions, key=lambda r: (r[0], r[1] or ""))
+            async with _borrow(self.source) as conn:
+                status = await conn.execute(
+                    _CLOSE_MISSING,
+                    list(self._seen),
+                    [sido for sido, _ in regions],
+                    [sigungu for _, sigungu in regions],
+                )
+            self.result.closed += int(status.split()[-1])
+        return self.result
+
+
+async def sync_store_pages(
+    source: Union[asyncpg.Connection, Any],
+    pages: AsyncIterable[Sequence[Tuple[Any, ...]]],
+    region_level: Optional[str] = "sigungu",
+) -> SyncResult:
+    """
+    페이지 스트림 전체 동기화
+
+    모든 페이지를 끝까지 받은 경우에만 누락 상가를 폐업 처리합니다
+    (수집 도중 예외가 나면 그대로 전파되고 폐업 처리는 건너뜀).
+    source가 풀이면 다음 페이지를 기다리는 동안에는 연결을 반납합니다.
+    """
+    sync = StoreSynchronizer(source, region_level)
+    async for page in pages:
+        await sync.apply_page(page)
+    return await sync.finish()
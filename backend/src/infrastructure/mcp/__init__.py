@@ -0,0 +1,16 @@
+"""
+Infrastructure MCP
+"""
+from .stdio_client import (
+    MCPError,
+    MCPTimeoutError,
+    MCPStdioClient,
+    mcp_client,
+)
+
+__all__ = [
+    "MCPError",
+    "MCPTimeoutError",
+    "MCPStdioClient",
+    "mcp_client",
+]
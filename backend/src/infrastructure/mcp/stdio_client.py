@@ -0,0 +1,280 @@
+"""
+MCP stdio 클라이언트
+
+mcp-server(Node) 프로세스를 한 번 띄워 두고 표준 입출력의 줄 단위 JSON-RPC 2.0으로 통신합니다.
+- 요청마다 id를 붙여 보내고 응답 읽기 태스크 하나가 id로 대기 중인 Future를 깨움 (동시 호출 다중화)
+- 호출별 타임아웃: 시간이 지나면 notifications/cancelled를 보내고 MCPTimeoutError
+- 프로세스가 죽으면 대기 중인 호출은 MCPError로 끝나고, 다음 호출에서 다시 띄움
+  (연속 재시작은 지수 백오프로 제한)
+"""
+from typing import Any, Dict, Optional, Sequence
+import asyncio
+import itertools
+import json
+import logging
+import os
+import shlex
+import time
+
+from ...config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+PROTOCOL_VERSION = "2024-11-05"
+CLIENT_INFO = {"name": "marketing-platform-backend", "version": "0.1.0"}
+
+# 한 줄 최대 크기 (도구 결과 JSON이 기본 64KB를 넘을 수 있음)
+LINE_LIMIT = 16 * 1024 * 1024
+
+
+class MCPError(Exception):
+    """MCP 서버 호출 실패 (프로세스 종료, JSON-RPC 오류, 도구 오류 결과)"""
+
+
+class MCPTimeoutError(MCPError):
+    """호출 타임아웃"""
+
+
+class MCPStdioClient:
+    """
+    장기 실행 MCP stdio 세션
+
+    사용법:
+        client = MCPStdioClient(["node", "dist/index.js"], cwd="../mcp-server")
+        result = await client.call_tool("analyze_target_customers", {"businessType": "cafe", "region": "강남"})
+        await client.aclose()
+    """
+
+    def __init__(
+        self,
+        command: Sequence[str],
+        cwd: Optional[str] = None,
+        env: Optional[Dict[str, str]] = None,
+        call_timeout: float = 10.0,
+        start_timeout: float = 10.0,
+        max_restart_backoff: float = 30.0,
+    ):
+        self.command = list(command)
+        self.cwd = cwd
+        self.env = env
+        self.call_timeout = call_timeout
+        self.start_timeout = start_timeout
+        self.max_restart_backoff = max_restart_backoff
+
+        self._process: Optional[asyncio.subprocess.Process] = None
+        self._reader: Optional[asyncio.Task] = None
+        self._stderr: Optional[asyncio.Task] = None
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._ids = itertools.count(1)
+        self._start_lock = asyncio.Lock()
+        self._write_lock = asyncio.Lock()
+        self._restart_backoff = 0.0
+        self._restart_after = 0.0
+        self.server_info: Optional[Dict[str, Any]] = None
+        self.starts = 0
+
+    @property
+    def is_running(self) -> bool:
+        return self._process is not None and self._process.returncode is None
+
+    @property
+    def pid(self) -> Optional[int]:
+        return self._process.pid if self.is_running else None
+
+    # ------------------------------------------------------------------
+    # 프로세스 수명
+    # ------------------------------------------------------------------
+
+    async def start(self) -> None:
+        """프로세스가 없거나 죽었으면 띄우고 initialize 핸드셰이크"""
+        if self.is_running:
+            return
+        async with self._start_lock:
+            if self.is_running:
+                return
+            now = time.monotonic()
+            if now < self._restart_after:
+                raise MCPError(f"MCP server restart backoff ({self._restart_after - now:.1f}s left)")
+
+            await self._stop()
+            self.starts += 1
+            try:
+                self._process = await asyncio.create_subprocess_exec(
+                    *self.command,
+                    cwd=self.cwd,
+                    env={**os.environ, **self.env} if self.env else None,
+                    stdin=asyncio.subprocess.PIPE,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE,
+                    limit=LINE_LIMIT,
+                )
+                self._reader = asyncio.create_task(self._read_responses(self._process))
+                self._stderr = asyncio.create_task(self._drain_stderr(self._process))
+
+                result = await self._request(
+                    "initialize",
+                    {"protocolVersion": PROTOCOL_VERSION, "capabilities": {}, "clientInfo": CLIENT_INFO},
+                    self.start_timeout,
+                )
+                await self._send({"jsonrpc": "2.0", "method": "notifications/initialized"})
+            except Exception as e:
+                # 기동 실패가 반복되면 다음 시도까지 대기 시간을 늘림
+                self._restart_backoff = min(max(self._restart_backoff * 2, 0.5), self.max_restart_backoff)
+                self._restart_after = time.monotonic() + self._restart_backoff
+                await self._stop()
+                if isinstance(e, MCPError):
+                    raise
+                raise MCPError(f"MCP server start failed: {e}") from e
+
+            self._restart_backoff = 0.0
+            self.server_info = result.get("serverInfo")
+            logger.info(f"MCP server started: pid {self._process.pid}, {self.server_info}")
+
+    async def aclose(self) -> None:
+        """프로세스 종료"""
+        async with self._start_lock:
+            await self._stop()
+
+    async def _stop(self) -> None:
+        process, self._process = self._process, None
+        if process is not None and process.returncode is None:
+            if process.stdin is not None:
+                process.stdin.close()
+            try:
+                await asyncio.wait_for(process.wait(), 2.0)
+            except asyncio.TimeoutError:
+                process.kill()
+                await process.wait()
+        for task in (self._reader, self._stderr):
+            if task is not None and not task.done():
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._reader = self._stderr = None
+        self._fail_pending(MCPError("MCP server stopped"))
+
+    # ------------------------------------------------------------------
+    # 입출력
+    # ------------------------------------------------------------------
+
+    async def _read_responses(self, process: asyncio.subprocess.Process) -> None:
+        """stdout 응답을 id로 대기 중인 호출에 전달 (EOF면 대기 호출 모두 실패)"""
+        try:
+            while True:
+                line = await process.stdout.readline()
+                if not line:
+                    break
+                try:
+                    message = json.loads(line)
+                except ValueError:
+                    logger.debug(f"MCP server non-JSON output: {line[:200]!r}")
+                    continue
+                future = self._pending.pop(message.get("id"), None) if isinstance(message, dict) else None
+                if future is None or future.done():
+                    # 서버 알림, 이미 타임아웃된 호출의 늦은 응답
+                    continue
+                if "error" in message:
+                    error = message["error"] or {}
+                    future.set_exception(MCPError(f"{error.get('message', 'JSON-RPC error')} ({error.get('code')})"))
+                else:
+                    future.set_result(message.get("result") or {})
+        except Exception as e:
+            # 줄 길이 초과 등으로 스트림을 더 읽을 수 없으면 세션을 버림 (다음 호출에서 재기동)
+            logger.warning(f"MCP server read failed: {str(e)}")
+            if process.returncode is None:
+                process.kill()
+        finally:
+            code = await process.wait()
+            # 재기동 후 끝난 이전 세션의 읽기 태스크는 새 세션 호출을 건드리지 않음
+            if process is self._process:
+                logger.warning(f"MCP server exited with code {code}")
+                self._fail_pending(MCPError(f"MCP server exited with code {code}"))
+
+    async def _drain_stderr(self, process: asyncio.subprocess.Process) -> None:
+        """stderr 로그 전달 (파이프가 차서 서버가 멈추지 않도록 계속 읽음)"""
+        try:
+            while True:
+                line = await process.stderr.readline()
+                if not line:
+                    return
+                logger.info(f"[mcp-server] {line.decode(errors='replace').rstrip()}")
+        except ValueError:
+            logger.warning("MCP server stderr line too long, stopped forwarding")
+
+    def _fail_pending(self, error: MCPError) -> None:
+        pending, self._pending = self._pending, {}
+        for future in pending.values():
+            if not future.done():
+                future.set_exception(error)
+
+    async def _send(self, message: Dict[str, Any]) -> None:
+        process = self._process
+        if process is None or process.returncode is not None:
+            raise MCPError("MCP server is not running")
+        data = json.dumps(message, ensure_ascii=False).encode() + b"\n"
+        async with self._write_lock:
+            try:
+                process.stdin.write(data)
+                await process.stdin.drain()
+            except (BrokenPipeError, ConnectionResetError) as e:
+                raise MCPError(f"MCP server pipe closed: {e}") from e
+
+    async def _request(self, method: str, params: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        try:
+            await self._send({"jsonrpc": "2.0", "id": request_id, "method": method, "params": params})
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            if self.is_running:
+                try:
+                    await self._send({
+                        "jsonrpc": "2.0",
+                        "method": "notifications/cancelled",
+                        "params": {"requestId": request_id, "reason": "timeout"},
+                    })
+                except MCPError:
+                    pass
+            raise MCPTimeoutError(f"MCP {method} timed out after {timeout:.1f}s") from None
+        finally:
+            self._pending.pop(request_id, None)
+
+    # ------------------------------------------------------------------
+    # 호출
+    # ------------------------------------------------------------------
+
+    async def request(self, method: str, params: Optional[Dict[str, Any]] = None,
+                      timeout: Optional[float] = None) -> Dict[str, Any]:
+        """JSON-RPC 요청 (필요하면 프로세스 기동)"""
+        await self.start()
+        return await self._request(method, params or {}, timeout if timeout is not None else self.call_timeout)
+
+    async def call_tool(self, name: str, arguments: Dict[str, Any],
+                        timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        tools/call 호출 후 첫 text 콘텐츠를 JSON으로 해석해 반환
+
+        도구가 오류 결과(isError 또는 "Error: ..." 텍스트)를 내면 MCPError
+        """
+        result = await self.request("tools/call", {"name": name, "arguments": arguments}, timeout)
+        text = next(
+            (item.get("text", "") for item in result.get("content", ()) if item.get("type") == "text"),
+            "",
+        )
+        if result.get("isError") or text.startswith("Error:"):
+            raise MCPError(f"MCP tool {name} failed: {text or 'no content'}")
+        try:
+            return json.loads(text)
+        except ValueError as e:
+            raise MCPError(f"MCP tool {name} returned non-JSON content") from e
+
+
+# 전역 클라이언트 인스턴스 (첫 호출에서 기동, 앱 종료 시 aclose)
+mcp_client = MCPStdioClient(
+    shlex.split(settings.mcp_server_command),
+    cwd=settings.mcp_server_dir,
+    call_timeout=settings.mcp_call_timeout,
+)
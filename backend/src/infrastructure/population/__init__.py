@@ -0,0 +1,56 @@
+"""
+Infrastructure Population
+"""
+from .cube import (
+    AGE_BANDS,
+    COUNT_COLUMNS,
+    GENDERS,
+    PopulationCube,
+    PopulationCubeCache,
+    population_cube,
+)
+from .catchment import (
+    CatchmentEstimate,
+    CatchmentEstimator,
+    CentroidIndex,
+    catchment_estimator,
+    read_centroids,
+)
+from .site_scoring import (
+    SITE_SCORE_COMPONENTS,
+    SiteScorer,
+    SiteScores,
+    StoreCategoryCounts,
+    band_weights,
+    score_sites,
+    site_scorer,
+)
+from .summary import (
+    PopulationSummaryCache,
+    SummarySnapshot,
+    population_summary,
+)
+
+__all__ = [
+    "AGE_BANDS",
+    "COUNT_COLUMNS",
+    "GENDERS",
+    "PopulationCube",
+    "PopulationCubeCache",
+    "population_cube",
+    "CatchmentEstimate",
+    "CatchmentEstimator",
+    "CentroidIndex",
+    "catchment_estimator",
+    "read_centroids",
+    "SITE_SCORE_COMPONENTS",
+    "SiteScorer",
+    "SiteScores",
+    "StoreCategoryCounts",
+    "band_weights",
+    "score_sites",
+    "site_scorer",
+    "PopulationSummaryCache",
+    "SummarySnapshot",
+    "population_summary",
+]
@@ -0,0 +1,208 @@
+"""
+상권 반경 인구 추정
+
+인구는 읍면동 단위, 상가는 위경도 단위라 "이 지점 반경 1km 안 20~39세 인구"를 바로 구할 수 없습니다.
+읍면동 중심점(행정기관코드, 위경도, 면적) CSV를 한 번 읽어 격자 인덱스에 올려 두고
+- 각 읍면동을 중심점 기준 같은 면적의 원으로 보고 인구가 고르게 분포한다고 가정
+- 가중치 = 반경 원과 읍면동 원의 겹친 면적 / 읍면동 면적
+- 인구 큐브의 읍면동별 최신 기준월 (연령대 × 성별) 인구에 가중치를 곱해 합산
+후보 중심점만 격자로 잘라 벡터 연산하므로 한 번 추정에 1ms 미만입니다.
+"""
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+import asyncio
+import csv
+import logging
+import math
+import os
+import time
+
+import numpy as np
+
+from ..spatial import GridSnapshot, bounding_box, circle_overlap_km2, haversine_km
+from .cube import AGE_BANDS, GENDERS, PopulationCube
+
+logger = logging.getLogger(__name__)
+
+CENTROID_COLUMNS = ("administrative_code", "latitude", "longitude", "area_km2")
+
+# 중심점 격자 셀 크기 (도, 0.05 ≈ 5.5km) - 읍면동 수천 개 규모라 성긴 격자로 충분
+CENTROID_CELL_DEG = 0.05
+
+# 면적이 없는 중심점에 쓰는 기본 면적 (면적 값이 하나도 없을 때)
+DEFAULT_AREA_KM2 = 1.0
+
+# 연령대 구간 [시작, 끝) - 100세 이상은 10년 폭으로 간주
+_BAND_STARTS = np.arange(len(AGE_BANDS), dtype=np.float64) * 10.0
+
+Centroid = Tuple[str, float, float, Optional[float]]
+
+
+def read_centroids(path: str, encoding: str = "utf-8-sig") -> List[Centroid]:
+    """
+    읍면동 중심점 CSV 읽기
+
+    컬럼: administrative_code, latitude, longitude, area_km2 (면적은 비어 있어도 됨)
+    좌표가 비어 있거나 숫자가 아닌 행은 건너뜁니다.
+    """
+    centroids: List[Centroid] = []
+    with open(path, newline="", encoding=encoding) as f:
+        reader = csv.DictReader(f)
+        missing = [column for column in CENTROID_COLUMNS[:3] if column not in (reader.fieldnames or ())]
+        if missing:
+            raise ValueError(f"Centroid CSV is missing columns: {', '.join(missing)}")
+        for row in reader:
+            try:
+                latitude, longitude = float(row["latitude"]), float(row["longitude"])
+            except (TypeError, ValueError):
+                continue
+            area = (row.get("area_km2") or "").strip()
+            centroids.append((row["administrative_code"].strip(), latitude, longitude, float(area) if area else None))
+    return centroids
+
+
+@dataclass(frozen=True)
+class CentroidIndex:
+    """읍면동 중심점 격자 인덱스 (grid의 ids = codes/radii_km 위치)"""
+
+    codes: Tuple[str, ...]
+    radii_km: np.ndarray    # float64 - 면적이 같은 원의 반경
+    grid: GridSnapshot
+    max_radius_km: float
+
+    @property
+    def size(self) -> int:
+        return len(self.codes)
+
+    @classmethod
+    def build(cls, centroids: Sequence[Centroid], cell_deg: float = CENTROID_CELL_DEG) -> "CentroidIndex":
+        areas = np.array([c[3] if c[3] and c[3] > 0 else np.nan for c in centroids], dtype=np.float64)
+        known = areas[~np.isnan(areas)]
+        areas[np.isnan(areas)] = float(np.median(known)) if known.size else DEFAULT_AREA_KM2
+        radii = np.sqrt(areas / math.pi)
+        radii.setflags(write=False)
+        grid = GridSnapshot.build([(i, c[1], c[2], None, None) for i, c in enumerate(centroids)], cell_deg)
+        return cls(
+            codes=tuple(c[0] for c in centroids),
+            radii_km=radii,
+            grid=grid,
+            max_radius_km=float(radii.max()) if radii.size else 0.0,
+        )
+
+
+@dataclass(frozen=True)
+class CatchmentEstimate:
+    """반경 내 추정 인구 (값은 면적 가중 실수)"""
+
+    latitude: float
+    longitude: float
+    radius_km: float
+    totals: np.ndarray          # (total_population, total_male, total_female)
+    counts: np.ndarray          # (연령대 11, 성별 2)
+    positions: np.ndarray       # 겹친 읍면동의 큐브 행 위치 (거리 오름차순)
+    weights: np.ndarray         # 읍면동 인구 중 반경 안 비율 (0~1)
+    distances_km: np.ndarray    # 중심점까지 거리
+
+    @property
+    def population(self) -> float:
+        return float(self.totals[0])
+
+    def population_between(
+        self, min_age: Optional[int] = None, max_age: Optional[int] = None, gender: Optional[str] = None
+    ) -> float:
+        """
+        만 min_age ~ max_age세 추정 인구 (양끝 포함, gender가 "male"/"female"이면 해당 성별만)
+
+        연령대 경계와 맞지 않으면 해당 10세 구간 안에서 나이별로 고르게 나눕니다.
+        """
+        low = float(min_age) if min_age is not None else 0.0
+        high = float(max_age) + 1.0 if max_age is not None else math.inf
+        overlap = np.clip(np.minimum(_BAND_STARTS + 10.0, high) - np.maximum(_BAND_STARTS, low), 0.0, 10.0) / 10.0
+        counts = self.counts.sum(axis=1) if gender is None else self.counts[:, GENDERS.index(gender)]
+        return float(overlap @ counts)
+
+
+class CatchmentEstimator:
+    """
+    반경 인구 추정기
+
+    사용법:
+        await catchment_estimator.refresh("data/administrative_centroids.csv")
+        estimate = catchment_estimator.estimate(population_cube.cube, 37.5, 127.03, 1.0)
+        estimate.population_between(20, 39)
+    """
+
+    def __init__(self):
+        self._index: Optional[CentroidIndex] = None
+        # 중심점 ↔ 큐브 행 정렬 결과 (큐브가 교체되면 다시 계산)
+        self._aligned: Optional[Tuple[CentroidIndex, PopulationCube, np.ndarray]] = None
+        self.built_at: Optional[float] = None
+
+    @property
+    def is_ready(self) -> bool:
+        """조회 가능 여부"""
+        return self._index is not None
+
+    @property
+    def index(self) -> Optional[CentroidIndex]:
+        return self._index
+
+    def load(self, centroids: Sequence[Centroid]) -> None:
+        """메모리 상의 중심점으로 인덱스 교체 (테스트/오프라인 적재용)"""
+        self._index = CentroidIndex.build(centroids)
+        self.built_at = time.time()
+
+    async def refresh(self, path: str) -> None:
+        """중심점 CSV를 읽어 인덱스 구축"""
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Centroid CSV not found: {path}")
+        started = time.perf_counter()
+        centroids = await asyncio.to_thread(read_centroids, path)
+        index = await asyncio.to_thread(CentroidIndex.build, centroids)
+        self._index = index
+        self.built_at = time.time()
+        logger.info(f"Catchment centroid index built: {index.size} centroids in {time.perf_counter() - started:.2f}s")
+
+    def _positions(self, index: CentroidIndex, cube: PopulationCube) -> np.ndarray:
+        """중심점 순서의 큐브 최신 행 위치 (-1: 인구 데이터 없음)"""
+        aligned = self._aligned
+        if aligned is None or aligned[0] is not index or aligned[1] is not cube:
+            aligned = (index, cube, cube.latest_positions_for_codes(index.codes))
+            self._aligned = aligned
+        return aligned[2]
+
+    def estimate(self, cube: PopulationCube, latitude: float, longitude: float, radius_km: float) -> CatchmentEstimate:
+        """반경 radius_km 원 안의 면적 가중 인구"""
+        index = self._index
+        if index is None:
+            raise RuntimeError("Catchment centroid index is not built")
+
+        positions = self._positions(index, cube)
+        # 읍면동 원이 반경 원에 걸치려면 중심점이 radius + 읍면동 반경 안에 있어야 함
+        slots = index.grid.bbox_candidates(*bounding_box(latitude, longitude, radius_km + index.max_radius_km))
+        cand = index.grid.ids[slots]
+        has_data = positions[cand] >= 0
+        slots, cand = slots[has_data], cand[has_data]
+
+        distances = haversine_km(latitude, longitude, index.grid.lats[slots], index.grid.lons[slots])
+        radii = index.radii_km[cand]
+        weights = np.minimum(circle_overlap_km2(distances, radius_km, radii) / (math.pi * radii * radii), 1.0)
+        # 걸친 읍면동만 거리 오름차순
+        hit = np.flatnonzero(weights > 0)
+        hit = hit[np.argsort(distances[hit], kind="stable")]
+        rows, weights, distances = positions[cand[hit]], weights[hit], distances[hit]
+
+        return CatchmentEstimate(
+            latitude=latitude,
+            longitude=longitude,
+            radius_km=radius_km,
+            totals=weights @ cube.totals[rows],
+            counts=np.tensordot(weights, cube.counts[rows], axes=1),
+            positions=rows,
+            weights=weights,
+            distances_km=distances,
+        )
+
+
+# 전역 추정기 인스턴스
+catchment_estimator = CatchmentEstimator()
@@ -0,0 +1,395 @@
+"""
+인메모리 인구 통계 큐브
+
+population_statistics는 (읍면동 × 기준월) 행마다 성별·연령대 정수 22개인 작은 표라
+전부 메모리에 올려 두고 엔드포인트별 SQL 집계를 배열 슬라이스/합계로 대체합니다.
+- counts: (행, 연령대 11, 성별 2) int32 - 행 축은 읍면동 × 기준월 좌표(region_ids, date_ids)를 가짐
+- 행은 /statistics 정렬 순서 (reference_date DESC, city, district, id)로 저장
+  → 필터는 정수 코드 비교 마스크, 커서 페이지는 이분 탐색 한 번
+- 인구 데이터 적재 알림(population_data_changed) 시 백그라운드 재구축 후 교체
+  (구축 중에는 이전 큐브로 계속 응답)
+"""
+from bisect import bisect_right
+from datetime import date
+from functools import cached_property
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import asyncio
+import logging
+import time
+
+import numpy as np
+
+from ..database import DatabasePool, db_pool
+
+logger = logging.getLogger(__name__)
+
+AGE_BANDS = ("0_9", "10_19", "20_29", "30_39", "40_49", "50_59", "60_69", "70_79", "80_89", "90_99", "100_plus")
+GENDERS = ("male", "female")
+
+COUNT_COLUMNS = tuple(f"age_{band}_{gender}" for band in AGE_BANDS for gender in GENDERS)
+
+LOAD_QUERY = f"""
+    SELECT id, administrative_code, reference_date, province, city, district,
+           total_population, total_male, total_female,
+           {", ".join(COUNT_COLUMNS)}
+    FROM population_statistics
+"""
+
+# LOAD_QUERY 결과 컬럼 위치
+_HEAD = 9
+
+# records()의 숫자 컬럼 순서
+_NUMBER_KEYS = (
+    "id", "total_population", "total_male", "total_female",
+    *COUNT_COLUMNS,
+    *(f"age_{band}_total" for band in AGE_BANDS),
+)
+
+
+def _encode(values: Sequence[Optional[str]]) -> Tuple[Tuple[Optional[str], ...], np.ndarray]:
+    """문자열 → (이름 튜플, int32 코드 배열)"""
+    lookup: Dict[Optional[str], int] = {}
+    codes = np.fromiter((lookup.setdefault(value, len(lookup)) for value in values), dtype=np.int32, count=len(values))
+    return tuple(lookup), codes
+
+
+class PopulationCube:
+    """
+    population_statistics 전체의 불변 열 지향 스냅샷
+
+    행 위치(positions)는 /statistics 정렬 순서 기준 인덱스입니다.
+    """
+
+    def __init__(self, rows: Sequence[Sequence[Any]]):
+        """
+        Args:
+            rows: LOAD_QUERY 결과 행
+        """
+        rows = sorted(rows, key=lambda r: (-r[2].toordinal(), r[4] or "", r[5] or "", r[0]))
+        n = len(rows)
+        columns = list(zip(*rows)) if n else [()] * (_HEAD + len(COUNT_COLUMNS))
+
+        self.size = n
+        self.ids = np.array(columns[0], dtype=np.int64)
+        self.administrative_codes: Tuple[str, ...] = tuple(columns[1])
+        self.reference_dates: Tuple[date, ...] = tuple(columns[2])
+        self.provinces: Tuple[Optional[str], ...] = tuple(columns[3])
+        self.cities: Tuple[Optional[str], ...] = tuple(columns[4])
+        self.districts: Tuple[Optional[str], ...] = tuple(columns[5])
+
+        # 좌표 축: 기준월, 읍면동(시도, 시군구, 읍면동)
+        self.dates, self.date_ids = _encode(self.reference_dates)
+        self.regions, self.region_ids = _encode(list(zip(self.provinces, self.cities, self.districts)))
+        self.province_names, self.province_ids = _encode(self.provinces)
+        self.city_names, self.city_ids = _encode(self.cities)
+        self.district_names, self.district_ids = _encode(self.districts)
+        self.years = np.array([d.year for d in self.dates], dtype=np.int32)[self.date_ids] if n else np.empty(0, np.int32)
+
+        totals = np.array(columns[6:_HEAD], dtype=np.int64).T if n else np.empty((0, 3), np.int64)
+        counts = np.array(columns[_HEAD:], dtype=np.int32).T if n else np.empty((0, len(COUNT_COLUMNS)), np.int32)
+        self.totals = np.ascontiguousarray(totals)                       # total_population, total_male, total_female
+        self.counts = np.ascontiguousarray(counts).reshape(n, len(AGE_BANDS), len(GENDERS))
+
+        # 커서 이분 탐색용 정렬 키 (행 순서와 동일)
+        self._sort_keys = [
+            (-d.toordinal(), c or "", s or "", i)
+            for d, c, s, i in zip(self.reference_dates, self.cities, self.districts, self.ids.tolist())
+        ]
+
+        for array in (self.ids, self.date_ids, self.region_ids, self.province_ids, self.city_ids,
+                      self.district_ids, self.years, self.totals, self.counts):
+            array.setflags(write=False)
+
+    # ------------------------------------------------------------------
+    # 선택
+    # ------------------------------------------------------------------
+
+    def _name_mask(self, names: Tuple[Optional[str], ...], ids: np.ndarray, value: str) -> np.ndarray:
+        try:
+            return ids == names.index(value)
+        except ValueError:
+            return np.zeros(self.size, dtype=bool)
+
+    def select(
+        self,
+        province: Optional[str] = None,
+        city: Optional[str] = None,
+        district: Optional[str] = None,
+        year: Optional[int] = None,
+        min_population: Optional[int] = None,
+    ) -> np.ndarray:
+        """조건(= 비교, total_population > min_population)을 만족하는 행 위치 (정렬 순서)"""
+        mask = np.ones(self.size, dtype=bool)
+        if province:
+            mask &= self._name_mask(self.province_names, self.province_ids, province)
+        if city:
+            mask &= self._name_mask(self.city_names, self.city_ids, city)
+        if district:
+            mask &= self._name_mask(self.district_names, self.district_ids, district)
+        if year:
+            mask &= self.years == year
+        if min_population is not None:
+            mask &= self.totals[:, 0] > min_population
+        return np.flatnonzero(mask)
+
+    def matching(self, term: str) -> np.ndarray:
+        """시군구명 또는 읍면동명에 term이 포함된 행 위치 (ILIKE '%term%')"""
+        needle = term.lower()
+        cities = [i for i, name in enumerate(self.city_names) if name and needle in name.lower()]
+        districts = [i for i, name in enumerate(self.district_names) if name and needle in name.lower()]
+        return np.flatnonzero(np.isin(self.city_ids, cities) | np.isin(self.district_ids, districts))
+
+    def page(self, positions: np.ndarray, after: Optional[Sequence[Any]], limit: int) -> np.ndarray:
+        """
+        keyset 페이지
+
+        Args:
+            after: 직전 페이지 마지막 행의 (reference_date, city, district, id)
+        """
+        if after is not None:
+            start = bisect_right(self._sort_keys, (-after[0].toordinal(), after[1] or "", after[2] or "", after[3]))
+            positions = positions[np.searchsorted(positions, start):]
+        return positions[:limit]
+
+    def top_by_population(self, positions: np.ndarray, k: int) -> np.ndarray:
+        """total_population 내림차순 상위 k개 행 위치 (동률은 정렬 순서)"""
+        if k <= 0 or positions.size == 0:
+            return positions[:0]
+        population = self.totals[positions, 0]
+        if positions.size > k:
+            # k번째 값 이상인 후보만 안정 정렬 (경계 동률은 앞선 행 우선)
+            threshold = population[np.argpartition(-population, k - 1)[:k]].min()
+            candidates = np.flatnonzero(population >= threshold)
+            order = candidates[np.argsort(-population[candidates], kind="stable")][:k]
+        else:
+            order = np.argsort(-population, kind="stable")
+        return positions[order]
+
+    # ------------------------------------------------------------------
+    # 지역 일괄 조회
+    # ------------------------------------------------------------------
+
+    @cached_property
+    def _regions_by_name(self) -> Dict[Tuple[Optional[str], Optional[str]], List[int]]:
+        """(시도, 읍면동) → 읍면동 좌표 id 목록 (시군구는 조회 시 비교)"""
+        index: Dict[Tuple[Optional[str], Optional[str]], List[int]] = {}
+        for region_id, (province, _, district) in enumerate(self.regions):
+            index.setdefault((province, district), []).append(region_id)
+        return index
+
+    @cached_property
+    def _positions_by_code(self) -> Dict[str, np.ndarray]:
+        """행정기관코드 → 행 위치 (정렬 순서)"""
+        index: Dict[str, List[int]] = {}
+        for position, code in enumerate(self.administrative_codes):
+            index.setdefault(code, []).append(position)
+        return {code: np.array(positions, dtype=np.int64) for code, positions in index.items()}
+
+    @cached_property
+    def _position_grid(self) -> np.ndarray:
+        """(읍면동 id, 기준월 id) → 행 위치 (-1: 해당 월 없음, 같은 칸 중복은 정렬 순서상 앞선 행)"""
+        n_dates = len(self.dates)
+        cells, first = np.unique(self.region_ids.astype(np.int64) * n_dates + self.date_ids, return_index=True)
+        grid = np.full(len(self.regions) * n_dates, -1, dtype=np.int64)
+        grid[cells] = first
+        return grid.reshape(len(self.regions), n_dates)
+
+    @cached_property
+    def _latest_positions(self) -> np.ndarray:
+        """읍면동 id → 최신 기준월 행 위치 (행이 최신 월부터 정렬돼 있으므로 읍면동별 첫 행)"""
+        _, first = np.unique(self.region_ids, return_index=True)
+        return first
+
+    def _first_per_region(self, positions: np.ndarray) -> np.ndarray:
+        """정렬된 행 위치 중 읍면동별 첫 행"""
+        _, first = np.unique(self.region_ids[positions], return_index=True)
+        return positions[np.sort(first)]
+
+    def lookup(
+        self,
+        keys: Sequence[Tuple[str, Optional[str], str]] = (),
+        codes: Sequence[str] = (),
+        reference_date: Optional[date] = None,
+    ) -> Tuple[np.ndarray, List[int], List[str]]:
+        """
+        읍면동 키/행정기관코드 일괄 조회
+
+        키는 일치하는 읍면동마다, 코드는 그 코드를 가진 행의 읍면동마다 한 행을 고릅니다.
+
+        Args:
+            keys: (시도, 시군구, 읍면동) - 시군구가 None이면 시군구 무관 (세종특별자치시 등)
+            codes: 행정기관코드
+            reference_date: 기준월 (None이면 읍면동별 최신 월)
+
+        Returns:
+            (행 위치 - 정렬 순서, 중복 제거), 찾지 못한 keys 인덱스, 찾지 못한 codes
+        """
+        date_id = self.dates.index(reference_date) if reference_date in self.dates else -1
+        found: List[np.ndarray] = []
+        missing_keys: List[int] = []
+        missing_codes: List[str] = []
+
+        for i, (province, city, district) in enumerate(keys):
+            regions = np.array([
+                region_id for region_id in self._regions_by_name.get((province, district), ())
+                if city is None or self.regions[region_id][1] == city
+            ], dtype=np.int64)
+            if reference_date is None:
+                positions = self._latest_positions[regions]
+            elif date_id >= 0:
+                positions = self._position_grid[regions, date_id]
+                positions = positions[positions >= 0]
+            else:
+                positions = regions[:0]
+            if positions.size:
+                found.append(positions)
+            else:
+                missing_keys.append(i)
+
+        for code in codes:
+            positions = self._positions_by_code.get(code, np.empty(0, np.int64))
+            if reference_date is not None:
+                positions = positions[self.date_ids[positions] == date_id]
+            positions = self._first_per_region(positions)
+            if positions.size:
+                found.append(positions)
+            else:
+                missing_codes.append(code)
+
+        positions = np.unique(np.concatenate(found)) if found else np.empty(0, np.int64)
+        return positions, missing_keys, missing_codes
+
+    def latest_region_positions(self) -> np.ndarray:
+        """읍면동별 최신 기준월 행 위치 (읍면동 id 순서)"""
+        return self._latest_positions
+
+    def latest_positions_for_codes(self, codes: Sequence[str]) -> np.ndarray:
+        """행정기관코드별 최신 기준월 행 위치 (-1: 없는 코드) - codes와 같은 순서"""
+        index = self._positions_by_code
+        return np.fromiter(
+            (int(index[code][0]) if code in index else -1 for code in codes), dtype=np.int64, count=len(codes)
+        )
+
+    # ------------------------------------------------------------------
+    # 집계
+    # ------------------------------------------------------------------
+
+    def band_totals(self, positions: np.ndarray) -> np.ndarray:
+        """행별 연령대 합계 (남+여) - (len(positions), 11) int64"""
+        return self.counts[positions].sum(axis=2, dtype=np.int64)
+
+    def band_sums(self, positions: np.ndarray) -> np.ndarray:
+        """선택 행 전체의 (연령대, 성별) 합계 - (11, 2) int64"""
+        return self.counts[positions].sum(axis=0, dtype=np.int64)
+
+    @cached_property
+    def summary(self) -> Dict[str, Any]:
+        """/summary 전체 통계 (COUNT/SUM/AVG, 시군구·읍면동 이름 DISTINCT 수)"""
+        population = self.totals[:, 0]
+        return {
+            "total_records": self.size,
+            "total_population": int(population.sum()) if self.size else None,
+            "avg_population_per_district": float(population.mean()) if self.size else None,
+            "total_cities": len({name for name in self.city_names if name is not None}),
+            "total_districts": len({name for name in self.district_names if name is not None}),
+        }
+
+    # ------------------------------------------------------------------
+    # 행 구성
+    # ------------------------------------------------------------------
+
+    def records(self, positions: np.ndarray) -> List[Dict[str, Any]]:
+        """
+        행 위치 → SQL 행과 같은 키의 dict
+
+        키: id, administrative_code, reference_date, province, city, district,
+            total_population, total_male, total_female, age_{band}_{male|female|total}
+        """
+        counts = self.counts[positions]
+        # 숫자 컬럼은 한 배열로 이어 붙여 tolist 한 번
+        numbers = np.concatenate([
+            self.ids[positions, None],
+            self.totals[positions],
+            counts.reshape(positions.shape[0], len(COUNT_COLUMNS)),
+            counts.sum(axis=2, dtype=np.int64),
+        ], axis=1).tolist()
+
+        result = []
+        for p, values in zip(positions.tolist(), numbers):
+            record = {
+                "administrative_code": self.administrative_codes[p],
+                "reference_date": self.reference_dates[p],
+                "province": self.provinces[p],
+                "city": self.cities[p],
+                "district": self.districts[p],
+            }
+            record.update(zip(_NUMBER_KEYS, values))
+            result.append(record)
+        return result
+
+
+class PopulationCubeCache:
+    """
+    인구 큐브 보관소
+
+    사용법:
+        await population_cube.refresh()
+        cube = population_cube.cube
+        rows = cube.records(cube.page(cube.select(city="강남구"), None, 100))
+    """
+
+    def __init__(self, pool: DatabasePool = db_pool):
+        self.pool = pool
+        self._cube: Optional[PopulationCube] = None
+        self._refresh_lock = asyncio.Lock()
+        self._pending: Optional[asyncio.Task] = None
+        # 진행 중인 갱신이 이미 읽은 뒤에 온 알림 (끝나면 한 번 더 갱신)
+        self._dirty = False
+        self.built_at: Optional[float] = None
+
+    @property
+    def is_ready(self) -> bool:
+        """조회 가능 여부"""
+        return self._cube is not None
+
+    @property
+    def cube(self) -> Optional[PopulationCube]:
+        return self._cube
+
+    def load(self, rows: Sequence[Sequence[Any]]) -> None:
+        """메모리 상의 행으로 큐브 교체 (테스트/오프라인 적재용)"""
+        self._cube = PopulationCube(rows)
+        self.built_at = time.time()
+
+    async def refresh(self) -> None:
+        """population_statistics를 읽어 큐브 재구축"""
+        async with self._refresh_lock:
+            started = time.perf_counter()
+            async with self.pool.acquire() as conn:
+                rows = await conn.fetch(LOAD_QUERY)
+
+            cube = await asyncio.to_thread(PopulationCube, [tuple(r) for r in rows])
+            self._cube = cube
+            self.built_at = time.time()
+            logger.info(f"Population cube built: {cube.size} rows, {len(cube.regions)} regions, "
+                        f"{len(cube.dates)} dates in {time.perf_counter() - started:.2f}s")
+
+    def schedule_refresh(self) -> None:
+        """백그라운드 재구축 예약 (인구 데이터 적재 알림 콜백, 진행 중이면 끝난 뒤 한 번 더)"""
+        self._dirty = True
+        if self._pending is not None and not self._pending.done():
+            return
+        self._pending = asyncio.get_running_loop().create_task(self._refresh_logged())
+
+    async def _refresh_logged(self) -> None:
+        # 갱신 중에 알림이 오면 (읽은 데이터가 이미 낡았을 수 있으므로) 다시 갱신
+        while self._dirty:
+            self._dirty = False
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.warning(f"Population cube rebuild failed: {str(e)}")
+
+
+# 전역 큐브 인스턴스
+population_cube = PopulationCubeCache()
@@ -0,0 +1,296 @@
+"""
+입지 점수 엔진
+
+인구 상위 20개 지역만 파이썬 루프로 점수를 매기던 방식 대신, 전국 읍면동(최신 기준월)을 한 번에 배열로 평가합니다.
+- 타겟 연령 비중 (+): 연령대 가중치를 곱한 인구 / 총인구
+- 인구 규모 (+): 총인구
+- 경쟁 상가 수 (-): 같은 업종 영업 상가 수
+- 업종 포화도 (-): 인구 1천 명당 같은 업종 상가 수
+각 지표를 평가 대상 안의 백분위(0~1, 동률은 평균 순위)로 바꿔 단위를 맞춘 뒤 가중합(0~100)하고,
+argpartition으로 상위 k개만 골라 정렬합니다.
+
+상가는 행정동 코드가 없어 (시도, 시군구, 읍면동) 이름으로 인구 큐브 읍면동과 맞춥니다.
+읍면동 면적 데이터가 없으므로 밀도는 면적 대신 상가 수와 인구 대비 상가 수로 봅니다.
+"""
+from dataclasses import dataclass
+from typing import Dict, Mapping, Optional, Sequence, Tuple
+import asyncio
+import logging
+import time
+
+import asyncpg
+import numpy as np
+
+from ..database import CategoryFilter, DatabasePool, db_pool
+from .cube import AGE_BANDS, PopulationCube
+
+logger = logging.getLogger(__name__)
+
+STORE_COUNT_QUERY = """
+    SELECT sido_name, sigungu_name, dong_name, business_code, business_name, COUNT(*) AS store_count
+    FROM business_stores
+    WHERE business_status = '영업'
+    GROUP BY sido_name, sigungu_name, dong_name, business_code, business_name
+"""
+
+SITE_SCORE_COMPONENTS = ("target_share", "population", "competition", "saturation")
+
+# 지표 방향 (+1: 클수록 유리, -1: 작을수록 유리)
+_COMPONENT_SIGNS = np.array([1.0, 1.0, -1.0, -1.0])
+
+DEFAULT_WEIGHTS = {"target_share": 0.35, "population": 0.25, "competition": 0.2, "saturation": 0.2}
+
+# 이 인구 이하 읍면동은 평가에서 제외 (소규모 읍면동의 비율 지표 왜곡 방지)
+MIN_POPULATION = 5000
+
+RegionKey = Tuple[Optional[str], Optional[str], Optional[str]]
+
+
+def component_weights(weights: Optional[Mapping[str, float]] = None) -> np.ndarray:
+    """지표 이름 → 가중치 dict를 SITE_SCORE_COMPONENTS 순서 배열로 (빠진 지표는 0, 합이 1이 되도록 정규화)"""
+    weights = DEFAULT_WEIGHTS if weights is None else weights
+    unknown = set(weights) - set(SITE_SCORE_COMPONENTS)
+    if unknown:
+        raise ValueError(f"Unknown site score components: {', '.join(sorted(unknown))}")
+    vector = np.array([float(weights.get(name, 0.0)) for name in SITE_SCORE_COMPONENTS])
+    if (vector < 0).any() or vector.sum() <= 0:
+        raise ValueError("Site score weights must be non-negative with a positive sum")
+    return vector / vector.sum()
+
+
+def percentile_ranks(values: np.ndarray) -> np.ndarray:
+    """값의 백분위 순위 0~1 (동률은 평균 순위, 값이 하나뿐이면 0.5)"""
+    n = values.size
+    if n <= 1:
+        return np.full(n, 0.5)
+    _, inverse, counts = np.unique(values, return_inverse=True, return_counts=True)
+    starts = np.cumsum(counts) - counts
+    return (starts + (counts - 1) / 2.0)[inverse] / (n - 1)
+
+
+@dataclass(frozen=True)
+class SiteScores:
+    """평가 결과 (배열은 모두 평가 대상 읍면동 순서)"""
+
+    indices: np.ndarray         # 입력 배열 기준 위치
+    scores: np.ndarray          # 0~100
+    components: np.ndarray      # (n, 4) 방향을 반영한 백분위 (클수록 유리)
+    target_share: np.ndarray    # 타겟 연령 비중 0~1
+    population: np.ndarray
+    competitors: np.ndarray
+    per_thousand: np.ndarray    # 인구 1천 명당 경쟁 상가 수
+
+    @property
+    def size(self) -> int:
+        return self.indices.size
+
+    def top(self, k: int) -> np.ndarray:
+        """점수 상위 k개 (평가 대상 기준 위치, 점수 내림차순 - 동률은 앞선 행 우선)"""
+        if k <= 0 or self.size == 0:
+            return np.empty(0, np.int64)
+        if self.size > k:
+            candidates = np.argpartition(-self.scores, k - 1)[:k]
+            # 경계 동률은 argpartition이 임의로 고르므로 k번째 점수 이상인 행을 모두 후보로
+            candidates = np.flatnonzero(self.scores >= self.scores[candidates].min())
+        else:
+            candidates = np.arange(self.size)
+        return candidates[np.argsort(-self.scores[candidates], kind="stable")][:k]
+
+
+def score_sites(
+    population: np.ndarray,
+    bands: np.ndarray,
+    competitors: np.ndarray,
+    age_weights: np.ndarray,
+    weights: Optional[Mapping[str, float]] = None,
+    min_population: int = MIN_POPULATION,
+) -> SiteScores:
+    """
+    읍면동 배열 일괄 평가
+
+    Args:
+        population: (n,) 총인구
+        bands: (n, 11) 연령대 인구 (남+여)
+        competitors: (n,) 같은 업종 영업 상가 수
+        age_weights: (11,) 연령대별 타겟 가중치
+        weights: 지표 이름 → 가중치 (None이면 DEFAULT_WEIGHTS)
+        min_population: 이 인구 이하 읍면동은 제외
+    """
+    vector = component_weights(weights)
+    indices = np.flatnonzero(population > min_population)
+    total = population[indices].astype(np.float64)
+    count = competitors[indices].astype(np.float64)
+
+    target_share = (bands[indices] @ np.asarray(age_weights, dtype=np.float64)) / total
+    per_thousand = count * 1000.0 / total
+    raw = (target_share, total, count, per_thousand)
+
+    components = np.empty((indices.size, len(SITE_SCORE_COMPONENTS)))
+    for column, (values, sign) in enumerate(zip(raw, _COMPONENT_SIGNS)):
+        ranks = percentile_ranks(values)
+        components[:, column] = ranks if sign > 0 else 1.0 - ranks
+
+    return SiteScores(
+        indices=indices,
+        scores=components @ vector * 100.0,
+        components=components,
+        target_share=target_share,
+        population=total,
+        competitors=count,
+        per_thousand=per_thousand,
+    )
+
+
+@dataclass(frozen=True)
+class StoreCategoryCounts:
+    """
+    읍면동 × (업종코드, 업종명) 영업 상가 수 (희소 형식)
+
+    업종 필터가 코드면 코드로, ILIKE 패턴이면 업종명으로 열을 골라 읍면동별로 합산합니다.
+    """
+
+    regions: Tuple[RegionKey, ...]
+    codes: Tuple[Optional[str], ...]
+    names: Tuple[str, ...]
+    region_ids: np.ndarray      # 항목별 읍면동 id
+    column_ids: np.ndarray      # 항목별 (코드, 업종명) 열 id
+    store_counts: np.ndarray    # 항목별 상가 수
+
+    @classmethod
+    def build(cls, rows: Sequence[Sequence]) -> "StoreCategoryCounts":
+        regions: Dict[RegionKey, int] = {}
+        columns: Dict[Tuple[Optional[str], str], int] = {}
+        region_ids, column_ids, store_counts = [], [], []
+        for sido, sigungu, dong, code, name, count in rows:
+            region_ids.append(regions.setdefault((sido, sigungu, dong), len(regions)))
+            column_ids.append(columns.setdefault((code, name or ""), len(columns)))
+            store_counts.append(count)
+        return cls(
+            regions=tuple(regions),
+            codes=tuple(code for code, _ in columns),
+            names=tuple(name for _, name in columns),
+            region_ids=np.array(region_ids, dtype=np.int64),
+            column_ids=np.array(column_ids, dtype=np.int64),
+            store_counts=np.array(store_counts, dtype=np.int64),
+        )
+
+    def column_mask(self, category: Optional[CategoryFilter]) -> np.ndarray:
+        """업종 필터에 맞는 열 (None이면 모든 업종)"""
+        if category is None:
+            return np.ones(len(self.codes), dtype=bool)
+        if category.uses_codes:
+            wanted = set(category.codes)
+            return np.fromiter((code in wanted for code in self.codes), dtype=bool, count=len(self.codes))
+        needle = (category.pattern or "").strip("%").lower()
+        return np.fromiter((needle in name.lower() for name in self.names), dtype=bool, count=len(self.names))
+
+    def region_counts(self, category: Optional[CategoryFilter]) -> np.ndarray:
+        """읍면동 id별 같은 업종 상가 수 - (len(regions),) int64"""
+        selected = self.column_mask(category)[self.column_ids]
+        return np.bincount(
+            self.region_ids[selected], weights=self.store_counts[selected], minlength=len(self.regions)
+        ).astype(np.int64)
+
+
+class SiteScorer:
+    """
+    입지 점수 엔진 (상가 업종별 집계는 TTL 캐시, 동기화 후 invalidate)
+
+    사용법:
+        category = await category_resolver.resolve("카페")
+        scores, positions = await site_scorer.score(population_cube.cube, category, age_weights)
+        top = scores.top(5)
+    """
+
+    def __init__(self, pool: DatabasePool = db_pool, ttl_seconds: int = 3600):
+        self.pool = pool
+        self.ttl_seconds = ttl_seconds
+        self._counts: Optional[StoreCategoryCounts] = None
+        self._loaded_at = 0.0
+        # 상가 읍면동 ↔ 큐브 최신 행 정렬 결과 (집계나 큐브가 바뀌면 다시 계산)
+        self._aligned: Optional[Tuple[StoreCategoryCounts, PopulationCube, np.ndarray, np.ndarray]] = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._counts is not None and time.time() - self._loaded_at <= self.ttl_seconds
+
+    def load(self, rows: Sequence[Sequence]) -> None:
+        """메모리 상의 집계 행으로 교체 (테스트/오프라인 적재용)"""
+        self._counts = StoreCategoryCounts.build(rows)
+        self._loaded_at = time.time()
+
+    def invalidate(self) -> None:
+        """다음 평가 시 상가 집계 재적재"""
+        self._counts = None
+
+    async def refresh(self, conn: Optional[asyncpg.Connection] = None) -> None:
+        """DB에서 읍면동 × 업종 상가 수 재적재"""
+        started = time.perf_counter()
+        if conn is None:
+            async with self.pool.acquire() as conn:
+                rows = await conn.fetch(STORE_COUNT_QUERY)
+        else:
+            rows = await conn.fetch(STORE_COUNT_QUERY)
+        self.load([tuple(row) for row in rows])
+        logger.info(f"Store category counts loaded: {len(rows)} rows in {time.perf_counter() - started:.2f}s")
+
+    def _alignment(self, counts: StoreCategoryCounts, cube: PopulationCube) -> Tuple[np.ndarray, np.ndarray]:
+        """(큐브 읍면동별 최신 행 위치, 그 행의 상가 집계 읍면동 id - 없으면 -1)"""
+        aligned = self._aligned
+        if aligned is None or aligned[0] is not counts or aligned[1] is not cube:
+            positions = cube.latest_region_positions()
+            store_regions = {key: i for i, key in enumerate(counts.regions)}
+            region_ids = np.fromiter(
+                (store_regions.get(cube.regions[r], -1) for r in cube.region_ids[positions].tolist()),
+                dtype=np.int64, count=positions.size,
+            )
+            aligned = (counts, cube, positions, region_ids)
+            self._aligned = aligned
+        return aligned[2], aligned[3]
+
+    def score_cube(
+        self,
+        cube: PopulationCube,
+        category: Optional[CategoryFilter],
+        age_weights: np.ndarray,
+        weights: Optional[Mapping[str, float]] = None,
+        min_population: int = MIN_POPULATION,
+    ) -> Tuple[SiteScores, np.ndarray]:
+        """적재된 집계로 큐브 전체 평가 → (결과, 평가 대상의 큐브 행 위치)"""
+        counts = self._counts
+        if counts is None:
+            raise RuntimeError("Store category counts are not loaded")
+        positions, region_ids = self._alignment(counts, cube)
+        # 상가 집계에 없는 읍면동은 0 (영업 상가가 하나도 없으면 집계 자체가 비어 있음)
+        competitors = np.zeros(positions.size, dtype=np.int64)
+        matched = region_ids >= 0
+        competitors[matched] = counts.region_counts(category)[region_ids[matched]]
+        scores = score_sites(
+            cube.totals[positions, 0], cube.band_totals(positions), competitors, age_weights, weights, min_population
+        )
+        return scores, positions[scores.indices]
+
+    async def score(
+        self,
+        cube: PopulationCube,
+        category: Optional[CategoryFilter],
+        age_weights: np.ndarray,
+        weights: Optional[Mapping[str, float]] = None,
+        min_population: int = MIN_POPULATION,
+    ) -> Tuple[SiteScores, np.ndarray]:
+        """상가 집계가 없거나 만료됐으면 재적재 후 score_cube"""
+        if not self.is_loaded:
+            async with self._lock:
+                if not self.is_loaded:
+                    await self.refresh()
+        return self.score_cube(cube, category, age_weights, weights, min_population)
+
+
+def band_weights(weights_by_band: Mapping[str, float]) -> np.ndarray:
+    """연령대 키("20_29" 등) → 가중치 dict를 AGE_BANDS 순서 배열로 (빠진 연령대는 0)"""
+    return np.array([float(weights_by_band.get(band, 0.0)) for band in AGE_BANDS])
+
+
+# 전역 점수 엔진 인스턴스
+site_scorer = SiteScorer()
@@ -0,0 +1,126 @@
+"""
+인구 요약 스냅샷 메모리 캐시
+
+population_summary_snapshot 한 행(응답 본문 JSON)을 읽어 인코딩된 본문과
+캐시 검증 헤더(ETag, Last-Modified)를 미리 만들어 둡니다.
+/population/summary 는 요청마다 집계하지 않고 이 값을 그대로 응답합니다.
+- ETag: 스냅샷 버전(최신 reference_date) + 본문 CRC32 (같은 월 재적재로 내용만 바뀐 경우도 구분)
+- Last-Modified: 스냅샷 재계산 시각
+- 인구 데이터 적재 알림(population_data_changed)마다 다시 읽음
+"""
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, Mapping, Optional
+import asyncio
+import logging
+import zlib
+
+import orjson
+
+from ..database import DatabasePool, db_pool
+from ..database.population_summary import SNAPSHOT_QUERY, rebuild_population_summary
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class SummarySnapshot:
+    """인코딩된 /summary 응답 본문 + 캐시 검증 헤더"""
+
+    version: Optional[date]
+    body: bytes
+    built_at: datetime
+    headers: Dict[str, str] = field(default_factory=dict)
+
+    @classmethod
+    def create(cls, version: Optional[date], payload: str, built_at: datetime) -> "SummarySnapshot":
+        # json_build_object 출력의 공백 제거 (키 순서 유지)
+        body = orjson.dumps(orjson.loads(payload))
+        built_at = built_at.replace(microsecond=0)
+        tag = version.strftime("%Y%m%d") if version else "empty"
+        headers = {
+            "ETag": f'"population-summary-{tag}-{zlib.crc32(body):08x}"',
+            "Last-Modified": format_datetime(built_at, usegmt=True),
+            "Cache-Control": "no-cache",
+        }
+        return cls(version, body, built_at, headers)
+
+    def is_fresh_for(self, request_headers: Mapping[str, str]) -> bool:
+        """조건부 요청(If-None-Match / If-Modified-Since)이 현재 스냅샷과 일치하면 True (→ 304)"""
+        if_none_match = request_headers.get("if-none-match")
+        if if_none_match is not None:
+            tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+            return "*" in tags or self.headers["ETag"] in tags
+
+        if_modified_since = request_headers.get("if-modified-since")
+        if if_modified_since:
+            try:
+                return parsedate_to_datetime(if_modified_since) >= self.built_at
+            except (TypeError, ValueError):
+                return False
+        return False
+
+
+class PopulationSummaryCache:
+    """
+    인구 요약 스냅샷 보관소
+
+    사용법:
+        await population_summary.refresh()
+        snapshot = population_summary.snapshot
+        Response(snapshot.body, media_type="application/json", headers=snapshot.headers)
+    """
+
+    def __init__(self, pool: DatabasePool = db_pool):
+        self.pool = pool
+        self._snapshot: Optional[SummarySnapshot] = None
+        self._refresh_lock = asyncio.Lock()
+        self._pending: Optional[asyncio.Task] = None
+        # 진행 중인 갱신이 이미 읽은 뒤에 온 알림 (끝나면 한 번 더 갱신)
+        self._dirty = False
+
+    @property
+    def is_ready(self) -> bool:
+        """조회 가능 여부"""
+        return self._snapshot is not None
+
+    @property
+    def snapshot(self) -> Optional[SummarySnapshot]:
+        return self._snapshot
+
+    def load(self, version: Optional[date], payload: str, built_at: datetime) -> None:
+        """스냅샷 행으로 교체 (테스트/오프라인 적재용)"""
+        self._snapshot = SummarySnapshot.create(version, payload, built_at)
+
+    async def refresh(self) -> None:
+        """스냅샷 행을 읽어 교체 (행이 없으면 한 번 계산)"""
+        async with self._refresh_lock:
+            async with self.pool.acquire() as conn:
+                row = await conn.fetchrow(SNAPSHOT_QUERY)
+                if row is None:
+                    await rebuild_population_summary(conn)
+                    row = await conn.fetchrow(SNAPSHOT_QUERY)
+
+            self.load(row["version"], row["payload"], row["built_at"])
+            logger.info(f"Population summary snapshot loaded: version {row['version']}")
+
+    def schedule_refresh(self) -> None:
+        """백그라운드 갱신 예약 (인구 데이터 적재 알림 콜백, 진행 중이면 끝난 뒤 한 번 더)"""
+        self._dirty = True
+        if self._pending is not None and not self._pending.done():
+            return
+        self._pending = asyncio.get_running_loop().create_task(self._refresh_logged())
+
+    async def _refresh_logged(self) -> None:
+        # 갱신 중에 알림이 오면 (읽은 데이터가 이미 낡았을 수 있으므로) 다시 갱신
+        while self._dirty:
+            self._dirty = False
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.warning(f"Population summary snapshot reload failed: {str(e)}")
+
+
+# 전역 스냅샷 인스턴스
+population_summary = PopulationSummaryCache()
@@ -0,0 +1,50 @@
+"""
+Infrastructure Spatial
+"""
+from .geo import (
+    EARTH_RADIUS_KM,
+    haversine_km,
+    haversine_pairwise_km,
+    bounding_box,
+    unit_vector,
+    chord_for_km,
+    km_for_chord,
+    circle_overlap_km2,
+)
+from .store_index import (
+    GridSnapshot,
+    RadiusProbe,
+    ProbeResult,
+    StoreSpatialIndex,
+    store_index,
+)
+from .density import (
+    DensityGrid,
+    DensityTile,
+    MarkerTile,
+    StoreDensityTiles,
+    density_tiles,
+    tiles_for_bbox,
+)
+
+__all__ = [
+    "EARTH_RADIUS_KM",
+    "haversine_km",
+    "haversine_pairwise_km",
+    "bounding_box",
+    "unit_vector",
+    "chord_for_km",
+    "km_for_chord",
+    "circle_overlap_km2",
+    "GridSnapshot",
+    "RadiusProbe",
+    "ProbeResult",
+    "StoreSpatialIndex",
+    "store_index",
+    "DensityGrid",
+    "DensityTile",
+    "MarkerTile",
+    "StoreDensityTiles",
+    "density_tiles",
+    "tiles_for_bbox",
+]
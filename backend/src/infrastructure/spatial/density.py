@@ -0,0 +1,593 @@
+"""
+상가 밀도 히트맵 타일 (다중 해상도 격자)
+
+공간 인덱스 스냅샷의 영업 상가를 웹 메르카토르 타일 좌표(최대 줌 24)의 모튼(quadkey) 순서로 정렬해 둡니다.
+- 모든 줌의 타일/셀은 모튼 키의 접두사이므로 정렬 배열의 연속 구간 → 어떤 해상도든 searchsorted 두 번으로 잘라냄
+- 타일 응답: 타일을 2^detail x 2^detail 셀로 나눈 셀별 건수 (선택적으로 업종코드별 건수)
+- 마커 클러스터: 같은 셀 분할의 셀별 무게중심/건수/최다 업종, 임계 줌 이상에서는 개별 상가
+- 타일 결과는 LRU 캐시, 스냅샷이 바뀌면(동기화 후 재구축) 내용이 달라진 줌 12 타일에 걸친 캐시만 제거
+"""
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+import asyncio
+import hashlib
+import logging
+import math
+import time
+
+import numpy as np
+
+from src.config.settings import settings
+from .store_index import GridSnapshot, StoreSpatialIndex, store_index
+
+logger = logging.getLogger(__name__)
+
+MAX_ZOOM = 24            # 모튼 키 해상도 (타일 좌표 24비트 x 2 = 48비트)
+DIRTY_ZOOM = 12          # 스냅샷 간 변경 감지 단위 (서울 위도에서 약 7.7km)
+MAX_LATITUDE = 85.05112878
+
+_MASKS = (
+    (16, 0x0000FFFF0000FFFF),
+    (8, 0x00FF00FF00FF00FF),
+    (4, 0x0F0F0F0F0F0F0F0F),
+    (2, 0x3333333333333333),
+    (1, 0x5555555555555555),
+)
+
+
+def lonlat_to_tile_xy(
+    lats: np.ndarray, lons: np.ndarray, zoom: int = MAX_ZOOM
+) -> Tuple[np.ndarray, np.ndarray]:
+    """위경도 배열 → 웹 메르카토르 타일 좌표 (int64)"""
+    n = 1 << zoom
+    lat_rad = np.radians(np.clip(np.asarray(lats, dtype=np.float64), -MAX_LATITUDE, MAX_LATITUDE))
+    x = (np.asarray(lons, dtype=np.float64) + 180.0) / 360.0 * n
+    y = (1.0 - np.log(np.tan(lat_rad) + 1.0 / np.cos(lat_rad)) / math.pi) / 2.0 * n
+    return (
+        np.clip(np.floor(x), 0, n - 1).astype(np.int64),
+        np.clip(np.floor(y), 0, n - 1).astype(np.int64),
+    )
+
+
+def tile_bounds(zoom: int, x: float, y: float) -> Tuple[float, float, float, float]:
+    """타일 (zoom, x, y) → (min_lat, min_lon, max_lat, max_lon) - 실수 좌표면 타일 내부 지점"""
+    n = 1 << zoom
+
+    def lat(row: float) -> float:
+        return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * row / n))))
+
+    return lat(y + 1), x / n * 360.0 - 180.0, lat(y), (x + 1) / n * 360.0 - 180.0
+
+
+def tiles_for_bbox(
+    min_lat: float, min_lon: float, max_lat: float, max_lon: float, zoom: int,
+    max_tiles: Optional[int] = None
+) -> List[Tuple[int, int]]:
+    """바운딩 박스를 덮는 타일 (x, y) 목록 - max_tiles를 넘으면 목록을 만들기 전에 ValueError"""
+    xs, ys = lonlat_to_tile_xy(np.array([max_lat, min_lat]), np.array([min_lon, max_lon]), zoom)
+    count = (int(xs[1]) - int(xs[0]) + 1) * (int(ys[1]) - int(ys[0]) + 1)
+    if max_tiles is not None and count > max_tiles:
+        raise ValueError(f"Bounding box covers {count} tiles at zoom {zoom} (max {max_tiles})")
+    return [
+        (x, y)
+        for y in range(int(ys[0]), int(ys[1]) + 1)
+        for x in range(int(xs[0]), int(xs[1]) + 1)
+    ]
+
+
+def morton_encode(xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+    """타일 좌표 → 모튼 키 (x는 짝수 비트, y는 홀수 비트)"""
+
+    def spread(v: np.ndarray) -> np.ndarray:
+        v = v.astype(np.uint64)
+        for shift, mask in _MASKS:
+            v = (v | (v << np.uint64(shift))) & np.uint64(mask)
+        return v
+
+    return (spread(xs) | (spread(ys) << np.uint64(1))).astype(np.int64)
+
+
+def _tile_key_range(zoom: int, x: int, y: int) -> Tuple[int, int]:
+    """줌 zoom 타일이 차지하는 최대 줌 모튼 키 구간 [start, end)"""
+    prefix = int(morton_encode(np.array([x]), np.array([y]))[0])
+    shift = 2 * (MAX_ZOOM - zoom)
+    return prefix << shift, (prefix + 1) << shift
+
+
+def _string_hashes(values: Sequence[str]) -> np.ndarray:
+    """사전 문자열의 스냅샷 간 안정적인 64비트 해시"""
+    return np.array(
+        [int.from_bytes(hashlib.blake2b(v.encode("utf-8"), digest_size=8).digest(), "little") for v in values],
+        dtype=np.uint64,
+    )
+
+
+@dataclass(frozen=True)
+class DensityTile:
+    """한 타일의 셀별 상가 수"""
+
+    zoom: int
+    x: int
+    y: int
+    cell_zoom: int
+    cell_x: np.ndarray                          # int64 전역 셀 좌표 (cell_zoom 기준)
+    cell_y: np.ndarray
+    counts: np.ndarray                          # int64
+    by_code: Optional[List[Dict[str, int]]] = None
+
+    @property
+    def total(self) -> int:
+        return int(self.counts.sum())
+
+    def to_dict(self) -> Dict[str, Any]:
+        min_lat, min_lon, max_lat, max_lon = tile_bounds(self.zoom, self.x, self.y)
+        return {
+            "zoom": self.zoom,
+            "x": self.x,
+            "y": self.y,
+            "cell_zoom": self.cell_zoom,
+            "bounds": {"min_lat": min_lat, "min_lon": min_lon, "max_lat": max_lat, "max_lon": max_lon},
+            "total_count": self.total,
+            "cells": self.cells(),
+        }
+
+    def cells(self) -> List[Dict[str, Any]]:
+        """셀 목록 (셀 중심 위경도 포함)"""
+        cells = []
+        for i, (cx, cy, count) in enumerate(zip(self.cell_x.tolist(), self.cell_y.tolist(), self.counts.tolist())):
+            min_lat, min_lon, max_lat, max_lon = tile_bounds(self.cell_zoom, cx, cy)
+            cell = {
+                "x": cx,
+                "y": cy,
+                "latitude": round((min_lat + max_lat) / 2, 6),
+                "longitude": round((min_lon + max_lon) / 2, 6),
+                "count": count,
+            }
+            if self.by_code is not None:
+                cell["by_code"] = self.by_code[i]
+            cells.append(cell)
+        return cells
+
+
+@dataclass(frozen=True)
+class MarkerTile:
+    """한 타일의 마커 (클러스터 + 개별 상가)"""
+
+    zoom: int
+    x: int
+    y: int
+    counts: np.ndarray              # int64 클러스터별 상가 수 (2건 이상)
+    latitudes: np.ndarray           # float64 클러스터 무게중심
+    longitudes: np.ndarray
+    dominant_codes: np.ndarray      # int32 클러스터 최다 업종코드 id
+    dominant_counts: np.ndarray     # int64 최다 업종 상가 수
+    store_positions: np.ndarray     # int64 개별 상가의 격자 인덱스
+    grid: "DensityGrid"
+
+    @property
+    def total(self) -> int:
+        return int(self.counts.sum()) + int(self.store_positions.shape[0])
+
+    def clusters(self) -> List[Dict[str, Any]]:
+        grid = self.grid
+        return [
+            {
+                "latitude": round(lat, 6),
+                "longitude": round(lon, 6),
+                "count": count,
+                "dominant_business_code": grid.codes[code],
+                "dominant_business_name": grid.code_names[code],
+                "dominant_share": round(dominant / count, 3),
+            }
+            for lat, lon, count, code, dominant in zip(
+                self.latitudes.tolist(),
+                self.longitudes.tolist(),
+                self.counts.tolist(),
+                self.dominant_codes.tolist(),
+                self.dominant_counts.tolist(),
+            )
+        ]
+
+    def stores(self) -> List[Dict[str, Any]]:
+        grid, pos = self.grid, self.store_positions
+        return [
+            {
+                "id": store_id,
+                "latitude": lat,
+                "longitude": lon,
+                "business_code": grid.codes[code],
+                "business_name": grid.names[name],
+            }
+            for store_id, lat, lon, code, name in zip(
+                grid.ids[pos].tolist(),
+                grid.lats[pos].tolist(),
+                grid.lons[pos].tolist(),
+                grid.code_ids[pos].tolist(),
+                grid.name_ids[pos].tolist(),
+            )
+        ]
+
+
+@dataclass(frozen=True)
+class DensityGrid:
+    """모튼 키 순으로 정렬된 상가 좌표 (모든 배열 길이 동일)"""
+
+    keys: np.ndarray         # int64 최대 줌 모튼 키 (오름차순)
+    xs: np.ndarray           # int64 최대 줌 타일 좌표
+    ys: np.ndarray
+    ids: np.ndarray          # int64 business_stores.id
+    lats: np.ndarray         # float64
+    lons: np.ndarray         # float64
+    code_ids: np.ndarray     # int32 -> codes
+    name_ids: np.ndarray     # int32 -> names
+    codes: Tuple[str, ...]
+    names: Tuple[str, ...]
+    code_names: Tuple[str, ...]  # 업종코드 id -> 대표 업종명
+    dirty_keys: np.ndarray   # int64 DIRTY_ZOOM 타일 모튼 키 (상가가 있는 타일만)
+    digests: np.ndarray      # uint64 타일별 내용 지문
+
+    @property
+    def size(self) -> int:
+        return int(self.keys.shape[0])
+
+    @classmethod
+    def from_snapshot(cls, snap: GridSnapshot) -> "DensityGrid":
+        xs, ys = lonlat_to_tile_xy(snap.lats, snap.lons)
+        keys = morton_encode(xs, ys)
+        order = np.argsort(keys, kind="stable")
+        keys, xs, ys = keys[order], xs[order], ys[order]
+        code_ids, name_ids = snap.code_ids[order], snap.name_ids[order]
+        first = np.full(len(snap.codes), -1, dtype=np.int64)
+        first[code_ids[::-1]] = np.arange(code_ids.shape[0] - 1, -1, -1)
+
+        # 상가별 (id, 위치, 업종) 지문을 DIRTY_ZOOM 타일별로 합산 (uint64 덧셈은 순서 무관)
+        with np.errstate(over="ignore"):
+            mixed = (
+                snap.ids[order].astype(np.uint64) * np.uint64(0x9E3779B97F4A7C15)
+                ^ keys.astype(np.uint64) * np.uint64(0xBF58476D1CE4E5B9)
+                ^ _string_hashes(snap.codes)[code_ids]
+                ^ (_string_hashes(snap.names)[name_ids] >> np.uint64(1))
+            )
+            mixed ^= mixed >> np.uint64(31)
+            mixed *= np.uint64(0x94D049BB133111EB)
+            tile_keys = keys >> (2 * (MAX_ZOOM - DIRTY_ZOOM))
+            starts = np.flatnonzero(np.r_[True, tile_keys[1:] != tile_keys[:-1]]) if keys.size else np.empty(0, dtype=np.int64)
+            digests = np.add.reduceat(mixed, starts) if keys.size else np.empty(0, dtype=np.uint64)
+
+        return cls(
+            keys=keys,
+            xs=xs,
+            ys=ys,
+            ids=snap.ids[order],
+            lats=snap.lats[order],
+            lons=snap.lons[order],
+            code_ids=code_ids,
+            name_ids=name_ids,
+            codes=snap.codes,
+            names=snap.names,
+            code_names=tuple(snap.names[name_ids[i]] if i >= 0 else "" for i in first.tolist()),
+            dirty_keys=tile_keys[starts] if keys.size else np.empty(0, dtype=np.int64),
+            digests=digests,
+        )
+
+    def changed_tiles(self, previous: "DensityGrid") -> np.ndarray:
+        """previous 대비 내용이 달라진 DIRTY_ZOOM 타일 모튼 키 (오름차순)"""
+        all_keys = np.union1d(self.dirty_keys, previous.dirty_keys)
+        return all_keys[_digests_at(self, all_keys) != _digests_at(previous, all_keys)]
+
+    def tile(
+        self,
+        zoom: int,
+        x: int,
+        y: int,
+        detail: int,
+        code_ids: Optional[np.ndarray] = None,
+        name_ids: Optional[np.ndarray] = None,
+        by_code: bool = False,
+    ) -> DensityTile:
+        """
+        타일 셀별 상가 수
+
+        Args:
+            detail: 타일 한 변의 셀 분할 수 = 2^detail
+            code_ids / name_ids: 업종코드 id / 업종명 id 필터
+        """
+        cell_zoom = zoom + detail
+        if cell_zoom > MAX_ZOOM:
+            raise ValueError(f"zoom + detail must be <= {MAX_ZOOM}")
+
+        members = self.members(zoom, x, y, code_ids, name_ids)
+        cells, inverse, counts, side = self._cells(members, zoom, x, y, detail)
+        cid = self.code_ids[members]
+
+        breakdown = None
+        if by_code:
+            pairs, pair_counts = np.unique(
+                inverse.astype(np.int64) * len(self.codes) + cid, return_counts=True
+            )
+            breakdown = [{} for _ in range(cells.shape[0])]
+            for pair, count in zip(pairs.tolist(), pair_counts.tolist()):
+                breakdown[pair // len(self.codes)][self.codes[pair % len(self.codes)]] = count
+
+        return DensityTile(
+            zoom=zoom,
+            x=x,
+            y=y,
+            cell_zoom=cell_zoom,
+            cell_x=(x << detail) + cells % side,
+            cell_y=(y << detail) + cells // side,
+            counts=counts.astype(np.int64),
+            by_code=breakdown,
+        )
+
+    def clusters(
+        self,
+        zoom: int,
+        x: int,
+        y: int,
+        detail: int,
+        code_ids: Optional[np.ndarray] = None,
+        name_ids: Optional[np.ndarray] = None,
+    ) -> "MarkerTile":
+        """
+        타일 마커 클러스터 (2^detail x 2^detail 격자 셀 = 클러스터)
+
+        셀마다 상가 수, 무게중심, 최다 업종코드를 계산하며 1건짜리 셀은 개별 상가로 돌려줌
+        """
+        members = self.members(zoom, x, y, code_ids, name_ids)
+        cells, inverse, counts, _ = self._cells(members, zoom, x, y, min(detail, MAX_ZOOM - zoom))
+        single = counts == 1
+
+        lats, lons = self.lats[members], self.lons[members]
+        centroid_lat = np.bincount(inverse, weights=lats, minlength=cells.shape[0]) / counts
+        centroid_lon = np.bincount(inverse, weights=lons, minlength=cells.shape[0]) / counts
+
+        # 셀별 최다 업종: (셀, 업종) 쌍 건수를 셀 → 건수 순으로 정렬해 셀마다 마지막 쌍 선택
+        n_codes = max(len(self.codes), 1)
+        pairs, pair_counts = np.unique(
+            inverse.astype(np.int64) * n_codes + self.code_ids[members], return_counts=True
+        )
+        pair_cells = pairs // n_codes
+        order = np.lexsort((-(pairs % n_codes), pair_counts, pair_cells))
+        last = order[np.r_[pair_cells[order][1:] != pair_cells[order][:-1], True]]
+
+        single_members = members[single[inverse]]
+        return MarkerTile(
+            zoom=zoom,
+            x=x,
+            y=y,
+            counts=counts[~single].astype(np.int64),
+            latitudes=centroid_lat[~single],
+            longitudes=centroid_lon[~single],
+            dominant_codes=(pairs[last] % n_codes)[~single].astype(np.int32),
+            dominant_counts=pair_counts[last][~single].astype(np.int64),
+            store_positions=single_members,
+            grid=self,
+        )
+
+    def stores(
+        self,
+        zoom: int,
+        x: int,
+        y: int,
+        code_ids: Optional[np.ndarray] = None,
+        name_ids: Optional[np.ndarray] = None,
+    ) -> "MarkerTile":
+        """타일의 개별 상가 마커 (클러스터 없음)"""
+        empty = np.empty(0, dtype=np.int64)
+        return MarkerTile(
+            zoom=zoom,
+            x=x,
+            y=y,
+            counts=empty,
+            latitudes=np.empty(0),
+            longitudes=np.empty(0),
+            dominant_codes=np.empty(0, dtype=np.int32),
+            dominant_counts=empty,
+            store_positions=self.members(zoom, x, y, code_ids, name_ids),
+            grid=self,
+        )
+
+    def members(
+        self,
+        zoom: int,
+        x: int,
+        y: int,
+        code_ids: Optional[np.ndarray] = None,
+        name_ids: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """타일에 속한(필터 통과) 상가의 격자 인덱스 (모튼 키 순)"""
+        start, end = _tile_key_range(zoom, x, y)
+        lo, hi = np.searchsorted(self.keys, [start, end], side="left")
+        members = np.arange(lo, hi, dtype=np.int64)
+        if code_ids is not None:
+            members = members[np.isin(self.code_ids[lo:hi], code_ids)]
+        elif name_ids is not None:
+            members = members[np.isin(self.name_ids[lo:hi], name_ids)]
+        return members
+
+    def _cells(
+        self, members: np.ndarray, zoom: int, x: int, y: int, detail: int
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, int]:
+        """상가 → 타일 내 셀 번호 (cells, inverse, counts, 한 변 셀 수)"""
+        shift = MAX_ZOOM - zoom - detail
+        side = 1 << detail
+        local = (
+            ((self.ys[members] >> shift) - (y << detail)) * side
+            + ((self.xs[members] >> shift) - (x << detail))
+        )
+        cells, inverse, counts = np.unique(local, return_inverse=True, return_counts=True)
+        return cells, inverse.reshape(-1), counts, side
+
+
+def _digests_at(grid: DensityGrid, keys: np.ndarray) -> np.ndarray:
+    """타일 키별 지문 (상가가 없는 타일은 0)"""
+    pos = np.searchsorted(grid.dirty_keys, keys)
+    found = pos < grid.dirty_keys.shape[0]
+    found[found] = grid.dirty_keys[pos[found]] == keys[found]
+    out = np.zeros(keys.shape[0], dtype=np.uint64)
+    out[found] = grid.digests[pos[found]]
+    return out
+
+
+def tile_overlaps(zoom: int, x: int, y: int, dirty: np.ndarray) -> bool:
+    """타일이 DIRTY_ZOOM 변경 타일 목록과 겹치는지"""
+    if dirty.size == 0:
+        return False
+    if zoom >= DIRTY_ZOOM:
+        start, _ = _tile_key_range(zoom, x, y)
+        ancestor = start >> (2 * (MAX_ZOOM - DIRTY_ZOOM))
+        start, end = ancestor, ancestor + 1
+    else:
+        start, end = _tile_key_range(zoom, x, y)
+        shift = 2 * (MAX_ZOOM - DIRTY_ZOOM)
+        start, end = start >> shift, end >> shift
+    lo = np.searchsorted(dirty, start, side="left")
+    return bool(lo < dirty.shape[0] and dirty[lo] < end)
+
+
+class StoreDensityTiles:
+    """
+    상가 밀도/마커 타일 서비스 (공간 인덱스 스냅샷 기반, 타일 LRU 캐시)
+
+    사용법:
+        tile = await density_tiles.tile(14, 13971, 6346, business_codes=["Q12"])
+        tile.to_dict()
+        markers = await density_tiles.markers(14, 13971, 6346)
+        markers.clusters(), markers.stores()
+    """
+
+    def __init__(
+        self,
+        index: StoreSpatialIndex = store_index,
+        detail: Optional[int] = None,
+        cache_size: Optional[int] = None,
+        cluster_detail: Optional[int] = None,
+        cluster_max_zoom: Optional[int] = None,
+    ):
+        self.index = index
+        self.detail = detail if detail is not None else settings.density_tile_detail
+        self.cache_size = cache_size if cache_size is not None else settings.density_tile_cache_size
+        self.cluster_detail = cluster_detail if cluster_detail is not None else settings.marker_cluster_detail
+        self.cluster_max_zoom = cluster_max_zoom if cluster_max_zoom is not None else settings.marker_cluster_max_zoom
+        self._grid: Optional[DensityGrid] = None
+        self._source: Optional[GridSnapshot] = None
+        self._cache: "OrderedDict[Tuple[Hashable, ...], DensityTile]" = OrderedDict()
+        self._lock = asyncio.Lock()
+
+    @property
+    def is_ready(self) -> bool:
+        return self.index.is_ready
+
+    async def grid(self) -> DensityGrid:
+        """현재 공간 인덱스 스냅샷의 격자 (스냅샷이 바뀌었으면 재구축)"""
+        snap = self.index.snapshot
+        if snap is None:
+            raise RuntimeError("Store spatial index is not built")
+        if snap is not self._source:
+            async with self._lock:
+                if snap is not self._source:
+                    grid = await asyncio.to_thread(DensityGrid.from_snapshot, snap)
+                    self._swap(snap, grid)
+        return self._grid
+
+    def load(self, snap: GridSnapshot) -> DensityGrid:
+        """동기 재구축 (테스트/오프라인용)"""
+        grid = DensityGrid.from_snapshot(snap)
+        self._swap(snap, grid)
+        return grid
+
+    def _swap(self, snap: GridSnapshot, grid: DensityGrid) -> None:
+        """격자 교체 후 내용이 바뀐 영역의 캐시 타일만 제거"""
+        started = time.perf_counter()
+        previous = self._grid
+        if previous is None:
+            self._cache.clear()
+        else:
+            dirty = grid.changed_tiles(previous)
+            for key in [k for k in self._cache if tile_overlaps(k[0], k[1], k[2], dirty)]:
+                del self._cache[key]
+        self._grid, self._source = grid, snap
+        logger.info(
+            f"Store density grid built: {grid.size} stores, "
+            f"{len(self._cache)} cached tiles kept in {time.perf_counter() - started:.3f}s"
+        )
+
+    async def tile(
+        self,
+        zoom: int,
+        x: int,
+        y: int,
+        detail: Optional[int] = None,
+        business_codes: Optional[Sequence[str]] = None,
+        business_type: Optional[str] = None,
+        by_code: bool = False,
+    ) -> DensityTile:
+        """
+        밀도 타일 조회 (캐시)
+
+        business_codes가 주어지면 업종코드로, 아니면 business_type 업종명 부분 일치로 거름
+        """
+        grid = await self.grid()
+        detail = detail if detail is not None else self.detail
+        key = (zoom, x, y, "density", detail, _filter_key(business_codes, business_type), by_code)
+        return self._cached(key, lambda: grid.tile(
+            zoom, x, y, detail, *_filter_ids(grid, business_codes, business_type), by_code=by_code
+        ))
+
+    async def markers(
+        self,
+        zoom: int,
+        x: int,
+        y: int,
+        business_codes: Optional[Sequence[str]] = None,
+        business_type: Optional[str] = None,
+    ) -> MarkerTile:
+        """
+        마커 타일 조회 (캐시)
+
+        cluster_max_zoom 미만은 격자 클러스터, 이상은 개별 상가
+        """
+        grid = await self.grid()
+        key = (zoom, x, y, "markers", _filter_key(business_codes, business_type))
+        filters = _filter_ids(grid, business_codes, business_type)
+        if zoom >= self.cluster_max_zoom:
+            return self._cached(key, lambda: grid.stores(zoom, x, y, *filters))
+        return self._cached(key, lambda: grid.clusters(zoom, x, y, self.cluster_detail, *filters))
+
+    def _cached(self, key: Tuple[Hashable, ...], compute: Callable[[], Any]) -> Any:
+        """(zoom, x, y, ...) 키 LRU 캐시"""
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            return cached
+
+        result = compute()
+        self._cache[key] = result
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return result
+
+
+def _filter_key(business_codes: Optional[Sequence[str]], business_type: Optional[str]) -> Hashable:
+    if business_codes is not None:
+        return ("codes", tuple(sorted(business_codes)))
+    return ("name", business_type or None)
+
+
+def _filter_ids(
+    grid: DensityGrid, business_codes: Optional[Sequence[str]], business_type: Optional[str]
+) -> Tuple[Optional[np.ndarray], Optional[np.ndarray]]:
+    """업종 필터 → (업종코드 id 배열, 업종명 id 배열)"""
+    if business_codes is not None:
+        wanted = set(business_codes)
+        return np.array([i for i, c in enumerate(grid.codes) if c in wanted], dtype=np.int32), None
+    if business_type:
+        needle = business_type.lower()
+        return None, np.array([i for i, n in enumerate(grid.names) if needle in n.lower()], dtype=np.int32)
+    return None, None
+
+
+# 전역 밀도 타일 인스턴스
+density_tiles = StoreDensityTiles()
@@ -0,0 +1,95 @@
+"""
+구면 거리 계산 유틸리티
+
+- Haversine 거리 (NumPy 벡터화)
+- 반경 검색용 위경도 바운딩 박스
+- 단위 벡터(x, y, z) 현(chord) 거리 <-> 대원 거리 변환
+  (business_stores.unit_x/unit_y/unit_z 생성 컬럼과 같은 정의)
+- 두 원의 겹친 면적 (상권 반경 인구 면적 가중)
+"""
+from typing import Tuple
+import math
+
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE = EARTH_RADIUS_KM * math.pi / 180.0
+
+
+def haversine_km(
+    lat: float, lon: float, lats: np.ndarray, lons: np.ndarray
+) -> np.ndarray:
+    """한 점과 좌표 배열 사이의 Haversine 거리 (km)"""
+    lat1 = math.radians(lat)
+    lat2 = np.radians(lats)
+    dlat = lat2 - lat1
+    dlon = np.radians(lons) - math.radians(lon)
+    a = np.sin(dlat / 2.0) ** 2 + math.cos(lat1) * np.cos(lat2) * np.sin(dlon / 2.0) ** 2
+    return 2.0 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+def haversine_pairwise_km(
+    lats1: np.ndarray, lons1: np.ndarray, lats2: np.ndarray, lons2: np.ndarray
+) -> np.ndarray:
+    """같은 길이의 좌표 배열 쌍 사이 Haversine 거리 (km)"""
+    lat1 = np.radians(lats1)
+    lat2 = np.radians(lats2)
+    dlat = lat2 - lat1
+    dlon = np.radians(lons2) - np.radians(lons1)
+    a = np.sin(dlat / 2.0) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon / 2.0) ** 2
+    return 2.0 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+def bounding_box(
+    latitude: float, longitude: float, radius_km: float
+) -> Tuple[float, float, float, float]:
+    """
+    반경 원을 완전히 포함하는 바운딩 박스
+
+    Returns:
+        (min_lat, min_lon, max_lat, max_lon)
+    """
+    dlat = radius_km / KM_PER_DEGREE
+    # 위도가 높을수록 경도 1°가 짧아지므로 밴드의 고위도 쪽 기준
+    edge_lat = min(abs(latitude) + dlat, 89.9)
+    dlon = radius_km / (KM_PER_DEGREE * math.cos(math.radians(edge_lat)))
+    return latitude - dlat, longitude - dlon, latitude + dlat, longitude + dlon
+
+
+def unit_vector(latitude: float, longitude: float) -> Tuple[float, float, float]:
+    """위경도를 단위 구 위의 (x, y, z)로 변환"""
+    lat = math.radians(latitude)
+    lon = math.radians(longitude)
+    return math.cos(lat) * math.cos(lon), math.cos(lat) * math.sin(lon), math.sin(lat)
+
+
+def chord_for_km(distance_km: float) -> float:
+    """대원 거리(km)에 해당하는 단위 구 현의 길이"""
+    return 2.0 * math.sin(min(distance_km / (2.0 * EARTH_RADIUS_KM), math.pi / 2))
+
+
+def km_for_chord(chord: float) -> float:
+    """단위 구 현의 길이에 해당하는 대원 거리(km)"""
+    return 2.0 * EARTH_RADIUS_KM * math.asin(min(chord / 2.0, 1.0))
+
+
+def circle_overlap_km2(distances_km: np.ndarray, radius_km: float, radii_km: np.ndarray) -> np.ndarray:
+    """
+    반경 radius_km 원과 중심 거리 distances_km, 반경 radii_km 원들의 겹친 면적 (km², 평면 근사)
+
+    수십 km 이내에서는 구면 곡률 오차가 무시할 만하므로 평면 두 원의 렌즈 면적을 사용합니다.
+    """
+    d = np.asarray(distances_km, dtype=np.float64)
+    r = np.asarray(radii_km, dtype=np.float64)
+    R = float(radius_km)
+
+    inside = d <= np.abs(R - r)
+    partial = ~inside & (d < R + r)
+    area = np.where(inside, math.pi * np.minimum(r, R) ** 2, 0.0)
+
+    d, r = d[partial], r[partial]
+    alpha = np.arccos(np.clip((d * d + r * r - R * R) / (2.0 * d * r), -1.0, 1.0))
+    beta = np.arccos(np.clip((d * d + R * R - r * r) / (2.0 * d * R), -1.0, 1.0))
+    kite = np.sqrt(np.maximum((-d + r + R) * (d + r - R) * (d - r + R) * (d + r + R), 0.0))
+    area[partial] = r * r * alpha + R * R * beta - 0.5 * kite
+    return area
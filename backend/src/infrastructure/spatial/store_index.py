@@ -0,0 +1,334 @@
+"""
+영업 중 상가 인메모리 공간 인덱스
+
+/business-stores/nearby 의 전 테이블 Haversine 스캔을 대체합니다.
+- 고정 크기 격자(기본 0.01°, 약 1.1km) 셀 키로 정렬된 NumPy float64 위경도 배열
+- 반경 쿼리: 후보 셀 범위만 searchsorted로 잘라낸 뒤 벡터화된 정확 거리 계산
+- 업종 필터: 해석된 업종코드 또는 업종명 부분 일치(ILIKE '%…%'와 동일 의미)를 사전에서 한 번 계산해 id 집합으로 비교
+- 다중 지점 조회: 모든 지점의 후보를 한 배열로 모아 거리/건수/업종 분포/최근접 k개를 한 번에 계산
+- 재구축은 새 스냅샷을 만든 뒤 참조만 교체 (조회 중인 요청에 영향 없음)
+"""
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+import asyncio
+import logging
+import math
+import time
+
+import numpy as np
+
+from src.config.settings import settings
+from src.infrastructure.database import DatabasePool, db_pool
+from .geo import bounding_box, haversine_km, haversine_pairwise_km
+
+logger = logging.getLogger(__name__)
+
+LOAD_QUERY = """
+    SELECT id, latitude, longitude, business_name, business_code
+    FROM business_stores
+    WHERE business_status = '영업'
+      AND latitude IS NOT NULL AND longitude IS NOT NULL
+"""
+
+
+@dataclass(frozen=True)
+class GridSnapshot:
+    """격자 인덱스 불변 스냅샷 (모든 배열은 셀 키 순으로 정렬)"""
+
+    cell_deg: float
+    origin_lat: float
+    origin_lon: float
+    n_rows: int
+    n_cols: int
+    keys: np.ndarray        # int64 셀 키 (row * n_cols + col)
+    ids: np.ndarray         # int64 business_stores.id
+    lats: np.ndarray        # float64
+    lons: np.ndarray        # float64
+    name_ids: np.ndarray    # int32 -> names
+    code_ids: np.ndarray    # int32 -> codes
+    names: Tuple[str, ...]
+    codes: Tuple[str, ...]
+
+    @property
+    def size(self) -> int:
+        return int(self.ids.shape[0])
+
+    @classmethod
+    def build(
+        cls,
+        rows: Sequence[Tuple[int, float, float, Optional[str], Optional[str]]],
+        cell_deg: float = 0.01,
+    ) -> "GridSnapshot":
+        """(id, latitude, longitude, business_name, business_code) 행으로 스냅샷 생성"""
+        n = len(rows)
+        ids = np.fromiter((r[0] for r in rows), dtype=np.int64, count=n)
+        lats = np.fromiter((r[1] for r in rows), dtype=np.float64, count=n)
+        lons = np.fromiter((r[2] for r in rows), dtype=np.float64, count=n)
+        names, name_ids = _encode((r[3] or "" for r in rows), n)
+        codes, code_ids = _encode((r[4] or "" for r in rows), n)
+
+        if n:
+            origin_lat = math.floor(float(lats.min()) / cell_deg) * cell_deg
+            origin_lon = math.floor(float(lons.min()) / cell_deg) * cell_deg
+        else:
+            origin_lat = origin_lon = 0.0
+
+        row_idx = np.floor((lats - origin_lat) / cell_deg).astype(np.int64)
+        col_idx = np.floor((lons - origin_lon) / cell_deg).astype(np.int64)
+        n_rows = int(row_idx.max()) + 1 if n else 0
+        n_cols = int(col_idx.max()) + 1 if n else 0
+        keys = row_idx * max(n_cols, 1) + col_idx
+
+        order = np.argsort(keys, kind="stable")
+        return cls(
+            cell_deg=cell_deg,
+            origin_lat=origin_lat,
+            origin_lon=origin_lon,
+            n_rows=n_rows,
+            n_cols=n_cols,
+            keys=keys[order],
+            ids=ids[order],
+            lats=lats[order],
+            lons=lons[order],
+            name_ids=name_ids[order],
+            code_ids=code_ids[order],
+            names=names,
+            codes=codes,
+        )
+
+    def bbox_candidates(
+        self, min_lat: float, min_lon: float, max_lat: float, max_lon: float
+    ) -> np.ndarray:
+        """바운딩 박스와 겹치는 셀에 속한 점 인덱스 (셀 단위 가지치기만 수행)"""
+        if self.size == 0:
+            return np.empty(0, dtype=np.int64)
+
+        r0 = max(int(math.floor((min_lat - self.origin_lat) / self.cell_deg)), 0)
+        r1 = min(int(math.floor((max_lat - self.origin_lat) / self.cell_deg)), self.n_rows - 1)
+        c0 = max(int(math.floor((min_lon - self.origin_lon) / self.cell_deg)), 0)
+        c1 = min(int(math.floor((max_lon - self.origin_lon) / self.cell_deg)), self.n_cols - 1)
+        if r0 > r1 or c0 > c1:
+            return np.empty(0, dtype=np.int64)
+
+        # 한 행(row)의 c0..c1 셀은 키 공간에서 연속 구간
+        rows = np.arange(r0, r1 + 1, dtype=np.int64)
+        starts = np.searchsorted(self.keys, rows * self.n_cols + c0, side="left")
+        ends = np.searchsorted(self.keys, rows * self.n_cols + c1, side="right")
+        spans = [np.arange(s, e, dtype=np.int64) for s, e in zip(starts, ends) if e > s]
+        if not spans:
+            return np.empty(0, dtype=np.int64)
+        return np.concatenate(spans)
+
+    def code_ids_for(self, codes: Iterable[str]) -> np.ndarray:
+        """업종코드 목록에 해당하는 업종코드 id 목록"""
+        wanted = set(codes)
+        return np.array([i for i, code in enumerate(self.codes) if code in wanted], dtype=np.int32)
+
+    def name_ids_matching(self, term: str) -> np.ndarray:
+        """업종명에 term이 포함된 업종명 id 목록 (대소문자 무시)"""
+        needle = term.lower()
+        return np.array(
+            [i for i, name in enumerate(self.names) if needle in name.lower()],
+            dtype=np.int32,
+        )
+
+
+@dataclass(frozen=True)
+class RadiusProbe:
+    """다중 지점 조회의 한 지점 (business_codes가 있으면 업종코드, 없으면 업종명 부분 일치 필터)"""
+
+    latitude: float
+    longitude: float
+    radius_km: float
+    business_type: Optional[str] = None
+    business_codes: Optional[Tuple[str, ...]] = None
+
+
+@dataclass(frozen=True)
+class ProbeResult:
+    """지점별 반경 내 상가 집계"""
+
+    total_count: int
+    histogram: Dict[str, int]       # 업종코드 -> 상가 수
+    nearest_ids: np.ndarray         # int64 business_stores.id (거리 오름차순, 최대 k개)
+    nearest_distances: np.ndarray   # float64 km
+
+
+def _encode(values: Iterable[str], n: int) -> Tuple[Tuple[str, ...], np.ndarray]:
+    """문자열 열을 (사전, int32 코드 배열)로 인코딩"""
+    lookup: Dict[str, int] = {}
+    codes = np.empty(n, dtype=np.int32)
+    for i, value in enumerate(values):
+        code = lookup.get(value)
+        if code is None:
+            code = lookup[value] = len(lookup)
+        codes[i] = code
+    return tuple(lookup), codes
+
+
+class StoreSpatialIndex:
+    """
+    영업 중 상가 공간 인덱스
+
+    사용법:
+        await store_index.refresh()
+        ids, distances = store_index.query_radius(37.5, 127.03, 1.0, "카페", limit=100)
+    """
+
+    def __init__(self, pool: DatabasePool = db_pool, cell_deg: Optional[float] = None):
+        self.pool = pool
+        self.cell_deg = cell_deg if cell_deg is not None else settings.spatial_index_cell_deg
+        self._snapshot: Optional[GridSnapshot] = None
+        self._refresh_lock = asyncio.Lock()
+        self.built_at: Optional[float] = None
+
+    @property
+    def is_ready(self) -> bool:
+        """조회 가능 여부"""
+        return self._snapshot is not None
+
+    @property
+    def snapshot(self) -> Optional[GridSnapshot]:
+        return self._snapshot
+
+    def load(self, rows: Sequence[Tuple[int, float, float, Optional[str], Optional[str]]]) -> None:
+        """메모리 상의 행으로 인덱스 교체 (테스트/오프라인 적재용)"""
+        self._snapshot = GridSnapshot.build(rows, self.cell_deg)
+        self.built_at = time.time()
+
+    async def refresh(self) -> None:
+        """business_stores에서 영업 중 상가를 읽어 인덱스 재구축"""
+        async with self._refresh_lock:
+            started = time.perf_counter()
+            async with self.pool.acquire() as conn:
+                rows = await conn.fetch(LOAD_QUERY)
+
+            records = [tuple(r) for r in rows]
+            snapshot = await asyncio.to_thread(GridSnapshot.build, records, self.cell_deg)
+            self._snapshot = snapshot
+            self.built_at = time.time()
+            logger.info(
+                f"Store spatial index built: {snapshot.size} stores, "
+                f"{snapshot.n_rows}x{snapshot.n_cols} cells in {time.perf_counter() - started:.2f}s"
+            )
+
+    def query_radius(
+        self,
+        latitude: float,
+        longitude: float,
+        radius_km: float,
+        business_type: Optional[str] = None,
+        limit: Optional[int] = None,
+        business_codes: Optional[Sequence[str]] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        반경 내 상가 조회
+        
+        business_codes가 주어지면 업종코드로, 아니면 business_type 업종명 부분 일치로 거름
+
+        Returns:
+            (business_stores.id 배열, 거리(km) 배열) - 거리 오름차순
+        """
+        snap = self._snapshot
+        if snap is None:
+            raise RuntimeError("Store spatial index is not built")
+
+        idx, dist = self._radius_hits(snap, latitude, longitude, radius_km, business_type, business_codes)
+
+        if limit is not None and idx.shape[0] > limit:
+            part = np.argpartition(dist, limit - 1)[:limit] if limit > 0 else np.empty(0, dtype=np.int64)
+            idx, dist = idx[part], dist[part]
+        order = np.argsort(dist, kind="stable")
+        return snap.ids[idx[order]], dist[order]
+
+    def _radius_hits(
+        self,
+        snap: GridSnapshot,
+        latitude: float,
+        longitude: float,
+        radius_km: float,
+        business_type: Optional[str],
+        business_codes: Optional[Sequence[str]] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """반경 내 (스냅샷 인덱스, 거리) - 정렬되지 않음"""
+        cand = self._candidates(snap, latitude, longitude, radius_km, business_type, business_codes)
+        if cand.size == 0:
+            return cand, np.empty(0, dtype=np.float64)
+
+        dist = haversine_km(latitude, longitude, snap.lats[cand], snap.lons[cand])
+        within = dist <= radius_km
+        return cand[within], dist[within]
+
+    @staticmethod
+    def _candidates(
+        snap: GridSnapshot,
+        latitude: float,
+        longitude: float,
+        radius_km: float,
+        business_type: Optional[str],
+        business_codes: Optional[Sequence[str]],
+    ) -> np.ndarray:
+        """바운딩 박스 셀 후보 중 업종 필터를 통과한 스냅샷 인덱스"""
+        cand = snap.bbox_candidates(*bounding_box(latitude, longitude, radius_km))
+        if business_codes is not None and cand.size:
+            cand = cand[np.isin(snap.code_ids[cand], snap.code_ids_for(business_codes))]
+        elif business_type and cand.size:
+            cand = cand[np.isin(snap.name_ids[cand], snap.name_ids_matching(business_type))]
+        return cand
+
+    def query_probes(self, probes: Sequence[RadiusProbe], nearest_k: int = 5) -> List[ProbeResult]:
+        """
+        여러 지점 반경 조회를 한 번에 계산
+
+        지점별 후보 셀을 한 배열로 이어 붙여 거리 계산, 건수(bincount), 업종 분포(unique),
+        최근접 k개(지점-거리 lexsort)를 모두 벡터 연산 한 번씩으로 처리합니다.
+        """
+        snap = self._snapshot
+        if snap is None:
+            raise RuntimeError("Store spatial index is not built")
+
+        n = len(probes)
+        parts = [
+            self._candidates(snap, p.latitude, p.longitude, p.radius_km, p.business_type, p.business_codes)
+            for p in probes
+        ]
+        cand = np.concatenate(parts) if parts else np.empty(0, dtype=np.int64)
+        owner = np.repeat(np.arange(n, dtype=np.int64), [part.shape[0] for part in parts])
+
+        p_lats = np.array([p.latitude for p in probes], dtype=np.float64)
+        p_lons = np.array([p.longitude for p in probes], dtype=np.float64)
+        p_radius = np.array([p.radius_km for p in probes], dtype=np.float64)
+        dist = haversine_pairwise_km(p_lats[owner], p_lons[owner], snap.lats[cand], snap.lons[cand])
+        within = dist <= p_radius[owner]
+        cand, owner, dist = cand[within], owner[within], dist[within]
+
+        counts = np.bincount(owner, minlength=n)
+
+        n_codes = max(len(snap.codes), 1)
+        pairs, pair_counts = np.unique(owner * n_codes + snap.code_ids[cand], return_counts=True)
+        histograms: List[Dict[str, int]] = [{} for _ in range(n)]
+        for pair, count in zip(pairs.tolist(), pair_counts.tolist()):
+            histograms[pair // n_codes][snap.codes[pair % n_codes]] = count
+
+        # 지점별 거리 오름차순 정렬 후 지점 내 순위 < k 만 남김
+        order = np.lexsort((dist, owner))
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1])) if n else np.empty(0, dtype=np.int64)
+        rank = np.arange(order.shape[0]) - starts[owner[order]]
+        top = order[rank < nearest_k]
+        top_owner = owner[top]
+        bounds = np.searchsorted(top_owner, np.arange(n + 1))
+        top_ids, top_dist = snap.ids[cand[top]], dist[top]
+
+        return [
+            ProbeResult(
+                total_count=int(counts[i]),
+                histogram=histograms[i],
+                nearest_ids=top_ids[bounds[i]:bounds[i + 1]],
+                nearest_distances=top_dist[bounds[i]:bounds[i + 1]],
+            )
+            for i in range(n)
+        ]
+
+
+# 전역 인덱스 인스턴스
+store_index = StoreSpatialIndex()
@@ -9,6 +9,7 @@ Main FastAPI application module following Clean Architecture principles.
 - Security Headers 미들웨어 추가
 - Structured Logging 적용
 """
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
@@ -21,6 +22,12 @@ from src.config.settings import settings
 from src.infrastructure.middleware.rate_limit import RateLimitMiddleware
 from src.infrastructure.middleware.security_headers import SecurityHeadersMiddleware
 from src.infrastructure.logging import setup_logging
+from src.infrastructure.database import db_pool, region_hierarchy
+from src.infrastructure.spatial import store_index, density_tiles
+from src.infrastructure.population import catchment_estimator, population_cube, population_summary
+from src.infrastructure.api.business_store_client import business_store_api
+from src.infrastructure.mcp import mcp_client
+from src.presentation.api.serialization import FastJSONResponse
 
 # API 라우터 임포트
 from src.presentation.api.v1.auth import router as auth_router
@@ -43,6 +50,80 @@ setup_logging(
 logger = logging.getLogger(__name__)
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    애플리케이션 수명주기 관리
+
+    - 시작: asyncpg 공유 풀 생성 및 워밍업 (DB 미가동 시 첫 요청에서 재시도)
+    - 시작: 상가 공간 인덱스 구축 (실패 시 SQL 반경 검색으로 동작)
+    - 시작: 행정구역 트리 적재 및 인구 데이터 적재 알림 구독 (실패 시 첫 조회에서 적재, TTL로 갱신)
+    - 시작: 인구 큐브 구축, 적재 알림 시 재구축 (실패 시 SQL 집계로 동작), 읍면동 중심점 인덱스 구축
+    - 종료: 풀, 알림 구독, 외부 API 연결 및 MCP 서버 프로세스 정리
+    """
+    try:
+        await db_pool.open()
+    except Exception as e:
+        logger.warning(
+            "Database pool warm-up failed",
+            extra={"error": str(e), "error_type": type(e).__name__}
+        )
+    
+    if settings.spatial_index_enabled and db_pool.is_open:
+        try:
+            await store_index.refresh()
+            await density_tiles.grid()
+        except Exception as e:
+            logger.warning(
+                "Store spatial index build failed",
+                extra={"error": str(e), "error_type": type(e).__name__}
+            )
+
+    if db_pool.is_open:
+        try:
+            await region_hierarchy.refresh()
+            await region_hierarchy.listen()
+        except Exception as e:
+            logger.warning(
+                "Region hierarchy warm-up failed",
+                extra={"error": str(e), "error_type": type(e).__name__}
+            )
+
+    if settings.population_cube_enabled and db_pool.is_open:
+        region_hierarchy.on_change(population_cube.schedule_refresh)
+        try:
+            await population_cube.refresh()
+        except Exception as e:
+            logger.warning(
+                "Population cube build failed",
+                extra={"error": str(e), "error_type": type(e).__name__}
+            )
+        try:
+            await catchment_estimator.refresh(settings.population_centroid_csv)
+        except Exception as e:
+            logger.warning(
+                "Catchment centroid index build failed",
+                extra={"error": str(e), "error_type": type(e).__name__}
+            )
+
+    if settings.population_summary_snapshot_enabled and db_pool.is_open:
+        region_hierarchy.on_change(population_summary.schedule_refresh)
+        try:
+            await population_summary.refresh()
+        except Exception as e:
+            logger.warning(
+                "Population summary snapshot load failed",
+                extra={"error": str(e), "error_type": type(e).__name__}
+            )
+
+    yield
+
+    await region_hierarchy.close()
+    await business_store_api.aclose()
+    await mcp_client.aclose()
+    await db_pool.close()
+
+
 def create_app() -> FastAPI:
     """
     Factory function that creates and configures the FastAPI application.
@@ -56,6 +137,8 @@ def create_app() -> FastAPI:
         version="0.1.0",
         docs_url="/docs" if settings.is_development else None,  # 프로덕션에서 docs 비활성화 (선택적)
         redoc_url="/redoc" if settings.is_development else None,
+        lifespan=lifespan,
+        default_response_class=FastJSONResponse,
     )
     
     # =================================
@@ -228,8 +311,6 @@ def create_app() -> FastAPI:
     @app.get("/api/health")
     async def api_health_check():
         """API 상세 헬스체크"""
-        import asyncpg
-        
         health_status = {
             "status": "healthy",
             "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
@@ -244,11 +325,9 @@ def create_app() -> FastAPI:
         
         # 데이터베이스 연결 확인
         try:
-            # asyncpg 직접 연결로 health check
-            db_url = settings.database_url.replace("postgresql+asyncpg://", "postgresql://")
-            conn = await asyncpg.connect(db_url)
-            await conn.fetchval("SELECT 1")
-            await conn.close()
+            # 공유 풀에서 연결을 빌려 health check
+            async with db_pool.acquire() as conn:
+                await conn.fetchval("SELECT 1")
             health_status["checks"]["database"] = True
             logger.debug("Database health check passed")
         except Exception as e:
@@ -0,0 +1,124 @@
+"""
+대용량 내보내기 스트리밍 유틸리티
+
+- 서버 측 커서(conn.cursor, prefetch 단위 왕복)로 행을 읽는 즉시 NDJSON/CSV로 인코딩해 전송
+- 메모리는 결과 크기와 무관하게 prefetch 한 묶음 분량만 사용
+- 연결은 요청 의존성이 아니라 스트림 생성기 안에서 빌림 (응답 전송이 끝날 때까지 유지, 중단 시 즉시 반납)
+"""
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, AsyncIterator, Optional, Sequence
+import csv
+import io
+import json
+
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+
+from ...config.settings import settings
+from ...infrastructure.database import DatabasePool, db_pool
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson; charset=utf-8",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (bytes, memoryview)):
+        return bytes(value).hex()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _csv_value(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+async def stream_rows(
+    query: str,
+    params: Sequence[Any],
+    columns: Sequence[str],
+    fmt: str,
+    prefetch: Optional[int] = None,
+    pool: DatabasePool = db_pool,
+) -> AsyncIterator[bytes]:
+    """
+    쿼리 결과를 NDJSON 또는 CSV 바이트 조각으로 스트리밍
+
+    Args:
+        columns: 내보낼 컬럼 (쿼리 결과 컬럼명, 순서대로 CSV 헤더)
+        prefetch: 커서 한 번에 가져올 행 수 (= 전송 조각 크기)
+    """
+    prefetch = prefetch or settings.export_prefetch_rows
+    columns = list(columns)
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+
+    if fmt == "csv":
+        # 엑셀에서 한글이 깨지지 않도록 BOM 포함
+        buffer.write("\ufeff")
+        writer.writerow(columns)
+
+    async with pool.acquire() as conn:
+        # 서버 측 커서는 트랜잭션 안에서만 유지됨
+        async with conn.transaction(readonly=True):
+            pending = 0
+            async for row in conn.cursor(query, *params, prefetch=prefetch):
+                if fmt == "csv":
+                    writer.writerow([_csv_value(row[c]) for c in columns])
+                else:
+                    buffer.write(json.dumps(
+                        {c: row[c] for c in columns},
+                        ensure_ascii=False, separators=(",", ":"), default=_json_default
+                    ))
+                    buffer.write("\n")
+                pending += 1
+                if pending >= prefetch:
+                    yield buffer.getvalue().encode("utf-8")
+                    buffer.seek(0)
+                    buffer.truncate()
+                    pending = 0
+
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+async def export_response(
+    query: str,
+    params: Sequence[Any],
+    columns: Sequence[str],
+    fmt: str,
+    filename: str,
+) -> StreamingResponse:
+    """
+    stream_rows를 감싼 다운로드 응답 (fmt: "ndjson" | "csv")
+
+    첫 조각까지는 응답 전에 만들어 두므로 연결/쿼리 오류는 일반 500 응답으로 반환됩니다.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unsupported export format: {fmt}")
+
+    chunks = stream_rows(query, params, columns, fmt)
+    try:
+        first = await chunks.__anext__()
+    except StopAsyncIteration:
+        first = b""
+
+    async def body() -> AsyncIterator[bytes]:
+        yield first
+        async for chunk in chunks:
+            yield chunk
+
+    return StreamingResponse(
+        body(),
+        media_type=EXPORT_FORMATS[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{fmt}"'},
+    )
@@ -0,0 +1,108 @@
+"""
+커서(keyset) 페이지네이션 유틸리티
+
+- 불투명 커서: 마지막 행의 정렬 키를 JSON → base64url로 인코딩
+- 개수 조회: 요청 시에만 COUNT(*), 그 외에는 캐시된 정확값 또는 플래너 추정치
+"""
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import base64
+import json
+import time
+
+import asyncpg
+from fastapi import HTTPException
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """정렬 키 값들을 불투명 커서 문자열로 인코딩"""
+    payload = json.dumps(list(values), ensure_ascii=False, separators=(",", ":"), default=str)
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> List[Any]:
+    """커서를 정렬 키 값 목록으로 디코딩 (형식이 맞지 않으면 400)"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8"))
+    except (ValueError, UnicodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    if not isinstance(values, list) or len(values) != size:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
+
+
+class CountCache:
+    """
+    정확한 COUNT(*) 결과 TTL 캐시
+
+    exact 요청으로 계산된 값을 보관해 두었다가 이후 추정 요청에 재사용합니다.
+    """
+
+    def __init__(self, ttl_seconds: int = 300, max_entries: int = 1024):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: Dict[Tuple[str, Tuple[Any, ...]], Tuple[float, int]] = {}
+
+    @staticmethod
+    def _key(query: str, params: Sequence[Any]) -> Tuple[str, Tuple[Any, ...]]:
+        # 배열 파라미터(= ANY($n))도 키로 쓸 수 있도록 튜플로 변환
+        return query, tuple(tuple(p) if isinstance(p, list) else p for p in params)
+
+    def get(self, query: str, params: Sequence[Any]) -> Optional[int]:
+        key = self._key(query, params)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        stored_at, value = entry
+        if time.time() - stored_at > self.ttl_seconds:
+            self._entries.pop(key, None)
+            return None
+        return value
+
+    def set(self, query: str, params: Sequence[Any], value: int) -> None:
+        if len(self._entries) >= self.max_entries:
+            self._entries.clear()
+        self._entries[self._key(query, params)] = (time.time(), value)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+count_cache = CountCache()
+
+
+async def estimate_row_count(conn: asyncpg.Connection, query: str, params: Sequence[Any]) -> int:
+    """EXPLAIN 플래너 추정 행 수 (쿼리는 실행하지 않음)"""
+    plan = await conn.fetchval(f"EXPLAIN (FORMAT JSON) {query}", *params)
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+async def count_rows(
+    conn: asyncpg.Connection,
+    query: str,
+    params: Sequence[Any],
+    exact: bool = False,
+    cache: CountCache = count_cache,
+) -> Tuple[int, bool]:
+    """
+    필터 쿼리의 전체 행 수
+
+    Args:
+        query: SELECT ... FROM ... WHERE ... (ORDER/LIMIT 없이)
+
+    Returns:
+        (행 수, 정확값 여부)
+    """
+    if exact:
+        value = await conn.fetchval(f"SELECT COUNT(*) FROM ({query}) as counted", *params)
+        cache.set(query, params, value)
+        return value, True
+
+    cached = cache.get(query, params)
+    if cached is not None:
+        return cached, True
+
+    return await estimate_row_count(conn, query, params), False
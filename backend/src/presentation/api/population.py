@@ -1,285 +1,512 @@
-from fastapi import APIRouter, HTTPException, Query
-from typing import Optional, List
+from fastapi import APIRouter, HTTPException, Query, Depends, Request, Response
+from pydantic import BaseModel, Field
+from typing import Optional, List, Tuple
+from datetime import date
+from operator import itemgetter
 import asyncpg
-from ...config.settings import Settings
+from ...config.settings import settings
+from ...infrastructure.database import acquire, db_pool, region_hierarchy
+from ...infrastructure.population import (
+    AGE_BANDS,
+    COUNT_COLUMNS,
+    catchment_estimator,
+    population_cube,
+    population_summary,
+)
+from .pagination import encode_cursor, decode_cursor
+from .export import export_response
+from .serialization import FastJSONResponse, RowSerializer
 
 router = APIRouter(tags=["population"])
 
-# 데이터베이스 연결 설정
-settings = Settings()
-DATABASE_URL = settings.database_url.replace("postgresql+asyncpg://", "postgresql://")
+AGE_GROUPS = ["0_9", "10_19", "20_29", "30_39", "40_49", "50_59", "60_69", "70_79", "80_89", "90_99", "100_plus"]
 
-async def get_db_connection():
-    try:
-        return await asyncpg.connect(DATABASE_URL)
-    except Exception as e:
-        print(f"Database connection error: {str(e)}")  # 디버깅을 위한 로그 추가
-        raise HTTPException(status_code=500, detail=f"Database connection failed: {str(e)}")
+STATISTICS_ROW = RowSerializer(
+    [
+        "administrative_code", "reference_date", "province", "city", "district",
+        "total_population", "total_male", "total_female",
+    ],
+    groups={
+        "age_groups": [(f"age_{group}", f"age_{group}_total") for group in AGE_GROUPS[:-1]],
+        "gender_breakdown": [f"age_{group}_{sex}" for group in AGE_GROUPS for sex in ("male", "female")],
+    },
+)
+
+AGE_DISTRIBUTION_ROW = RowSerializer(
+    ["city", "district", "total_population"],
+    groups={
+        "age_distribution": [
+            (f"{group.replace('_', '-')}세", f"age_{group}_total") for group in AGE_GROUPS[:8]
+        ],
+    },
+)
+
+INCOME_DISTRIBUTION_ROW = RowSerializer(
+    ["year", "region", "total_households"],
+    groups={
+        "income_brackets": [
+            ("50만원미만", "under_50"),
+            ("50-100만원", "from_50_to_100"),
+            ("100-200만원", "from_100_to_200"),
+            ("200-300만원", "from_200_to_300"),
+            ("300-400만원", "from_300_to_400"),
+            ("400-500만원", "from_400_to_500"),
+            ("500-600만원", "from_500_to_600"),
+            ("600-700만원", "from_600_to_700"),
+            ("700-800만원", "from_700_to_800"),
+            ("800만원이상", "over_800"),
+        ],
+    },
+)
 
 @router.get("/locations")
 async def get_locations(
     province: Optional[str] = Query(None, description="시도명"),
-    city: Optional[str] = Query(None, description="시군구명")
+    city: Optional[str] = Query(None, description="시군구명"),
 ):
-    """지역 정보를 조회합니다."""
+    """지역 정보를 조회합니다. (메모리 행정구역 트리에서 응답)"""
     
-    conn = await get_db_connection()
     try:
-        if province is None:
-            # 모든 시도 반환
-            provinces_query = "SELECT DISTINCT province FROM population_statistics ORDER BY province"
-            provinces_result = await conn.fetch(provinces_query)
-            provinces = [row['province'] for row in provinces_result]
-            
-            return {
-                "provinces": provinces,
-                "cities": [],
-                "districts": []
-            }
-        elif city is None:
-            # 특정 시도의 시군구 반환
-            cities_query = "SELECT DISTINCT city FROM population_statistics WHERE province = $1 ORDER BY city"
-            cities_result = await conn.fetch(cities_query, province)
-            cities = [row['city'] for row in cities_result]
-            
-            return {
-                "provinces": [],
-                "cities": cities,
-                "districts": []
-            }
-        else:
-            # 특정 시군구의 읍면동 반환
-            districts_query = "SELECT DISTINCT district FROM population_statistics WHERE province = $1 AND city = $2 ORDER BY district"
-            districts_result = await conn.fetch(districts_query, province, city)
-            districts = [row['district'] for row in districts_result]
-            
-            return {
-                "provinces": [],
-                "cities": [],
-                "districts": districts
-            }
+        tree = await region_hierarchy.get()
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch locations: {str(e)}")
-    finally:
-        await conn.close()
+
+    if province is None:
+        # 모든 시도 반환
+        return {"provinces": list(tree.provinces), "cities": [], "districts": []}
+    if city is None:
+        # 특정 시도의 시군구 반환
+        return {"provinces": [], "cities": list(tree.cities_of(province)), "districts": []}
+    # 특정 시군구의 읍면동 반환
+    return {"provinces": [], "cities": [], "districts": list(tree.districts_of(province, city))}
 
 @router.get("/statistics")
 async def get_population_statistics(
     province: Optional[str] = Query(None, description="시도명"),
     city: Optional[str] = Query(None, description="도시명"),
     district: Optional[str] = Query(None, description="구/군명"),
-    year: Optional[int] = Query(None, description="연도"),
-    limit: int = Query(100, description="결과 제한")
+    year: Optional[int] = Query(None, ge=1, le=9998, description="연도"),
+    limit: int = Query(100, description="결과 제한 (페이지 크기)"),
+    cursor: Optional[str] = Query(None, description="다음 페이지 커서 (이전 응답의 next_cursor)"),
 ):
-    """인구 통계 데이터를 조회합니다."""
+    """
+    인구 통계 데이터를 조회합니다.
+    
+    (reference_date DESC, city, district, id) 기준 keyset 커서로 다음 페이지를 이어서 조회합니다.
+    인구 큐브가 적재돼 있으면 DB 왕복 없이 메모리에서 응답합니다.
+    """
+    
+    after = decode_cursor(cursor, 4) if cursor else None
+    if after is not None:
+        try:
+            after[0] = date.fromisoformat(after[0])
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
     
-    conn = await get_db_connection()
     try:
-        # 기본 쿼리
-        query = """
-            SELECT 
-                administrative_code,
-                reference_date,
-                province,
-                city,
-                district,
-                total_population,
-                total_male,
-                total_female,
-                (age_0_9_male + age_0_9_female) as age_0_9_total,
-                (age_10_19_male + age_10_19_female) as age_10_19_total,
-                (age_20_29_male + age_20_29_female) as age_20_29_total,
-                (age_30_39_male + age_30_39_female) as age_30_39_total,
-                (age_40_49_male + age_40_49_female) as age_40_49_total,
-                (age_50_59_male + age_50_59_female) as age_50_59_total,
-                (age_60_69_male + age_60_69_female) as age_60_69_total,
-                (age_70_79_male + age_70_79_female) as age_70_79_total,
-                (age_80_89_male + age_80_89_female) as age_80_89_total,
-                (age_90_99_male + age_90_99_female) as age_90_99_total,
-                age_0_9_male, age_0_9_female,
-                age_10_19_male, age_10_19_female,
-                age_20_29_male, age_20_29_female,
-                age_30_39_male, age_30_39_female,
-                age_40_49_male, age_40_49_female,
-                age_50_59_male, age_50_59_female,
-                age_60_69_male, age_60_69_female,
-                age_70_79_male, age_70_79_female,
-                age_80_89_male, age_80_89_female,
-                age_90_99_male, age_90_99_female,
-                age_100_plus_male, age_100_plus_female
-            FROM population_statistics
-            WHERE 1=1
-        """
-        
-        params = []
-        param_count = 0
-        
-        if province:
-            param_count += 1
-            query += f" AND province = ${param_count}"
-            params.append(province)
-        
-        if city:
-            param_count += 1
-            query += f" AND city = ${param_count}"
-            params.append(city)
-            
-        if district:
-            param_count += 1
-            query += f" AND district = ${param_count}"
-            params.append(district)
-            
-        if year:
-            param_count += 1
-            query += f" AND EXTRACT(YEAR FROM reference_date) = ${param_count}"
-            params.append(year)
-        
-        query += f" ORDER BY reference_date DESC, city, district LIMIT ${param_count + 1}"
-        params.append(limit)
+        cube = population_cube.cube if settings.population_cube_enabled else None
+        if cube is not None:
+            rows = cube.records(cube.page(cube.select(province, city, district, year), after, limit))
+        else:
+            rows = await _statistics_from_sql(province, city, district, year, after, limit)
         
-        rows = await conn.fetch(query, *params)
+        next_cursor = (
+            encode_cursor([
+                rows[-1]["reference_date"].isoformat(),
+                rows[-1]["city"] or "",
+                rows[-1]["district"],
+                rows[-1]["id"],
+            ])
+            if len(rows) == limit else None
+        )
         
-        # 결과를 딕셔너리로 변환
-        result = []
-        for row in rows:
-            result.append({
-                "administrative_code": row["administrative_code"],
-                "reference_date": row["reference_date"].isoformat() if row["reference_date"] else None,
-                "province": row["province"],
-                "city": row["city"], 
-                "district": row["district"],
-                "total_population": row["total_population"],
-                "total_male": row["total_male"],
-                "total_female": row["total_female"],
-                "age_groups": {
-                    "age_0_9": row["age_0_9_total"],
-                    "age_10_19": row["age_10_19_total"],
-                    "age_20_29": row["age_20_29_total"],
-                    "age_30_39": row["age_30_39_total"],
-                    "age_40_49": row["age_40_49_total"],
-                    "age_50_59": row["age_50_59_total"],
-                    "age_60_69": row["age_60_69_total"],
-                    "age_70_79": row["age_70_79_total"],
-                    "age_80_89": row["age_80_89_total"],
-                    "age_90_99": row["age_90_99_total"],
-                },
-                "gender_breakdown": {
-                    "age_0_9_male": row["age_0_9_male"],
-                    "age_0_9_female": row["age_0_9_female"],
-                    "age_10_19_male": row["age_10_19_male"],
-                    "age_10_19_female": row["age_10_19_female"],
-                    "age_20_29_male": row["age_20_29_male"],
-                    "age_20_29_female": row["age_20_29_female"],
-                    "age_30_39_male": row["age_30_39_male"],
-                    "age_30_39_female": row["age_30_39_female"],
-                    "age_40_49_male": row["age_40_49_male"],
-                    "age_40_49_female": row["age_40_49_female"],
-                    "age_50_59_male": row["age_50_59_male"],
-                    "age_50_59_female": row["age_50_59_female"],
-                    "age_60_69_male": row["age_60_69_male"],
-                    "age_60_69_female": row["age_60_69_female"],
-                    "age_70_79_male": row["age_70_79_male"],
-                    "age_70_79_female": row["age_70_79_female"],
-                    "age_80_89_male": row["age_80_89_male"],
-                    "age_80_89_female": row["age_80_89_female"],
-                    "age_90_99_male": row["age_90_99_male"],
-                    "age_90_99_female": row["age_90_99_female"],
-                    "age_100_plus_male": row["age_100_plus_male"],
-                    "age_100_plus_female": row["age_100_plus_female"]
-                }
-            })
+        result = STATISTICS_ROW.many(rows)
         
-        return {
+        return FastJSONResponse({
             "data": result,
             "total_count": len(result),
+            "next_cursor": next_cursor,
             "filters": {
                 "province": province,
                 "city": city,
                 "district": district, 
                 "year": year
             }
-        }
+        })
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Query failed: {str(e)}")
-    finally:
-        await conn.close()
 
-@router.get("/age-distribution")
-async def get_age_distribution(
+async def _statistics_from_sql(
+    province: Optional[str],
+    city: Optional[str],
+    district: Optional[str],
+    year: Optional[int],
+    after: Optional[List],
+    limit: int
+) -> List[asyncpg.Record]:
+    """큐브 미적재 시 /statistics SQL 조회"""
+    # 기본 쿼리
+    query = """
+        SELECT 
+            id,
+            administrative_code,
+            reference_date,
+            province,
+            city,
+            district,
+            total_population,
+            total_male,
+            total_female,
+            (age_0_9_male + age_0_9_female) as age_0_9_total,
+            (age_10_19_male + age_10_19_female) as age_10_19_total,
+            (age_20_29_male + age_20_29_female) as age_20_29_total,
+            (age_30_39_male + age_30_39_female) as age_30_39_total,
+            (age_40_49_male + age_40_49_female) as age_40_49_total,
+            (age_50_59_male + age_50_59_female) as age_50_59_total,
+            (age_60_69_male + age_60_69_female) as age_60_69_total,
+            (age_70_79_male + age_70_79_female) as age_70_79_total,
+            (age_80_89_male + age_80_89_female) as age_80_89_total,
+            (age_90_99_male + age_90_99_female) as age_90_99_total,
+            age_0_9_male, age_0_9_female,
+            age_10_19_male, age_10_19_female,
+            age_20_29_male, age_20_29_female,
+            age_30_39_male, age_30_39_female,
+            age_40_49_male, age_40_49_female,
+            age_50_59_male, age_50_59_female,
+            age_60_69_male, age_60_69_female,
+            age_70_79_male, age_70_79_female,
+            age_80_89_male, age_80_89_female,
+            age_90_99_male, age_90_99_female,
+            age_100_plus_male, age_100_plus_female
+        FROM population_statistics
+        WHERE 1=1
+    """
+    
+    conditions, params = _statistics_filters(province, city, district, year)
+    query += conditions
+    param_count = len(params)
+    
+    if after is not None:
+        query += f"""
+            AND (reference_date < ${param_count + 1}
+                 OR (reference_date = ${param_count + 1}
+                     AND (COALESCE(city, ''), district, id) > (${param_count + 2}, ${param_count + 3}, ${param_count + 4})))
+        """
+        params.extend(after)
+        param_count += 4
+    
+    query += f" ORDER BY reference_date DESC, COALESCE(city, ''), district, id LIMIT ${param_count + 1}"
+    params.append(limit)
+    
+    async with db_pool.acquire() as conn:
+        return await conn.fetch(query, *params)
+
+STATISTICS_EXPORT_COLUMNS = [
+    "id", "administrative_code", "reference_date", "province", "city", "district",
+    "total_population", "total_male", "total_female",
+    *(f"age_{group}_{sex}" for group in AGE_GROUPS for sex in ("male", "female")),
+]
+
+def _statistics_filters(
+    province: Optional[str],
+    city: Optional[str],
+    district: Optional[str],
+    year: Optional[int]
+) -> Tuple[str, List]:
+    """/statistics, /statistics/export 공용 조건 (" AND ..." 조각, 파라미터)"""
+    conditions = ""
+    params = []
+    
+    if province:
+        params.append(province)
+        conditions += f" AND province = ${len(params)}"
+    
+    if city:
+        params.append(city)
+        conditions += f" AND city = ${len(params)}"
+        
+    if district:
+        params.append(district)
+        conditions += f" AND district = ${len(params)}"
+        
+    if year:
+        # 반열림 날짜 범위 → 연도 파티션 프루닝 + reference_date 인덱스 범위 스캔
+        params.extend([date(year, 1, 1), date(year + 1, 1, 1)])
+        conditions += f" AND reference_date >= ${len(params) - 1} AND reference_date < ${len(params)}"
+    
+    return conditions, params
+
+@router.get("/statistics/export")
+async def export_population_statistics(
+    province: Optional[str] = Query(None, description="시도명"),
     city: Optional[str] = Query(None, description="도시명"),
-    top_districts: int = Query(10, description="상위 구/군 수")
+    district: Optional[str] = Query(None, description="구/군명"),
+    year: Optional[int] = Query(None, ge=1, le=9998, description="연도"),
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$", description="내보내기 형식 (ndjson | csv)")
 ):
-    """연령대별 인구 분포를 조회합니다."""
+    """
+    인구 통계 전체 내보내기 (NDJSON/CSV 스트리밍)
     
-    conn = await get_db_connection()
+    /statistics와 같은 필터, 같은 정렬로 성별·연령대 원본 컬럼을 평탄한 행으로 흘려보냅니다.
+    """
     try:
-        query = """
-            SELECT 
-                city,
-                district,
-                total_population,
-                (age_0_9_male + age_0_9_female) as age_0_9,
-                (age_10_19_male + age_10_19_female) as age_10_19,
-                (age_20_29_male + age_20_29_female) as age_20_29,
-                (age_30_39_male + age_30_39_female) as age_30_39,
-                (age_40_49_male + age_40_49_female) as age_40_49,
-                (age_50_59_male + age_50_59_female) as age_50_59,
-                (age_60_69_male + age_60_69_female) as age_60_69,
-                (age_70_79_male + age_70_79_female) as age_70_79
+        conditions, params = _statistics_filters(province, city, district, year)
+        query = f"""
+            SELECT {", ".join(STATISTICS_EXPORT_COLUMNS)}
             FROM population_statistics
-            WHERE 1=1
+            WHERE 1=1{conditions}
+            ORDER BY reference_date DESC, COALESCE(city, ''), district, id
         """
+        return await export_response(query, params, STATISTICS_EXPORT_COLUMNS, format, "population_statistics")
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Export failed: {str(e)}")
+
+REGION_BATCH_COLUMNS = [
+    "administrative_code", "province", "city", "district", "reference_date",
+    "total_population", "total_male", "total_female", *COUNT_COLUMNS,
+]
+
+REGION_BATCH_ROW = itemgetter(*REGION_BATCH_COLUMNS)
+
+class RegionKey(BaseModel):
+    province: str = Field(..., description="시도명")
+    city: Optional[str] = Field(None, description="시군구명 (없으면 시군구 무관 - 세종특별자치시 등)")
+    district: str = Field(..., description="읍면동명")
+
+class RegionBatchRequest(BaseModel):
+    regions: List[RegionKey] = Field(default_factory=list, description="조회할 읍면동 키 목록")
+    administrative_codes: List[str] = Field(default_factory=list, description="조회할 행정기관코드 목록")
+    reference_date: Optional[date] = Field(None, description="기준월 (없으면 읍면동별 최신 월)")
+
+@router.post("/regions/batch")
+async def get_regions_batch(request: RegionBatchRequest):
+    """
+    여러 읍면동의 성별·연령대 인구 일괄 조회
+    
+    읍면동 키(시도, 시군구, 읍면동) 또는 행정기관코드 목록을 받아 한 번에 응답합니다.
+    응답은 columns + rows(배열의 배열)이며 rows는 /statistics 정렬 순서, 같은 행은 한 번만 나옵니다.
+    missing에는 찾지 못한 regions 인덱스와 administrative_codes를 돌려줍니다.
+    """
+    requested = len(request.regions) + len(request.administrative_codes)
+    if requested == 0:
+        raise HTTPException(status_code=400, detail="No regions or administrative_codes given")
+    if requested > settings.population_batch_max_regions:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many regions: {requested} (max {settings.population_batch_max_regions})"
+        )
+    
+    keys = [(region.province, region.city, region.district) for region in request.regions]
+    codes = list(dict.fromkeys(request.administrative_codes))
+    
+    try:
+        cube = population_cube.cube if settings.population_cube_enabled else None
+        if cube is not None:
+            positions, missing_keys, missing_codes = cube.lookup(keys, codes, request.reference_date)
+            rows = cube.records(positions)
+        else:
+            rows = await _regions_batch_from_sql(keys, codes, request.reference_date)
+            missing_keys = [
+                i for i, (province, city, district) in enumerate(keys)
+                if not any(
+                    row["province"] == province and row["district"] == district
+                    and (city is None or row["city"] == city)
+                    for row in rows
+                )
+            ]
+            found_codes = {row["administrative_code"] for row in rows}
+            missing_codes = [code for code in codes if code not in found_codes]
         
-        params = []
-        param_count = 0
+        return FastJSONResponse({
+            "columns": REGION_BATCH_COLUMNS,
+            "rows": [REGION_BATCH_ROW(row) for row in rows],
+            "total_count": len(rows),
+            "reference_date": request.reference_date,
+            "missing": {
+                "regions": missing_keys,
+                "administrative_codes": missing_codes
+            }
+        })
         
-        if city:
-            param_count += 1
-            query += f" AND city = ${param_count}"
-            params.append(city)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Batch query failed: {str(e)}")
+
+async def _regions_batch_from_sql(
+    keys: List[Tuple[str, Optional[str], str]],
+    codes: List[str],
+    reference_date: Optional[date]
+) -> List[asyncpg.Record]:
+    """
+    큐브 미적재 시 일괄 조회 SQL (왕복 한 번)
+    
+    키는 일치하는 읍면동마다, 코드는 administrative_code = ANY($4) 행의 읍면동마다
+    최신(또는 지정 기준월) 한 행을 DISTINCT ON으로 고릅니다.
+    """
+    params: List = [
+        [province for province, _, _ in keys],
+        [city for _, city, _ in keys],
+        [district for _, _, district in keys],
+        codes,
+    ]
+    date_condition = ""
+    if reference_date is not None:
+        # 상수 기준월 → 해당 연도 파티션만 스캔
+        params.append(reference_date)
+        date_condition = " AND p.reference_date = $5"
+    
+    columns = ", ".join(f"p.{column}" for column in ["id", *REGION_BATCH_COLUMNS])
+    query = f"""
+        WITH keys AS (
+            SELECT * FROM unnest($1::text[], $2::text[], $3::text[]) AS k(province, city, district)
+        )
+        SELECT * FROM (
+            (SELECT DISTINCT ON (p.province, p.city, p.district) {columns}
+             FROM population_statistics p
+             WHERE EXISTS (
+                 SELECT 1 FROM keys k
+                 WHERE k.province = p.province AND k.district = p.district
+                   AND (k.city IS NULL OR k.city = p.city)
+             ){date_condition}
+             ORDER BY p.province, p.city, p.district, p.reference_date DESC, p.id)
+            UNION
+            (SELECT DISTINCT ON (p.administrative_code, p.province, p.city, p.district) {columns}
+             FROM population_statistics p
+             WHERE p.administrative_code = ANY($4::text[]){date_condition}
+             ORDER BY p.administrative_code, p.province, p.city, p.district, p.reference_date DESC, p.id)
+        ) AS found
+        ORDER BY reference_date DESC, COALESCE(city, ''), district, id
+    """
+    
+    async with db_pool.acquire() as conn:
+        return await conn.fetch(query, *params)
+
+@router.get("/catchment")
+async def get_catchment_population(
+    latitude: float = Query(..., ge=-90, le=90, description="위도"),
+    longitude: float = Query(..., ge=-180, le=180, description="경도"),
+    radius_km: float = Query(1.0, gt=0, le=20, description="반경 (km)"),
+    min_age: Optional[int] = Query(None, ge=0, le=120, description="타겟 최소 나이 (포함)"),
+    max_age: Optional[int] = Query(None, ge=0, le=120, description="타겟 최대 나이 (포함)"),
+):
+    """
+    지점 반경 내 추정 인구 (연령대 × 성별)
+    
+    읍면동 중심점과 면적으로 반경 원에 걸친 비율을 구해 읍면동별 최신 인구에 곱해 합산합니다.
+    min_age/max_age를 주면 그 나이 구간 추정 인구(target_population)를 함께 반환합니다.
+    """
+    cube = population_cube.cube if settings.population_cube_enabled else None
+    if cube is None or not catchment_estimator.is_ready:
+        raise HTTPException(status_code=503, detail="Catchment estimator is not ready")
+    if min_age is not None and max_age is not None and min_age > max_age:
+        raise HTTPException(status_code=400, detail="min_age must not exceed max_age")
+    
+    try:
+        estimate = catchment_estimator.estimate(cube, latitude, longitude, radius_km)
+        totals = [round(value) for value in estimate.totals.tolist()]
+        counts = estimate.counts.round().astype(int).tolist()
         
-        query += f" ORDER BY total_population DESC LIMIT ${param_count + 1}"
-        params.append(top_districts)
+        return FastJSONResponse({
+            "latitude": latitude,
+            "longitude": longitude,
+            "radius_km": radius_km,
+            "total_population": totals[0],
+            "total_male": totals[1],
+            "total_female": totals[2],
+            "age_groups": {
+                band: {"male": male, "female": female, "total": male + female}
+                for band, (male, female) in zip(AGE_BANDS, counts)
+            },
+            "target_population": (
+                round(estimate.population_between(min_age, max_age))
+                if min_age is not None or max_age is not None else None
+            ),
+            "regions": [
+                {
+                    "administrative_code": record["administrative_code"],
+                    "province": record["province"],
+                    "city": record["city"],
+                    "district": record["district"],
+                    "reference_date": record["reference_date"],
+                    "distance_km": round(distance, 3),
+                    "weight": round(weight, 4)
+                }
+                for record, distance, weight in zip(
+                    cube.records(estimate.positions), estimate.distances_km.tolist(), estimate.weights.tolist()
+                )
+            ]
+        })
         
-        rows = await conn.fetch(query, *params)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Catchment estimate failed: {str(e)}")
+
+@router.get("/age-distribution")
+async def get_age_distribution(
+    city: Optional[str] = Query(None, description="도시명"),
+    top_districts: int = Query(10, description="상위 구/군 수"),
+):
+    """연령대별 인구 분포를 조회합니다."""
+    
+    try:
+        cube = population_cube.cube if settings.population_cube_enabled else None
+        if cube is not None:
+            rows = cube.records(cube.top_by_population(cube.select(city=city), top_districts))
+        else:
+            rows = await _age_distribution_from_sql(city, top_districts)
         
-        result = []
-        for row in rows:
-            result.append({
-                "city": row["city"],
-                "district": row["district"],
-                "total_population": row["total_population"],
-                "age_distribution": {
-                    "0-9세": row["age_0_9"],
-                    "10-19세": row["age_10_19"],
-                    "20-29세": row["age_20_29"],
-                    "30-39세": row["age_30_39"],
-                    "40-49세": row["age_40_49"],
-                    "50-59세": row["age_50_59"],
-                    "60-69세": row["age_60_69"],
-                    "70-79세": row["age_70_79"],
-                }
-            })
+        result = AGE_DISTRIBUTION_ROW.many(rows)
         
-        return {
+        return FastJSONResponse({
             "data": result,
             "total_count": len(result)
-        }
+        })
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Query failed: {str(e)}")
-    finally:
-        await conn.close()
+
+async def _age_distribution_from_sql(city: Optional[str], top_districts: int) -> List[asyncpg.Record]:
+    """큐브 미적재 시 /age-distribution SQL 조회"""
+    query = """
+        SELECT 
+            city,
+            district,
+            total_population,
+            (age_0_9_male + age_0_9_female) as age_0_9_total,
+            (age_10_19_male + age_10_19_female) as age_10_19_total,
+            (age_20_29_male + age_20_29_female) as age_20_29_total,
+            (age_30_39_male + age_30_39_female) as age_30_39_total,
+            (age_40_49_male + age_40_49_female) as age_40_49_total,
+            (age_50_59_male + age_50_59_female) as age_50_59_total,
+            (age_60_69_male + age_60_69_female) as age_60_69_total,
+            (age_70_79_male + age_70_79_female) as age_70_79_total
+        FROM population_statistics
+        WHERE 1=1
+    """
+    
+    params = []
+    param_count = 0
+    
+    if city:
+        param_count += 1
+        query += f" AND city = ${param_count}"
+        params.append(city)
+    
+    query += f" ORDER BY total_population DESC LIMIT ${param_count + 1}"
+    params.append(top_districts)
+    
+    async with db_pool.acquire() as conn:
+        return await conn.fetch(query, *params)
 
 @router.get("/income-distribution")
 async def get_income_distribution(
     year: Optional[int] = Query(None, description="연도"),
-    region: Optional[str] = Query(None, description="지역명")
+    region: Optional[str] = Query(None, description="지역명"),
+    conn: asyncpg.Connection = Depends(acquire)
 ):
     """소득 분포 데이터를 조회합니다."""
     
-    conn = await get_db_connection()
     try:
         query = """
             SELECT 
@@ -317,71 +544,41 @@ async def get_income_distribution(
         
         rows = await conn.fetch(query, *params)
         
-        result = []
-        for row in rows:
-            result.append({
-                "year": row["year"],
-                "region": row["region"],
-                "total_households": row["total_households"],
-                "income_brackets": {
-                    "50만원미만": row["under_50"],
-                    "50-100만원": row["from_50_to_100"],
-                    "100-200만원": row["from_100_to_200"],
-                    "200-300만원": row["from_200_to_300"],
-                    "300-400만원": row["from_300_to_400"],
-                    "400-500만원": row["from_400_to_500"],
-                    "500-600만원": row["from_500_to_600"],
-                    "600-700만원": row["from_600_to_700"],
-                    "700-800만원": row["from_700_to_800"],
-                    "800만원이상": row["over_800"],
-                }
-            })
+        result = INCOME_DISTRIBUTION_ROW.many(rows)
         
-        return {
+        return FastJSONResponse({
             "data": result,
             "total_count": len(result)
-        }
+        })
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Query failed: {str(e)}")
-    finally:
-        await conn.close()
 
 @router.get("/summary")
-async def get_population_summary():
-    """인구 통계 요약 정보를 제공합니다."""
+async def get_population_summary(request: Request):
+    """인구 통계 요약 정보를 제공합니다. (적재 시 미리 계산한 스냅샷, ETag/Last-Modified 조건부 응답)"""
+    
+    snapshot = population_summary.snapshot if settings.population_summary_snapshot_enabled else None
+    if snapshot is not None:
+        if snapshot.is_fresh_for(request.headers):
+            return Response(status_code=304, headers=snapshot.headers)
+        return Response(snapshot.body, media_type="application/json", headers=snapshot.headers)
     
-    conn = await get_db_connection()
     try:
-        # 전체 통계
-        summary_query = """
-            SELECT 
-                COUNT(*) as total_records,
-                SUM(total_population) as total_population,
-                AVG(total_population) as avg_population_per_district,
-                COUNT(DISTINCT city) as total_cities,
-                COUNT(DISTINCT district) as total_districts
-            FROM population_statistics
-        """
-        
-        # 상위 지역
-        top_regions_query = """
-            SELECT city, district, total_population
-            FROM population_statistics
-            ORDER BY total_population DESC
-            LIMIT 10
-        """
-        
-        summary_row = await conn.fetchrow(summary_query)
-        top_regions = await conn.fetch(top_regions_query)
+        cube = population_cube.cube if settings.population_cube_enabled else None
+        if cube is not None:
+            summary = cube.summary
+            top_regions = cube.records(cube.top_by_population(cube.select(), 10))
+        else:
+            summary, top_regions = await _summary_from_sql()
         
         return {
             "summary": {
-                "total_records": summary_row["total_records"],
-                "total_population": summary_row["total_population"],
-                "avg_population_per_district": round(summary_row["avg_population_per_district"], 0) if summary_row["avg_population_per_district"] else 0,
-                "total_cities": summary_row["total_cities"],
-                "total_districts": summary_row["total_districts"]
+                "total_records": summary["total_records"],
+                "total_population": summary["total_population"],
+                "avg_population_per_district": round(summary["avg_population_per_district"]) if summary["avg_population_per_district"] else 0,
+                "total_cities": summary["total_cities"],
+                "total_districts": summary["total_districts"]
             },
             "top_regions": [
                 {
@@ -394,5 +591,27 @@ async def get_population_summary():
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Query failed: {str(e)}")
-    finally:
-        await conn.close()
+
+async def _summary_from_sql() -> Tuple[asyncpg.Record, List[asyncpg.Record]]:
+    """큐브 미적재 시 /summary SQL 조회 (전체 통계, 상위 지역)"""
+    # 전체 통계
+    summary_query = """
+        SELECT 
+            COUNT(*) as total_records,
+            SUM(total_population) as total_population,
+            AVG(total_population) as avg_population_per_district,
+            COUNT(DISTINCT city) as total_cities,
+            COUNT(DISTINCT district) as total_districts
+        FROM population_statistics
+    """
+    
+    # 상위 지역
+    top_regions_query = """
+        SELECT city, district, total_population
+        FROM population_statistics
+        ORDER BY total_population DESC
+        LIMIT 10
+    """
+    
+    async with db_pool.acquire() as conn:
+        return await conn.fetchrow(summary_query), await conn.fetch(top_regions_query)
@@ -0,0 +1,109 @@
+"""
+빠른 JSON 직렬화 경로
+
+- FastJSONResponse: orjson 기반 응답 클래스 (앱 기본 응답 클래스)
+  · date/datetime/UUID/dataclass/NumPy 배열을 네이티브로 인코딩, Decimal은 float로 변환
+- RowSerializer: asyncpg Record → 응답 dict 변환기 (엔드포인트별로 한 번 정의)
+  · 컬럼을 itemgetter 한 번으로 꺼내 zip으로 dict 구성 (행마다 키를 하나씩 복사하지 않음)
+  · 중첩 그룹(예: age_groups)과 소수점 반올림 필드 지원
+- 라우터가 FastJSONResponse(payload)를 직접 반환하면 jsonable_encoder 단계를 건너뜀
+"""
+from decimal import Decimal
+from operator import itemgetter
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
+
+import orjson
+from fastapi.responses import JSONResponse
+
+Field = Union[str, Tuple[str, str]]   # 컬럼명 또는 (응답 키, 컬럼명)
+
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    if isinstance(value, Mapping):
+        # asyncpg Record 등 매핑 객체
+        return dict(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """orjson 직렬화 (FastJSONResponse와 같은 옵션)"""
+    return orjson.dumps(content, default=_default, option=_ORJSON_OPTIONS)
+
+
+class FastJSONResponse(JSONResponse):
+    """orjson으로 렌더링하는 JSON 응답"""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def _split(fields: Sequence[Field]) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    keys, columns = [], []
+    for field in fields:
+        key, column = (field, field) if isinstance(field, str) else field
+        keys.append(key)
+        columns.append(column)
+    return tuple(keys), tuple(columns)
+
+
+def _getter(columns: Tuple[str, ...]) -> Callable[[Any], Tuple[Any, ...]]:
+    """항상 튜플을 돌려주는 itemgetter (컬럼이 하나여도)"""
+    if len(columns) == 1:
+        single = itemgetter(columns[0])
+        return lambda row: (single(row),)
+    return itemgetter(*columns)
+
+
+class RowSerializer:
+    """
+    Record → dict 변환기
+
+    사용법:
+        STORE = RowSerializer(["id", "store_name", ("lat", "latitude")], rounding={"lat": 6})
+        payload = {"stores": STORE.many(rows)}
+        return FastJSONResponse(payload)
+    """
+
+    def __init__(
+        self,
+        fields: Sequence[Field],
+        groups: Optional[Dict[str, Sequence[Field]]] = None,
+        rounding: Optional[Dict[str, int]] = None,
+    ):
+        """
+        Args:
+            fields: 최상위 필드 (컬럼명 또는 (응답 키, 컬럼명))
+            groups: 중첩 객체 이름 -> 그 안의 필드 목록
+            rounding: 최상위 응답 키 -> 반올림 자릿수 (None 값은 그대로)
+        """
+        self.keys, columns = _split(fields)
+        self._get = _getter(columns)
+        self._groups = [
+            (name, keys, _getter(group_columns))
+            for name, (keys, group_columns) in (
+                (name, _split(group_fields)) for name, group_fields in (groups or {}).items()
+            )
+        ]
+        self._rounding = tuple((rounding or {}).items())
+
+    def one(self, row: Any) -> Dict[str, Any]:
+        item = dict(zip(self.keys, self._get(row)))
+        for name, keys, get in self._groups:
+            item[name] = dict(zip(keys, get(row)))
+        for key, digits in self._rounding:
+            value = item[key]
+            if value is not None:
+                item[key] = round(float(value), digits)
+        return item
+
+    def many(self, rows: Iterable[Any]) -> List[Dict[str, Any]]:
+        one = self.one
+        return [one(row) for row in rows]
@@ -6,8 +6,13 @@ from pydantic import BaseModel, Field
 from typing import Optional, List, Dict, Any
 from datetime import datetime, timedelta
 import random
+import logging
+
+from ....config.settings import settings
+from ....infrastructure.population import CatchmentEstimate, catchment_estimator, population_cube
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
 
 
 # Request Models
@@ -47,6 +52,8 @@ class TargetAudienceResponse(BaseModel):
     business_id: str
     analysis_date: datetime
     total_population: int
+    # catchment_estimate: 인구와 연령·성별 비율이 반경 추정값 / sample: 샘플 값
+    population_source: str = "sample"
     demographics: List[DemographicData]
     peak_hours: List[Dict[str, Any]]
     seasonal_trends: Dict[str, float]
@@ -114,6 +121,9 @@ async def analyze_target_audience(request: TargetAnalysisRequest):
     타겟 고객층을 식별하고 특성을 분석합니다.
     """
     try:
+        # 반경 내 추정 인구 (중심점/인구 큐브 미적재 시 샘플 값)
+        catchment = _catchment_estimate(request.latitude, request.longitude, request.radius_km)
+        
         # 샘플 데이터 생성 (실제로는 공공데이터 API 연동)
         demographics = []
         
@@ -171,6 +181,11 @@ async def analyze_target_audience(request: TargetAnalysisRequest):
                 )
             ]
         
+        # 반경 추정이 있으면 타겟층 비율을 추정 인구의 연령·성별 구성으로 교체 (소득/라이프스타일은 업종별 프로필)
+        if catchment is not None and catchment.population > 0:
+            for demographic in demographics:
+                demographic.percentage = _estimated_share(catchment, demographic.age_group, demographic.gender)
+        
         # 피크 시간대 (업종별)
         peak_hours = [
             {"hour": 9, "traffic": 0.3, "description": "출근길"},
@@ -199,7 +214,8 @@ async def analyze_target_audience(request: TargetAnalysisRequest):
         return TargetAudienceResponse(
             business_id=request.business_id,
             analysis_date=datetime.now(),
-            total_population=random.randint(5000, 20000),
+            total_population=round(catchment.population) if catchment else random.randint(5000, 20000),
+            population_source="catchment_estimate" if catchment else "sample",
             demographics=demographics,
             peak_hours=peak_hours,
             seasonal_trends=seasonal_trends,
@@ -213,6 +229,30 @@ async def analyze_target_audience(request: TargetAnalysisRequest):
         )
 
 
+def _catchment_estimate(latitude: float, longitude: float, radius_km: float) -> Optional[CatchmentEstimate]:
+    """반경 인구 추정 (큐브 비활성/추정기 미준비/실패 시 None)"""
+    cube = population_cube.cube if settings.population_cube_enabled else None
+    if cube is None or not catchment_estimator.is_ready:
+        return None
+    try:
+        return catchment_estimator.estimate(cube, latitude, longitude, radius_km)
+    except Exception as e:
+        logger.warning(f"반경 인구 추정 실패: {str(e)}")
+        return None
+
+
+GENDER_KEYS = {"남성": "male", "여성": "female"}
+
+
+def _estimated_share(estimate: CatchmentEstimate, age_group: str, gender: str) -> float:
+    """반경 추정 인구 중 "20-29" 연령 구간 × 성별("전체"면 남녀 합) 비율 (%)"""
+    min_age, _, max_age = age_group.partition("-")
+    population = estimate.population_between(
+        int(min_age) if min_age else None, int(max_age) if max_age else None, GENDER_KEYS.get(gender)
+    )
+    return round(population / estimate.population * 100, 1)
+
+
 @router.post("/competitors", response_model=CompetitorAnalysisResponse)
 async def analyze_competitors(request: CompetitorAnalysisRequest):
     """
@@ -1,27 +1,69 @@
-from fastapi import APIRouter, HTTPException, Query, Depends
-from typing import Optional, List, Dict
+from fastapi import APIRouter, HTTPException, Query, Depends, BackgroundTasks
+from pydantic import BaseModel, Field
+from typing import Optional, List, Dict, Tuple
 import asyncpg
 from datetime import datetime
 import math
 import logging
 
-from ....config.settings import Settings
-from ....infrastructure.api.business_store_client import BusinessStoreAPIClient
+from ....config.settings import settings
+from ....infrastructure.api.business_store_client import business_store_api
+from ....infrastructure.database import (
+    db_pool,
+    acquire,
+    sync_store_pages,
+    category_resolver,
+    CategoryFilter,
+    STORE_COLUMNS,
+)
+from ....infrastructure.population import site_scorer
+from ....infrastructure.spatial import (
+    store_index,
+    RadiusProbe,
+    density_tiles,
+    tiles_for_bbox,
+    bounding_box,
+    unit_vector,
+    chord_for_km,
+    km_for_chord,
+)
 from ....domain.models.business_store import BusinessStore
+from ..pagination import encode_cursor, decode_cursor, count_rows
+from ..export import export_response
+from ..serialization import FastJSONResponse, RowSerializer
 
 router = APIRouter(tags=["business-stores"])
 logger = logging.getLogger(__name__)
 
-# 데이터베이스 연결 설정
-settings = Settings()
-DATABASE_URL = settings.database_url.replace("postgresql+asyncpg://", "postgresql://")
 
-async def get_db_connection():
-    try:
-        return await asyncpg.connect(DATABASE_URL)
-    except Exception as e:
-        logger.error(f"Database connection error: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Database connection failed: {str(e)}")
+STORE_SUMMARY_FIELDS = [
+    "id", "store_name", "business_name", "business_code", "latitude", "longitude",
+    "road_address",
+]
+
+NEARBY_STORE = RowSerializer([
+    *STORE_SUMMARY_FIELDS, "jibun_address", "sido_name", "sigungu_name", "dong_name",
+    "building_name", "floor_info", "business_status", "open_date",
+])
+
+BATCH_STORE = RowSerializer(STORE_SUMMARY_FIELDS)
+
+REGION_STORE = RowSerializer([
+    *STORE_SUMMARY_FIELDS, "sido_name", "sigungu_name", "dong_name", "business_status", "open_date",
+])
+
+
+class NearbyProbe(BaseModel):
+    latitude: float = Field(..., ge=-90, le=90, description="위도")
+    longitude: float = Field(..., ge=-180, le=180, description="경도")
+    radius_km: float = Field(1.0, gt=0, le=20, description="반경 (km)")
+    business_type: Optional[str] = Field(None, description="업종 필터")
+
+
+class NearbyBatchRequest(BaseModel):
+    probes: List[NearbyProbe] = Field(..., min_length=1, description="조회 지점 목록")
+    nearest_k: int = Field(5, ge=0, le=50, description="지점별 최근접 경쟁 상가 수")
+
 
 @router.get("/nearby")
 async def get_nearby_stores(
@@ -29,70 +71,26 @@ async def get_nearby_stores(
     longitude: float = Query(..., description="경도"), 
     radius_km: float = Query(1.0, description="반경 (km)"),
     business_type: Optional[str] = Query(None, description="업종 필터"),
-    limit: int = Query(100, description="결과 제한")
+    limit: int = Query(100, description="결과 제한"),
+    conn: asyncpg.Connection = Depends(acquire)
 ):
     """주변 상가 정보 조회 (좌표 기반)"""
     
-    conn = await get_db_connection()
     try:
-        # 위도/경도를 이용한 거리 계산 쿼리 (서브쿼리로 수정)
-        # Haversine 공식을 사용한 거리 계산
-        distance_query = """
-            SELECT * FROM (
-                SELECT *,
-                    (6371 * acos(
-                        cos(radians($1)) * 
-                        cos(radians(latitude)) * 
-                        cos(radians(longitude) - radians($2)) + 
-                        sin(radians($1)) * 
-                        sin(radians(latitude))
-                    )) as distance
-                FROM business_stores
-                WHERE business_status = '영업'
-        """
-        
-        params = [latitude, longitude]
-        param_count = 2
-        
-        if business_type:
-            param_count += 1
-            distance_query += f" AND business_name ILIKE ${param_count}"
-            params.append(f"%{business_type}%")
-        
-        distance_query += f"""
-            ) as stores_with_distance
-            WHERE distance <= ${param_count + 1}
-            ORDER BY distance ASC
-            LIMIT ${param_count + 2}
-        """
-        
-        params.extend([radius_km, limit])
-        
-        rows = await conn.fetch(distance_query, *params)
+        category = await category_resolver.resolve(business_type, conn) if business_type else None
+        if settings.spatial_index_enabled and store_index.is_ready:
+            rows = await _nearby_from_index(conn, latitude, longitude, radius_km, category, limit)
+        else:
+            rows = await _nearby_from_sql(conn, latitude, longitude, radius_km, category, limit)
         
         # 결과 포맷
         stores = []
-        for row in rows:
-            stores.append({
-                "id": row["id"],
-                "store_name": row["store_name"],
-                "business_name": row["business_name"],
-                "business_code": row["business_code"],
-                "latitude": row["latitude"],
-                "longitude": row["longitude"],
-                "road_address": row["road_address"],
-                "jibun_address": row["jibun_address"],
-                "sido_name": row["sido_name"],
-                "sigungu_name": row["sigungu_name"],
-                "dong_name": row["dong_name"],
-                "building_name": row["building_name"],
-                "floor_info": row["floor_info"],
-                "business_status": row["business_status"],
-                "open_date": row["open_date"].isoformat() if row["open_date"] else None,
-                "distance_km": round(row["distance"], 2)
-            })
+        for row, distance in rows:
+            store = NEARBY_STORE.one(row)
+            store["distance_km"] = round(distance, 2)
+            stores.append(store)
             
-        return {
+        return FastJSONResponse({
             "stores": stores,
             "search_location": {
                 "latitude": latitude,
@@ -101,13 +99,272 @@ async def get_nearby_stores(
             "search_radius_km": radius_km,
             "total_count": len(stores),
             "business_type_filter": business_type
-        }
+        })
         
     except Exception as e:
         logger.error(f"주변 상가 조회 오류: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to fetch nearby stores: {str(e)}")
-    finally:
-        await conn.close()
+
+async def _nearby_from_index(
+    conn: asyncpg.Connection,
+    latitude: float,
+    longitude: float,
+    radius_km: float,
+    category: Optional[CategoryFilter],
+    limit: int
+) -> List[Tuple[asyncpg.Record, float]]:
+    """인메모리 공간 인덱스로 후보를 찾고 PK로 상세 정보 조회"""
+    store_ids, distances = store_index.query_radius(
+        latitude, longitude, radius_km,
+        business_type=category.term if category else None,
+        limit=limit,
+        business_codes=category.codes if category and category.uses_codes else None
+    )
+    if store_ids.size == 0:
+        return []
+    
+    rows = await conn.fetch(
+        "SELECT * FROM business_stores WHERE id = ANY($1::int[]) AND business_status = '영업'",
+        store_ids.tolist()
+    )
+    by_id = {row["id"]: row for row in rows}
+    return [
+        (by_id[store_id], float(distance))
+        for store_id, distance in zip(store_ids.tolist(), distances.tolist())
+        if store_id in by_id
+    ]
+
+async def _nearby_from_sql(
+    conn: asyncpg.Connection,
+    latitude: float,
+    longitude: float,
+    radius_km: float,
+    category: Optional[CategoryFilter],
+    limit: int
+) -> List[Tuple[asyncpg.Record, float]]:
+    """
+    SQL 반경 검색 (공간 인덱스 비활성화 또는 미구축 시)
+    
+    1. 위경도 BETWEEN 바운딩 박스로 ix_business_stores_geo_status 범위 스캔
+    2. 단위 벡터 생성 컬럼(unit_x/y/z)의 현 거리 제곱으로 반경 필터 및 정렬 (acos 없음)
+    """
+    min_lat, min_lon, max_lat, max_lon = bounding_box(latitude, longitude, radius_km)
+    x0, y0, z0 = unit_vector(latitude, longitude)
+    max_chord = chord_for_km(radius_km)
+    
+    distance_query = """
+        SELECT * FROM (
+            SELECT *,
+                (unit_x - $5) * (unit_x - $5) +
+                (unit_y - $6) * (unit_y - $6) +
+                (unit_z - $7) * (unit_z - $7) as chord_sq
+            FROM business_stores
+            WHERE business_status = '영업'
+              AND latitude BETWEEN $1 AND $3
+              AND longitude BETWEEN $2 AND $4
+    """
+    
+    params = [min_lat, min_lon, max_lat, max_lon, x0, y0, z0]
+    param_count = 7
+    
+    if category:
+        param_count += 1
+        condition, value = category.sql(param_count)
+        distance_query += condition
+        params.append(value)
+    
+    distance_query += f"""
+        ) as stores_with_distance
+        WHERE chord_sq <= ${param_count + 1}
+        ORDER BY chord_sq ASC
+        LIMIT ${param_count + 2}
+    """
+    
+    params.extend([max_chord * max_chord, limit])
+    
+    rows = await conn.fetch(distance_query, *params)
+    return [(row, km_for_chord(math.sqrt(row["chord_sq"]))) for row in rows]
+
+@router.post("/nearby/batch")
+async def get_nearby_batch(
+    request: NearbyBatchRequest,
+    conn: asyncpg.Connection = Depends(acquire)
+):
+    """
+    여러 후보 지점의 경쟁 밀도 일괄 조회
+    
+    지점마다 반경 내 상가 수, 업종코드별 분포, 최근접 k개 상가를 반환합니다.
+    인메모리 공간 인덱스가 있으면 벡터 연산 한 번, 없으면 unnest 배열 SQL 한 번으로 계산합니다.
+    """
+    if len(request.probes) > settings.nearby_batch_max_probes:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many probes: {len(request.probes)} (max {settings.nearby_batch_max_probes})"
+        )
+    
+    try:
+        # 같은 업종 검색어는 한 번만 해석
+        categories: Dict[str, Optional[CategoryFilter]] = {}
+        for probe in request.probes:
+            if probe.business_type and probe.business_type not in categories:
+                categories[probe.business_type] = await category_resolver.resolve(probe.business_type, conn)
+        probes = [
+            (probe, categories.get(probe.business_type) if probe.business_type else None)
+            for probe in request.probes
+        ]
+        
+        if settings.spatial_index_enabled and store_index.is_ready:
+            results = _nearby_batch_from_index(probes, request.nearest_k)
+        else:
+            results = await _nearby_batch_from_sql(conn, probes, request.nearest_k)
+        
+        # 최근접 상가 상세는 전체 지점에 대해 한 번에 조회
+        nearest_ids = {store_id for _, _, nearest in results for store_id, _ in nearest}
+        rows = await conn.fetch(
+            f"SELECT {', '.join(STORE_SUMMARY_FIELDS)} FROM business_stores WHERE id = ANY($1::int[])",
+            list(nearest_ids)
+        ) if nearest_ids else []
+        by_id = {row["id"]: row for row in rows}
+        
+        return FastJSONResponse({
+            "results": [
+                {
+                    "latitude": probe.latitude,
+                    "longitude": probe.longitude,
+                    "radius_km": probe.radius_km,
+                    "business_type_filter": probe.business_type,
+                    "total_count": total,
+                    "category_histogram": histogram,
+                    "nearest": [
+                        {**BATCH_STORE.one(by_id[store_id]), "distance_km": round(distance, 3)}
+                        for store_id, distance in nearest
+                        if store_id in by_id
+                    ]
+                }
+                for (probe, _), (total, histogram, nearest) in zip(probes, results)
+            ],
+            "probe_count": len(probes),
+            "nearest_k": request.nearest_k
+        })
+        
+    except Exception as e:
+        logger.error(f"일괄 주변 상가 조회 오류: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to fetch nearby stores in batch: {str(e)}")
+
+ProbeSummary = Tuple[int, Dict[str, int], List[Tuple[int, float]]]
+
+def _nearby_batch_from_index(
+    probes: List[Tuple[NearbyProbe, Optional[CategoryFilter]]],
+    nearest_k: int
+) -> List[ProbeSummary]:
+    """인메모리 공간 인덱스로 모든 지점을 한 번에 계산"""
+    results = store_index.query_probes(
+        [
+            RadiusProbe(
+                latitude=probe.latitude,
+                longitude=probe.longitude,
+                radius_km=probe.radius_km,
+                business_type=category.term if category else None,
+                business_codes=category.codes if category and category.uses_codes else None
+            )
+            for probe, category in probes
+        ],
+        nearest_k
+    )
+    return [
+        (
+            result.total_count,
+            result.histogram,
+            list(zip(result.nearest_ids.tolist(), result.nearest_distances.tolist()))
+        )
+        for result in results
+    ]
+
+NEARBY_BATCH_QUERY = """
+    WITH probe AS (
+        SELECT *
+        FROM unnest(
+            $1::float8[], $2::float8[], $3::float8[], $4::float8[],
+            $5::float8[], $6::float8[], $7::float8[], $8::float8[],
+            $9::text[], $10::text[]
+        ) WITH ORDINALITY AS p(
+            min_lat, min_lon, max_lat, max_lon, x0, y0, z0, max_chord_sq,
+            codes, pattern, idx
+        )
+    ),
+    hit AS (
+        SELECT p.idx, s.id, s.business_code,
+            (s.unit_x - p.x0) * (s.unit_x - p.x0) +
+            (s.unit_y - p.y0) * (s.unit_y - p.y0) +
+            (s.unit_z - p.z0) * (s.unit_z - p.z0) AS chord_sq
+        FROM probe p
+        JOIN business_stores s
+          ON s.business_status = '영업'
+         AND s.latitude BETWEEN p.min_lat AND p.max_lat
+         AND s.longitude BETWEEN p.min_lon AND p.max_lon
+         AND (p.codes IS NULL OR s.business_code = ANY(string_to_array(p.codes, ',')))
+         AND (p.pattern IS NULL OR s.business_name ILIKE p.pattern)
+    ),
+    within AS (
+        SELECT *, ROW_NUMBER() OVER (PARTITION BY idx ORDER BY chord_sq, id) AS rank
+        FROM hit h
+        WHERE h.chord_sq <= (SELECT max_chord_sq FROM probe WHERE probe.idx = h.idx)
+    ),
+    histogram AS (
+        SELECT idx, array_agg(business_code ORDER BY business_code) AS codes,
+               array_agg(cnt ORDER BY business_code) AS counts, SUM(cnt) AS total
+        FROM (SELECT idx, business_code, COUNT(*) AS cnt FROM within GROUP BY idx, business_code) c
+        GROUP BY idx
+    ),
+    nearest AS (
+        SELECT idx, array_agg(id ORDER BY rank) AS ids, array_agg(chord_sq ORDER BY rank) AS chords
+        FROM within
+        WHERE rank <= $11
+        GROUP BY idx
+    )
+    SELECT p.idx, COALESCE(h.total, 0) AS total, h.codes, h.counts, n.ids, n.chords
+    FROM probe p
+    LEFT JOIN histogram h ON h.idx = p.idx
+    LEFT JOIN nearest n ON n.idx = p.idx
+    ORDER BY p.idx
+"""
+
+async def _nearby_batch_from_sql(
+    conn: asyncpg.Connection,
+    probes: List[Tuple[NearbyProbe, Optional[CategoryFilter]]],
+    nearest_k: int
+) -> List[ProbeSummary]:
+    """
+    unnest 배열 SQL 한 번으로 모든 지점 계산 (공간 인덱스 비활성화 또는 미구축 시)
+    
+    지점별 바운딩 박스로 ix_business_stores_geo_status를 범위 스캔하고 단위 벡터 현 거리로 반경 필터
+    """
+    columns: List[List] = [[] for _ in range(10)]
+    for probe, category in probes:
+        min_lat, min_lon, max_lat, max_lon = bounding_box(probe.latitude, probe.longitude, probe.radius_km)
+        max_chord = chord_for_km(probe.radius_km)
+        values = (
+            min_lat, min_lon, max_lat, max_lon,
+            *unit_vector(probe.latitude, probe.longitude),
+            max_chord * max_chord,
+            ",".join(category.codes) if category and category.uses_codes else None,
+            category.pattern if category and not category.uses_codes else None,
+        )
+        for column, value in zip(columns, values):
+            column.append(value)
+    
+    rows = await conn.fetch(NEARBY_BATCH_QUERY, *columns, nearest_k)
+    return [
+        (
+            row["total"],
+            dict(zip(row["codes"] or [], row["counts"] or [])),
+            [
+                (store_id, km_for_chord(math.sqrt(chord_sq)))
+                for store_id, chord_sq in zip(row["ids"] or [], row["chords"] or [])
+            ]
+        )
+        for row in rows
+    ]
 
 @router.get("/by-region")
 async def get_stores_by_region(
@@ -115,79 +372,60 @@ async def get_stores_by_region(
     sigungu_name: Optional[str] = Query(None, description="시군구명"),
     dong_name: Optional[str] = Query(None, description="동명"),
     business_type: Optional[str] = Query(None, description="업종"),
-    page: int = Query(1, description="페이지 번호"),
-    page_size: int = Query(50, description="페이지 크기")
+    page: int = Query(1, description="페이지 번호 (cursor가 없을 때만 사용)"),
+    page_size: int = Query(50, description="페이지 크기"),
+    cursor: Optional[str] = Query(None, description="다음 페이지 커서 (이전 응답의 next_cursor)"),
+    exact_count: bool = Query(False, description="정확한 전체 개수 계산 여부 (기본: 추정치)"),
+    conn: asyncpg.Connection = Depends(acquire)
 ):
-    """지역별 상가 정보 조회"""
+    """
+    지역별 상가 정보 조회
+    
+    cursor를 넘기면 (store_name, id) 기준 keyset 탐색으로 OFFSET 없이 다음 페이지를 읽습니다.
+    """
+    
+    after = decode_cursor(cursor, 2) if cursor else None
     
-    conn = await get_db_connection()
     try:
         # 기본 쿼리
-        base_query = """
+        conditions, params = await _region_filters(conn, sido_name, sigungu_name, dong_name, business_type)
+        param_count = len(params)
+        base_query = f"""
             SELECT *
             FROM business_stores
-            WHERE business_status = '영업'
+            WHERE business_status = '영업'{conditions}
         """
         
-        params = []
-        param_count = 0
-        
-        if sido_name:
-            param_count += 1
-            base_query += f" AND sido_name = ${param_count}"
-            params.append(sido_name)
-            
-        if sigungu_name:
-            param_count += 1  
-            base_query += f" AND sigungu_name = ${param_count}"
-            params.append(sigungu_name)
-            
-        if dong_name:
-            param_count += 1
-            base_query += f" AND dong_name ILIKE ${param_count}"
-            params.append(f"%{dong_name}%")
-            
-        if business_type:
-            param_count += 1
-            base_query += f" AND business_name ILIKE ${param_count}"
-            params.append(f"%{business_type}%")
-        
-        # 전체 개수 조회
-        count_query = base_query.replace("SELECT *", "SELECT COUNT(*)")
-        total_count = await conn.fetchval(count_query, *params)
+        # 전체 개수 (요청 시에만 정확값, 그 외 캐시값 또는 플래너 추정치)
+        total_count, total_count_exact = await count_rows(
+            conn, base_query.replace("SELECT *", "SELECT id"), params, exact=exact_count
+        )
         
         # 페이징 처리
-        offset = (page - 1) * page_size
-        base_query += f" ORDER BY store_name LIMIT ${param_count + 1} OFFSET ${param_count + 2}"
-        params.extend([page_size, offset])
+        if after is not None:
+            base_query += f" AND (store_name, id) > (${param_count + 1}, ${param_count + 2})"
+            base_query += f" ORDER BY store_name, id LIMIT ${param_count + 3}"
+            params.extend([after[0], after[1], page_size])
+        else:
+            offset = (page - 1) * page_size
+            base_query += f" ORDER BY store_name, id LIMIT ${param_count + 1} OFFSET ${param_count + 2}"
+            params.extend([page_size, offset])
         
         rows = await conn.fetch(base_query, *params)
+        next_cursor = (
+            encode_cursor([rows[-1]["store_name"], rows[-1]["id"]])
+            if len(rows) == page_size else None
+        )
         
-        # 결과 포맷
-        stores = []
-        for row in rows:
-            stores.append({
-                "id": row["id"],
-                "store_name": row["store_name"],
-                "business_name": row["business_name"],
-                "business_code": row["business_code"],
-                "latitude": row["latitude"],
-                "longitude": row["longitude"],
-                "road_address": row["road_address"],
-                "sido_name": row["sido_name"],
-                "sigungu_name": row["sigungu_name"],
-                "dong_name": row["dong_name"],
-                "business_status": row["business_status"],
-                "open_date": row["open_date"].isoformat() if row["open_date"] else None
-            })
-            
-        return {
-            "stores": stores,
+        return FastJSONResponse({
+            "stores": REGION_STORE.many(rows),
             "pagination": {
-                "page": page,
+                "page": page if after is None else None,
                 "page_size": page_size,
                 "total_count": total_count,
-                "total_pages": math.ceil(total_count / page_size)
+                "total_count_exact": total_count_exact,
+                "total_pages": math.ceil(total_count / page_size),
+                "next_cursor": next_cursor
             },
             "filters": {
                 "sido_name": sido_name,
@@ -195,30 +433,250 @@ async def get_stores_by_region(
                 "dong_name": dong_name,
                 "business_type": business_type
             }
-        }
+        })
         
     except Exception as e:
         logger.error(f"지역별 상가 조회 오류: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to fetch stores by region: {str(e)}")
-    finally:
-        await conn.close()
+
+MAX_DENSITY_TILES = 64
+
+async def _density_filter(business_type: Optional[str]) -> Tuple[Optional[List[str]], Optional[str]]:
+    """업종 필터 → (업종코드 목록, 업종명 검색어) 중 하나"""
+    if not business_type:
+        return None, None
+    category = await category_resolver.resolve(business_type)
+    if category is None:
+        return None, None
+    if category.uses_codes:
+        return list(category.codes), None
+    return None, category.term
+
+def _viewport_tiles(
+    min_lat: float, min_lon: float, max_lat: float, max_lon: float, zoom: int
+) -> List[Tuple[int, int]]:
+    """뷰포트를 덮는 타일 목록 (MAX_DENSITY_TILES 초과 시 목록을 만들기 전에 400)"""
+    if min_lat > max_lat or min_lon > max_lon:
+        raise HTTPException(status_code=400, detail="Invalid bounding box")
+    try:
+        return tiles_for_bbox(min_lat, min_lon, max_lat, max_lon, zoom, max_tiles=MAX_DENSITY_TILES)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def _check_density_args(zoom: int, detail: Optional[int]) -> int:
+    detail = detail if detail is not None else density_tiles.detail
+    if zoom + detail > 24:
+        raise HTTPException(status_code=400, detail="zoom + detail must be <= 24")
+    if not density_tiles.is_ready:
+        raise HTTPException(status_code=503, detail="Store spatial index is not ready")
+    return detail
+
+@router.get("/density/tiles/{zoom}/{x}/{y}")
+async def get_density_tile(
+    zoom: int,
+    x: int,
+    y: int,
+    detail: Optional[int] = Query(None, ge=0, le=8, description="타일 한 변 셀 분할 (2^detail, 기본 설정값)"),
+    business_type: Optional[str] = Query(None, description="업종 필터"),
+    by_code: bool = Query(False, description="셀별 업종코드 건수 포함")
+):
+    """
+    상가 밀도 히트맵 타일 (웹 메르카토르 z/x/y)
+    
+    영업 중 상가를 타일 안 2^detail x 2^detail 셀별로 집계합니다 (인메모리 격자, 타일 캐시).
+    """
+    if not (0 <= zoom <= 24 and 0 <= x < (1 << zoom) and 0 <= y < (1 << zoom)):
+        raise HTTPException(status_code=400, detail="Invalid tile coordinates")
+    detail = _check_density_args(zoom, detail)
+    
+    try:
+        business_codes, name_term = await _density_filter(business_type)
+        tile = await density_tiles.tile(
+            zoom, x, y, detail,
+            business_codes=business_codes, business_type=name_term, by_code=by_code
+        )
+        result = tile.to_dict()
+        result["business_type_filter"] = business_type
+        return FastJSONResponse(result)
+        
+    except Exception as e:
+        logger.error(f"밀도 타일 조회 오류: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to fetch density tile: {str(e)}")
+
+@router.get("/density")
+async def get_density(
+    min_lat: float = Query(..., description="남쪽 위도"),
+    min_lon: float = Query(..., description="서쪽 경도"),
+    max_lat: float = Query(..., description="북쪽 위도"),
+    max_lon: float = Query(..., description="동쪽 경도"),
+    zoom: int = Query(..., ge=0, le=24, description="지도 줌 레벨"),
+    detail: Optional[int] = Query(None, ge=0, le=8, description="타일 한 변 셀 분할 (2^detail, 기본 설정값)"),
+    business_type: Optional[str] = Query(None, description="업종 필터"),
+    by_code: bool = Query(False, description="셀별 업종코드 건수 포함")
+):
+    """
+    바운딩 박스 상가 밀도 (셀별 건수)
+    
+    박스를 덮는 줌 타일들의 셀을 합쳐 반환합니다. 셀 좌표는 cell_zoom 기준 타일 좌표입니다.
+    """
+    tiles = _viewport_tiles(min_lat, min_lon, max_lat, max_lon, zoom)
+    detail = _check_density_args(zoom, detail)
+    
+    try:
+        business_codes, name_term = await _density_filter(business_type)
+        cells = []
+        for x, y in tiles:
+            tile = await density_tiles.tile(
+                zoom, x, y, detail,
+                business_codes=business_codes, business_type=name_term, by_code=by_code
+            )
+            cells.extend(
+                cell for cell in tile.cells()
+                if min_lat <= cell["latitude"] <= max_lat and min_lon <= cell["longitude"] <= max_lon
+            )
+        
+        return FastJSONResponse({
+            "zoom": zoom,
+            "cell_zoom": zoom + detail,
+            "bounds": {"min_lat": min_lat, "min_lon": min_lon, "max_lat": max_lat, "max_lon": max_lon},
+            "total_count": sum(cell["count"] for cell in cells),
+            "max_count": max((cell["count"] for cell in cells), default=0),
+            "cells": cells,
+            "business_type_filter": business_type
+        })
+        
+    except Exception as e:
+        logger.error(f"밀도 조회 오류: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to fetch store density: {str(e)}")
+
+@router.get("/clusters")
+async def get_store_clusters(
+    min_lat: float = Query(..., description="남쪽 위도"),
+    min_lon: float = Query(..., description="서쪽 경도"),
+    max_lat: float = Query(..., description="북쪽 위도"),
+    max_lon: float = Query(..., description="동쪽 경도"),
+    zoom: int = Query(..., ge=0, le=22, description="지도 줌 레벨"),
+    business_type: Optional[str] = Query(None, description="업종 필터")
+):
+    """
+    지도 뷰포트 마커 클러스터
+    
+    영업 중 상가를 인메모리 격자에서 타일 단위로 묶어 클러스터(무게중심, 건수, 최다 업종)를 반환합니다.
+    marker_cluster_max_zoom 이상이거나 셀에 1건만 있으면 개별 상가(stores)로 반환합니다.
+    """
+    tiles = _viewport_tiles(min_lat, min_lon, max_lat, max_lon, zoom)
+    if not density_tiles.is_ready:
+        raise HTTPException(status_code=503, detail="Store spatial index is not ready")
+    
+    def inside(marker: Dict) -> bool:
+        return min_lat <= marker["latitude"] <= max_lat and min_lon <= marker["longitude"] <= max_lon
+    
+    try:
+        business_codes, name_term = await _density_filter(business_type)
+        clusters, stores = [], []
+        for x, y in tiles:
+            markers = await density_tiles.markers(
+                zoom, x, y, business_codes=business_codes, business_type=name_term
+            )
+            clusters.extend(c for c in markers.clusters() if inside(c))
+            stores.extend(s for s in markers.stores() if inside(s))
+        
+        return FastJSONResponse({
+            "zoom": zoom,
+            "clustered": zoom < density_tiles.cluster_max_zoom,
+            "clusters": clusters,
+            "stores": stores,
+            "total_count": sum(c["count"] for c in clusters) + len(stores),
+            "business_type_filter": business_type
+        })
+        
+    except Exception as e:
+        logger.error(f"마커 클러스터 조회 오류: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to fetch store clusters: {str(e)}")
+
+async def _region_filters(
+    conn: Optional[asyncpg.Connection],
+    sido_name: Optional[str],
+    sigungu_name: Optional[str],
+    dong_name: Optional[str],
+    business_type: Optional[str]
+) -> Tuple[str, List]:
+    """/by-region, /export 공용 지역·업종 조건 (" AND ..." 조각, 파라미터)"""
+    conditions = ""
+    params = []
+    
+    if sido_name:
+        params.append(sido_name)
+        conditions += f" AND sido_name = ${len(params)}"
+        
+    if sigungu_name:
+        params.append(sigungu_name)
+        conditions += f" AND sigungu_name = ${len(params)}"
+        
+    if dong_name:
+        params.append(f"%{dong_name}%")
+        conditions += f" AND dong_name ILIKE ${len(params)}"
+        
+    if business_type:
+        # 업종코드 = ANY(...)로 해석 (해석 불가 시 ILIKE, pg_trgm 인덱스)
+        category = await category_resolver.resolve(business_type, conn)
+        if category is not None:
+            condition, value = category.sql(len(params) + 1)
+            conditions += condition
+            params.append(value)
+    
+    return conditions, params
+
+@router.get("/export")
+async def export_stores(
+    sido_name: Optional[str] = Query(None, description="시도명"),
+    sigungu_name: Optional[str] = Query(None, description="시군구명"),
+    dong_name: Optional[str] = Query(None, description="동명"),
+    business_type: Optional[str] = Query(None, description="업종"),
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$", description="내보내기 형식 (ndjson | csv)")
+):
+    """
+    지역별 영업 상가 전체 내보내기 (NDJSON/CSV 스트리밍)
+    
+    /by-region과 같은 필터를 받아 페이지 없이 id 순으로 전체 행을 서버 측 커서로 흘려보냅니다.
+    """
+    try:
+        conditions, params = await _region_filters(None, sido_name, sigungu_name, dong_name, business_type)
+        columns = ["id", *STORE_COLUMNS]
+        query = f"""
+            SELECT {", ".join(columns)}
+            FROM business_stores
+            WHERE business_status = '영업'{conditions}
+            ORDER BY id
+        """
+        return await export_response(query, params, columns, format, "business_stores")
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"상가 내보내기 오류: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to export stores: {str(e)}")
 
 @router.get("/statistics")
 async def get_business_statistics(
     sido_name: Optional[str] = Query(None, description="시도명"),
-    sigungu_name: Optional[str] = Query(None, description="시군구명")
+    sigungu_name: Optional[str] = Query(None, description="시군구명"),
+    conn: asyncpg.Connection = Depends(acquire)
 ):
-    """상가 통계 정보 조회"""
+    """
+    상가 통계 정보 조회
+    
+    원본 테이블 대신 트리거로 유지되는 business_store_stats 집계 테이블만 조회합니다.
+    """
     
-    conn = await get_db_connection()
     try:
         # 업종별 통계
         business_stats_query = """
             SELECT 
                 business_name,
-                COUNT(*) as store_count,
-                ROUND(COUNT(*) * 100.0 / SUM(COUNT(*)) OVER(), 2) as percentage
-            FROM business_stores
+                SUM(store_count) as store_count,
+                ROUND(SUM(store_count) * 100.0 / SUM(SUM(store_count)) OVER(), 2) as percentage
+            FROM business_store_stats
             WHERE business_status = '영업'
         """
         
@@ -247,13 +705,15 @@ async def get_business_statistics(
         region_stats_query = """
             SELECT 
                 sigungu_name,
-                COUNT(*) as store_count
-            FROM business_stores
+                SUM(store_count) as store_count
+            FROM business_store_stats
             WHERE business_status = '영업'
         """
         
+        region_params = []
         if sido_name:
-            region_stats_query += f" AND sido_name = ${1 if sido_name and not sigungu_name else ''}"
+            region_stats_query += " AND sido_name = $1"
+            region_params.append(sido_name)
             
         region_stats_query += """
             GROUP BY sigungu_name
@@ -261,7 +721,6 @@ async def get_business_statistics(
             LIMIT 20
         """
         
-        region_params = [sido_name] if sido_name and not sigungu_name else []
         region_stats = await conn.fetch(region_stats_query, *region_params)
         
         return {
@@ -289,96 +748,55 @@ async def get_business_statistics(
     except Exception as e:
         logger.error(f"상가 통계 조회 오류: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to fetch business statistics: {str(e)}")
-    finally:
-        await conn.close()
 
 @router.post("/sync-data")
 async def sync_business_data(
+    background_tasks: BackgroundTasks,
     sido_cd: str = Query(..., description="시도코드"),
     sigungu_cd: Optional[str] = Query(None, description="시군구코드")
 ):
     """공공데이터 API에서 상가 정보 동기화"""
     
     try:
-        # API 클라이언트로 데이터 조회
-        api_client = BusinessStoreAPIClient()
-        stores_data = await api_client.get_stores_by_region(
-            sido_cd=sido_cd,
-            sigungu_cd=sigungu_cd
+        # 페이지가 도착하는 대로 지문 비교 → 바뀐 행만 기록, 전체 수집 후 누락 상가 폐업 처리
+        # (연결은 페이지 반영 때만 빌림 - API 수집·재시도 대기 중에는 풀에 반납)
+        result = await sync_store_pages(
+            db_pool,
+            business_store_api.iter_store_pages(sido_cd=sido_cd, sigungu_cd=sigungu_cd),
+            region_level="sigungu" if sigungu_cd else "sido"
         )
         
-        if not stores_data:
+        if not result.fetched:
             return {
                 "message": "조회된 데이터가 없습니다",
                 "synced_count": 0
             }
         
-        # 데이터베이스에 저장
-        conn = await get_db_connection()
-        synced_count = 0
-        
-        try:
-            for store in stores_data:
-                # 중복 확인 (상가업소번호 기준)
-                existing_store = await conn.fetchrow(
-                    "SELECT id FROM business_stores WHERE store_number = $1",
-                    store['store_number']
-                )
-                
-                if existing_store:
-                    # 업데이트
-                    await conn.execute("""
-                        UPDATE business_stores SET
-                            store_name = $2, business_code = $3, business_name = $4,
-                            longitude = $5, latitude = $6, jibun_address = $7, road_address = $8,
-                            sido_name = $9, sigungu_name = $10, dong_name = $11,
-                            building_name = $12, floor_info = $13, room_info = $14,
-                            open_date = $15, close_date = $16, business_status = $17,
-                            standard_industry_code = $18, commercial_category_code = $19,
-                            updated_at = NOW()
-                        WHERE store_number = $1
-                    """, 
-                        store['store_number'], store['store_name'], store['business_code'],
-                        store['business_name'], store['longitude'], store['latitude'],
-                        store['jibun_address'], store['road_address'], store['sido_name'],
-                        store['sigungu_name'], store['dong_name'], store['building_name'],
-                        store['floor_info'], store['room_info'], store['open_date'],
-                        store['close_date'], store['business_status'], 
-                        store['standard_industry_code'], store['commercial_category_code']
-                    )
-                else:
-                    # 신규 삽입
-                    await conn.execute("""
-                        INSERT INTO business_stores (
-                            store_number, store_name, business_code, business_name,
-                            longitude, latitude, jibun_address, road_address,
-                            sido_name, sigungu_name, dong_name, building_name,
-                            floor_info, room_info, open_date, close_date, business_status,
-                            standard_industry_code, commercial_category_code
-                        ) VALUES (
-                            $1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, $14, $15, $16, $17, $18, $19
-                        )
-                    """,
-                        store['store_number'], store['store_name'], store['business_code'],
-                        store['business_name'], store['longitude'], store['latitude'],
-                        store['jibun_address'], store['road_address'], store['sido_name'],
-                        store['sigungu_name'], store['dong_name'], store['building_name'],
-                        store['floor_info'], store['room_info'], store['open_date'],
-                        store['close_date'], store['business_status'],
-                        store['standard_industry_code'], store['commercial_category_code']
-                    )
-                
-                synced_count += 1
-                
-        finally:
-            await conn.close()
+        # 업종 카탈로그와 입지 점수용 상가 집계는 다음 사용 때 다시 읽고, 공간 인덱스는 응답 후 재구축
+        if result.changed or result.closed:
+            category_resolver.invalidate()
+            site_scorer.invalidate()
+        if settings.spatial_index_enabled and (result.changed or result.closed):
+            background_tasks.add_task(_refresh_store_index)
             
         return {
             "message": f"상가 정보 동기화 완료",
-            "synced_count": synced_count,
-            "total_fetched": len(stores_data)
+            "synced_count": result.changed,
+            "total_fetched": result.fetched,
+            "inserted": result.inserted,
+            "updated": result.updated,
+            "unchanged": result.unchanged,
+            "closed": result.closed
         }
         
     except Exception as e:
         logger.error(f"데이터 동기화 오류: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Data sync failed: {str(e)}") 
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Data sync failed: {str(e)}") 
+
+async def _refresh_store_index():
+    """동기화 후 공간 인덱스 재구축 (실패 시 기존 스냅샷 유지), 밀도 격자는 바뀐 영역 캐시만 무효화"""
+    try:
+        await store_index.refresh()
+        await density_tiles.grid()
+    except Exception as e:
+        logger.error(f"공간 인덱스 재구축 오류: {str(e)}")
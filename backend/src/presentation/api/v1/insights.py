@@ -1,35 +1,181 @@
-from fastapi import APIRouter, HTTPException, Query, Depends
-from typing import Optional, List, Dict, Any
+from fastapi import APIRouter, HTTPException, Query
+from typing import Optional, List, Dict, Any, Tuple
+from datetime import date
 import logging
 import asyncio
-import asyncpg
-import os
+import re
+
+import numpy as np
+
+from ....config.settings import settings
+from ....infrastructure.database import CategoryFilter, DatabasePool, category_resolver, db_pool
+from ....infrastructure.population import (
+    AGE_BANDS,
+    PopulationCube,
+    PopulationCubeCache,
+    SITE_SCORE_COMPONENTS,
+    SiteScorer,
+    SiteScores,
+    band_weights,
+    population_cube,
+    score_sites,
+    site_scorer,
+)
 # from ....domain.entities.insights import TargetCustomerAnalysis, LocationRecommendation, MarketingTiming
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/insights", tags=["insights"])
 
-# 데이터베이스 연결 설정 (Docker 컨테이너 기준)
-DATABASE_URL = f"postgresql://{os.getenv('DB_USER', 'test')}:{os.getenv('DB_PASSWORD', 'test')}@{os.getenv('DB_HOST', 'localhost')}:{os.getenv('DB_PORT', '5432')}/{os.getenv('DB_NAME', 'testdb')}"
+REGION_POPULATION_QUERY = """
+    SELECT 
+        province, city, district,
+        age_20_29_male + age_20_29_female as age_20s,
+        age_30_39_male + age_30_39_female as age_30s,
+        age_40_49_male + age_40_49_female as age_40s,
+        age_50_59_male + age_50_59_female as age_50s,
+        total_population
+    FROM population_statistics 
+    WHERE city ILIKE $1 OR district ILIKE $1
+    LIMIT 10
+"""
+
+# 읍면동별 최신 기준월 인구 + 같은 업종 영업 상가 수 (큐브가 없을 때 입지 점수 입력)
+SITE_SCORE_QUERY = f"""
+    WITH latest AS (
+        SELECT DISTINCT ON (province, city, district)
+            province, city, district, total_population,
+            {", ".join(f"age_{band}_male + age_{band}_female AS age_{band}" for band in AGE_BANDS)}
+        FROM population_statistics
+        ORDER BY province, city, district, reference_date DESC
+    ), stores AS (
+        SELECT sido_name, sigungu_name, dong_name, COUNT(*) AS competitors
+        FROM business_stores
+        WHERE business_status = '영업'{{category}}
+        GROUP BY sido_name, sigungu_name, dong_name
+    )
+    SELECT l.*, COALESCE(s.competitors, 0) AS competitors
+    FROM latest l
+    LEFT JOIN stores s
+      ON s.sido_name = l.province
+     AND s.sigungu_name IS NOT DISTINCT FROM l.city
+     AND s.dong_name = l.district
+    ORDER BY l.province, l.city, l.district
+"""
+
+# 업종별 연령대 가중치 (20~50대)
+BUSINESS_AGE_WEIGHTS = {
+    "카페": {"20s": 1.5, "30s": 1.3, "40s": 1.0, "50s": 0.8},
+    "음식점": {"20s": 1.2, "30s": 1.4, "40s": 1.3, "50s": 1.1},
+    "미용실": {"20s": 1.4, "30s": 1.5, "40s": 1.2, "50s": 0.9},
+    "편의점": {"20s": 1.3, "30s": 1.1, "40s": 1.2, "50s": 1.0},
+    "의류": {"20s": 1.6, "30s": 1.4, "40s": 1.1, "50s": 0.8}
+}
+DEFAULT_AGE_WEIGHTS = {"20s": 1.0, "30s": 1.0, "40s": 1.0, "50s": 1.0}
+
+# 입지 추천 응답의 지표별 추천 사유
+SITE_SCORE_REASONS = {
+    "target_share": "타겟 연령대 집중",
+    "population": "높은 인구 규모",
+    "competition": "동일 업종 경쟁 상가 적음",
+    "saturation": "인구 대비 업종 포화도 낮음",
+}
 
-async def get_db_connection():
-    """데이터베이스 연결을 가져옵니다."""
-    try:
-        return await asyncpg.connect(DATABASE_URL)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Database connection failed: {str(e)}")
+RECOMMENDED_AREA_COUNT = 5
+
+
+def target_age_weights(business_type: str, target_age: Optional[str] = None) -> np.ndarray:
+    """
+    입지 점수용 연령대 가중치 (AGE_BANDS 순서)
+
+    target_age가 "20대", "20-39" 처럼 나이를 담고 있으면 해당 연령대만 1,
+    아니면 업종별 20~50대 가중치를 씁니다.
+    """
+    ages = [int(age) for age in re.findall(r"\d+", target_age or "")]
+    if ages:
+        low, high = ages[0] // 10, ages[-1] // 10
+        return np.array([1.0 if low <= i <= high else 0.0 for i in range(len(AGE_BANDS))])
+    weights = BUSINESS_AGE_WEIGHTS.get(business_type, DEFAULT_AGE_WEIGHTS)
+    vector = band_weights({f"{decade}_{decade + 9}": weights[f"{decade}s"] for decade in (20, 30, 40, 50)})
+    # 최대 가중치를 1로 맞춰 타겟 비중이 0~1 범위에 있도록
+    return vector / vector.max()
+
+
+def _decade_rows(cube: PopulationCube, positions) -> List[Dict[str, Any]]:
+    """큐브 행 → 위 쿼리와 같은 키의 dict (20~50대 합계)"""
+    decades = cube.band_totals(positions)[:, 2:6].tolist()
+    population = cube.totals[positions, 0].tolist()
+    return [
+        {
+            "province": cube.provinces[p],
+            "city": cube.cities[p],
+            "district": cube.districts[p],
+            "total_population": population[i],
+            "age_20s": decades[i][0],
+            "age_30s": decades[i][1],
+            "age_40s": decades[i][2],
+            "age_50s": decades[i][3],
+        }
+        for i, p in enumerate(positions.tolist())
+    ]
 
 class InsightsService:
     """실제 데이터 기반 인사이트 서비스"""
     
-    def __init__(self):
-        self.db_config = {
-            'host': 'localhost',
-            'port': 5432,
-            'database': 'testdb',
-            'user': 'test',
-            'password': 'test'
-        }
+    def __init__(
+        self,
+        pool: DatabasePool = db_pool,
+        cube: PopulationCubeCache = population_cube,
+        scorer: SiteScorer = site_scorer,
+    ):
+        self.pool = pool
+        self.cube = cube
+        self.scorer = scorer
+
+    def _loaded_cube(self) -> Optional[PopulationCube]:
+        return self.cube.cube if settings.population_cube_enabled else None
+
+    async def _region_population(self, region: str) -> List[Any]:
+        """시군구/읍면동 이름에 region이 포함된 인구 행 (최대 10개)"""
+        cube = self._loaded_cube()
+        if cube is not None:
+            return _decade_rows(cube, cube.matching(region)[:10])
+        async with self.pool.acquire() as conn:
+            return await conn.fetch(REGION_POPULATION_QUERY, f"%{region}%")
+
+    async def _score_sites(
+        self, category: Optional[CategoryFilter], age_weights: np.ndarray, k: int
+    ) -> Tuple[SiteScores, np.ndarray, List[Tuple[Optional[str], ...]]]:
+        """
+        전국 읍면동 입지 점수 (큐브가 없으면 SQL 한 번으로 입력 배열 구성)
+
+        Returns:
+            (평가 결과, 상위 k개의 평가 대상 기준 위치, 상위 k개의 (시도, 시군구, 읍면동))
+        """
+        weights = settings.site_score_weights
+        cube = self._loaded_cube()
+        if cube is not None:
+            scores, positions = await self.scorer.score(cube, category, age_weights, weights)
+            top = scores.top(k)
+            return scores, top, [cube.regions[r] for r in cube.region_ids[positions[top]].tolist()]
+
+        # 업종 필터가 없으면(공백 검색어) 모든 영업 상가를 경쟁 상가로
+        condition, args = "", []
+        if category is not None:
+            condition, value = category.sql(1)
+            args = [value]
+        async with self.pool.acquire() as conn:
+            rows = await conn.fetch(SITE_SCORE_QUERY.format(category=condition), *args)
+        scores = score_sites(
+            np.array([row["total_population"] or 0 for row in rows], dtype=np.int64),
+            np.array([[row[f"age_{band}"] or 0 for band in AGE_BANDS] for row in rows], dtype=np.int64)
+            .reshape(len(rows), len(AGE_BANDS)),
+            np.array([row["competitors"] for row in rows], dtype=np.int64),
+            age_weights,
+            weights,
+        )
+        top = scores.top(k)
+        rows = [rows[i] for i in scores.indices[top].tolist()]
+        return scores, top, [(row["province"], row["city"], row["district"]) for row in rows]
 
     async def get_target_customer_analysis(
         self, 
@@ -39,91 +185,66 @@ class InsightsService:
         """타겟 고객 분석 - 실제 인구 데이터 기반"""
         
         try:
-            conn = await asyncpg.connect(**self.db_config)
-            try:
-                # 1. 지역별 인구 분포 조회
-                population_query = """
-                    SELECT 
-                        province, city, district,
-                        age_20_29_male + age_20_29_female as age_20s,
-                        age_30_39_male + age_30_39_female as age_30s,
-                        age_40_49_male + age_40_49_female as age_40s,
-                        age_50_59_male + age_50_59_female as age_50s,
-                        total_population
-                    FROM population_statistics 
-                    WHERE city ILIKE $1 OR district ILIKE $1
-                    LIMIT 10
-                """
-                
-                population_data = await conn.fetch(population_query, f"%{region}%")
-                
-                if not population_data:
-                    return {
-                        "primaryTarget": "데이터 없음",
-                        "secondaryTarget": "데이터 없음",
-                        "strategy": ["데이터 수집 필요"],
-                        "confidence": 0,
-                        "dataSource": "실제 인구통계 데이터"
-                    }
-                
-                # 2. 연령대별 인구 집계
-                total_20s = sum(row['age_20s'] or 0 for row in population_data)
-                total_30s = sum(row['age_30s'] or 0 for row in population_data)
-                total_40s = sum(row['age_40s'] or 0 for row in population_data)
-                total_50s = sum(row['age_50s'] or 0 for row in population_data)
-                total_pop = sum(row['total_population'] or 0 for row in population_data)
-                
-                # 3. 업종별 특성 반영
-                business_weights = {
-                    "카페": {"20s": 1.5, "30s": 1.3, "40s": 1.0, "50s": 0.8},
-                    "음식점": {"20s": 1.2, "30s": 1.4, "40s": 1.3, "50s": 1.1},
-                    "미용실": {"20s": 1.4, "30s": 1.5, "40s": 1.2, "50s": 0.9},
-                    "편의점": {"20s": 1.3, "30s": 1.1, "40s": 1.2, "50s": 1.0},
-                    "의류": {"20s": 1.6, "30s": 1.4, "40s": 1.1, "50s": 0.8}
-                }
-                
-                weights = business_weights.get(business_type, {"20s": 1.0, "30s": 1.0, "40s": 1.0, "50s": 1.0})
-                
-                # 4. 가중 점수 계산
-                scores = {
-                    "20대": total_20s * weights["20s"],
-                    "30대": total_30s * weights["30s"], 
-                    "40대": total_40s * weights["40s"],
-                    "50대": total_50s * weights["50s"]
-                }
-                
-                # 5. 정렬 및 비율 계산
-                sorted_ages = sorted(scores.items(), key=lambda x: x[1], reverse=True)
-                total_weighted = sum(scores.values())
-                
-                if total_weighted > 0:
-                    primary_ratio = (sorted_ages[0][1] / total_weighted) * 100
-                    secondary_ratio = (sorted_ages[1][1] / total_weighted) * 100
-                else:
-                    primary_ratio = secondary_ratio = 0
-                
-                # 6. 마케팅 전략 생성
-                strategies = self._generate_marketing_strategies(business_type, sorted_ages[0][0])
-                
+            # 1. 지역별 인구 분포 조회
+            population_data = await self._region_population(region)
+            
+            if not population_data:
                 return {
-                    "primaryTarget": f"{sorted_ages[0][0]} ({primary_ratio:.1f}%)",
-                    "secondaryTarget": f"{sorted_ages[1][0]} ({secondary_ratio:.1f}%)",
-                    "strategy": strategies,
-                    "confidence": min(95, max(60, len(population_data) * 10)),
-                    "dataSource": f"실제 인구통계 데이터 ({len(population_data)}개 지역)",
-                    "regionAnalysis": {
-                        "totalPopulation": total_pop,
-                        "ageDistribution": {
-                            "20대": total_20s,
-                            "30대": total_30s,
-                            "40대": total_40s,
-                            "50대": total_50s
-                        }
-                    }
+                    "primaryTarget": "데이터 없음",
+                    "secondaryTarget": "데이터 없음",
+                    "strategy": ["데이터 수집 필요"],
+                    "confidence": 0,
+                    "dataSource": "실제 인구통계 데이터"
                 }
-            finally:
-                await conn.close()
             
+            # 2. 연령대별 인구 집계
+            total_20s = sum(row['age_20s'] or 0 for row in population_data)
+            total_30s = sum(row['age_30s'] or 0 for row in population_data)
+            total_40s = sum(row['age_40s'] or 0 for row in population_data)
+            total_50s = sum(row['age_50s'] or 0 for row in population_data)
+            total_pop = sum(row['total_population'] or 0 for row in population_data)
+            
+            # 3. 업종별 특성 반영
+            weights = BUSINESS_AGE_WEIGHTS.get(business_type, DEFAULT_AGE_WEIGHTS)
+            
+            # 4. 가중 점수 계산
+            scores = {
+                "20대": total_20s * weights["20s"],
+                "30대": total_30s * weights["30s"], 
+                "40대": total_40s * weights["40s"],
+                "50대": total_50s * weights["50s"]
+            }
+            
+            # 5. 정렬 및 비율 계산
+            sorted_ages = sorted(scores.items(), key=lambda x: x[1], reverse=True)
+            total_weighted = sum(scores.values())
+            
+            if total_weighted > 0:
+                primary_ratio = (sorted_ages[0][1] / total_weighted) * 100
+                secondary_ratio = (sorted_ages[1][1] / total_weighted) * 100
+            else:
+                primary_ratio = secondary_ratio = 0
+            
+            # 6. 마케팅 전략 생성
+            strategies = self._generate_marketing_strategies(business_type, sorted_ages[0][0])
+            
+            return {
+                "primaryTarget": f"{sorted_ages[0][0]} ({primary_ratio:.1f}%)",
+                "secondaryTarget": f"{sorted_ages[1][0]} ({secondary_ratio:.1f}%)",
+                "strategy": strategies,
+                "confidence": min(95, max(60, len(population_data) * 10)),
+                "dataSource": f"실제 인구통계 데이터 ({len(population_data)}개 지역)",
+                "regionAnalysis": {
+                    "totalPopulation": total_pop,
+                    "ageDistribution": {
+                        "20대": total_20s,
+                        "30대": total_30s,
+                        "40대": total_40s,
+                        "50대": total_50s
+                    }
+                }
+            }
+        
         except Exception as e:
             logger.error(f"타겟 고객 분석 오류: {e}")
             # 데이터베이스 연결 실패 시 업종별 동적 더미 데이터 반환
@@ -153,87 +274,45 @@ class InsightsService:
         """최적 입지 추천 - 실제 데이터 기반"""
         
         try:
-            conn = await asyncpg.connect(**self.db_config)
-            try:
-                # 1. 인구 밀도가 높은 지역 조회
-                location_query = """
-                    SELECT 
-                        province, city, district,
-                        total_population,
-                        age_20_29_male + age_20_29_female as age_20s,
-                        age_30_39_male + age_30_39_female as age_30s,
-                        age_40_49_male + age_40_49_female as age_40s
-                    FROM population_statistics 
-                    WHERE total_population > 5000
-                    ORDER BY total_population DESC
-                    LIMIT 20
-                """
-                
-                location_data = await conn.fetch(location_query)
-                
-                # 2. 유동인구 데이터는 현재 사용하지 않음 (테이블 없음)
-                # floating_query = """
-                #     SELECT district, admin_dong, AVG(visitor_count) as avg_visitors
-                #     FROM floating_population 
-                #     GROUP BY district, admin_dong
-                #     HAVING AVG(visitor_count) > 100
-                #     ORDER BY avg_visitors DESC
-                #     LIMIT 10
-                # """
-                # 
-                # floating_data = await conn.fetch(floating_query)
-                
-                # 3. 추천 지역 점수 계산
-                recommendations = []
-                
-                for location in location_data[:10]:
-                    # 기본 점수 (인구 밀도)
-                    base_score = location['total_population'] / 1000
-                    
-                    # 타겟 연령대 보정
-                    if target_age == "20대":
-                        age_bonus = (location['age_20s'] or 0) / 100
-                    elif target_age == "30대":
-                        age_bonus = (location['age_30s'] or 0) / 100
-                    elif target_age == "40대":
-                        age_bonus = (location['age_40s'] or 0) / 100
-                    else:
-                        age_bonus = 0
-                    
-                    # 총 점수 계산
-                    total_score = base_score + age_bonus
-                    
-                    # 예상 ROI 계산 (간단한 모델)
-                    expected_roi = min(150, max(80, total_score * 2))
-                    
-                    recommendations.append({
-                        "area": f"{location['city']} {location['district']}",
-                        "expectedROI": f"{expected_roi:.1f}%",
-                        "population": location['total_population'],
-                        "score": total_score
-                    })
-                
-                # 점수순 정렬
-                recommendations.sort(key=lambda x: x['score'], reverse=True)
-                
-                return {
-                    "recommendedAreas": recommendations[:5],
-                    "analysisMetadata": {
-                        "totalLocationsAnalyzed": len(location_data),
-                        "budgetRange": f"{budget:,}원",
-                        "analysisDate": "2025-06-04"
-                    },
-                    "reasons": [
-                        "높은 인구 밀도",
-                        "타겟 연령대 집중",
-                        "유동인구 활발",
-                        "적정 임대료 수준"
-                    ]
-                }
+            # 1. 업종 검색어 → 업종코드 (경쟁 상가 집계 기준, 공백 검색어는 전체 업종)
+            category = await category_resolver.resolve(business_type)
             
-            finally:
-                await conn.close()
+            # 2. 전국 읍면동 일괄 평가 (타겟 연령 비중, 인구, 경쟁 상가 수, 인구 대비 포화도)
+            scores, top, regions = await self._score_sites(
+                category, target_age_weights(business_type, target_age), RECOMMENDED_AREA_COUNT
+            )
             
+            # 3. 추천 지역 (점수 0~100 → 예상 ROI 80~150%)
+            recommendations = []
+            for i, (province, city, district) in zip(top.tolist(), regions):
+                score = float(scores.scores[i])
+                recommendations.append({
+                    "area": f"{city or province} {district}",
+                    "expectedROI": f"{80 + score * 0.7:.1f}%",
+                    "population": int(scores.population[i]),
+                    "score": round(score, 1),
+                    "targetShare": round(float(scores.target_share[i]) * 100, 1),
+                    "competitors": int(scores.competitors[i]),
+                    "storesPerThousand": round(float(scores.per_thousand[i]), 2)
+                })
+            
+            # 4. 1위 지역에서 강한 지표 순으로 추천 사유
+            reasons = []
+            if top.size:
+                strengths = scores.components[top[0]]
+                reasons = [SITE_SCORE_REASONS[SITE_SCORE_COMPONENTS[c]] for c in np.argsort(-strengths, kind="stable")]
+            
+            return {
+                "recommendedAreas": recommendations,
+                "analysisMetadata": {
+                    "totalLocationsAnalyzed": scores.size,
+                    "budgetRange": f"{budget:,}원",
+                    "analysisDate": date.today().isoformat(),
+                    "scoreWeights": settings.site_score_weights
+                },
+                "reasons": reasons
+            }
+        
         except Exception as e:
             logger.error(f"입지 추천 오류: {e}")
             # 데이터베이스 연결 실패 시 동적 더미 데이터 반환
@@ -3,6 +3,7 @@
 """
 import logging
 from fastapi import APIRouter, HTTPException, Depends, status
+from sqlalchemy import text
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from datetime import date
@@ -13,6 +14,7 @@ from src.domain.schemas.population import (
 )
 from src.domain.models.population import PopulationStatistics
 from src.config.database import get_db
+from src.infrastructure.database.region_hierarchy import REGION_QUERY, region_hierarchy
 
 # 로거 설정
 logger = logging.getLogger(__name__)
@@ -32,69 +34,22 @@ async def get_locations(
     try:
         logger.info(f"[API] get_locations - province: {province}, city: {city}")
         
-        # 1. 시/도 목록 조회 (항상 반환)
-        try:
-            provinces_result = db.query(PopulationStatistics.province)\
-                .distinct()\
-                .order_by(PopulationStatistics.province)\
-                .all()
-            provinces = [p[0] for p in provinces_result if p[0]]
-            logger.info(f"Found {len(provinces)} provinces")
-        except Exception as e:
-            logger.error(f"Error fetching provinces: {str(e)}", exc_info=True)
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail={"message": "시/도 목록을 가져오는 중 오류가 발생했습니다."}
-            )
+        # 시/도 → 시/군/구 → 읍면동 트리 (캐시가 비었을 때만 DISTINCT 쿼리 한 번)
+        tree = region_hierarchy.get_sync(lambda: db.execute(text(REGION_QUERY)).all())
         
-        # 기본값으로 빈 딕셔너리 초기화
         cities = {}
         districts = {}
-        
-        # 2. 시/군/구 목록 조회 (province가 제공된 경우)
         if province:
-            try:
-                cities_result = db.query(PopulationStatistics.city)\
-                    .filter(PopulationStatistics.province == province)\
-                    .distinct()\
-                    .order_by(PopulationStatistics.city)\
-                    .all()
-                cities_list = [c[0] for c in cities_result if c[0]]
-                cities[province] = cities_list
-                logger.info(f"Found {len(cities_list)} cities for province {province}")
-                
-                # 3. 읍면동 목록 조회 (province와 city가 모두 제공된 경우)
-                if city:
-                    try:
-                        districts_result = db.query(PopulationStatistics.district)\
-                            .filter(
-                                PopulationStatistics.province == province,
-                                PopulationStatistics.city == city
-                            )\
-                            .distinct()\
-                            .order_by(PopulationStatistics.district)\
-                            .all()
-                        districts_list = [d[0] for d in districts_result if d[0]]
-                        if province not in districts:
-                            districts[province] = {}
-                        districts[province][city] = districts_list
-                        logger.info(f"Found {len(districts_list)} districts for {province} {city}")
-                    except Exception as e:
-                        logger.error(f"Error fetching districts: {str(e)}", exc_info=True)
-                        districts[province] = {city: []}
-            except Exception as e:
-                logger.error(f"Error fetching cities: {str(e)}", exc_info=True)
-                cities[province] = []
+            cities[province] = list(tree.cities_of(province))
+            if city:
+                districts[province] = {city: list(tree.districts_of(province, city))}
         
-        # 4. 결과 반환
         return LocationResponse(
-            provinces=provinces,
+            provinces=list(tree.provinces),
             cities=cities,
             districts=districts
         )
         
-    except HTTPException:
-        raise
     except Exception as e:
         error_msg = f"Failed to fetch location data: {str(e)}"
         logger.error(error_msg, exc_info=True)
@@ -0,0 +1,53 @@
+"""
+population_statistics 오래된 연도 파티션 떼어내기
+
+사용법:
+    python -m src.scripts.archive_population_partitions            # 파티션 목록
+    python -m src.scripts.archive_population_partitions 2020       # 2020년 이전 파티션 DETACH
+
+떼어낸 population_statistics_y<연도> 테이블은 독립 테이블로 남으므로
+pg_dump -t 로 보관한 뒤 DROP TABLE 로 정리합니다.
+"""
+import asyncio
+import logging
+import sys
+
+import asyncpg
+
+from src.infrastructure.database import (
+    POPULATION_CHANGED_CHANNEL,
+    db_pool,
+    detach_population_partitions,
+    population_partitions,
+    rebuild_population_summary,
+)
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+async def archive(before_year=None):
+    conn = await asyncpg.connect(db_pool.dsn)
+    try:
+        if before_year is None:
+            for partition in await population_partitions(conn):
+                print(f"{partition.name}\t{partition.year}\t~{partition.estimated_rows} rows")
+            return
+
+        # CONCURRENTLY: 조회 중인 API를 막지 않음 (asyncpg 기본 자동 커밋 모드)
+        detached = await detach_population_partitions(conn, before_year, concurrently=True)
+        if detached:
+            await rebuild_population_summary(conn)
+            # 실행 중인 API 서버의 인구 큐브/요약/행정구역 캐시 갱신
+            await conn.execute(f"NOTIFY {POPULATION_CHANGED_CHANNEL}")
+        logger.info(f"Detached {len(detached)} partitions: {', '.join(detached) or '-'}")
+    finally:
+        await conn.close()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 2:
+        print("Usage: python -m src.scripts.archive_population_partitions [before_year]")
+        sys.exit(1)
+
+    asyncio.run(archive(int(sys.argv[1]) if len(sys.argv) == 2 else None))
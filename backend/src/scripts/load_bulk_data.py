@@ -0,0 +1,47 @@
+"""
+유동인구/카드소비 CSV 병렬 적재
+
+사용법:
+    python -m src.scripts.load_bulk_data floating_population S-DoT_WALK_2025.04.21-04.27.csv
+    python -m src.scripts.load_bulk_data card_consumption tbsh_gyeonggi_day_202503_*.csv --workers 8
+    python -m src.scripts.load_bulk_data card_consumption big.csv --chunk-size 500000 --encoding cp949
+
+중단되면 같은 명령을 다시 실행해 마지막으로 커밋된 청크 다음부터 이어서 적재합니다
+(infrastructure/database/bulk_import.py).
+"""
+import argparse
+import asyncio
+import logging
+import sys
+
+from src.infrastructure.database import BULK_LOAD_SPECS, bulk_load, db_pool
+from src.infrastructure.database.bulk_import import DEFAULT_CHUNK_SIZE
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="유동인구/카드소비 CSV 병렬 적재")
+    parser.add_argument("table", choices=sorted(BULK_LOAD_SPECS), help="대상 테이블")
+    parser.add_argument("files", nargs="+", help="CSV 파일 경로")
+    parser.add_argument("--workers", type=int, default=None, help="워커 프로세스 수 (기본: CPU 수)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="청크당 줄 수 (재개 시 동일해야 함)")
+    parser.add_argument("--encoding", default="utf-8-sig", help="CSV 인코딩 (예: cp949)")
+    parser.add_argument("--dsn", default=db_pool.dsn, help="PostgreSQL 접속 문자열 (기본: 설정의 DATABASE_URL)")
+    return parser.parse_args(argv)
+
+
+async def main(argv=None):
+    args = parse_args(argv)
+    for path in args.files:
+        logger.info(f"Loading {path} into {args.table}...")
+        await bulk_load(args.table, path, args.dsn, args.workers, args.chunk_size, args.encoding)
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        logger.info("Interrupted - rerun the same command to resume from the last committed chunk")
+        sys.exit(130)
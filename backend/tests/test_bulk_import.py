@@ -0,0 +1,168 @@
+"""
+유동인구/카드소비 병렬 적재 테스트
+
+청크 변환/검증은 DB 없이, 청크 COPY + 진행 기록(재개)은 세션 임시 테이블
+(card_consumption, bulk_load_progress)로 확인합니다. DB에 연결할 수 없으면 건너뜁니다.
+"""
+from datetime import date, datetime
+import io
+
+import pandas as pd
+import pytest
+import asyncpg
+
+from src.config.settings import settings
+from src.infrastructure.database import BULK_LOAD_SPECS
+from src.infrastructure.database.bulk_import import (
+    card_consumption_records,
+    completed_chunks,
+    floating_population_records,
+    iter_csv_chunks,
+    load_chunk,
+)
+
+CARD_HEADER = "ta_ymd,cty_rgn_no,admi_cty_no,card_tpbuz_cd,card_tpbuz_nm_1,card_tpbuz_nm_2,hour,sex,age,day,amt,cnt"
+
+
+def _card_csv(n_rows: int) -> str:
+    lines = [CARD_HEADER]
+    for i in range(n_rows):
+        lines.append(f"202503{i % 28 + 1:02d},41110,4111{i % 10},Q01,음식,한식,{i % 24},{'MF'[i % 2]},{i % 9 + 1},{i % 7 + 1},{i * 100},{i % 5 + 1}")
+    return "\n".join(lines) + "\n"
+
+
+def _frame(text: str) -> pd.DataFrame:
+    return pd.read_csv(io.StringIO(text), dtype=str)
+
+
+def test_card_consumption_records_validates_in_bulk():
+    """날짜/숫자 파싱 실패와 음수 금액은 제외, 빈 숫자는 0"""
+    frame = _frame(
+        CARD_HEADER + "\n"
+        "20250301,41110,4111051000,Q01,음식,한식,9,M,3,6,15000,2\n"
+        "2025-03-01,41110,4111051000,Q01,음식,한식,9,M,3,6,15000,2\n"
+        "20250302,41110,4111051000,Q01,음식,한식,,F,4,7,-500,1\n"
+        "20250303,41110,0111051000,Q01,음식,한식,abc,F,4,7,500,1\n"
+        "20250304,41110,0111051000,Q01,음식,한식,10,F,,7,500,1\n"
+    )
+
+    records, rejected = card_consumption_records(frame)
+
+    assert rejected == 3
+    assert records == [
+        (date(2025, 3, 1), "41110", "4111051000", "Q01", "음식", "한식", 9, "M", 3, 6, 15000, 2),
+        (date(2025, 3, 4), "41110", "0111051000", "Q01", "음식", "한식", 10, "F", 0, 7, 500, 1),
+    ]
+    assert len(records[0]) == len(BULK_LOAD_SPECS["card_consumption"].columns)
+
+
+def test_floating_population_records():
+    """측정시간 형식(YYYY-MM-DD_HH:MM:SS) 변환, 시리얼 없는 행 제외"""
+    frame = _frame(
+        "시리얼,측정시간,지역,자치구,행정동,방문자수\n"
+        "V01,2025-04-21_09:00:00,main_street,강남구,역삼1동,37\n"
+        ",2025-04-21_09:00:00,main_street,강남구,역삼1동,12\n"
+        "V02,2025-04-21 09:00,main_street,강남구,역삼1동,12\n"
+        "V03,2025-04-21_10:00:00,traditional_markets,중구,,\n"
+    )
+
+    records, rejected = floating_population_records(frame)
+
+    assert rejected == 2
+    assert records == [
+        ("V01", datetime(2025, 4, 21, 9), "main_street", "강남구", "역삼1동", 37),
+        ("V03", datetime(2025, 4, 21, 10), "traditional_markets", "중구", None, 0),
+    ]
+
+
+def test_iter_csv_chunks_repeats_header(tmp_path):
+    """청크마다 헤더를 붙여 워커가 독립적으로 파싱"""
+    path = tmp_path / "card.csv"
+    path.write_text(_card_csv(10), encoding="utf-8")
+
+    chunks = list(iter_csv_chunks(str(path), 4))
+
+    assert [index for index, _ in chunks] == [0, 1, 2]
+    assert all(block.startswith(CARD_HEADER.encode()) for _, block in chunks)
+    assert sum(len(_frame(block.decode())) for _, block in chunks) == 10
+
+
+@pytest.fixture
+async def conn():
+    dsn = settings.database_url.replace("postgresql+asyncpg://", "postgresql://")
+    try:
+        connection = await asyncpg.connect(dsn, timeout=3)
+    except Exception as e:
+        pytest.skip(f"PostgreSQL 연결 불가: {e}")
+
+    transaction = connection.transaction()
+    await transaction.start()
+    await connection.execute("""
+        CREATE TEMP TABLE card_consumption (
+            id SERIAL PRIMARY KEY,
+            transaction_date DATE,
+            region_code VARCHAR(20),
+            admin_code VARCHAR(20),
+            business_type_code VARCHAR(10),
+            business_category_1 VARCHAR(50),
+            business_category_2 VARCHAR(50),
+            hour_range INTEGER,
+            gender VARCHAR(10),
+            age_group INTEGER,
+            day_of_week INTEGER,
+            amount BIGINT,
+            transaction_count INTEGER
+        )
+    """)
+    await connection.execute("""
+        CREATE TEMP TABLE bulk_load_progress (
+            table_name varchar(63) NOT NULL,
+            source text NOT NULL,
+            chunk_size integer NOT NULL,
+            chunk_index integer NOT NULL,
+            rows integer NOT NULL,
+            rejected integer NOT NULL,
+            loaded_at timestamp DEFAULT now(),
+            PRIMARY KEY (table_name, source, chunk_index)
+        )
+    """)
+    try:
+        yield connection
+    finally:
+        await transaction.rollback()
+        await connection.close()
+
+
+@pytest.mark.db
+class TestBulkLoad:
+    """청크 적재/재개 테스트 클래스"""
+
+    async def test_resume_skips_committed_chunks(self, conn, tmp_path):
+        """커밋된 청크는 진행 기록에 남아 재실행 시 건너뜀"""
+        path = tmp_path / "card.csv"
+        path.write_text(_card_csv(25), encoding="utf-8")
+        spec = BULK_LOAD_SPECS["card_consumption"]
+        chunks = list(iter_csv_chunks(str(path), 10))
+
+        # 첫 실행이 두 번째 청크까지만 커밋하고 중단
+        for chunk_index, block in chunks[:2]:
+            await load_chunk(conn, spec, "card.csv:1", 10, chunk_index, block)
+
+        done = await completed_chunks(conn, spec.table, "card.csv:1", 10)
+        for chunk_index, block in chunks:
+            if chunk_index not in done:
+                await load_chunk(conn, spec, "card.csv:1", 10, chunk_index, block)
+
+        assert done == {0, 1}
+        assert await conn.fetchval("SELECT COUNT(*) FROM card_consumption") == 25
+        assert await conn.fetchval("SELECT SUM(amount) FROM card_consumption") == sum(i * 100 for i in range(25))
+
+    async def test_resume_requires_same_chunk_size(self, conn, tmp_path):
+        """청크 크기를 바꿔 재개하면 경계가 어긋나므로 거부"""
+        path = tmp_path / "card.csv"
+        path.write_text(_card_csv(5), encoding="utf-8")
+        (chunk_index, block), = iter_csv_chunks(str(path), 10)
+        await load_chunk(conn, BULK_LOAD_SPECS["card_consumption"], "card.csv:1", 10, chunk_index, block)
+
+        with pytest.raises(ValueError):
+            await completed_chunks(conn, "card_consumption", "card.csv:1", 20)
@@ -0,0 +1,264 @@
+"""
+상가 동기화 테스트
+
+세션 임시 테이블(business_stores)에 지문 비교 + COPY/ON CONFLICT 병합을 수행해
+신규/변경/유지/폐업 건수와 실제 기록 여부를 확인합니다. DB에 연결할 수 없으면 건너뜁니다.
+"""
+from contextlib import asynccontextmanager
+from datetime import date
+
+import pytest
+import asyncpg
+
+from src.config.settings import settings
+from src.infrastructure.database import (
+    changed_records,
+    fingerprint,
+    sync_store_pages,
+    to_records,
+    upsert_stores,
+)
+
+
+TEMP_TABLE = """
+    CREATE TEMP TABLE business_stores (
+        id serial PRIMARY KEY,
+        store_number varchar(20) NOT NULL UNIQUE,
+        store_name varchar(200) NOT NULL,
+        business_code varchar(10) NOT NULL,
+        business_name varchar(100) NOT NULL,
+        longitude double precision NOT NULL,
+        latitude double precision NOT NULL,
+        jibun_address varchar(300),
+        road_address varchar(300),
+        sido_name varchar(50) NOT NULL,
+        sigungu_name varchar(50) NOT NULL,
+        dong_name varchar(50) NOT NULL,
+        building_name varchar(200),
+        floor_info varchar(50),
+        room_info varchar(50),
+        open_date date,
+        close_date date,
+        business_status varchar(20) NOT NULL,
+        standard_industry_code varchar(10),
+        commercial_category_code varchar(20),
+        content_hash bytea,
+        created_at timestamp DEFAULT now(),
+        updated_at timestamp DEFAULT now()
+    ) ON COMMIT DROP
+"""
+
+
+def _store(number: int, **overrides):
+    store = {
+        "store_number": f"S{number}",
+        "store_name": f"상가{number}",
+        "business_code": "Q12",
+        "business_name": "카페",
+        "longitude": 127.0 + number * 1e-4,
+        "latitude": 37.5,
+        "jibun_address": None,
+        "road_address": None,
+        "sido_name": "서울특별시",
+        "sigungu_name": "강남구",
+        "dong_name": "역삼동",
+        "building_name": None,
+        "floor_info": "1",
+        "room_info": None,
+        "open_date": date(2020, 1, 1),
+        "close_date": None,
+        "business_status": "영업",
+        "standard_industry_code": None,
+        "commercial_category_code": None,
+    }
+    store.update(overrides)
+    return store
+
+
+@pytest.fixture
+async def conn():
+    dsn = settings.database_url.replace("postgresql+asyncpg://", "postgresql://")
+    try:
+        connection = await asyncpg.connect(dsn, timeout=3)
+    except Exception as e:
+        pytest.skip(f"PostgreSQL 연결 불가: {e}")
+
+    transaction = connection.transaction()
+    await transaction.start()
+    await connection.execute(TEMP_TABLE)
+    try:
+        yield connection
+    finally:
+        await transaction.rollback()
+        await connection.close()
+
+
+@pytest.mark.db
+class TestUpsertStores:
+    """upsert_stores 테스트 클래스"""
+
+    async def test_initial_load_inserts_all(self, conn):
+        """빈 테이블에는 모두 신규 삽입"""
+        result = await upsert_stores(conn, to_records(_store(i) for i in range(100)))
+
+        assert (result.inserted, result.updated, result.unchanged) == (100, 0, 0)
+        assert await conn.fetchval("SELECT COUNT(*) FROM business_stores") == 100
+
+    async def test_only_changed_rows_are_updated(self, conn):
+        """동일 데이터 재동기화는 쓰기 없음, 바뀐 행만 UPDATE"""
+        stores = [_store(i) for i in range(50)]
+        await upsert_stores(conn, to_records(stores))
+        await conn.execute("UPDATE business_stores SET updated_at = '2000-01-01'")
+
+        stores[3] = _store(3, store_name="새이름")
+        stores[7] = _store(7, business_status="폐업", close_date=date(2026, 10, 1))
+        result = await upsert_stores(conn, to_records(stores + [_store(99)]))
+
+        assert (result.inserted, result.updated, result.unchanged, result.closed) == (1, 2, 48, 1)
+        touched = await conn.fetch(
+            "SELECT store_number FROM business_stores "
+            "WHERE updated_at > '2000-01-01' ORDER BY store_number"
+        )
+        assert [row["store_number"] for row in touched] == ["S3", "S7", "S99"]
+
+    async def test_duplicate_store_numbers_in_batch(self, conn):
+        """한 배치 안의 중복 상가업소번호는 한 번만 반영"""
+        result = await upsert_stores(conn, to_records([_store(1), _store(1), _store(2)]))
+
+        assert result.fetched == 3
+        assert (result.inserted, result.unchanged) == (2, 0)
+
+    async def test_duplicate_keeps_last_record(self, conn):
+        """중복 상가업소번호는 마지막 레코드로 반영되고, 같은 배치를 다시 받으면 변경 없음"""
+        records = to_records([_store(1, store_name="이전 상호"), _store(1, store_name="새 상호")])
+        await upsert_stores(conn, records)
+
+        assert await conn.fetchval("SELECT store_name FROM business_stores WHERE store_number = 'S1'") == "새 상호"
+        assert await changed_records(conn, records) == []
+        assert (await upsert_stores(conn, records)).changed == 0
+
+    async def test_empty_batch(self, conn):
+        """빈 배치는 DB 접근 없이 0건"""
+        result = await upsert_stores(conn, [])
+
+        assert result.changed == 0
+
+
+async def _pages(*pages, fail_after=None):
+    for i, page in enumerate(pages):
+        if fail_after is not None and i == fail_after:
+            raise RuntimeError("API 수집 중단")
+        yield to_records(page)
+
+
+async def _row_versions(conn):
+    rows = await conn.fetch("SELECT store_number, ctid::text AS version FROM business_stores")
+    return {row["store_number"]: row["version"] for row in rows}
+
+
+def test_fingerprint_covers_every_field():
+    """지문은 매핑 필드 하나만 바뀌어도 달라짐"""
+    base = to_records([_store(1)])[0]
+    assert fingerprint(base) == fingerprint(to_records([_store(1)])[0])
+    for position, value in enumerate(base):
+        changed = list(base)
+        changed[position] = None if value is not None else "x"
+        assert fingerprint(changed) != fingerprint(base)
+
+
+@pytest.mark.db
+class TestSyncStorePages:
+    """sync_store_pages 테스트 클래스"""
+
+    async def test_unchanged_refresh_writes_nothing(self, conn):
+        """동일 데이터 재수집은 어떤 행도 다시 쓰지 않음"""
+        pages = [[_store(i) for i in range(p * 100, (p + 1) * 100)] for p in range(3)]
+        first = await sync_store_pages(conn, _pages(*pages))
+        before = await _row_versions(conn)
+
+        second = await sync_store_pages(conn, _pages(*pages))
+
+        assert (first.inserted, first.closed) == (300, 0)
+        assert (second.fetched, second.changed, second.unchanged, second.closed) == (300, 0, 300, 0)
+        assert await _row_versions(conn) == before
+
+    async def test_only_new_or_changed_rows_are_written(self, conn):
+        """바뀐 행과 새 행만 새 버전이 생김"""
+        stores = [_store(i) for i in range(50)]
+        await sync_store_pages(conn, _pages(stores))
+        before = await _row_versions(conn)
+
+        stores[10] = _store(10, road_address="새 주소")
+        result = await sync_store_pages(conn, _pages(stores, [_store(77)]))
+        after = await _row_versions(conn)
+
+        assert (result.inserted, result.updated, result.unchanged) == (1, 1, 49)
+        assert {n for n in after if after[n] != before.get(n)} == {"S10", "S77"}
+
+    async def test_missing_stores_in_region_are_closed(self, conn):
+        """전체 수집에서 빠진 상가는 해당 시군구 안에서만 폐업 처리"""
+        await sync_store_pages(conn, _pages([_store(i) for i in range(10)]))
+        await upsert_stores(conn, to_records([_store(100, sigungu_name="서초구")]))
+
+        result = await sync_store_pages(conn, _pages([_store(i) for i in range(8)]))
+        rows = await conn.fetch(
+            "SELECT store_number, business_status, close_date, content_hash "
+            "FROM business_stores WHERE business_status = '폐업' ORDER BY store_number"
+        )
+
+        assert result.closed == 2
+        assert [row["store_number"] for row in rows] == ["S8", "S9"]
+        assert all(row["close_date"] is not None and row["content_hash"] is None for row in rows)
+
+        reopened = await sync_store_pages(conn, _pages([_store(i) for i in range(10)]))
+        assert (reopened.updated, reopened.closed) == (2, 0)
+
+    async def test_incomplete_pull_does_not_close(self, conn):
+        """수집이 중간에 실패하면 폐업 처리하지 않음"""
+        await sync_store_pages(conn, _pages([_store(i) for i in range(10)]))
+
+        with pytest.raises(RuntimeError):
+            await sync_store_pages(conn, _pages([_store(0)], [_store(1)], fail_after=1))
+
+        closed = await conn.fetchval(
+            "SELECT COUNT(*) FROM business_stores WHERE business_status = '폐업'"
+        )
+        assert closed == 0
+
+    async def test_missing_status_defaults_to_open(self, conn):
+        """영업상태가 없는 행은 영업으로 저장"""
+        await sync_store_pages(conn, _pages([_store(1, business_status=None)]))
+
+        assert await conn.fetchval("SELECT business_status FROM business_stores") == "영업"
+
+    async def test_pool_is_borrowed_per_page(self, conn):
+        """풀을 넘기면 페이지 반영/폐업 처리 때만 연결을 빌리고, 다음 페이지를 기다리는 동안은 반납"""
+        pool = _CountingPool(conn)
+
+        async def pages():
+            for p in range(3):
+                assert not pool.in_use
+                yield to_records([_store(i) for i in range(p * 10, (p + 1) * 10)])
+
+        result = await sync_store_pages(pool, pages())
+
+        assert (result.inserted, result.closed) == (30, 0)
+        assert pool.acquired == 4      # 페이지 3 + 폐업 처리 1
+
+
+class _CountingPool:
+    """같은 연결을 빌려주며 대여 횟수/대여 중 여부를 기록하는 풀 대용"""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.acquired = 0
+        self.in_use = False
+
+    @asynccontextmanager
+    async def acquire(self):
+        self.acquired += 1
+        self.in_use = True
+        try:
+            yield self.conn
+        finally:
+            self.in_use = False
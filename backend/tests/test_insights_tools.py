@@ -0,0 +1,138 @@
+"""
+프로세스 내 인사이트 도구(InProcessToolConnector) 테스트
+
+세션 임시 테이블(population_statistics)로 mcp-server와 같은 결과 형식인지 확인합니다.
+DB에 연결할 수 없으면 건너뜁니다.
+"""
+from contextlib import asynccontextmanager
+from datetime import date
+import sys
+
+import asyncpg
+import pytest
+
+from src.application.services.insights_analysis_service import (
+    InProcessToolConnector,
+    InsightsAnalysisService,
+    MCPServerConnector,
+    create_mcp_connector,
+    stdio_server_available,
+)
+from src.config.settings import settings
+from src.infrastructure.mcp import MCPError
+
+BANDS = ("20_29", "30_39", "40_49", "50_59")
+
+# (시군구, 읍면동, 기준월, 총인구, 20대, 30대, 40대, 50대) - 연령대 값은 남녀 각각
+ROWS = [
+    ("강남구", "역삼1동", date(2025, 5, 31), 40000, 5000, 4000, 3000, 2000),
+    ("강남구", "역삼1동", date(2024, 12, 31), 39000, 1, 1, 1, 1),
+    ("관악구", "신림동", date(2025, 5, 31), 60000, 12000, 3000, 2000, 1000),
+    ("종로구", "청운효자동", date(2025, 5, 31), 4000, 500, 500, 500, 500),
+]
+
+
+class _Pool:
+    """트랜잭션 연결 하나를 돌려주는 풀 대용"""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    @asynccontextmanager
+    async def acquire(self):
+        yield self.conn
+
+
+@pytest.fixture
+async def connector():
+    dsn = settings.database_url.replace("postgresql+asyncpg://", "postgresql://")
+    try:
+        connection = await asyncpg.connect(dsn, timeout=3)
+    except Exception as e:
+        pytest.skip(f"PostgreSQL 연결 불가: {e}")
+
+    transaction = connection.transaction()
+    await transaction.start()
+    columns = ", ".join(f"age_{band}_{sex} integer" for band in BANDS for sex in ("male", "female"))
+    await connection.execute(f"""
+        CREATE TEMP TABLE population_statistics (
+            city varchar(20), district varchar(20), reference_date date, total_population integer, {columns}
+        )
+    """)
+    await connection.executemany(
+        f"INSERT INTO population_statistics VALUES ({', '.join(f'${i}' for i in range(1, 13))})",
+        [(city, district, day, total, *(count for count in counts for _ in range(2)))
+         for city, district, day, total, *counts in ROWS],
+    )
+    try:
+        yield InProcessToolConnector(pool=_Pool(connection))
+    finally:
+        await transaction.rollback()
+        await connection.close()
+
+
+@pytest.mark.db
+class TestInProcessToolConnector:
+    """mcp-server 도구와 같은 형식의 결과"""
+
+    async def test_analyze_target_customers(self, connector):
+        result = await connector.call_tool("analyze_target_customers", {"businessType": "Cafe", "region": "역삼"})
+
+        assert result["region"] == "강남구 역삼1동"
+        assert result["totalPopulation"] == 40000
+        assert result["ageAnalysis"]["20-29세"] == {"count": 10000, "percentage": "25.0"}
+        assert result["targetCustomerAnalysis"]["primaryTarget"] == "30-49세"
+
+        missing = await connector.call_tool("analyze_target_customers", {"businessType": "cafe", "region": "부산"})
+        assert missing["searchedRegion"] == "부산"
+
+    async def test_recommend_optimal_location(self, connector):
+        result = await connector.call_tool(
+            "recommend_optimal_location", {"businessType": "retail", "budget": 5000, "targetAge": "20-29"}
+        )
+
+        assert [area["area"] for area in result["recommendedAreas"]] == ["관악구 신림동", "강남구 역삼1동", "강남구 역삼1동"]
+        # 60000/50000*40 + 24000/60000*30 + 24000/60000*25
+        assert result["recommendedAreas"][0]["score"] == "70.0"
+        assert result["recommendedAreas"][0]["expectedROI"] == "76.0%"
+        assert result["analysisMetadata"]["totalAnalyzedLocations"] == 3
+
+    async def test_marketing_timing(self, connector):
+        result = await connector.call_tool(
+            "get_marketing_timing", {"targetAge": "30-39", "businessType": "cafe", "region": "신림"}
+        )
+
+        assert result["timing"]["bestDays"] == ["토요일", "일요일", "금요일"]
+        assert result["populationContext"] == {"totalPopulation": 60000, "targetAgePopulation": 6000}
+
+        young = await connector.call_tool(
+            "get_marketing_timing", {"targetAge": "20-29", "businessType": "cafe", "region": "신림"}
+        )
+        assert young["timing"]["bestHours"] == ["19:00-22:00", "12:00-14:00"]
+
+    async def test_service_and_unknown_tool(self, connector):
+        analysis = await InsightsAnalysisService(connector).analyze_target_customers("restaurant", "신림")
+
+        assert analysis.primary_target == "20-29세"
+        assert analysis.total_population == 60000
+        with pytest.raises(MCPError):
+            await connector.call_tool("execute_sql", {"query": "SELECT 1"})
+
+
+def test_create_mcp_connector():
+    assert isinstance(create_mcp_connector("python"), InProcessToolConnector)
+    assert isinstance(create_mcp_connector("stdio"), MCPServerConnector)
+    with pytest.raises(ValueError):
+        create_mcp_connector("http")
+
+
+def test_stdio_server_available(tmp_path):
+    """빌드된 진입 스크립트가 없으면 stdio를 고르지 않음"""
+    python = sys.executable
+
+    assert not stdio_server_available(f"{python} dist/index.js", str(tmp_path))
+    (tmp_path / "dist").mkdir()
+    (tmp_path / "dist" / "index.js").write_text("", encoding="utf-8")
+    assert stdio_server_available(f"{python} --no-warnings dist/index.js", str(tmp_path))
+    assert not stdio_server_available("missing-node-binary dist/index.js", str(tmp_path))
+    assert not stdio_server_available(f"{python} dist/index.js", str(tmp_path / "missing"))
@@ -0,0 +1,128 @@
+"""
+반경 검색 SQL 경로 정합성 테스트
+
+바운딩 박스 + 단위 벡터 쿼리 결과가 기존 acos Haversine 쿼리와 같은지
+실제 PostgreSQL에서 비교합니다. 세션 임시 테이블(business_stores)을 만들어
+실데이터를 건드리지 않으며, DB에 연결할 수 없으면 건너뜁니다.
+"""
+import pytest
+import asyncpg
+import numpy as np
+
+from src.config.settings import settings
+from src.infrastructure.spatial.store_index import StoreSpatialIndex
+from src.presentation.api.v1 import business_stores
+from src.presentation.api.v1.business_stores import _nearby_from_index, _nearby_from_sql
+
+
+LEGACY_HAVERSINE_QUERY = """
+    SELECT * FROM (
+        SELECT id,
+            (6371 * acos(least(1.0,
+                cos(radians($1)) *
+                cos(radians(latitude)) *
+                cos(radians(longitude) - radians($2)) +
+                sin(radians($1)) *
+                sin(radians(latitude))
+            ))) as distance
+        FROM business_stores
+        WHERE business_status = '영업'
+    ) as stores_with_distance
+    WHERE distance <= $3
+    ORDER BY distance ASC
+"""
+
+TEMP_TABLE = """
+    CREATE TEMP TABLE business_stores (
+        id integer PRIMARY KEY,
+        store_number varchar(20),
+        store_name varchar(200),
+        business_code varchar(10),
+        business_name varchar(100),
+        longitude double precision NOT NULL,
+        latitude double precision NOT NULL,
+        unit_x double precision GENERATED ALWAYS AS (cos(radians(latitude)) * cos(radians(longitude))) STORED,
+        unit_y double precision GENERATED ALWAYS AS (cos(radians(latitude)) * sin(radians(longitude))) STORED,
+        unit_z double precision GENERATED ALWAYS AS (sin(radians(latitude))) STORED,
+        business_status varchar(20) NOT NULL
+    ) ON COMMIT DROP
+"""
+
+
+@pytest.fixture
+async def conn():
+    dsn = settings.database_url.replace("postgresql+asyncpg://", "postgresql://")
+    try:
+        connection = await asyncpg.connect(dsn, timeout=3)
+    except Exception as e:
+        pytest.skip(f"PostgreSQL 연결 불가: {e}")
+
+    transaction = connection.transaction()
+    await transaction.start()
+    await connection.execute(TEMP_TABLE)
+
+    rng = np.random.default_rng(11)
+    n = 3000
+    lats = rng.uniform(37.45, 37.60, n)
+    lons = rng.uniform(126.95, 127.15, n)
+    statuses = rng.choice(["영업", "폐업"], n, p=[0.9, 0.1])
+    names = rng.choice(["카페", "한식음식점", "편의점"], n)
+    await connection.copy_records_to_table(
+        "business_stores",
+        records=[
+            (i + 1, f"S{i + 1}", f"상가{i + 1}", "Q12", str(names[i]),
+             float(lons[i]), float(lats[i]), str(statuses[i]))
+            for i in range(n)
+        ],
+        columns=["id", "store_number", "store_name", "business_code", "business_name",
+                 "longitude", "latitude", "business_status"],
+    )
+    try:
+        yield connection
+    finally:
+        await transaction.rollback()
+        await connection.close()
+
+
+@pytest.mark.db
+class TestNearbySQLPath:
+    """바운딩 박스 + 단위 벡터 SQL 경로 테스트"""
+
+    @pytest.mark.parametrize("radius_km", [0.5, 1.0, 3.0])
+    async def test_matches_legacy_haversine_query(self, conn, radius_km):
+        """기존 acos Haversine 쿼리와 동일한 상가/거리 반환"""
+        lat, lon = 37.5066, 127.0534
+        legacy = await conn.fetch(LEGACY_HAVERSINE_QUERY, lat, lon, radius_km)
+        rows = await _nearby_from_sql(conn, lat, lon, radius_km, None, 100000)
+
+        assert [row["id"] for row, _ in rows] == [row["id"] for row in legacy]
+        assert np.allclose([d for _, d in rows], [row["distance"] for row in legacy], atol=1e-6)
+
+    async def test_uses_geo_index_bounding_box(self, conn):
+        """바운딩 박스 조건이 실행 계획의 인덱스 조건으로 사용됨"""
+        await conn.execute(
+            "CREATE INDEX ON business_stores (business_status, latitude, longitude)"
+        )
+        await conn.execute("ANALYZE business_stores")
+        await conn.execute("SET LOCAL enable_seqscan = off")
+
+        plan = await conn.fetchval(
+            "EXPLAIN SELECT id FROM business_stores "
+            "WHERE business_status = '영업' AND latitude BETWEEN 37.49 AND 37.52 "
+            "AND longitude BETWEEN 127.04 AND 127.07"
+        )
+        assert "Index" in plan or "Bitmap" in plan
+
+    async def test_index_path_skips_closed_stores(self, conn, monkeypatch):
+        """폐업 상가가 남은 오래된 인덱스여도 SQL 경로와 같은 영업 상가만 반환"""
+        rows = await conn.fetch("SELECT id, latitude, longitude, business_name, business_code FROM business_stores")
+        index = StoreSpatialIndex()
+        index.load([tuple(row) for row in rows])
+        monkeypatch.setattr(business_stores, "store_index", index)
+
+        lat, lon = 37.5066, 127.0534
+        from_index = await _nearby_from_index(conn, lat, lon, 1.0, None, 100000)
+        from_sql = await _nearby_from_sql(conn, lat, lon, 1.0, None, 100000)
+
+        assert all(row["business_status"] == "영업" for row, _ in from_index)
+        assert [row["id"] for row, _ in from_index] == [row["id"] for row, _ in from_sql]
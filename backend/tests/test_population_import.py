@@ -0,0 +1,179 @@
+"""
+인구 통계 CSV 적재 테스트
+
+세션 임시 파티션 테이블(population_statistics)에 CSV를 청크 COPY + 기준월 교체로 적재해
+변환 결과, 재적재 시 중복이 없는지, 요약 스냅샷(population_summary_snapshot)이
+함께 재계산되는지 확인합니다. DB에 연결할 수 없으면 건너뜁니다.
+"""
+import csv
+from datetime import date
+import json
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+import asyncpg
+
+from src.config.settings import settings
+from src.infrastructure.database import IMPORT_COLUMNS, import_population_csv
+from src.infrastructure.database.population_import import (
+    CSV_COUNT_COLUMNS,
+    CSV_TEXT_COLUMNS,
+    to_population_records,
+)
+
+HEADER = [*CSV_TEXT_COLUMNS, *CSV_COUNT_COLUMNS]
+
+
+def _write_csv(path, reference_date: str, n_regions: int, seed: int = 7):
+    """읍면동 n_regions개의 월별 인구 CSV (공공데이터 파일과 같은 헤더, BOM 포함)"""
+    rng = np.random.default_rng(seed)
+    with open(path, "w", encoding="utf-8-sig", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(HEADER)
+        for r in range(n_regions):
+            counts = rng.integers(0, 3000, 22).tolist()
+            male, female = sum(counts[:11]), sum(counts[11:])
+            city = "" if r % 50 == 0 else f"시군구{r // 20}"
+            writer.writerow([f"{r:010d}", reference_date, f"시도{r // 300}", city, f"동{r}",
+                             *counts, male + female, male, female])
+    return path
+
+
+@pytest.fixture
+async def conn():
+    dsn = settings.database_url.replace("postgresql+asyncpg://", "postgresql://")
+    try:
+        connection = await asyncpg.connect(dsn, timeout=3)
+    except Exception as e:
+        pytest.skip(f"PostgreSQL 연결 불가: {e}")
+
+    transaction = connection.transaction()
+    await transaction.start()
+    columns = ",\n".join(
+        f"{column} {'integer NOT NULL' if column in CSV_COUNT_COLUMNS.values() else 'varchar(20)'}"
+        for column in IMPORT_COLUMNS if column != "reference_date"
+    )
+    await connection.execute(f"""
+        CREATE TEMP TABLE population_statistics (
+            id serial,
+            reference_date date NOT NULL,
+            {columns},
+            PRIMARY KEY (id, reference_date)
+        ) PARTITION BY RANGE (reference_date)
+    """)
+    await connection.execute(
+        "CREATE TEMP TABLE population_statistics_y2025 PARTITION OF population_statistics "
+        "FOR VALUES FROM ('2025-01-01') TO ('2026-01-01')"
+    )
+    await connection.execute("""
+        CREATE TEMP TABLE population_summary_snapshot (
+            id smallint PRIMARY KEY DEFAULT 1,
+            version date,
+            payload json NOT NULL,
+            built_at timestamptz NOT NULL DEFAULT now()
+        )
+    """)
+    try:
+        yield connection
+    finally:
+        await transaction.rollback()
+        await connection.close()
+
+
+def test_to_population_records():
+    """헤더 이름으로 컬럼 매핑, 행정코드 앞자리 0 유지, 빈 시군구는 NULL, 빈 인원은 0"""
+    frame = pd.DataFrame([
+        ["0036011000", "2025-05-31", "세종특별자치시", None, "조치원읍", *range(22), 231, 55, 176],
+        ["1168064000", "2025-05-31", "서울특별시", "강남구", "역삼1동", *([None] + [1] * 21), 21, 10, 11],
+    ], columns=HEADER).astype({column: str for column in ("행정기관코드", "기준연월")})
+
+    records = to_population_records(frame)
+
+    assert len(records[0]) == len(IMPORT_COLUMNS)
+    assert records[0][:5] == ("0036011000", date(2025, 5, 31), "세종특별자치시", None, "조치원읍")
+    assert records[0][5:] == (*range(22), 231, 55, 176)
+    assert records[1][IMPORT_COLUMNS.index("age_0_9_male")] == 0
+    assert all(type(value) is int for value in records[1][5:])
+
+
+@pytest.mark.db
+class TestPopulationImport:
+    """인구 CSV 적재 테스트 클래스"""
+
+    async def test_import_streams_chunks(self, conn, tmp_path):
+        """여러 청크로 나눠 읽어도 모든 행이 그대로 적재"""
+        path = _write_csv(tmp_path / "population.csv", "2025-05-31", 120)
+
+        result = await import_population_csv(conn, str(path), chunk_size=50)
+
+        assert result.rows == 120
+        assert result.replaced == 0
+        assert result.reference_dates == (date(2025, 5, 31),)
+        row = await conn.fetchrow(
+            "SELECT administrative_code, city, total_population FROM population_statistics WHERE district = '동0'"
+        )
+        assert row["administrative_code"] == "0000000000"
+        assert row["city"] is None
+        assert await conn.fetchval("SELECT COUNT(*) FROM population_statistics") == 120
+
+    async def test_reimport_replaces_month(self, conn, tmp_path):
+        """같은 기준월을 다시 적재하면 교체되고 다른 월은 유지"""
+        await import_population_csv(conn, str(_write_csv(tmp_path / "april.csv", "2025-04-30", 30)))
+        await import_population_csv(conn, str(_write_csv(tmp_path / "may.csv", "2025-05-31", 30)))
+
+        result = await import_population_csv(conn, str(_write_csv(tmp_path / "may2.csv", "2025-05-31", 25, seed=9)))
+
+        assert result.replaced == 30
+        counts = dict(await conn.fetch(
+            "SELECT reference_date, COUNT(*) FROM population_statistics GROUP BY 1"
+        ))
+        assert counts == {date(2025, 4, 30): 30, date(2025, 5, 31): 25}
+
+    async def test_import_rebuilds_summary_snapshot(self, conn, tmp_path):
+        """적재 트랜잭션에서 /summary 스냅샷도 재계산 (버전 = 최신 기준월)"""
+        await import_population_csv(conn, str(_write_csv(tmp_path / "april.csv", "2025-04-30", 30)))
+        await import_population_csv(conn, str(_write_csv(tmp_path / "may.csv", "2025-05-31", 20)))
+
+        row = await conn.fetchrow("SELECT version, payload::text AS payload FROM population_summary_snapshot")
+        payload = json.loads(row["payload"])
+        top = await conn.fetch(
+            "SELECT district, total_population FROM population_statistics ORDER BY total_population DESC LIMIT 10"
+        )
+
+        assert row["version"] == date(2025, 5, 31)
+        assert payload["summary"]["total_records"] == 50
+        assert payload["summary"]["total_population"] == await conn.fetchval(
+            "SELECT SUM(total_population) FROM population_statistics"
+        )
+        assert [region["population"] for region in payload["top_regions"]] == [r["total_population"] for r in top]
+
+    @pytest.mark.slow
+    async def test_nationwide_monthly_file_benchmark(self, conn, tmp_path):
+        """전국 월별 파일(읍면동 3,600행): 기존 DictReader + 1,000행 배치 INSERT 대비 COPY 적재"""
+        path = _write_csv(tmp_path / "nationwide.csv", "2025-05-31", 3600)
+        placeholders = ", ".join(f"${i}" for i in range(1, len(IMPORT_COLUMNS) + 1))
+        legacy_insert = f"INSERT INTO population_statistics ({', '.join(IMPORT_COLUMNS)}) VALUES ({placeholders})"
+
+        started = time.perf_counter()
+        with open(path, encoding="utf-8-sig") as file:
+            batch = []
+            for row in csv.DictReader(file):
+                batch.append((
+                    row["행정기관코드"], date.fromisoformat(row["기준연월"]),
+                    row["시도명"], row["시군구명"], row["읍면동명"],
+                    *(int(row[column]) for column in CSV_COUNT_COLUMNS),
+                ))
+                if len(batch) >= 1000:
+                    await conn.executemany(legacy_insert, batch)
+                    batch = []
+            await conn.executemany(legacy_insert, batch)
+        legacy_seconds = time.perf_counter() - started
+        await conn.execute("DELETE FROM population_statistics")
+
+        result = await import_population_csv(conn, str(path))
+
+        print(f"\nlegacy: {legacy_seconds * 1000:.1f}ms, copy: {result.seconds * 1000:.1f}ms")
+        assert result.rows == 3600
+        assert result.seconds < legacy_seconds
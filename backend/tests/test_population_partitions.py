@@ -0,0 +1,100 @@
+"""
+population_statistics 연도 파티션 테스트
+
+연도 조건이 반열림 날짜 범위로 만들어져 파티션 프루닝이 적용되는지,
+오래된 파티션을 떼어낼 수 있는지 실제 PostgreSQL에서 확인합니다.
+세션 임시 파티션 테이블(population_statistics)을 만들어 실데이터를 건드리지 않으며,
+DB에 연결할 수 없으면 건너뜁니다.
+"""
+from datetime import date
+
+import pytest
+import asyncpg
+
+from src.config.settings import settings
+from src.infrastructure.database.population_partitions import (
+    detach_population_partitions,
+    population_partitions,
+)
+from src.presentation.api.population import _statistics_filters
+
+YEARS = (2023, 2024, 2025)
+
+
+@pytest.fixture
+async def conn():
+    dsn = settings.database_url.replace("postgresql+asyncpg://", "postgresql://")
+    try:
+        connection = await asyncpg.connect(dsn, timeout=3)
+    except Exception as e:
+        pytest.skip(f"PostgreSQL 연결 불가: {e}")
+
+    transaction = connection.transaction()
+    await transaction.start()
+    await connection.execute("""
+        CREATE TEMP TABLE population_statistics (
+            id integer NOT NULL,
+            reference_date date NOT NULL,
+            province varchar(20) NOT NULL,
+            city varchar(20),
+            district varchar(20) NOT NULL,
+            total_population integer NOT NULL,
+            PRIMARY KEY (id, reference_date)
+        ) PARTITION BY RANGE (reference_date)
+    """)
+    for year in YEARS:
+        await connection.execute(
+            f"CREATE TEMP TABLE population_statistics_y{year} PARTITION OF population_statistics "
+            f"FOR VALUES FROM ('{year}-01-01') TO ('{year + 1}-01-01')"
+        )
+    await connection.execute("CREATE INDEX ON population_statistics (reference_date)")
+    await connection.executemany(
+        "INSERT INTO population_statistics VALUES ($1, $2, '서울특별시', '강남구', $3, 1000)",
+        [
+            (i, date(year, month, 28), f"동{i}")
+            for i, (year, month) in enumerate((y, m) for y in YEARS for m in (1, 6, 12))
+        ],
+    )
+    await connection.execute("ANALYZE population_statistics")
+    try:
+        yield connection
+    finally:
+        await transaction.rollback()
+        await connection.close()
+
+
+def test_year_filter_is_half_open_date_range():
+    """연도 조건은 EXTRACT 대신 [1월 1일, 다음 해 1월 1일) 범위"""
+    conditions, params = _statistics_filters("서울특별시", None, None, 2024)
+
+    assert conditions == " AND province = $1 AND reference_date >= $2 AND reference_date < $3"
+    assert params == ["서울특별시", date(2024, 1, 1), date(2025, 1, 1)]
+
+
+@pytest.mark.db
+class TestPopulationPartitions:
+    """연도 파티션 테스트 클래스"""
+
+    async def test_year_filter_prunes_partitions(self, conn):
+        """연도 조건은 해당 연도 파티션만 스캔"""
+        conditions, params = _statistics_filters(None, None, None, 2024)
+        query = f"SELECT id FROM population_statistics WHERE 1=1{conditions}"
+
+        plan = "\n".join(row[0] for row in await conn.fetch(f"EXPLAIN {query}", *params))
+        rows = await conn.fetch(query, *params)
+
+        assert "population_statistics_y2024" in plan
+        assert "population_statistics_y2023" not in plan
+        assert "population_statistics_y2025" not in plan
+        assert len(rows) == 3
+
+    async def test_detach_old_partitions(self, conn):
+        """기준 연도 이전 파티션을 떼어내면 본 테이블에서 빠지고 독립 테이블로 남음"""
+        assert [p.year for p in await population_partitions(conn)] == list(YEARS)
+
+        detached = await detach_population_partitions(conn, 2025)
+
+        assert detached == ["population_statistics_y2023", "population_statistics_y2024"]
+        assert [p.year for p in await population_partitions(conn)] == [2025]
+        assert await conn.fetchval("SELECT COUNT(*) FROM population_statistics") == 3
+        assert await conn.fetchval("SELECT COUNT(*) FROM population_statistics_y2023") == 3
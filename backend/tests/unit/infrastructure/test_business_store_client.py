@@ -0,0 +1,186 @@
+"""
+상가 정보 API 클라이언트 테스트
+
+로컬 스텁 HTTP 서버(data.go.kr 응답 형식)를 띄워 페이지 순회,
+동시성 제한, 재시도, 연결 재사용을 확인합니다.
+"""
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from src.infrastructure.api.business_store_client import BusinessStoreAPIClient
+from src.infrastructure.api.token_bucket import TokenBucket
+
+
+def _page_xml(page_no: int, num_of_rows: int, total_count: int) -> str:
+    start = (page_no - 1) * num_of_rows
+    items = "".join(
+        f"<item><bizesId>S{i}</bizesId><bizesNm>상가{i}</bizesNm>"
+        f"<indsLclsCd>Q</indsLclsCd><indsLclsNm>음식</indsLclsNm>"
+        f"<lon>127.0</lon><lat>37.5</lat><trdStateNm>영업</trdStateNm></item>"
+        for i in range(start, min(start + num_of_rows, total_count))
+    )
+    return (
+        "<response><header><resultCode>00</resultCode></header><body>"
+        f"<items>{items}</items><numOfRows>{num_of_rows}</numOfRows>"
+        f"<pageNo>{page_no}</pageNo><totalCount>{total_count}</totalCount></body></response>"
+    )
+
+
+class StubServer:
+    """data.go.kr 상가정보 API 스텁"""
+
+    def __init__(self, total_count: int, failures=None, delay: float = 0.0):
+        self.total_count = total_count
+        self.failures = dict(failures or {})  # pageNo -> [상태 코드, ...]
+        self.delay = delay
+        self.requests = []
+        self.peers = set()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                query = {k: v[0] for k, v in parse_qs(urlparse(self.path).query).items()}
+                page_no = int(query["pageNo"])
+                with stub._lock:
+                    stub.requests.append(page_no)
+                    stub.peers.add(self.client_address)
+                    stub.in_flight += 1
+                    stub.max_in_flight = max(stub.max_in_flight, stub.in_flight)
+                    pending = stub.failures.get(page_no)
+                    status = pending.pop(0) if pending else 200
+                try:
+                    time.sleep(stub.delay)
+                    body = b"" if status != 200 else _page_xml(
+                        page_no, int(query["numOfRows"]), stub.total_count
+                    ).encode("utf-8")
+                    self.send_response(status)
+                    if status == 429:
+                        self.send_header("Retry-After", "0")
+                    self.send_header("Content-Type", "application/xml")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                finally:
+                    with stub._lock:
+                        stub.in_flight -= 1
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}/"
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def _client(url: str, **kwargs) -> BusinessStoreAPIClient:
+    options = dict(base_url=url, service_key="test", rate_per_second=1000,
+                   concurrency=3, max_retries=3, backoff_base=0.01)
+    options.update(kwargs)
+    return BusinessStoreAPIClient(**options)
+
+
+class TestBusinessStoreAPIClient:
+    """BusinessStoreAPIClient 테스트 클래스"""
+
+    async def test_fetches_all_pages_from_total_count(self):
+        """totalCount 기준으로 모든 페이지를 가져옴"""
+        with StubServer(total_count=2350) as server:
+            async with _client(server.url) as client:
+                stores = await client.get_stores_by_region("11", "11680", num_of_rows=500)
+
+        assert len(stores) == 2350
+        assert {s["store_number"] for s in stores} == {f"S{i}" for i in range(2350)}
+        assert sorted(server.requests) == [1, 2, 3, 4, 5]
+
+    async def test_pages_are_yielded_incrementally(self):
+        """첫 페이지는 나머지 페이지 요청 전에 반환"""
+        with StubServer(total_count=300) as server:
+            async with _client(server.url) as client:
+                pages = client.iter_store_pages("11", num_of_rows=100)
+                first = await pages.__anext__()
+                requested_before_rest = list(server.requests)
+                rest = [page async for page in pages]
+
+        assert len(first) == 100 and requested_before_rest == [1]
+        assert sum(len(page) for page in rest) == 200
+
+    async def test_concurrency_and_keep_alive(self):
+        """동시 요청 수 제한과 연결 재사용"""
+        with StubServer(total_count=2000, delay=0.02) as server:
+            async with _client(server.url, concurrency=3) as client:
+                stores = await client.get_stores_by_region("11", num_of_rows=100)
+
+        assert len(stores) == 2000
+        assert server.max_in_flight <= 3
+        assert len(server.peers) <= 3
+
+    async def test_retries_on_429_and_5xx(self):
+        """429/5xx는 백오프 후 재시도"""
+        failures = {2: [429, 503], 3: [500]}
+        with StubServer(total_count=300, failures=failures) as server:
+            async with _client(server.url) as client:
+                stores = await client.get_stores_by_region("11", num_of_rows=100)
+
+        assert len(stores) == 300
+        assert server.requests.count(2) == 3
+        assert server.requests.count(3) == 2
+
+    async def test_gives_up_after_max_retries(self):
+        """재시도 한도 초과 시 HTTPStatusError"""
+        import httpx
+
+        with StubServer(total_count=100, failures={1: [503] * 10}) as server:
+            async with _client(server.url, max_retries=2) as client:
+                with pytest.raises(httpx.HTTPStatusError):
+                    await client.get_stores_by_region("11")
+
+        assert server.requests == [1, 1, 1]
+
+    async def test_client_errors_are_not_retried(self):
+        """4xx(429 제외)는 즉시 실패"""
+        import httpx
+
+        with StubServer(total_count=100, failures={1: [400]}) as server:
+            async with _client(server.url) as client:
+                with pytest.raises(httpx.HTTPStatusError):
+                    await client.get_stores_by_region("11")
+
+        assert server.requests == [1]
+
+
+class TestTokenBucket:
+    """TokenBucket 테스트 클래스"""
+
+    async def test_limits_rate_after_burst(self):
+        """버스트 소진 후 초당 rate 회로 제한"""
+        bucket = TokenBucket(rate=50, capacity=5)
+
+        started = time.perf_counter()
+        for _ in range(15):
+            await bucket.acquire()
+        elapsed = time.perf_counter() - started
+
+        assert elapsed >= 10 / 50 * 0.9
+
+    def test_rejects_non_positive_rate(self):
+        """rate는 양수"""
+        with pytest.raises(ValueError):
+            TokenBucket(rate=0)
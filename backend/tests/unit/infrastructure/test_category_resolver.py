@@ -0,0 +1,97 @@
+"""
+업종 검색어 해석기 테스트
+"""
+import pytest
+
+from src.infrastructure.database.category_resolver import (
+    CategoryCatalog,
+    CategoryResolver,
+)
+
+
+@pytest.fixture
+def catalog():
+    return CategoryCatalog(
+        store_names={
+            "Q12": {"커피전문점/카페/다방"},
+            "Q01": {"한식음식점"},
+            "Q05": {"양식음식점"},
+            "D03": {"편의점"},
+            "X99": {"기타음식", "기타 서비스"},
+        },
+        code_names={
+            "Q": {"음식"},
+            "Q12": {"커피점/카페"},
+            "D03": {"편의점", "종합소매점"},
+            "Z01": {"카페"},  # 상가 테이블에 없는 코드
+        },
+    )
+
+
+class TestCategoryCatalog:
+    """CategoryCatalog 테스트 클래스"""
+
+    def test_resolves_term_to_codes(self, catalog):
+        """업종명 부분 일치는 업종코드 목록으로 해석"""
+        category = catalog.resolve("카페")
+
+        assert category.uses_codes
+        assert category.codes == ("Q12",)
+        assert category.sql(3) == (" AND business_code = ANY($3::varchar[])", ["Q12"])
+
+    def test_business_codes_names_extend_match(self, catalog):
+        """업종코드표 분류명으로도 매칭 (상가 테이블에 있는 코드만)"""
+        assert catalog.resolve("종합소매").codes == ("D03",)
+
+    def test_business_codes_names_broaden_ilike(self, catalog):
+        """분류명 매칭은 business_name ILIKE보다 넓음 - 업종명에 검색어가 없는 상가도 포함"""
+        category = catalog.resolve("종합소매")
+
+        assert not any("종합소매" in name for name in catalog.store_names["D03"])
+        assert category.sql(1) == (" AND business_code = ANY($1::varchar[])", ["D03"])
+
+    @pytest.mark.parametrize("term", ["", "   ", "\t\n"])
+    def test_blank_term_is_no_filter(self, catalog, term):
+        """공백뿐인 검색어는 모든 코드가 아니라 필터 없음"""
+        assert catalog.resolve(term) is None
+
+    def test_term_is_stripped(self, catalog):
+        assert catalog.resolve("  카페 ").codes == ("Q12",)
+        assert catalog.resolve(" 자전거 ").pattern == "%자전거%"
+
+    def test_mixed_names_under_one_code_fall_back_to_ilike(self, catalog):
+        """한 코드의 업종명 일부만 맞으면 ILIKE 폴백"""
+        category = catalog.resolve("음식")
+
+        assert not category.uses_codes
+        assert category.sql(2, "s.") == (" AND s.business_name ILIKE $2", "%음식%")
+
+    def test_unknown_term_falls_back_to_ilike(self, catalog):
+        """어떤 코드와도 맞지 않으면 ILIKE 폴백"""
+        category = catalog.resolve("자전거")
+
+        assert category.codes == ()
+        assert category.pattern == "%자전거%"
+
+    def test_case_insensitive(self):
+        """대소문자 무시 (ILIKE와 동일)"""
+        catalog = CategoryCatalog(store_names={"P1": {"PC방"}}, code_names={})
+
+        assert catalog.resolve("pc").codes == ("P1",)
+
+
+class TestCategoryResolver:
+    """CategoryResolver 테스트 클래스"""
+
+    async def test_resolution_is_cached_until_invalidated(self, catalog):
+        """검색어 해석은 캐시되고 invalidate 시 초기화"""
+        resolver = CategoryResolver(pool=None)
+        resolver.load(catalog)
+
+        first = await resolver.resolve("카페")
+        assert await resolver.resolve("카페") is first
+        assert await resolver.resolve(" 카페 ") is first
+        assert await resolver.resolve("  ") is None
+
+        resolver.invalidate()
+        assert not resolver.is_loaded
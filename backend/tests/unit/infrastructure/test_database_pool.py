@@ -0,0 +1,99 @@
+"""
+asyncpg 공유 커넥션 풀 테스트
+"""
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from src.infrastructure.database.pool import DatabasePool
+
+
+def _make_fake_pool():
+    """acquire/release/close를 흉내내는 가짜 asyncpg 풀"""
+    conn = MagicMock()
+    conn.fetchval = AsyncMock(return_value=1)
+
+    acquire_ctx = MagicMock()
+    acquire_ctx.__aenter__ = AsyncMock(return_value=conn)
+    acquire_ctx.__aexit__ = AsyncMock(return_value=False)
+
+    pool = MagicMock()
+    pool.acquire = MagicMock(side_effect=lambda *args, **kwargs: _Awaitable(conn, acquire_ctx))
+    pool.release = AsyncMock()
+    pool.close = AsyncMock()
+    return pool, conn
+
+
+class _Awaitable:
+    """asyncpg PoolAcquireContext처럼 await와 async with 모두 지원"""
+
+    def __init__(self, conn, ctx):
+        self._conn = conn
+        self._ctx = ctx
+
+    def __await__(self):
+        async def _get():
+            return self._conn
+        return _get().__await__()
+
+    async def __aenter__(self):
+        return await self._ctx.__aenter__()
+
+    async def __aexit__(self, *exc):
+        return await self._ctx.__aexit__(*exc)
+
+
+class TestDatabasePool:
+    """DatabasePool 테스트 클래스"""
+
+    @pytest.mark.asyncio
+    async def test_should_open_with_configured_sizes_and_warm_up(self):
+        """설정된 크기로 풀을 만들고 최소 연결 수만큼 워밍업"""
+        fake_pool, conn = _make_fake_pool()
+        with patch("src.infrastructure.database.pool.asyncpg.create_pool",
+                   AsyncMock(return_value=fake_pool)) as create_pool:
+            pool = DatabasePool(dsn="postgresql://test", min_size=3, max_size=7)
+            await pool.open()
+
+        kwargs = create_pool.call_args.kwargs
+        assert kwargs["min_size"] == 3
+        assert kwargs["max_size"] == 7
+        assert conn.fetchval.await_count == 3
+        assert fake_pool.release.await_count == 3
+        assert pool.is_open
+
+    @pytest.mark.asyncio
+    async def test_open_is_idempotent(self):
+        """이미 열린 풀은 다시 생성하지 않음"""
+        fake_pool, _ = _make_fake_pool()
+        with patch("src.infrastructure.database.pool.asyncpg.create_pool",
+                   AsyncMock(return_value=fake_pool)) as create_pool:
+            pool = DatabasePool(dsn="postgresql://test", min_size=1, max_size=2)
+            await pool.open()
+            await pool.open()
+
+        assert create_pool.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_acquire_opens_lazily(self):
+        """시작 시 열리지 않은 풀은 첫 대여 시점에 생성"""
+        fake_pool, conn = _make_fake_pool()
+        with patch("src.infrastructure.database.pool.asyncpg.create_pool",
+                   AsyncMock(return_value=fake_pool)):
+            pool = DatabasePool(dsn="postgresql://test", min_size=1, max_size=2)
+            async with pool.acquire() as acquired:
+                assert acquired is conn
+
+        assert pool.is_open
+
+    @pytest.mark.asyncio
+    async def test_close_releases_pool(self):
+        """close 후에는 풀이 비워짐"""
+        fake_pool, _ = _make_fake_pool()
+        with patch("src.infrastructure.database.pool.asyncpg.create_pool",
+                   AsyncMock(return_value=fake_pool)):
+            pool = DatabasePool(dsn="postgresql://test", min_size=1, max_size=2)
+            await pool.open()
+            await pool.close()
+
+        fake_pool.close.assert_awaited_once()
+        assert not pool.is_open
@@ -0,0 +1,49 @@
+"""
+구면 거리 유틸리티 테스트
+"""
+import math
+
+import numpy as np
+import pytest
+
+from src.domain.value_objects.coordinates import Coordinates
+from src.infrastructure.spatial.geo import (
+    bounding_box,
+    chord_for_km,
+    haversine_km,
+    km_for_chord,
+    unit_vector,
+)
+
+
+class TestGeo:
+    """geo 모듈 테스트 클래스"""
+
+    @pytest.mark.parametrize("target", [(37.5172, 127.0473), (37.4979, 127.0276), (35.1796, 129.0756)])
+    def test_chord_distance_matches_haversine(self, target):
+        """단위 벡터 현 거리로 계산한 거리가 Haversine과 일치"""
+        origin = (37.5066, 127.0534)
+        a = unit_vector(*origin)
+        b = unit_vector(*target)
+        chord = math.sqrt(sum((p - q) ** 2 for p, q in zip(a, b)))
+
+        expected = Coordinates(*origin).distance_to(Coordinates(*target))
+        assert km_for_chord(chord) == pytest.approx(expected, rel=1e-9)
+
+    def test_chord_for_km_roundtrip(self):
+        """km -> 현 -> km 왕복 변환"""
+        for km in [0.1, 1.0, 5.0, 50.0]:
+            assert km_for_chord(chord_for_km(km)) == pytest.approx(km, rel=1e-9)
+
+    def test_bounding_box_contains_radius(self):
+        """반경 원 위의 점이 모두 바운딩 박스 안에 포함"""
+        lat, lon, radius = 37.5066, 127.0534, 2.0
+        min_lat, min_lon, max_lat, max_lon = bounding_box(lat, lon, radius)
+
+        rng = np.random.default_rng(0)
+        lats = rng.uniform(lat - 0.1, lat + 0.1, 20000)
+        lons = rng.uniform(lon - 0.1, lon + 0.1, 20000)
+        inside = haversine_km(lat, lon, lats, lons) <= radius
+
+        assert np.all((lats[inside] >= min_lat) & (lats[inside] <= max_lat))
+        assert np.all((lons[inside] >= min_lon) & (lons[inside] <= max_lon))
@@ -0,0 +1,124 @@
+"""
+MCP stdio 클라이언트 테스트
+
+줄 단위 JSON-RPC로 응답하는 가짜 MCP 서버(파이썬 스크립트)를 띄워
+다중화, 타임아웃, 비정상 종료 후 재기동을 확인합니다.
+"""
+import asyncio
+import sys
+import textwrap
+
+import pytest
+
+from src.infrastructure.mcp import MCPError, MCPStdioClient, MCPTimeoutError
+
+FAKE_SERVER = textwrap.dedent('''
+    import json, os, sys, threading, time
+
+    lock = threading.Lock()
+
+    def reply(message):
+        with lock:
+            sys.stdout.write(json.dumps(message) + "\\n")
+            sys.stdout.flush()
+
+    def text(request_id, value, **extra):
+        reply({"jsonrpc": "2.0", "id": request_id,
+               "result": {"content": [{"type": "text", "text": value}], **extra}})
+
+    def handle(message):
+        name = message["params"]["name"]
+        args = message["params"]["arguments"]
+        if name == "echo":
+            text(message["id"], json.dumps({"args": args, "pid": os.getpid()}))
+        elif name == "sleep":
+            time.sleep(args["seconds"])
+            text(message["id"], json.dumps({"slept": args["seconds"]}))
+        elif name == "fail":
+            text(message["id"], "Error: boom")
+        elif name == "crash":
+            os._exit(3)
+
+    print("fake server booting", file=sys.stderr, flush=True)
+    for line in sys.stdin:
+        message = json.loads(line)
+        method = message.get("method")
+        if method == "initialize":
+            reply({"jsonrpc": "2.0", "id": message["id"],
+                   "result": {"protocolVersion": message["params"]["protocolVersion"],
+                              "capabilities": {"tools": {}}, "serverInfo": {"name": "fake", "version": "1"}}})
+        elif method == "tools/call":
+            # 요청마다 스레드 → 느린 호출 뒤의 빠른 호출이 먼저 응답 (순서 무관 다중화)
+            threading.Thread(target=handle, args=(message,), daemon=True).start()
+        elif "id" in message:
+            reply({"jsonrpc": "2.0", "id": message["id"], "error": {"code": -32601, "message": "Method not found"}})
+''')
+
+
+@pytest.fixture
+async def client(tmp_path):
+    script = tmp_path / "fake_mcp_server.py"
+    script.write_text(FAKE_SERVER, encoding="utf-8")
+    client = MCPStdioClient([sys.executable, str(script)], call_timeout=5.0, max_restart_backoff=0.0)
+    yield client
+    await client.aclose()
+
+
+class TestMCPStdioClient:
+    """MCPStdioClient 테스트 클래스"""
+
+    async def test_concurrent_calls_share_one_process(self, client):
+        """동시 호출이 한 프로세스에서 id로 다중화 (느린 호출이 빠른 호출을 막지 않음)"""
+        slow = asyncio.create_task(client.call_tool("sleep", {"seconds": 0.3}))
+        await asyncio.sleep(0.05)
+        started = asyncio.get_running_loop().time()
+        echoes = await asyncio.gather(*(client.call_tool("echo", {"n": i}) for i in range(20)))
+        elapsed = asyncio.get_running_loop().time() - started
+
+        assert [echo["args"]["n"] for echo in echoes] == list(range(20))
+        assert {echo["pid"] for echo in echoes} == {client.pid}
+        assert elapsed < 0.25
+        assert await slow == {"slept": 0.3}
+        assert client.starts == 1
+        assert client.server_info == {"name": "fake", "version": "1"}
+
+    async def test_timeout_keeps_session(self, client):
+        """타임아웃된 호출만 실패하고 세션은 유지 (늦은 응답은 버림)"""
+        with pytest.raises(MCPTimeoutError):
+            await client.call_tool("sleep", {"seconds": 0.5}, timeout=0.1)
+
+        pid = client.pid
+        assert (await client.call_tool("echo", {}))["pid"] == pid
+        await asyncio.sleep(0.5)
+        assert (await client.call_tool("echo", {}))["pid"] == pid
+
+    async def test_restart_after_crash(self, client):
+        """프로세스가 죽으면 대기 중인 호출은 MCPError, 다음 호출에서 재기동"""
+        first = (await client.call_tool("echo", {}))["pid"]
+        pending = asyncio.create_task(client.call_tool("sleep", {"seconds": 2}))
+        await asyncio.sleep(0.05)
+
+        with pytest.raises(MCPError):
+            await client.call_tool("crash", {})
+        with pytest.raises(MCPError, match="exited"):
+            await pending
+
+        second = (await client.call_tool("echo", {}))["pid"]
+        assert second != first
+        assert client.starts == 2
+
+    async def test_tool_and_protocol_errors(self, client):
+        with pytest.raises(MCPError, match="boom"):
+            await client.call_tool("fail", {})
+        with pytest.raises(MCPError, match="Method not found"):
+            await client.request("resources/list")
+
+    async def test_start_failure_backs_off(self, tmp_path):
+        """실행 파일이 없으면 MCPError, 백오프 동안은 다시 띄우지 않음"""
+        client = MCPStdioClient([str(tmp_path / "missing-node")], max_restart_backoff=30.0)
+
+        with pytest.raises(MCPError, match="start failed"):
+            await client.call_tool("echo", {})
+        with pytest.raises(MCPError, match="backoff"):
+            await client.call_tool("echo", {})
+        assert client.starts == 1
@@ -0,0 +1,168 @@
+"""
+상권 반경 인구 추정 테스트
+"""
+from datetime import date
+import math
+import time
+
+import numpy as np
+import pytest
+
+from src.infrastructure.population import CatchmentEstimator, PopulationCube, read_centroids
+from src.infrastructure.spatial import circle_overlap_km2
+
+KM_PER_DEGREE = 6371.0 * math.pi / 180.0
+
+
+def _row(row_id, code, district, counts, reference_date=date(2025, 5, 31)):
+    total = sum(counts)
+    male = sum(counts[0::2])
+    return (row_id, code, reference_date, "서울특별시", "강남구", district, total, male, total - male, *counts)
+
+
+# 동A: 20대 남녀 100명씩, 동B: 30대 남녀 50명씩
+COUNTS_A = [0] * 22
+COUNTS_A[4:6] = [100, 100]
+COUNTS_B = [0] * 22
+COUNTS_B[6:8] = [50, 50]
+
+ROWS = [
+    _row(1, "A", "동A", COUNTS_A),
+    _row(2, "A", "동A", [1] * 22, date(2024, 12, 31)),     # 이전 월은 쓰지 않음
+    _row(3, "B", "동B", COUNTS_B),
+]
+
+# 동A: 원점, 면적 π km² (반경 1km) / 동B: 동쪽 10km / C: 인구 데이터 없음
+CENTROIDS = [
+    ("A", 37.5, 127.0, math.pi),
+    ("B", 37.5, 127.0 + 10.0 / (KM_PER_DEGREE * math.cos(math.radians(37.5))), math.pi),
+    ("C", 37.5, 127.0, math.pi),
+]
+
+
+class TestCircleOverlap:
+    """두 원 겹친 면적"""
+
+    def test_known_values(self):
+        area = circle_overlap_km2(np.array([1.0, 0.0, 3.0, 0.2, 0.0]), 1.0, np.array([1.0, 0.5, 1.0, 2.0, 1.0]))
+
+        assert area == pytest.approx([2 * math.pi / 3 - math.sqrt(3) / 2, math.pi / 4, 0.0, math.pi, math.pi])
+
+    def test_monte_carlo(self):
+        """부분 겹침 면적이 표본 추정과 일치"""
+        rng = np.random.default_rng(0)
+        points = rng.uniform(-2, 2, size=(400_000, 2))
+        inside = (np.hypot(*points.T) <= 1.5) & (np.hypot(points[:, 0] - 1.2, points[:, 1]) <= 0.8)
+        sampled = inside.mean() * 16.0
+
+        assert circle_overlap_km2(np.array([1.2]), 1.5, np.array([0.8]))[0] == pytest.approx(sampled, rel=0.02)
+
+
+class TestCatchmentEstimator:
+    """CatchmentEstimator 테스트 클래스"""
+
+    @pytest.fixture(scope="class")
+    def cube(self):
+        return PopulationCube(ROWS)
+
+    @pytest.fixture(scope="class")
+    def estimator(self):
+        estimator = CatchmentEstimator()
+        estimator.load(CENTROIDS)
+        return estimator
+
+    def test_full_coverage_uses_latest_month(self, estimator, cube):
+        """읍면동 원을 모두 덮으면 최신 월 인구 전체"""
+        estimate = estimator.estimate(cube, 37.5, 127.0, 2.0)
+
+        assert estimate.population == pytest.approx(200)
+        assert estimate.counts[2].tolist() == pytest.approx([100, 100])
+        assert estimate.weights.tolist() == pytest.approx([1.0])
+
+    def test_partial_coverage_is_area_weighted(self, estimator, cube):
+        """반경 0.5km는 반경 1km 읍면동 면적의 1/4"""
+        estimate = estimator.estimate(cube, 37.5, 127.0, 0.5)
+
+        assert estimate.population == pytest.approx(50)
+        assert estimate.population_between(20, 29) == pytest.approx(50)
+
+    def test_multiple_regions_and_age_range(self, estimator, cube):
+        """두 읍면동에 걸친 반경, 나이 구간은 연령대 안에서 고르게 나눔"""
+        estimate = estimator.estimate(cube, 37.5, 127.0, 11.0)
+
+        assert estimate.population == pytest.approx(300)
+        assert estimate.population_between(20, 39) == pytest.approx(300)
+        assert estimate.population_between(25, 34) == pytest.approx(100 + 50)
+        assert estimate.population_between(min_age=30) == pytest.approx(100)
+        assert estimate.population_between(20, 29, gender="female") == pytest.approx(100)
+        assert estimate.population_between(30, 39, gender="male") == pytest.approx(50)
+        assert estimate.distances_km.tolist() == pytest.approx([0.0, 10.0], abs=1e-3)
+
+    def test_far_point_is_empty(self, estimator, cube):
+        estimate = estimator.estimate(cube, 35.1, 129.0, 1.0)
+
+        assert estimate.population == 0
+        assert estimate.positions.size == 0
+
+    def test_follows_cube_swap(self, estimator, cube):
+        """큐브가 교체되면 중심점-행 정렬을 다시 계산"""
+        estimator.estimate(cube, 37.5, 127.0, 2.0)
+        doubled = PopulationCube([_row(1, "A", "동A", [c * 2 for c in COUNTS_A])])
+
+        assert estimator.estimate(doubled, 37.5, 127.0, 2.0).population == pytest.approx(400)
+
+    def test_not_ready(self, cube):
+        estimator = CatchmentEstimator()
+
+        assert not estimator.is_ready
+        with pytest.raises(RuntimeError):
+            estimator.estimate(cube, 37.5, 127.0, 1.0)
+
+    def test_read_centroids(self, tmp_path):
+        """면적이 비면 None, 좌표가 잘못된 행은 건너뜀"""
+        path = tmp_path / "centroids.csv"
+        path.write_text(
+            "administrative_code,latitude,longitude,area_km2\n"
+            "1111051500,37.5735,126.9790,2.5\n"
+            "1111053000,37.5800,126.9700,\n"
+            "1111054000,,126.9600,1.0\n",
+            encoding="utf-8",
+        )
+
+        centroids = read_centroids(str(path))
+
+        assert centroids == [("1111051500", 37.5735, 126.979, 2.5), ("1111053000", 37.58, 126.97, None)]
+
+        estimator = CatchmentEstimator()
+        estimator.load(centroids)
+        # 면적이 없는 중심점은 면적 중앙값
+        assert estimator.index.radii_km.tolist() == pytest.approx([math.sqrt(2.5 / math.pi)] * 2)
+
+    def test_read_centroids_requires_columns(self, tmp_path):
+        path = tmp_path / "centroids.csv"
+        path.write_text("code,lat,lon\n1,37.5,127.0\n", encoding="utf-8")
+
+        with pytest.raises(ValueError):
+            read_centroids(str(path))
+
+    @pytest.mark.slow
+    def test_nationwide_latency(self):
+        """전국 규모(읍면동 3,600개)에서 반경 3km 추정이 1ms 이내"""
+        rng = np.random.default_rng(5)
+        lats = rng.uniform(34.5, 38.0, 3600)
+        lons = rng.uniform(126.3, 129.4, 3600)
+        centroids = [(f"{i:010d}", lat, lon, area) for i, (lat, lon, area)
+                     in enumerate(zip(lats, lons, rng.uniform(0.5, 40.0, 3600)))]
+        cube = PopulationCube([
+            _row(i + 1, f"{i:010d}", f"동{i:04d}", rng.integers(0, 2000, 22).tolist()) for i in range(3600)
+        ])
+        estimator = CatchmentEstimator()
+        estimator.load(centroids)
+        estimator.estimate(cube, 37.5, 127.0, 3.0)
+
+        started = time.perf_counter()
+        for lat, lon in zip(lats[:500], lons[:500]):
+            estimator.estimate(cube, float(lat), float(lon), 3.0)
+        per_call = (time.perf_counter() - started) / 500
+
+        assert per_call < 0.001
@@ -0,0 +1,262 @@
+"""
+인메모리 인구 큐브 테스트
+"""
+from contextlib import asynccontextmanager
+from datetime import date
+import asyncio
+import time
+
+import numpy as np
+import pytest
+
+from src.infrastructure.population.cube import AGE_BANDS, PopulationCube, PopulationCubeCache
+
+
+def _random_rows(n_regions: int, dates, seed: int = 3):
+    """LOAD_QUERY 컬럼 순서의 가짜 인구 행 (읍면동 × 기준월)"""
+    rng = np.random.default_rng(seed)
+    provinces = ["서울특별시", "경기도", "세종특별자치시"]
+    rows = []
+    row_id = 0
+    for r in range(n_regions):
+        province = provinces[r % len(provinces)]
+        city = None if province == "세종특별자치시" else f"{'가나다라마'[r % 5]}구"
+        district = f"동{r:04d}"
+        for reference_date in dates:
+            row_id += 1
+            counts = rng.integers(0, 2000, 22).tolist()
+            total = sum(counts)
+            male = sum(counts[0::2])
+            rows.append((
+                row_id, f"{r:010d}", reference_date, province, city, district,
+                total, male, total - male, *counts,
+            ))
+    # 적재 순서는 정렬 순서와 무관
+    rng.shuffle(rows)
+    return rows
+
+
+DATES = [date(2024, 12, 31), date(2025, 4, 30), date(2025, 5, 31)]
+
+
+class _GatedPool:
+    """fetch가 gate가 열릴 때까지 기다리는 풀 대용 (호출 시점의 rows를 반환)"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.fetches = 0
+        self.gate = asyncio.Event()
+
+    @asynccontextmanager
+    async def acquire(self):
+        yield self
+
+    async def fetch(self, query):
+        self.fetches += 1
+        rows = list(self.rows)
+        await self.gate.wait()
+        return rows
+
+
+def _sort_key(row):
+    return (-row[2].toordinal(), row[4] or "", row[5] or "", row[0])
+
+
+class TestPopulationCube:
+    """PopulationCube 테스트 클래스"""
+
+    @pytest.fixture(scope="class")
+    def rows(self):
+        return _random_rows(60, DATES)
+
+    @pytest.fixture(scope="class")
+    def cube(self, rows):
+        return PopulationCube(rows)
+
+    @pytest.mark.parametrize("filters", [
+        {},
+        {"province": "경기도"},
+        {"city": "가구", "year": 2025},
+        {"province": "세종특별자치시", "district": "동0002"},
+        {"city": "없는구"},
+    ])
+    def test_select_matches_brute_force(self, cube, rows, filters):
+        """필터 결과가 전수 비교 + /statistics 정렬과 동일"""
+        def keep(row):
+            return (
+                (not filters.get("province") or row[3] == filters["province"])
+                and (not filters.get("city") or row[4] == filters["city"])
+                and (not filters.get("district") or row[5] == filters["district"])
+                and (not filters.get("year") or row[2].year == filters["year"])
+            )
+
+        expected = [row[0] for row in sorted(rows, key=_sort_key) if keep(row)]
+
+        assert cube.ids[cube.select(**filters)].tolist() == expected
+
+    def test_cursor_pages_cover_all_rows(self, cube, rows):
+        """커서를 따라가면 모든 행을 정렬 순서대로 한 번씩 방문"""
+        positions = cube.select(province="서울특별시")
+        seen, after = [], None
+        while True:
+            page = cube.records(cube.page(positions, after, 7))
+            seen.extend(record["id"] for record in page)
+            if len(page) < 7:
+                break
+            last = page[-1]
+            after = [last["reference_date"], last["city"] or "", last["district"], last["id"]]
+
+        assert seen == cube.ids[positions].tolist()
+
+    def test_records_have_sql_columns(self, cube, rows):
+        """행 dict는 SQL 행과 같은 값 (연령대 합계 포함)"""
+        by_id = {row[0]: row for row in rows}
+        record = cube.records(cube.select()[:1])[0]
+        row = by_id[record["id"]]
+
+        assert record["reference_date"] == row[2]
+        assert (record["province"], record["city"], record["district"]) == row[3:6]
+        assert record["total_population"] == row[6]
+        assert record["age_0_9_male"] == row[9]
+        assert record["age_100_plus_female"] == row[30]
+        assert record["age_20_29_total"] == row[13] + row[14]
+
+    def test_top_by_population_with_ties(self):
+        """인구 내림차순, 동률은 정렬 순서 (경계 동률 포함)"""
+        rows = [
+            (i, "0", date(2025, 5, 31), "서울특별시", "강남구", f"동{i}", population, 0, population, *([0] * 22))
+            for i, population in enumerate([5, 9, 7, 9, 7, 7, 1])
+        ]
+        cube = PopulationCube(rows)
+
+        top = cube.top_by_population(cube.select(), 4)
+
+        assert cube.ids[top].tolist() == [1, 3, 2, 4]
+        assert cube.ids[cube.top_by_population(cube.select(min_population=6), 10)].tolist() == [1, 3, 2, 4, 5]
+
+    def test_band_sums_and_summary(self, cube, rows):
+        """연령대×성별 합계와 /summary 통계"""
+        sums = cube.band_sums(cube.select(year=2024))
+        expected = np.array([row[9:31] for row in rows if row[2].year == 2024]).sum(axis=0)
+
+        assert sums.shape == (len(AGE_BANDS), 2)
+        assert sums.ravel().tolist() == expected.tolist()
+        assert cube.summary["total_records"] == len(rows)
+        assert cube.summary["total_population"] == sum(row[6] for row in rows)
+        assert cube.summary["total_cities"] == 5
+
+    def test_matching_is_case_insensitive_substring(self):
+        """시군구/읍면동 부분 일치 (ILIKE)"""
+        rows = [
+            (1, "0", date(2025, 5, 31), "서울특별시", "강남구", "역삼1동", 1, 0, 1, *([0] * 22)),
+            (2, "0", date(2025, 5, 31), "경기도", "성남시", "판교Dong", 1, 0, 1, *([0] * 22)),
+        ]
+        cube = PopulationCube(rows)
+
+        assert cube.ids[cube.matching("강남")].tolist() == [1]
+        assert cube.ids[cube.matching("dong")].tolist() == [2]
+        assert cube.matching("부산").size == 0
+
+    @pytest.fixture(scope="class")
+    def partial_cube(self, rows):
+        """동0004는 2025-05-31 행이 없는 큐브"""
+        return PopulationCube([row for row in rows if not (row[5] == "동0004" and row[2] == DATES[-1])])
+
+    @pytest.mark.parametrize("reference_date, expected, missing", [
+        (None, [("동0001", DATES[-1]), ("동0002", DATES[-1]), ("동0004", DATES[1])], [4, 5]),
+        (DATES[-1], [("동0001", DATES[-1]), ("동0002", DATES[-1])], [1, 4, 5]),
+        (DATES[0], [("동0001", DATES[0]), ("동0002", DATES[0]), ("동0004", DATES[0])], [4, 5]),
+        (date(2020, 1, 31), [], [0, 1, 2, 3, 4, 5]),
+    ])
+    def test_lookup_keys(self, partial_cube, reference_date, expected, missing):
+        """읍면동 키 일괄 조회 - 기준월 미지정 시 읍면동별 최신 월, 시군구 None은 시군구 무관"""
+        keys = [
+            ("경기도", "나구", "동0001"),
+            ("경기도", "마구", "동0004"),
+            ("세종특별자치시", None, "동0002"),
+            ("경기도", None, "동0001"),        # 같은 행 → 한 번만
+            ("경기도", "가구", "동0001"),      # 시군구 불일치
+            ("서울특별시", "가구", "없는동"),
+        ]
+
+        positions, missing_keys, missing_codes = partial_cube.lookup(keys, reference_date=reference_date)
+        records = partial_cube.records(positions)
+
+        assert sorted((r["district"], r["reference_date"]) for r in records) == expected
+        assert np.all(np.diff(positions) > 0)     # 정렬 순서, 중복 없음
+        assert missing_keys == missing
+        assert missing_codes == []
+
+    def test_lookup_codes_and_keys_overlap(self, partial_cube):
+        """행정기관코드는 그 코드를 가진 행 중 최신 월, 키와 겹치는 행은 한 번만"""
+        positions, missing_keys, missing_codes = partial_cube.lookup(
+            keys=[("경기도", "나구", "동0001")],
+            codes=["0000000001", "0000000004", "9999999999"],
+        )
+        records = partial_cube.records(positions)
+
+        assert [(r["administrative_code"], r["reference_date"]) for r in records] == [
+            ("0000000001", DATES[-1]), ("0000000004", DATES[1]),
+        ]
+        assert missing_keys == []
+        assert missing_codes == ["9999999999"]
+
+        positions, _, missing_codes = partial_cube.lookup(codes=["0000000004"], reference_date=DATES[-1])
+        assert positions.size == 0
+        assert missing_codes == ["0000000004"]
+
+    def test_empty_cube(self):
+        """빈 테이블도 조회 가능"""
+        cube = PopulationCube([])
+
+        assert cube.lookup([("서울특별시", None, "역삼1동")], ["1"])[1:] == ([0], ["1"])
+        assert cube.records(cube.page(cube.select(city="강남구"), None, 10)) == []
+        assert cube.summary["total_population"] is None
+
+    def test_cache_load(self, rows):
+        """load 후 조회 가능"""
+        cache = PopulationCubeCache(pool=None)
+        assert not cache.is_ready
+
+        cache.load(rows)
+
+        assert cache.is_ready
+        assert cache.cube.size == len(rows)
+
+    async def test_notification_during_rebuild_reruns(self, rows):
+        """재구축이 행을 읽은 뒤 온 알림은 버리지 않고 한 번 더 재구축"""
+        pool = _GatedPool(rows[:10])
+        cache = PopulationCubeCache(pool=pool)
+
+        cache.schedule_refresh()
+        await asyncio.sleep(0)
+        pool.rows = rows
+        cache.schedule_refresh()
+        cache.schedule_refresh()
+        pool.gate.set()
+        await cache._pending
+
+        assert pool.fetches == 2
+        assert cache.cube.size == len(rows)
+
+    @pytest.mark.slow
+    def test_nationwide_latency(self):
+        """전국 규모(읍면동 3,600 × 24개월)에서 /statistics 한 페이지, /age-distribution 상위 10개가 각각 1ms 이내"""
+        dates = [date(2023 + m // 12, m % 12 + 1, 1) for m in range(24)]
+        cube = PopulationCube(_random_rows(3600, dates))
+
+        def per_call_ms(fn, repeat=100):
+            started = time.perf_counter()
+            for _ in range(repeat):
+                fn()
+            return (time.perf_counter() - started) * 1000 / repeat
+
+        statistics_ms = per_call_ms(
+            lambda: cube.records(cube.page(cube.select(province="경기도", year=2024), None, 100))
+        )
+        age_distribution_ms = per_call_ms(
+            lambda: cube.records(cube.top_by_population(cube.select(city="가구"), 10))
+        )
+
+        assert statistics_ms < 1
+        assert age_distribution_ms < 1
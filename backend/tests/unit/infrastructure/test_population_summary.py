@@ -0,0 +1,141 @@
+"""
+인구 요약 스냅샷 캐시 테스트
+"""
+from contextlib import asynccontextmanager
+from datetime import date, datetime, timedelta, timezone
+from email.utils import format_datetime
+import asyncio
+import json
+
+import pytest
+from starlette.requests import Request
+
+from src.infrastructure.population import PopulationSummaryCache, SummarySnapshot, population_summary
+from src.presentation.api.population import get_population_summary
+
+PAYLOAD = (
+    '{"summary" : {"total_records" : 2, "total_population" : 300, "avg_population_per_district" : 150, '
+    '"total_cities" : 1, "total_districts" : 2}, '
+    '"top_regions" : [{"city" : "강남구", "district" : "역삼1동", "population" : 200}]}'
+)
+BUILT_AT = datetime(2026, 10, 17, 9, 30, 15, 123456, tzinfo=timezone.utc)
+
+
+class _GatedPool:
+    """fetchrow가 gate가 열릴 때까지 기다리는 풀 대용 (호출 시점의 스냅샷 행을 반환)"""
+
+    def __init__(self, version):
+        self.version = version
+        self.fetches = 0
+        self.gate = asyncio.Event()
+
+    @asynccontextmanager
+    async def acquire(self):
+        yield self
+
+    async def fetchrow(self, query):
+        self.fetches += 1
+        row = {"version": self.version, "payload": PAYLOAD, "built_at": BUILT_AT}
+        await self.gate.wait()
+        return row
+
+
+def _request(headers=None) -> Request:
+    raw = [(name.lower().encode(), value.encode()) for name, value in (headers or {}).items()]
+    return Request({"type": "http", "method": "GET", "path": "/summary", "headers": raw})
+
+
+class TestSummarySnapshot:
+    """SummarySnapshot 테스트 클래스"""
+
+    def test_body_is_compact_and_keeps_key_order(self):
+        """json_build_object 출력 공백 제거, 키 순서 유지"""
+        snapshot = SummarySnapshot.create(date(2025, 5, 31), PAYLOAD, BUILT_AT)
+
+        assert snapshot.body.startswith(b'{"summary":{"total_records":2,')
+        assert json.loads(snapshot.body) == json.loads(PAYLOAD)
+
+    def test_validators(self):
+        """ETag는 버전 + 본문 해시, Last-Modified는 초 단위 재계산 시각"""
+        snapshot = SummarySnapshot.create(date(2025, 5, 31), PAYLOAD, BUILT_AT)
+        changed = SummarySnapshot.create(date(2025, 5, 31), PAYLOAD.replace("300", "301"), BUILT_AT)
+
+        assert snapshot.headers["ETag"].startswith('"population-summary-20250531-')
+        assert snapshot.headers["ETag"] != changed.headers["ETag"]
+        assert snapshot.headers["Last-Modified"] == "Sat, 17 Oct 2026 09:30:15 GMT"
+
+    @pytest.mark.parametrize("headers, fresh", [
+        ({}, False),
+        ({"If-None-Match": "*"}, True),
+        ({"If-None-Match": '"other", {etag}'}, True),
+        ({"If-None-Match": "W/{etag}"}, True),
+        ({"If-None-Match": '"other"', "If-Modified-Since": "{last_modified}"}, False),
+        ({"If-Modified-Since": "{last_modified}"}, True),
+        ({"If-Modified-Since": "{earlier}"}, False),
+        ({"If-Modified-Since": "not a date"}, False),
+    ])
+    def test_conditional_requests(self, headers, fresh):
+        """If-None-Match가 있으면 우선, 없으면 If-Modified-Since 비교"""
+        snapshot = SummarySnapshot.create(date(2025, 5, 31), PAYLOAD, BUILT_AT)
+        values = {
+            "etag": snapshot.headers["ETag"],
+            "last_modified": snapshot.headers["Last-Modified"],
+            "earlier": format_datetime(BUILT_AT - timedelta(seconds=1), usegmt=True),
+        }
+        request_headers = {name.lower(): value.format(**values) for name, value in headers.items()}
+
+        assert snapshot.is_fresh_for(request_headers) is fresh
+
+    def test_empty_table_version(self):
+        """데이터가 없으면 버전 없이도 스냅샷 생성"""
+        snapshot = SummarySnapshot.create(None, '{"summary" : {}, "top_regions" : []}', BUILT_AT)
+
+        assert snapshot.headers["ETag"].startswith('"population-summary-empty-')
+
+
+class TestSummaryEndpoint:
+    """스냅샷이 있으면 /summary 는 본문을 그대로 응답"""
+
+    @pytest.fixture
+    def loaded(self):
+        previous = population_summary._snapshot
+        population_summary.load(date(2025, 5, 31), PAYLOAD, BUILT_AT)
+        yield population_summary.snapshot
+        population_summary._snapshot = previous
+
+    async def test_serves_snapshot(self, loaded):
+        response = await get_population_summary(_request())
+
+        assert response.status_code == 200
+        assert response.body == loaded.body
+        assert response.headers["etag"] == loaded.headers["ETag"]
+        assert response.headers["content-type"] == "application/json"
+
+    async def test_not_modified(self, loaded):
+        response = await get_population_summary(_request({"If-None-Match": loaded.headers["ETag"]}))
+
+        assert response.status_code == 304
+        assert response.body == b""
+        assert response.headers["etag"] == loaded.headers["ETag"]
+
+    def test_cache_not_ready_until_loaded(self):
+        cache = PopulationSummaryCache(pool=None)
+
+        assert not cache.is_ready
+        cache.load(date(2025, 5, 31), PAYLOAD, BUILT_AT)
+        assert cache.is_ready
+
+    async def test_notification_during_reload_reruns(self):
+        """갱신이 스냅샷을 읽은 뒤 온 알림은 버리지 않고 한 번 더 갱신 (이전 버전 ETag가 남지 않음)"""
+        pool = _GatedPool(date(2025, 4, 30))
+        cache = PopulationSummaryCache(pool=pool)
+
+        cache.schedule_refresh()
+        await asyncio.sleep(0)
+        pool.version = date(2025, 5, 31)
+        cache.schedule_refresh()
+        pool.gate.set()
+        await cache._pending
+
+        assert pool.fetches == 2
+        assert cache.snapshot.version == date(2025, 5, 31)
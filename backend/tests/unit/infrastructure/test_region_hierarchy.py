@@ -0,0 +1,109 @@
+"""
+행정구역 계층 캐시 테스트
+"""
+import pytest
+
+from src.infrastructure.database.region_hierarchy import (
+    POPULATION_CHANGED_CHANNEL,
+    RegionHierarchy,
+    RegionTree,
+)
+
+ROWS = [
+    ("경기도", "성남시 분당구", "정자동"),
+    ("서울특별시", "강남구", "역삼1동"),
+    ("서울특별시", "강남구", "역삼2동"),
+    ("서울특별시", "종로구", "청운효자동"),
+    ("서울특별시", "종로구", None),
+    ("세종특별자치시", None, None),
+]
+
+
+class FakeConnection:
+    """fetch 호출 횟수를 기록하는 가짜 연결"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.fetches = 0
+
+    async def fetch(self, query, *args):
+        self.fetches += 1
+        return self.rows
+
+
+class TestRegionTree:
+    """RegionTree 테스트 클래스"""
+
+    def test_levels_keep_query_order(self):
+        """각 단계는 쿼리 정렬 순서를 유지하고 빈 이름은 제외"""
+        tree = RegionTree.from_rows(ROWS)
+
+        assert tree.provinces == ("경기도", "서울특별시", "세종특별자치시")
+        assert tree.cities_of("서울특별시") == ("강남구", "종로구")
+        assert tree.cities_of("세종특별자치시") == ()
+        assert tree.districts_of("서울특별시", "종로구") == ("청운효자동",)
+        assert tree.districts_of("서울특별시", "없는구") == ()
+
+    def test_nested_matches_location_response(self):
+        """get_unique_locations 응답 구조"""
+        nested = RegionTree.from_rows(ROWS).nested
+
+        assert nested["provinces"] == ["경기도", "서울특별시", "세종특별자치시"]
+        assert nested["cities"]["경기도"] == ["성남시 분당구"]
+        assert nested["districts"]["서울특별시"] == {
+            "강남구": ["역삼1동", "역삼2동"],
+            "종로구": ["청운효자동"],
+        }
+        assert nested["districts"]["세종특별자치시"] == {}
+
+    def test_tree_is_immutable(self):
+        """트리는 수정할 수 없음"""
+        tree = RegionTree.from_rows(ROWS)
+
+        with pytest.raises(TypeError):
+            tree.cities["부산광역시"] = ()
+
+
+class TestRegionHierarchy:
+    """RegionHierarchy 테스트 클래스"""
+
+    @pytest.mark.asyncio
+    async def test_single_query_until_invalidated(self):
+        """조회는 쿼리 한 번 후 캐시, 적재 알림 시 재적재"""
+        conn = FakeConnection(ROWS)
+        hierarchy = RegionHierarchy(pool=None)
+
+        first = await hierarchy.get(conn)
+        assert await hierarchy.get(conn) is first
+        assert conn.fetches == 1
+
+        hierarchy._on_notify(None, 0, POPULATION_CHANGED_CHANNEL, "")
+        assert hierarchy.current is None
+
+        await hierarchy.get(conn)
+        assert conn.fetches == 2
+
+    @pytest.mark.asyncio
+    async def test_ttl_expiry_reloads(self):
+        """TTL이 지나면 재적재"""
+        conn = FakeConnection(ROWS)
+        hierarchy = RegionHierarchy(pool=None, ttl_seconds=0)
+        hierarchy.load(RegionTree.from_rows(ROWS[:1]))
+        object.__setattr__(hierarchy._tree, "loaded_at", 0.0)
+
+        tree = await hierarchy.get(conn)
+
+        assert conn.fetches == 1
+        assert len(tree.provinces) == 3
+
+    def test_sync_loader_called_once(self):
+        """동기 세션 경로도 같은 캐시 사용"""
+        calls = []
+        hierarchy = RegionHierarchy(pool=None)
+
+        def fetch_rows():
+            calls.append(1)
+            return ROWS
+
+        assert hierarchy.get_sync(fetch_rows) is hierarchy.get_sync(fetch_rows)
+        assert len(calls) == 1
@@ -0,0 +1,177 @@
+"""
+입지 점수 엔진 테스트
+"""
+from datetime import date
+import time
+
+import numpy as np
+import pytest
+
+from src.infrastructure.database import CategoryFilter
+from src.infrastructure.population import PopulationCube, SiteScorer, StoreCategoryCounts, score_sites
+from src.infrastructure.population.site_scoring import component_weights, percentile_ranks
+
+# 20대만 1
+TWENTIES = np.zeros(11)
+TWENTIES[2] = 1.0
+
+
+def _row(row_id, city, district, counts, reference_date=date(2025, 5, 31)):
+    total = sum(counts)
+    male = sum(counts[0::2])
+    return (row_id, f"{row_id:010d}", reference_date, "서울특별시", city, district, total, male, total - male, *counts)
+
+
+def _counts(twenties, others):
+    """20대 남녀 twenties명씩, 40대 남녀 others명씩"""
+    counts = [0] * 22
+    counts[4:6] = [twenties, twenties]
+    counts[8:10] = [others, others]
+    return counts
+
+
+CUBE_ROWS = [
+    _row(1, "강남구", "역삼1동", _counts(5000, 5000)),
+    _row(2, "강남구", "역삼1동", _counts(1, 1), date(2024, 12, 31)),   # 이전 월은 쓰지 않음
+    _row(3, "관악구", "신림동", _counts(8000, 2000)),
+    _row(4, "종로구", "청운효자동", _counts(8000, 2000)),
+    _row(5, "종로구", "사직동", _counts(1000, 1000)),                   # 인구 4천 명 - 제외
+]
+
+# (시도, 시군구, 읍면동, 업종코드, 업종명, 상가 수)
+STORE_ROWS = [
+    ("서울특별시", "강남구", "역삼1동", "Q12", "카페", 40),
+    ("서울특별시", "강남구", "역삼1동", "Q01", "한식음식점", 10),
+    ("서울특별시", "관악구", "신림동", "Q12", "카페", 30),
+    ("서울특별시", "관악구", "신림동", "D05", "의류소매", 3),
+    ("서울특별시", "종로구", "청운효자동", "Q12", "카페", 2),
+    ("부산광역시", "해운대구", "우동", "Q12", "카페", 99),               # 인구 데이터 없는 읍면동
+]
+
+
+class TestScoreSites:
+    """score_sites 테스트 클래스"""
+
+    def test_percentile_ranks_midrank_ties(self):
+        assert percentile_ranks(np.array([10.0, 0.0, 0.0, 5.0])).tolist() == [1.0, 1 / 6, 1 / 6, 2 / 3]
+        assert percentile_ranks(np.array([3.0])).tolist() == [0.5]
+
+    def test_component_weights(self):
+        assert component_weights({"target_share": 2, "population": 2}).tolist() == [0.5, 0.5, 0.0, 0.0]
+        with pytest.raises(ValueError):
+            component_weights({"rent": 1.0})
+        with pytest.raises(ValueError):
+            component_weights({"population": 0.0})
+
+    def test_directions_and_top_k(self):
+        """타겟 비중·인구는 클수록, 경쟁 상가 수·포화도는 작을수록 유리"""
+        population = np.array([20000, 20000, 20000, 3000])
+        bands = np.zeros((4, 11), dtype=np.int64)
+        bands[:, 2] = [10000, 2000, 10000, 3000]
+        competitors = np.array([50, 0, 0, 0])
+
+        scores = score_sites(population, bands, competitors, TWENTIES)
+
+        # 인구 3천 명 읍면동은 제외
+        assert scores.indices.tolist() == [0, 1, 2]
+        assert scores.target_share.tolist() == pytest.approx([0.5, 0.1, 0.5])
+        assert scores.per_thousand.tolist() == pytest.approx([2.5, 0.0, 0.0])
+        # 타겟 비중이 같고 경쟁이 없는 2번이 1위, 경쟁 상가가 많은 0번이 최하위
+        assert scores.top(3).tolist() == [2, 1, 0]
+        assert scores.top(1).tolist() == [2]
+        assert scores.scores.max() <= 100.0
+
+    def test_weights_change_ranking(self):
+        """경쟁만 보면 경쟁 없는 지역, 타겟 비중만 보면 타겟 비중 높은 지역"""
+        population = np.array([20000, 20000])
+        bands = np.zeros((2, 11), dtype=np.int64)
+        bands[:, 2] = [10000, 2000]
+        competitors = np.array([30, 0])
+
+        assert score_sites(population, bands, competitors, TWENTIES, {"competition": 1.0}).top(1).tolist() == [1]
+        assert score_sites(population, bands, competitors, TWENTIES, {"target_share": 1.0}).top(1).tolist() == [0]
+
+    def test_top_keeps_first_on_ties(self):
+        population = np.full(6, 10000)
+        bands = np.zeros((6, 11), dtype=np.int64)
+
+        scores = score_sites(population, bands, np.zeros(6, dtype=np.int64), TWENTIES)
+
+        assert scores.top(3).tolist() == [0, 1, 2]
+        assert scores.top(0).size == 0
+
+
+class TestSiteScorer:
+    """SiteScorer 테스트 클래스"""
+
+    @pytest.fixture(scope="class")
+    def cube(self):
+        return PopulationCube(CUBE_ROWS)
+
+    @pytest.fixture
+    def scorer(self):
+        scorer = SiteScorer()
+        scorer.load(STORE_ROWS)
+        return scorer
+
+    def test_region_counts_by_code_and_name(self):
+        counts = StoreCategoryCounts.build(STORE_ROWS)
+
+        assert counts.region_counts(CategoryFilter("카페", codes=("Q12",))).tolist() == [40, 30, 2, 99]
+        assert counts.region_counts(CategoryFilter("의류", pattern="%의류%")).tolist() == [0, 3, 0, 0]
+        # 업종 필터 없음 = 모든 영업 상가
+        assert counts.region_counts(None).tolist() == [50, 33, 2, 99]
+
+    def test_score_cube_aligns_latest_month(self, scorer, cube):
+        scores, positions = scorer.score_cube(cube, CategoryFilter("카페", codes=("Q12",)), TWENTIES)
+
+        districts = [cube.districts[p] for p in positions.tolist()]
+        assert sorted(districts) == ["신림동", "역삼1동", "청운효자동"]
+        assert cube.reference_dates[positions[districts.index("역삼1동")]] == date(2025, 5, 31)
+        assert scores.competitors[districts.index("역삼1동")] == 40
+        # 타겟 비중이 같으면 카페가 적은 청운효자동이 신림동보다 앞섬
+        assert [districts[i] for i in scores.top(3).tolist()] == ["청운효자동", "신림동", "역삼1동"]
+
+    def test_no_open_stores(self, cube):
+        """영업 상가가 없으면 모든 읍면동 경쟁 상가 0으로 평가"""
+        scorer = SiteScorer()
+        scorer.load([])
+
+        scores, positions = scorer.score_cube(cube, CategoryFilter("카페", codes=("Q12",)), TWENTIES)
+
+        assert scores.size == 3
+        assert scores.competitors.tolist() == [0, 0, 0]
+        assert scores.top(1).size == 1
+
+    def test_invalidate_requires_reload(self, scorer, cube):
+        scorer.invalidate()
+
+        assert not scorer.is_loaded
+        with pytest.raises(RuntimeError):
+            scorer.score_cube(cube, CategoryFilter("카페", codes=("Q12",)), TWENTIES)
+
+    @pytest.mark.slow
+    def test_nationwide_latency(self):
+        """전국 규모(읍면동 3,600개 × 2개월, 업종 250종)에서 평가 + 상위 5개 선택이 50ms 이내"""
+        rng = np.random.default_rng(7)
+        cube = PopulationCube([
+            _row(i + 1 + month * 3600, f"시군구{i // 15:03d}", f"동{i:04d}", rng.integers(0, 3000, 22).tolist(),
+                 date(2025, 5, 31) if month == 0 else date(2024, 12, 31))
+            for month in range(2) for i in range(3600)
+        ])
+        scorer = SiteScorer()
+        scorer.load([
+            ("서울특별시", f"시군구{i // 15:03d}", f"동{i:04d}", f"C{code:03d}", f"업종{code:03d}", int(count))
+            for i in range(3600) for code, count in zip(rng.choice(250, 30, replace=False), rng.integers(1, 80, 30))
+        ])
+        category = CategoryFilter("업종", codes=("C001", "C002"))
+        scorer.score_cube(cube, category, TWENTIES)
+
+        started = time.perf_counter()
+        for _ in range(20):
+            scores, positions = scorer.score_cube(cube, category, TWENTIES)
+            scores.top(5)
+        per_call = (time.perf_counter() - started) / 20
+
+        assert scores.size > 3000
+        assert per_call < 0.05
@@ -0,0 +1,234 @@
+"""
+상가 밀도 타일 테스트
+"""
+import math
+import time
+
+import numpy as np
+import pytest
+
+from src.infrastructure.spatial.density import (
+    DIRTY_ZOOM,
+    StoreDensityTiles,
+    morton_encode,
+    tile_overlaps,
+    tiles_for_bbox,
+)
+from src.infrastructure.spatial.store_index import StoreSpatialIndex
+
+
+def _random_stores(n: int, seed: int = 7):
+    """서울 일대에 흩어진 가짜 상가 (id, lat, lon, 업종명, 업종코드)"""
+    rng = np.random.default_rng(seed)
+    lats = rng.uniform(37.45, 37.60, n)
+    lons = rng.uniform(126.90, 127.10, n)
+    categories = [("카페", "Q12"), ("한식음식점", "Q01"), ("편의점", "D03")]
+    picks = rng.integers(0, len(categories), n)
+    return [
+        (i + 1, float(lats[i]), float(lons[i]), categories[picks[i]][0], categories[picks[i]][1])
+        for i in range(n)
+    ]
+
+
+def _tile_of(lat: float, lon: float, zoom: int):
+    """표준 슬리피 맵 타일 공식 (스칼라)"""
+    n = 2 ** zoom
+    lat_rad = math.radians(lat)
+    x = int((lon + 180.0) / 360.0 * n)
+    y = int((1.0 - math.asinh(math.tan(lat_rad)) / math.pi) / 2.0 * n)
+    return x, y
+
+
+def _service(stores):
+    index = StoreSpatialIndex(pool=None)
+    index.load(stores)
+    service = StoreDensityTiles(index=index, detail=4, cache_size=128)
+    service.load(index.snapshot)
+    return index, service
+
+
+class TestStoreDensityTiles:
+    """StoreDensityTiles 테스트 클래스"""
+
+    @pytest.fixture(scope="class")
+    def stores(self):
+        return _random_stores(3000)
+
+    @pytest.mark.parametrize("zoom", [10, 13, 15])
+    async def test_cells_match_brute_force(self, stores, zoom):
+        """셀별 건수가 상가마다 타일 좌표를 계산한 결과와 동일"""
+        _, service = _service(stores)
+        detail = 4
+        for tx, ty in {_tile_of(lat, lon, zoom) for _, lat, lon, _, _ in stores[:20]}:
+            tile = await service.tile(zoom, tx, ty, detail)
+
+            expected = {}
+            for _, lat, lon, _, _ in stores:
+                cx, cy = _tile_of(lat, lon, zoom + detail)
+                if (cx >> detail, cy >> detail) == (tx, ty):
+                    expected[(cx, cy)] = expected.get((cx, cy), 0) + 1
+
+            actual = dict(zip(zip(tile.cell_x.tolist(), tile.cell_y.tolist()), tile.counts.tolist()))
+            assert actual == expected
+
+    async def test_code_breakdown_and_filter(self, stores):
+        """업종코드별 건수 합 = 셀 건수, 코드 필터는 해당 코드만 집계"""
+        _, service = _service(stores)
+        x, y = _tile_of(37.52, 127.0, 12)
+        tile = await service.tile(12, x, y, by_code=True)
+        cafes = await service.tile(12, x, y, business_codes=["Q12"])
+        by_name = await service.tile(12, x, y, business_type="카페")
+
+        assert all(sum(cell["by_code"].values()) == cell["count"] for cell in tile.cells())
+        assert cafes.total == sum(cell["by_code"].get("Q12", 0) for cell in tile.cells())
+        assert by_name.total == cafes.total
+
+    async def test_tiles_are_cached(self, stores):
+        """같은 타일/필터 재요청은 캐시된 결과 반환"""
+        _, service = _service(stores)
+        x, y = _tile_of(37.52, 127.0, 14)
+
+        first = await service.tile(14, x, y)
+        assert await service.tile(14, x, y) is first
+        assert await service.tile(14, x, y, business_codes=["Q01"]) is not first
+
+    async def test_rebuild_evicts_only_changed_area(self, stores):
+        """스냅샷 재구축 시 내용이 바뀐 영역의 타일만 캐시에서 제거"""
+        index, service = _service(stores)
+        moved_id, lat, lon, name, code = stores[0]
+        far = next(s for s in stores if _tile_of(s[1], s[2], DIRTY_ZOOM) != _tile_of(lat, lon, DIRTY_ZOOM))
+        changed_tile = _tile_of(lat, lon, 14)
+        other_tile = _tile_of(far[1], far[2], 14)
+
+        changed_before = await service.tile(14, *changed_tile)
+        other_before = await service.tile(14, *other_tile)
+        overview_before = await service.tile(8, *_tile_of(lat, lon, 8))
+
+        replacement = ("미용실", "F01")
+        assert (name, code) != replacement
+        index.load([(moved_id, lat, lon) + replacement] + stores[1:])
+        service.load(index.snapshot)
+
+        assert await service.tile(14, *other_tile) is other_before
+        assert await service.tile(14, *changed_tile) is not changed_before
+        assert await service.tile(8, *_tile_of(lat, lon, 8)) is not overview_before
+
+    async def test_identical_rebuild_keeps_cache(self, stores):
+        """같은 데이터로 재구축하면 캐시 유지"""
+        index, service = _service(stores)
+        x, y = _tile_of(37.52, 127.0, 13)
+        before = await service.tile(13, x, y)
+
+        index.load(list(reversed(stores)))
+        service.load(index.snapshot)
+
+        assert await service.tile(13, x, y) is before
+
+
+def test_tiles_for_bbox_covers_box():
+    """바운딩 박스 모서리 타일이 모두 포함"""
+    tiles = tiles_for_bbox(37.45, 126.9, 37.6, 127.1, 12)
+    xs = {x for x, _ in tiles}
+    ys = {y for _, y in tiles}
+
+    assert _tile_of(37.6, 126.9, 12) in tiles
+    assert _tile_of(37.45, 127.1, 12) in tiles
+    assert len(tiles) == len(xs) * len(ys)
+
+
+def test_tiles_for_bbox_rejects_span_before_building():
+    """max_tiles를 넘는 박스는 목록을 만들기 전에 ValueError"""
+    assert len(tiles_for_bbox(37.45, 126.9, 37.6, 127.1, 12, max_tiles=64)) <= 64
+
+    started = time.perf_counter()
+    with pytest.raises(ValueError):
+        tiles_for_bbox(33.0, 124.0, 38.6, 132.0, 24, max_tiles=64)
+    assert time.perf_counter() - started < 0.05
+
+
+def test_tile_overlaps_across_zoom_levels():
+    """상위 줌 타일은 하위 변경 타일을 포함하면 겹침"""
+    x, y = _tile_of(37.5, 127.0, DIRTY_ZOOM)
+    dirty = morton_encode(np.array([x]), np.array([y]))
+
+    assert tile_overlaps(DIRTY_ZOOM, x, y, dirty)
+    assert tile_overlaps(DIRTY_ZOOM - 4, x >> 4, y >> 4, dirty)
+    assert tile_overlaps(DIRTY_ZOOM + 3, (x << 3) + 5, (y << 3) + 2, dirty)
+    assert not tile_overlaps(DIRTY_ZOOM, x + 1, y, dirty)
+
+
+class TestMarkerClusters:
+    """StoreDensityTiles.markers 테스트 클래스"""
+
+    @pytest.fixture(scope="class")
+    def stores(self):
+        return _random_stores(3000, seed=11)
+
+    async def test_clusters_match_members(self, stores):
+        """클러스터 건수/무게중심/최다 업종이 셀 구성원으로 계산한 값과 동일"""
+        index = StoreSpatialIndex(pool=None)
+        index.load(stores)
+        service = StoreDensityTiles(index=index, cluster_detail=2, cluster_max_zoom=17)
+        zoom = 13
+        x, y = _tile_of(37.52, 127.0, zoom)
+        markers = await service.markers(zoom, x, y)
+
+        groups = {}
+        for store in stores:
+            if _tile_of(store[1], store[2], zoom) == (x, y):
+                groups.setdefault(_tile_of(store[1], store[2], zoom + 2), []).append(store)
+
+        expected = {}
+        for members in groups.values():
+            if len(members) < 2:
+                continue
+            codes = [code for *_, code in members]
+            top = max(codes.count(code) for code in codes)
+            lat = round(sum(m[1] for m in members) / len(members), 6)
+            expected[(len(members), lat)] = (top, {code for code in codes if codes.count(code) == top})
+
+        clusters = markers.clusters()
+        assert len(clusters) == len(expected)
+        for cluster in clusters:
+            top, tied = expected[(cluster["count"], cluster["latitude"])]
+            assert cluster["dominant_business_code"] in tied
+            assert round(cluster["dominant_share"] * cluster["count"]) == top
+        assert sorted(s["id"] for s in markers.stores()) == sorted(
+            m[0][0] for m in groups.values() if len(m) == 1
+        )
+        assert markers.total == sum(len(m) for m in groups.values())
+
+    async def test_individual_stores_past_threshold(self, stores):
+        """임계 줌 이상에서는 클러스터 없이 필터된 개별 상가"""
+        index = StoreSpatialIndex(pool=None)
+        index.load(stores)
+        service = StoreDensityTiles(index=index, cluster_max_zoom=15)
+        lat, lon = stores[0][1], stores[0][2]
+        x, y = _tile_of(lat, lon, 15)
+
+        markers = await service.markers(15, x, y, business_codes=[stores[0][4]])
+
+        assert markers.clusters() == []
+        assert stores[0][0] in {s["id"] for s in markers.stores()}
+        assert {s["business_code"] for s in markers.stores()} == {stores[0][4]}
+
+    @pytest.mark.slow
+    async def test_dense_district_clusters_in_milliseconds(self):
+        """강남구 규모(약 40km², 6만 곳) 뷰포트 클러스터링이 타일당 수 ms 이내"""
+        rng = np.random.default_rng(3)
+        n = 60000
+        lats = rng.normal(37.50, 0.015, n)
+        lons = rng.normal(127.05, 0.02, n)
+        stores = [(i + 1, float(lats[i]), float(lons[i]), "카페", "Q12") for i in range(n)]
+        index = StoreSpatialIndex(pool=None)
+        index.load(stores)
+        service = StoreDensityTiles(index=index)
+        service.load(index.snapshot)
+
+        tiles = tiles_for_bbox(37.46, 127.00, 37.54, 127.10, 14)
+        started = time.perf_counter()
+        for x, y in tiles:
+            await service.markers(14, x, y)
+        per_tile_ms = (time.perf_counter() - started) / len(tiles) * 1000
+
+        assert per_tile_ms < 10, f"{per_tile_ms:.2f} ms per tile"
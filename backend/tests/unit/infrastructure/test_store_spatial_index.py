@@ -0,0 +1,165 @@
+"""
+상가 인메모리 공간 인덱스 테스트
+"""
+import time
+
+import numpy as np
+import pytest
+
+from src.domain.value_objects.coordinates import Coordinates
+from src.infrastructure.spatial.store_index import RadiusProbe, StoreSpatialIndex
+
+
+def _random_stores(n: int, seed: int = 42):
+    """서울 일대에 흩어진 가짜 상가 (id, lat, lon, 업종명, 업종코드)"""
+    rng = np.random.default_rng(seed)
+    lats = rng.uniform(37.40, 37.70, n)
+    lons = rng.uniform(126.80, 127.20, n)
+    categories = [("카페", "Q12"), ("한식음식점", "Q01"), ("편의점", "D03"), ("미용실", "F01")]
+    picks = rng.integers(0, len(categories), n)
+    return [
+        (i + 1, float(lats[i]), float(lons[i]), categories[picks[i]][0], categories[picks[i]][1])
+        for i in range(n)
+    ]
+
+
+def _brute_force(stores, lat, lon, radius_km, business_type=None):
+    """모든 상가에 대해 Haversine 거리 계산"""
+    origin = Coordinates(lat, lon)
+    hits = []
+    for store_id, s_lat, s_lon, name, _ in stores:
+        if business_type and business_type not in name:
+            continue
+        distance = origin.distance_to(Coordinates(s_lat, s_lon))
+        if distance <= radius_km:
+            hits.append((distance, store_id))
+    hits.sort()
+    return hits
+
+
+class TestStoreSpatialIndex:
+    """StoreSpatialIndex 테스트 클래스"""
+
+    @pytest.fixture(scope="class")
+    def stores(self):
+        return _random_stores(5000)
+
+    @pytest.fixture(scope="class")
+    def index(self, stores):
+        index = StoreSpatialIndex(pool=None, cell_deg=0.01)
+        index.load(stores)
+        return index
+
+    @pytest.mark.parametrize("radius_km", [0.3, 1.0, 3.0])
+    def test_radius_query_matches_brute_force(self, index, stores, radius_km):
+        """격자 가지치기 결과가 전수 계산과 동일"""
+        ids, distances = index.query_radius(37.5066, 127.0534, radius_km)
+        expected = _brute_force(stores, 37.5066, 127.0534, radius_km)
+
+        assert ids.tolist() == [store_id for _, store_id in expected]
+        assert np.allclose(distances, [d for d, _ in expected])
+
+    def test_category_filter(self, index, stores):
+        """업종명 부분 일치 필터"""
+        ids, _ = index.query_radius(37.55, 127.0, 2.0, business_type="음식")
+        expected = _brute_force(stores, 37.55, 127.0, 2.0, business_type="음식")
+
+        assert ids.tolist() == [store_id for _, store_id in expected]
+
+    def test_limit_keeps_nearest(self, index, stores):
+        """limit 적용 시 가장 가까운 순으로 잘림"""
+        ids, distances = index.query_radius(37.55, 127.0, 5.0, limit=10)
+        expected = _brute_force(stores, 37.55, 127.0, 5.0)[:10]
+
+        assert ids.tolist() == [store_id for _, store_id in expected]
+        assert list(distances) == sorted(distances)
+
+    def test_query_outside_grid_returns_empty(self, index):
+        """데이터가 없는 영역은 빈 결과"""
+        ids, distances = index.query_radius(35.1, 129.0, 1.0)
+
+        assert ids.size == 0
+        assert distances.size == 0
+
+    def test_query_before_build_raises(self):
+        """구축 전 조회는 RuntimeError"""
+        index = StoreSpatialIndex(pool=None)
+
+        with pytest.raises(RuntimeError):
+            index.query_radius(37.5, 127.0, 1.0)
+
+    @pytest.mark.slow
+    def test_nationwide_lookup_latency(self):
+        """전국 규모(200만) 반경 1km 조회가 10ms 이내"""
+        rng = np.random.default_rng(7)
+        n = 2_000_000
+        lats = rng.uniform(33.0, 38.6, n)
+        lons = rng.uniform(124.6, 131.9, n)
+        rows = [(i, lats[i], lons[i], "카페", "Q12") for i in range(n)]
+        index = StoreSpatialIndex(pool=None)
+        index.load(rows)
+
+        started = time.perf_counter()
+        for _ in range(100):
+            index.query_radius(37.5066, 127.0534, 1.0, limit=100)
+        elapsed_ms = (time.perf_counter() - started) * 1000 / 100
+
+        assert elapsed_ms < 10
+
+    def test_business_code_filter(self, index, stores):
+        """업종코드 필터는 해당 코드 상가만 반환"""
+        ids, _ = index.query_radius(37.55, 127.0, 2.0, business_codes=["Q12", "D03"])
+        expected = [
+            store_id for _, store_id in _brute_force(stores, 37.55, 127.0, 2.0)
+            if stores[store_id - 1][4] in ("Q12", "D03")
+        ]
+
+        assert ids.tolist() == expected
+
+    def test_batch_probes_match_single_queries(self, index, stores):
+        """다중 지점 조회의 건수/업종 분포/최근접 k개가 지점별 전수 계산과 동일"""
+        probes = [
+            RadiusProbe(37.5066, 127.0534, 1.0),
+            RadiusProbe(37.55, 127.0, 2.0, business_type="음식"),
+            RadiusProbe(37.45, 126.9, 1.5, business_codes=("Q12", "D03")),
+            RadiusProbe(35.1, 129.0, 1.0),
+        ]
+        results = index.query_probes(probes, nearest_k=5)
+
+        for probe, result in zip(probes, results):
+            expected = [
+                (distance, store_id)
+                for distance, store_id in _brute_force(
+                    stores, probe.latitude, probe.longitude, probe.radius_km, probe.business_type
+                )
+                if probe.business_codes is None or stores[store_id - 1][4] in probe.business_codes
+            ]
+            histogram = {}
+            for _, store_id in expected:
+                code = stores[store_id - 1][4]
+                histogram[code] = histogram.get(code, 0) + 1
+
+            assert result.total_count == len(expected)
+            assert result.histogram == histogram
+            assert result.nearest_ids.tolist() == [store_id for _, store_id in expected[:5]]
+            assert np.allclose(result.nearest_distances, [d for d, _ in expected[:5]])
+
+    @pytest.mark.slow
+    def test_batch_faster_than_sequential(self, index):
+        """100개 지점 일괄 조회가 지점별 순차 조회보다 빠름"""
+        rng = np.random.default_rng(1)
+        probes = [
+            RadiusProbe(float(lat), float(lon), 1.0)
+            for lat, lon in zip(rng.uniform(37.45, 37.65, 100), rng.uniform(126.85, 127.15, 100))
+        ]
+
+        started = time.perf_counter()
+        for probe in probes:
+            index.query_radius(probe.latitude, probe.longitude, probe.radius_km, limit=5)
+        sequential = time.perf_counter() - started
+
+        started = time.perf_counter()
+        index.query_probes(probes, nearest_k=5)
+        batch = time.perf_counter() - started
+
+        assert batch < sequential, f"batch {batch * 1000:.1f} ms, sequential {sequential * 1000:.1f} ms"
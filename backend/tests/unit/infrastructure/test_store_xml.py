@@ -0,0 +1,188 @@
+"""
+상가정보 API XML 스트리밍 파서 테스트
+"""
+from datetime import date, datetime
+import gc
+import time
+import tracemalloc
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from src.infrastructure.api.store_xml import (
+    StorePageParser,
+    XML_FIELD_MAPPING,
+    parse_store_rows,
+    row_to_dict,
+)
+
+
+def _item_xml(i: int) -> str:
+    """sdsc2 storeListInDong 응답의 item 한 건 (실제 응답과 같은 태그 구성)"""
+    return (
+        "<item>"
+        f"<bizesId>MA0101202210A{i:07d}</bizesId><bizesNm>테스트상가{i}</bizesNm><brchNm></brchNm>"
+        "<indsLclsCd>I2</indsLclsCd><indsLclsNm>음식</indsLclsNm>"
+        "<indsMclsCd>I201</indsMclsCd><indsMclsNm>한식</indsMclsNm>"
+        "<indsSclsCd>I20101</indsSclsCd><indsSclsNm>백반/한정식</indsSclsNm>"
+        "<ksicCd>I56111</ksicCd><ksicNm>한식 일반 음식점업</ksicNm>"
+        "<ctprvnCd>11</ctprvnCd><ctprvnNm>서울특별시</ctprvnNm>"
+        "<signguCd>11680</signguCd><signguNm>강남구</signguNm>"
+        "<adongCd>1168064000</adongCd><adongNm>역삼1동</adongNm>"
+        "<ldongCd>1168010100</ldongCd><ldongNm>역삼동</ldongNm>"
+        f"<lnoCd>116801010010{i % 1000:04d}</lnoCd><plotSctCd>1</plotSctCd><plotSctNm>대지</plotSctNm>"
+        f"<lnoMnno>{i % 900}</lnoMnno><lnoSlno>{i % 13}</lnoSlno>"
+        f"<lnmadr>서울특별시 강남구 역삼동 {i % 900}-{i % 13}</lnmadr>"
+        "<rdnmCd>116803122010</rdnmCd><rdnm>서울특별시 강남구 테헤란로</rdnm>"
+        f"<bldMnno>{i % 500}</bldMnno><bldSlno></bldSlno><bldMngNo>1168010100107370000000001</bldMngNo>"
+        f"<bldNm>역삼빌딩{i % 50}</bldNm>"
+        f"<rdnmadr>서울특별시 강남구 테헤란로 {i % 500}</rdnmadr>"
+        "<oldZipcd>135080</oldZipcd><newZipcd>06234</newZipcd>"
+        f"<dongNo></dongNo><flrNo>{i % 20}</flrNo><flrInfo>{i % 20}</flrInfo><hoNo></hoNo><hoInfo></hoInfo>"
+        f"<lon>{127.02 + (i % 1000) * 1e-5:.7f}</lon><lat>{37.49 + (i % 997) * 1e-5:.7f}</lat>"
+        f"<opnDt>2019{1 + i % 12:02d}{1 + i % 28:02d}</opnDt><clsDt></clsDt>"
+        "<trdStateNm>영업</trdStateNm><ctgryThreeNm>백반/한정식</ctgryThreeNm>"
+        "</item>"
+    )
+
+
+def _page_xml(n_items: int, total_count: int = 12345) -> bytes:
+    items = "".join(_item_xml(i) for i in range(n_items))
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        "<response><header><description>소상공인시장진흥공단 주요상권현황</description>"
+        "<resultCode>00</resultCode><resultMsg>NORMAL SERVICE</resultMsg></header>"
+        f"<body><items>{items}</items><numOfRows>{n_items}</numOfRows><pageNo>1</pageNo>"
+        f"<totalCount>{total_count}</totalCount></body></response>"
+    ).encode("utf-8")
+
+
+def _legacy_parse(xml_text: str):
+    """기존 구현: 전체 트리 생성 후 item마다 find 19회"""
+    stores = []
+    root = ET.fromstring(xml_text)
+    for item in root.findall('.//item'):
+        store_data = {}
+        field_mapping = dict(XML_FIELD_MAPPING)
+        for xml_field, db_field in field_mapping.items():
+            element = item.find(xml_field)
+            if element is not None and element.text:
+                value = element.text.strip()
+                if db_field in ['longitude', 'latitude']:
+                    try:
+                        store_data[db_field] = float(value)
+                    except ValueError:
+                        store_data[db_field] = None
+                elif db_field in ['open_date', 'close_date']:
+                    try:
+                        if len(value) == 8:
+                            store_data[db_field] = datetime.strptime(value, '%Y%m%d').date()
+                        else:
+                            store_data[db_field] = None
+                    except ValueError:
+                        store_data[db_field] = None
+                else:
+                    store_data[db_field] = value
+            else:
+                store_data[db_field] = None
+        if (store_data.get('store_number') and store_data.get('store_name')
+                and store_data.get('longitude') and store_data.get('latitude')):
+            stores.append(store_data)
+    return stores
+
+
+def _chunks(payload: bytes, size: int):
+    return [payload[i:i + size] for i in range(0, len(payload), size)]
+
+
+class TestStorePageParser:
+    """StorePageParser 테스트 클래스"""
+
+    @pytest.fixture(scope="class")
+    def payload(self):
+        return _page_xml(1000)
+
+    def test_matches_legacy_parser(self, payload):
+        """기존 DOM 파서와 동일한 결과"""
+        rows, total_count = parse_store_rows([payload])
+
+        assert total_count == 12345
+        assert [row_to_dict(row) for row in rows] == _legacy_parse(payload.decode("utf-8"))
+
+    @pytest.mark.parametrize("chunk_size", [1, 7, 4096])
+    def test_chunk_boundaries_do_not_matter(self, chunk_size):
+        """태그/멀티바이트 문자가 조각 경계에 걸려도 동일"""
+        small = _page_xml(20)
+        assert parse_store_rows(_chunks(small, chunk_size)) == parse_store_rows([small])
+
+    def test_processed_items_are_released(self, payload):
+        """처리한 item의 하위 요소는 해제"""
+        parser = StorePageParser()
+        for chunk in _chunks(payload, 8192):
+            parser.feed(chunk)
+        parser.close()
+
+        items = parser.root.findall(".//item")
+        assert len(items) == 1000
+        assert all(len(item) == 0 for item in items)
+
+    def test_conversions_and_required_fields(self):
+        """좌표/날짜 변환과 필수 필드 누락 행 제외"""
+        payload = (
+            "<response><body><items>"
+            "<item><bizesId>A</bizesId><bizesNm>가</bizesNm><lon>127.1</lon><lat>37.5</lat>"
+            "<opnDt>20200230</opnDt><clsDt>20211231</clsDt><flrInfo> 2 </flrInfo></item>"
+            "<item><bizesId>B</bizesId><bizesNm>나</bizesNm><lon>abc</lon><lat>37.5</lat></item>"
+            "<item><bizesId>C</bizesId><lon>127.1</lon><lat>37.5</lat></item>"
+            "</items><totalCount>3</totalCount></body></response>"
+        ).encode("utf-8")
+        parser = StorePageParser()
+        rows = parser.feed(payload) + parser.close()
+
+        assert len(rows) == 1 and parser.skipped == 2
+        store = row_to_dict(rows[0])
+        assert store["longitude"] == 127.1
+        assert store["open_date"] is None
+        assert store["close_date"] == date(2021, 12, 31)
+        assert store["floor_info"] == "2"
+
+    def test_truncated_document_raises(self):
+        """잘린 응답은 ParseError"""
+        with pytest.raises(ET.ParseError):
+            parse_store_rows([_page_xml(3)[:-40]])
+
+    @pytest.mark.slow
+    def test_benchmark_1000_items(self, payload):
+        """1,000건 페이지: 스트리밍 파서가 기존 DOM 파서보다 빠르고 피크 메모리가 작음"""
+        text = payload.decode("utf-8")
+        chunks = _chunks(payload, 16384)
+
+        def best_of(fns, repeat=20):
+            """번갈아 실행한 최솟값 (GC는 매 실행 전에 수행)"""
+            timings = [[] for _ in fns]
+            for _ in range(repeat):
+                for fn, bucket in zip(fns, timings):
+                    gc.collect()
+                    started = time.perf_counter()
+                    fn()
+                    bucket.append(time.perf_counter() - started)
+            return [min(bucket) for bucket in timings]
+
+        def peak(fn):
+            tracemalloc.start()
+            fn()
+            _, peak_bytes = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            return peak_bytes
+
+        legacy_s, stream_s = best_of([lambda: _legacy_parse(text), lambda: parse_store_rows(chunks)])
+        legacy_peak = peak(lambda: _legacy_parse(text))
+        stream_peak = peak(lambda: parse_store_rows(chunks))
+        print(
+            f"\n1000 items ({len(payload) / 1024:.0f} KiB): "
+            f"legacy {legacy_s * 1000:.1f}ms / {legacy_peak / 1024:.0f} KiB, "
+            f"streaming {stream_s * 1000:.1f}ms / {stream_peak / 1024:.0f} KiB"
+        )
+
+        assert stream_s < legacy_s
+        assert stream_peak < legacy_peak
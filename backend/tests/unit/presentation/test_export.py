@@ -0,0 +1,115 @@
+"""
+대용량 내보내기 스트리밍 테스트
+"""
+from contextlib import asynccontextmanager
+from datetime import date
+from decimal import Decimal
+import csv
+import io
+import json
+
+import pytest
+from fastapi import HTTPException
+
+from src.presentation.api.export import export_response, stream_rows
+
+
+class FakeConnection:
+    """conn.cursor(prefetch) 호출과 행 소비량을 기록하는 가짜 연결"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.prefetch = None
+        self.consumed = 0
+
+    @asynccontextmanager
+    async def transaction(self, **kwargs):
+        yield
+
+    def cursor(self, query, *params, prefetch=None):
+        self.prefetch = prefetch
+        return self._iterate()
+
+    async def _iterate(self):
+        for row in self.rows:
+            self.consumed += 1
+            yield row
+
+
+class FakePool:
+    def __init__(self, conn):
+        self.conn = conn
+
+    @asynccontextmanager
+    async def acquire(self):
+        yield self.conn
+
+
+def _rows(n):
+    return [
+        {"id": i, "name": f"상가{i}", "opened": date(2024, 1, 1), "score": Decimal("1.5"), "memo": None}
+        for i in range(n)
+    ]
+
+
+COLUMNS = ["id", "name", "opened", "score", "memo"]
+
+
+async def _collect(chunks):
+    return [chunk async for chunk in chunks]
+
+
+class TestStreamRows:
+    """stream_rows 테스트 클래스"""
+
+    @pytest.mark.asyncio
+    async def test_ndjson_lines(self):
+        """행마다 JSON 한 줄, 날짜/Decimal/None 변환"""
+        conn = FakeConnection(_rows(3))
+        chunks = await _collect(stream_rows("SELECT", [], COLUMNS, "ndjson", prefetch=100, pool=FakePool(conn)))
+        lines = b"".join(chunks).decode("utf-8").splitlines()
+
+        assert [json.loads(line) for line in lines][1] == {
+            "id": 1, "name": "상가1", "opened": "2024-01-01", "score": 1.5, "memo": None
+        }
+        assert len(lines) == 3
+        assert conn.prefetch == 100
+
+    @pytest.mark.asyncio
+    async def test_csv_header_and_bom(self):
+        """CSV는 BOM + 헤더, None은 빈 칸"""
+        conn = FakeConnection(_rows(2))
+        chunks = await _collect(stream_rows("SELECT", [], COLUMNS, "csv", prefetch=100, pool=FakePool(conn)))
+        text = b"".join(chunks).decode("utf-8")
+
+        assert text.startswith("\ufeff")
+        assert list(csv.reader(io.StringIO(text.lstrip("\ufeff")))) == [
+            COLUMNS,
+            ["0", "상가0", "2024-01-01", "1.5", ""],
+            ["1", "상가1", "2024-01-01", "1.5", ""],
+        ]
+
+    @pytest.mark.asyncio
+    async def test_chunks_are_bounded_by_prefetch(self):
+        """prefetch 행마다 한 조각씩 내보내고, 소비자보다 앞서 읽지 않음"""
+        conn = FakeConnection(_rows(1050))
+        stream = stream_rows("SELECT", [], COLUMNS, "ndjson", prefetch=100, pool=FakePool(conn))
+
+        first = await stream.__anext__()
+        assert first.count(b"\n") == 100
+        assert conn.consumed == 100
+
+        rest = await _collect(stream)
+        assert [chunk.count(b"\n") for chunk in rest] == [100] * 9 + [50]
+
+
+class TestExportResponse:
+    """export_response 테스트 클래스"""
+
+    @pytest.mark.asyncio
+    async def test_unknown_format_is_400(self):
+        """지원하지 않는 형식은 400"""
+        with pytest.raises(HTTPException) as exc_info:
+            await export_response("SELECT", [], COLUMNS, "xml", "stores")
+
+        assert exc_info.value.status_code == 400
@@ -0,0 +1,74 @@
+"""
+커서 페이지네이션 유틸리티 테스트
+"""
+import pytest
+from fastapi import HTTPException
+from unittest.mock import AsyncMock
+
+from src.presentation.api.pagination import (
+    CountCache,
+    count_rows,
+    decode_cursor,
+    encode_cursor,
+)
+
+
+class TestCursor:
+    """커서 인코딩/디코딩 테스트"""
+
+    def test_roundtrip(self):
+        """인코딩한 값이 그대로 복원"""
+        cursor = encode_cursor(["스타벅스 강남점", 1234])
+
+        assert decode_cursor(cursor, 2) == ["스타벅스 강남점", 1234]
+
+    def test_cursor_is_url_safe(self):
+        """쿼리 파라미터로 그대로 쓸 수 있는 문자만 포함"""
+        cursor = encode_cursor(["??>>//++", 1])
+
+        assert all(c.isalnum() or c in "-_" for c in cursor)
+
+    @pytest.mark.parametrize("cursor", ["not-base64!!", encode_cursor([1, 2, 3]), encode_cursor({"a": 1})])
+    def test_invalid_cursor_raises_400(self, cursor):
+        """형식이 맞지 않는 커서는 400"""
+        with pytest.raises(HTTPException) as exc_info:
+            decode_cursor(cursor, 2)
+
+        assert exc_info.value.status_code == 400
+
+
+class TestCountRows:
+    """전체 개수 조회 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_exact_count_is_cached(self):
+        """정확값을 계산하면 이후 추정 요청에 재사용"""
+        conn = AsyncMock()
+        conn.fetchval = AsyncMock(return_value=42)
+        cache = CountCache()
+
+        assert await count_rows(conn, "SELECT id FROM t", [1], exact=True, cache=cache) == (42, True)
+        assert await count_rows(conn, "SELECT id FROM t", [1], cache=cache) == (42, True)
+        assert conn.fetchval.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_estimate_uses_planner_rows(self):
+        """캐시가 없으면 EXPLAIN 추정 행 수 사용"""
+        conn = AsyncMock()
+        conn.fetchval = AsyncMock(return_value='[{"Plan": {"Plan Rows": 1234}}]')
+
+        count, exact = await count_rows(conn, "SELECT id FROM t", [], cache=CountCache())
+
+        assert (count, exact) == (1234, False)
+        assert conn.fetchval.call_args.args[0].startswith("EXPLAIN (FORMAT JSON)")
+
+    @pytest.mark.asyncio
+    async def test_array_params_can_be_cached(self):
+        """= ANY($n) 배열 파라미터도 캐시 키로 사용"""
+        conn = AsyncMock()
+        conn.fetchval = AsyncMock(return_value=7)
+        cache = CountCache()
+
+        await count_rows(conn, "SELECT id FROM t", [["Q12", "D03"]], exact=True, cache=cache)
+
+        assert cache.get("SELECT id FROM t", [["Q12", "D03"]]) == 7
@@ -0,0 +1,125 @@
+"""
+빠른 JSON 직렬화 경로 테스트
+"""
+from datetime import date
+from decimal import Decimal
+import json
+import time
+
+import numpy as np
+import pytest
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from src.presentation.api.population import AGE_GROUPS, STATISTICS_ROW
+from src.presentation.api.serialization import FastJSONResponse, RowSerializer
+
+
+def _population_rows(n: int):
+    """population /statistics 쿼리 결과와 같은 컬럼의 행 (asyncpg Record처럼 키로 접근)"""
+    rows = []
+    for i in range(n):
+        row = {
+            "id": i,
+            "administrative_code": f"11{i:08d}",
+            "reference_date": date(2025, 5, 31),
+            "province": "서울특별시",
+            "city": "강남구",
+            "district": f"역삼{i}동",
+            "total_population": 40000 + i,
+            "total_male": 19000 + i,
+            "total_female": 21000,
+        }
+        for group in AGE_GROUPS:
+            row[f"age_{group}_male"] = 1000 + i
+            row[f"age_{group}_female"] = 1100 + i
+            row[f"age_{group}_total"] = 2100 + 2 * i
+        rows.append(row)
+    return rows
+
+
+def _legacy_statistics(rows):
+    """기존 /statistics 수작업 dict 구성"""
+    result = []
+    for row in rows:
+        result.append({
+            "administrative_code": row["administrative_code"],
+            "reference_date": row["reference_date"].isoformat() if row["reference_date"] else None,
+            "province": row["province"],
+            "city": row["city"],
+            "district": row["district"],
+            "total_population": row["total_population"],
+            "total_male": row["total_male"],
+            "total_female": row["total_female"],
+            "age_groups": {f"age_{g}": row[f"age_{g}_total"] for g in AGE_GROUPS[:-1]},
+            "gender_breakdown": {
+                f"age_{g}_{sex}": row[f"age_{g}_{sex}"] for g in AGE_GROUPS for sex in ("male", "female")
+            },
+        })
+    return result
+
+
+class TestRowSerializer:
+    """RowSerializer 테스트 클래스"""
+
+    def test_matches_legacy_shape(self):
+        """기존 수작업 dict와 같은 JSON (키 순서 포함)"""
+        rows = _population_rows(3)
+        legacy = JSONResponse(jsonable_encoder({"data": _legacy_statistics(rows)})).body
+        fast = FastJSONResponse({"data": STATISTICS_ROW.many(rows)}).body
+
+        assert json.loads(fast) == json.loads(legacy)
+        assert list(json.loads(fast)["data"][0]) == list(json.loads(legacy)["data"][0])
+
+    def test_rename_and_rounding(self):
+        """(응답 키, 컬럼) 이름 변경과 반올림, None 유지"""
+        serializer = RowSerializer(["id", ("lat", "latitude"), "score"], rounding={"lat": 3, "score": 1})
+
+        assert serializer.one({"id": 1, "latitude": 37.123456, "score": None}) == {
+            "id": 1, "lat": 37.123, "score": None
+        }
+
+    def test_single_column_group(self):
+        """필드가 하나뿐인 그룹도 dict로 구성"""
+        serializer = RowSerializer(["id"], groups={"meta": ["name"]})
+
+        assert serializer.one({"id": 1, "name": "카페"}) == {"id": 1, "meta": {"name": "카페"}}
+
+
+class TestFastJSONResponse:
+    """FastJSONResponse 테스트 클래스"""
+
+    def test_native_types(self):
+        """date, Decimal, NumPy 값 인코딩 (한글은 이스케이프 없이)"""
+        body = FastJSONResponse({
+            "date": date(2024, 1, 2),
+            "amount": Decimal("1.25"),
+            "counts": np.array([1, 2]),
+            "name": "카페",
+        }).body
+
+        assert body.decode("utf-8") == '{"date":"2024-01-02","amount":1.25,"counts":[1,2],"name":"카페"}'
+
+    @pytest.mark.slow
+    def test_serialization_benchmark(self):
+        """1,000행 /statistics 응답 직렬화: 수작업 dict + jsonable_encoder 대비 2배 이상 빠름"""
+        rows = _population_rows(1000)
+
+        def legacy():
+            return JSONResponse(jsonable_encoder({"data": _legacy_statistics(rows)})).body
+
+        def fast():
+            return FastJSONResponse({"data": STATISTICS_ROW.many(rows)}).body
+
+        def best_of(fn, repeat=7):
+            timings = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                fn()
+                timings.append(time.perf_counter() - started)
+            return min(timings)
+
+        legacy_ms, fast_ms = best_of(legacy) * 1000, best_of(fast) * 1000
+        print(f"\n1,000 rows: legacy {legacy_ms:.1f} ms, fast {fast_ms:.1f} ms ({legacy_ms / fast_ms:.1f}x)")
+
+        assert fast_ms * 2 < legacy_ms
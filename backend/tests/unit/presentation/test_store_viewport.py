@@ -0,0 +1,40 @@
+"""
+상가 밀도/클러스터 뷰포트 검증 테스트
+"""
+import time
+
+import pytest
+from fastapi import HTTPException
+
+from src.presentation.api.v1.business_stores import get_density, get_store_clusters
+
+# 서울 전체
+SEOUL = dict(min_lat=37.41, min_lon=126.76, max_lat=37.72, max_lon=127.19)
+
+
+class TestViewportTiles:
+    """뷰포트 타일 수 제한 테스트"""
+
+    async def test_clusters_reject_wide_bbox_at_high_zoom(self):
+        """넓은 박스 + 최대 줌은 타일 목록을 만들지 않고 곧바로 400"""
+        started = time.perf_counter()
+        with pytest.raises(HTTPException) as exc_info:
+            await get_store_clusters(**SEOUL, zoom=22, business_type=None)
+
+        assert exc_info.value.status_code == 400
+        assert "tiles" in exc_info.value.detail
+        assert time.perf_counter() - started < 0.05
+
+    async def test_density_rejects_wide_bbox_at_high_zoom(self):
+        started = time.perf_counter()
+        with pytest.raises(HTTPException) as exc_info:
+            await get_density(**SEOUL, zoom=24, detail=0, business_type=None, by_code=False)
+
+        assert exc_info.value.status_code == 400
+        assert time.perf_counter() - started < 0.05
+
+    async def test_invalid_bbox(self):
+        with pytest.raises(HTTPException) as exc_info:
+            await get_store_clusters(min_lat=37.7, min_lon=127.0, max_lat=37.5, max_lon=127.1, zoom=10, business_type=None)
+
+        assert exc_info.value.status_code == 400
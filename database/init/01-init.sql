@@ -4,6 +4,7 @@
 -- 확장 프로그램 활성화
 CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
 CREATE EXTENSION IF NOT EXISTS "pgcrypto";
+CREATE EXTENSION IF NOT EXISTS "pg_trgm";
 
 -- 한국어 지원을 위한 설정
 SET default_text_search_config = 'korean';